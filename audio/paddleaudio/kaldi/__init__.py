@@ -12,4 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from .kaldi import fbank
+from .kaldi import fbank_batch
+from .kaldi import StreamingFbank
 #from .kaldi import pitch
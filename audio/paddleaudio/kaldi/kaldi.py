@@ -11,17 +11,21 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from typing import List
+from typing import Sequence
+
+import numpy as np
 import paddleaudio
 from paddleaudio._internal import module_utils
 
 __all__ = [
     'fbank',
+    'StreamingFbank',
+    'fbank_batch',
 ]
 
 
-@module_utils.requires_kaldi()
-def fbank(
-        wav,
+def _fbank_options(
         samp_freq: int=16000,
         frame_shift_ms: float=10.0,
         frame_length_ms: float=25.0,
@@ -75,11 +79,142 @@ def fbank(
     fbank_opts.htk_compat = htk_compat
     fbank_opts.use_log_fbank = use_log_fbank
     fbank_opts.use_power = use_power
+    return frame_opts, mel_opts, fbank_opts
+
+
+@module_utils.requires_kaldi()
+def fbank(
+        wav,
+        samp_freq: int=16000,
+        frame_shift_ms: float=10.0,
+        frame_length_ms: float=25.0,
+        dither: float=0.0,
+        preemph_coeff: float=0.97,
+        remove_dc_offset: bool=True,
+        window_type: str='povey',
+        round_to_power_of_two: bool=True,
+        blackman_coeff: float=0.42,
+        snip_edges: bool=True,
+        max_feature_vectors: int=-1,
+        num_bins: int=23,
+        low_freq: float=20,
+        high_freq: float=0,
+        vtln_low: float=100,
+        vtln_high: float=-500,
+        debug_mel: bool=False,
+        htk_mode: bool=False,
+        use_energy: bool=False,  # fbank opts
+        energy_floor: float=0.0,
+        raw_energy: bool=True,
+        htk_compat: bool=False,
+        use_log_fbank: bool=True,
+        use_power: bool=True):
+    frame_opts, mel_opts, fbank_opts = _fbank_options(
+        samp_freq=samp_freq,
+        frame_shift_ms=frame_shift_ms,
+        frame_length_ms=frame_length_ms,
+        dither=dither,
+        preemph_coeff=preemph_coeff,
+        remove_dc_offset=remove_dc_offset,
+        window_type=window_type,
+        round_to_power_of_two=round_to_power_of_two,
+        blackman_coeff=blackman_coeff,
+        snip_edges=snip_edges,
+        max_feature_vectors=max_feature_vectors,
+        num_bins=num_bins,
+        low_freq=low_freq,
+        high_freq=high_freq,
+        vtln_low=vtln_low,
+        vtln_high=vtln_high,
+        debug_mel=debug_mel,
+        htk_mode=htk_mode,
+        use_energy=use_energy,
+        energy_floor=energy_floor,
+        raw_energy=raw_energy,
+        htk_compat=htk_compat,
+        use_log_fbank=use_log_fbank,
+        use_power=use_power)
     feat = paddleaudio._paddleaudio.ComputeFbank(frame_opts, mel_opts,
                                                  fbank_opts, wav)
     return feat
 
 
+class StreamingFbank:
+    """The fbank of a stream, fed chunk by chunk.
+
+    The samples not covered by a complete frame are kept for the next chunk,
+    so the frames are the same as those of `fbank` of the whole stream. Every
+    instance owns its state, so the streams of a process, e.g. the sessions of
+    a server, are independent. The features are computed with the GIL
+    released, so the streams can be fed from different threads in parallel.
+
+    Args:
+        **kwargs: the options of `fbank`, e.g. `num_bins`.
+    """
+
+    @module_utils.requires_kaldi()
+    def __init__(self, **kwargs):
+        self._extractor = paddleaudio._paddleaudio.FbankExtractor(
+            *_fbank_options(**kwargs))
+
+    @property
+    def dim(self) -> int:
+        return self._extractor.dim()
+
+    def accept_waveform(self, wav: np.ndarray):
+        """Feed a chunk of samples, the new frames are kept until `get_frames`.
+
+        Args:
+            wav (np.ndarray): the samples, (T,)
+        """
+        self._extractor.accept_waveform(np.asarray(wav, dtype=np.float32))
+
+    def get_frames(self) -> np.ndarray:
+        """The frames computed since the last call.
+
+        Returns:
+            np.ndarray: (num_frames, dim)
+        """
+        return self._extractor.get_frames()
+
+    def __call__(self, wav: np.ndarray) -> np.ndarray:
+        """Feed a chunk of samples and get the new frames.
+
+        Args:
+            wav (np.ndarray): the samples, (T,)
+
+        Returns:
+            np.ndarray: (num_frames, dim)
+        """
+        return self._extractor.compute(np.asarray(wav, dtype=np.float32))
+
+    def reset(self):
+        """Drop the samples and the frames kept, to start a new stream."""
+        self._extractor.reset()
+
+
+@module_utils.requires_kaldi()
+def fbank_batch(streams: Sequence[StreamingFbank],
+                wavs: Sequence[np.ndarray],
+                num_threads: int=0) -> List[np.ndarray]:
+    """Feed a chunk of samples to each of the streams in one call.
+
+    The streams are computed in parallel by `num_threads` native threads
+    without the GIL.
+
+    Args:
+        streams (Sequence[StreamingFbank]): the streams, which should be distinct.
+        wavs (Sequence[np.ndarray]): a chunk of samples of each stream, (Ti,)
+        num_threads (int, optional): number of threads, all the hardware threads if 0, by default 0
+
+    Returns:
+        List[np.ndarray]: the new frames of each stream, (num_frames_i, dim)
+    """
+    return paddleaudio._paddleaudio.ComputeFbankBatch(
+        [stream._extractor for stream in streams],
+        [np.asarray(wav, dtype=np.float32) for wav in wavs], num_threads)
+
+
 #@module_utils.requires_kaldi()
 #def pitch(wav,
 #samp_freq: int=16000,
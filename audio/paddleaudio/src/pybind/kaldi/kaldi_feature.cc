@@ -18,7 +18,7 @@
 namespace paddleaudio {
 namespace kaldi {
 
-bool InitFbank(
+knf::FbankOptions MakeFbankOptions(
     knf::FrameExtractionOptions frame_opts,
     knf::MelBanksOptions mel_opts,
     FbankOptions fbank_opts) {
@@ -31,13 +31,15 @@ bool InitFbank(
     opts.htk_compat = fbank_opts.htk_compat;
     opts.use_log_fbank = fbank_opts.use_log_fbank;
     opts.use_power = fbank_opts.use_power;
-    paddleaudio::kaldi::KaldiFeatureWrapper::GetInstance()->InitFbank(opts);
-    return true;
+    return opts;
 }
 
-py::array_t<float> ComputeFbankStreaming(const py::array_t<float>& wav) {
-    return paddleaudio::kaldi::KaldiFeatureWrapper::GetInstance()->ComputeFbank(
-        wav);
+std::unique_ptr<KaldiFeatureWrapper> CreateFbank(
+    knf::FrameExtractionOptions frame_opts,
+    knf::MelBanksOptions mel_opts,
+    FbankOptions fbank_opts) {
+    return std::unique_ptr<KaldiFeatureWrapper>(new KaldiFeatureWrapper(
+        MakeFbankOptions(frame_opts, mel_opts, fbank_opts)));
 }
 
 py::array_t<float> ComputeFbank(
@@ -45,14 +47,10 @@ py::array_t<float> ComputeFbank(
     knf::MelBanksOptions mel_opts,
     FbankOptions fbank_opts,
     const py::array_t<float>& wav) {
-    InitFbank(frame_opts, mel_opts, fbank_opts);
-    py::array_t<float> result = ComputeFbankStreaming(wav);
-    paddleaudio::kaldi::KaldiFeatureWrapper::GetInstance()->ResetFbank();
-    return result;
-}
-
-void ResetFbank() {
-    paddleaudio::kaldi::KaldiFeatureWrapper::GetInstance()->ResetFbank();
+    // a stream of its own, so concurrent calls do not share any state
+    std::unique_ptr<KaldiFeatureWrapper> fbank =
+        CreateFbank(frame_opts, mel_opts, fbank_opts);
+    return fbank->ComputeFbank(wav);
 }
 
 //py::array_t<float> ComputeKaldiPitch(
@@ -41,7 +41,13 @@ struct FbankOptions{
                  use_power(true) {}
 };
 
-bool InitFbank(
+knf::FbankOptions MakeFbankOptions(
+    knf::FrameExtractionOptions frame_opts,
+    knf::MelBanksOptions mel_opts,
+    FbankOptions fbank_opts);
+
+// A streaming fbank extractor of its own, for a stream.
+std::unique_ptr<KaldiFeatureWrapper> CreateFbank(
     knf::FrameExtractionOptions frame_opts,
     knf::MelBanksOptions mel_opts,
     FbankOptions fbank_opts);
@@ -52,10 +58,6 @@ py::array_t<float> ComputeFbank(
     FbankOptions fbank_opts,
     const py::array_t<float>& wav);
 
-py::array_t<float> ComputeFbankStreaming(const py::array_t<float>& wav);
-
-void ResetFbank();
-
 //py::array_t<float> ComputeKaldiPitch(
     //const ::kaldi::PitchExtractionOptions& opts,
     //const py::array_t<float>& wav);
@@ -14,35 +14,106 @@
 
 #include "paddleaudio/src/pybind/kaldi/kaldi_feature_wrapper.h"
 
+#include <algorithm>
+#include <atomic>
+#include <cstring>
+#include <stdexcept>
+#include <thread>
+#include <unordered_set>
+
 namespace paddleaudio {
 namespace kaldi {
 
-KaldiFeatureWrapper* KaldiFeatureWrapper::GetInstance() {
-    static KaldiFeatureWrapper instance;
-    return &instance;
+static std::vector<float> ToVector(const py::array_t<float>& wav) {
+    py::buffer_info info = wav.request();
+    const float* data = static_cast<const float*>(info.ptr);
+    return std::vector<float>(data, data + info.size);
+}
+
+KaldiFeatureWrapper::KaldiFeatureWrapper(const knf::FbankOptions& opts)
+    : fbank_(new Fbank(opts)) {}
+
+void KaldiFeatureWrapper::Accept(std::vector<float> wav) {
+    std::vector<float> feats;
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (fbank_->ComputeFeature(wav, &feats) == false) return;
+    frames_.insert(frames_.end(), feats.begin(), feats.end());
+}
+
+void KaldiFeatureWrapper::AcceptWaveform(const py::array_t<float>& wav) {
+    // copy the samples with the GIL held, then compute without it
+    std::vector<float> input_wav = ToVector(wav);
+    py::gil_scoped_release release;
+    Accept(std::move(input_wav));
 }
 
-bool KaldiFeatureWrapper::InitFbank(knf::FbankOptions opts) {
-    fbank_.reset(new Fbank(opts));
-    return true;
+py::array_t<float> KaldiFeatureWrapper::GetFrames() {
+    std::lock_guard<std::mutex> lock(mutex_);
+    int dim = Dim();
+    auto result = py::array_t<float>(
+        {static_cast<py::ssize_t>(frames_.size() / dim),
+         static_cast<py::ssize_t>(dim)});
+    std::memcpy(
+        result.mutable_data(), frames_.data(), sizeof(float) * frames_.size());
+    frames_.clear();
+    return result;
 }
 
 py::array_t<float> KaldiFeatureWrapper::ComputeFbank(
-    const py::array_t<float> wav) {
-    py::buffer_info info = wav.request();
-    std::vector<float> input_wav((float*)info.ptr, (float*)info.ptr + info.size);
+    const py::array_t<float>& wav) {
+    AcceptWaveform(wav);
+    return GetFrames();
+}
 
-    std::vector<float> feats;
-    bool flag = fbank_->ComputeFeature(input_wav, &feats);
-    if (flag == false || feats.size() == 0) return py::array_t<float>();
-    auto result = py::array_t<float>(feats.size());
-    py::buffer_info xs = result.request();
-    float* res_ptr = (float*)xs.ptr;
-    std::memcpy(res_ptr, feats.data(), sizeof(float)*feats.size());
-    std::vector<int> shape{static_cast<int>(feats.size() / Dim()), 
-                           static_cast<int>(Dim())};
-    return result.reshape(shape);
+void KaldiFeatureWrapper::Reset() {
+    std::lock_guard<std::mutex> lock(mutex_);
+    fbank_->Reset();
+    frames_.clear();
+}
+
+std::vector<py::array_t<float>> ComputeFbankBatch(
+    const std::vector<KaldiFeatureWrapper*>& streams,
+    const std::vector<py::array_t<float>>& wavs,
+    int num_threads) {
+    if (streams.size() != wavs.size()) {
+        throw std::invalid_argument(
+            "the numbers of the streams and the waveforms differ");
+    }
+    // the chunks of a stream would be fed in no particular order
+    std::unordered_set<KaldiFeatureWrapper*> unique(streams.begin(),
+                                                    streams.end());
+    if (unique.size() != streams.size() || unique.count(nullptr) > 0) {
+        throw std::invalid_argument("the streams should be distinct");
+    }
+
+    int num_streams = streams.size();
+    std::vector<std::vector<float>> inputs;
+    inputs.reserve(num_streams);
+    for (const auto& wav : wavs) inputs.push_back(ToVector(wav));
+
+    if (num_threads <= 0) {
+        num_threads = std::max(1u, std::thread::hardware_concurrency());
+    }
+    num_threads = std::min(num_threads, num_streams);
+    {
+        py::gil_scoped_release release;
+        std::atomic<int> next(0);
+        auto worker = [&]() {
+            for (int i = next++; i < num_streams; i = next++) {
+                streams[i]->Accept(std::move(inputs[i]));
+            }
+        };
+        std::vector<std::thread> threads;
+        for (int i = 1; i < num_threads; ++i) threads.emplace_back(worker);
+        worker();
+        for (auto& thread : threads) thread.join();
+    }
+
+    std::vector<py::array_t<float>> results;
+    results.reserve(num_streams);
+    for (auto* stream : streams) results.push_back(stream->GetFrames());
+    return results;
 }
 
-}  // namesapce kaldi
+}  // namespace kaldi
 }  // namespace paddleaudio
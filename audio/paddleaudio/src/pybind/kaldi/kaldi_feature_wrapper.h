@@ -14,6 +14,9 @@
 
 #pragma once
 
+#include <mutex>
+#include <vector>
+
 #include "paddleaudio/third_party/kaldi-native-fbank/csrc/feature-fbank.h"
 #include "paddleaudio/src/pybind/kaldi/feature_common.h"
 
@@ -22,17 +25,37 @@ namespace kaldi {
 
 typedef StreamingFeatureTpl<knf::FbankComputer> Fbank;
 
+// The streaming fbank of one stream. Every instance owns its state, so the
+// streams of a process are independent and can be fed from different threads.
+// The features are computed with the GIL released.
 class KaldiFeatureWrapper {
   public:
-    static KaldiFeatureWrapper* GetInstance();
-    bool InitFbank(knf::FbankOptions opts);
-    py::array_t<float> ComputeFbank(const py::array_t<float> wav);
+    explicit KaldiFeatureWrapper(const knf::FbankOptions& opts);
+    // Feed the samples, the new frames are kept until GetFrames.
+    void AcceptWaveform(const py::array_t<float>& wav);
+    // The frames computed since the last call, (num_frames, dim).
+    py::array_t<float> GetFrames();
+    // AcceptWaveform and GetFrames.
+    py::array_t<float> ComputeFbank(const py::array_t<float>& wav);
     int Dim() { return fbank_->Dim(); }
-    void ResetFbank() { fbank_->Reset(); }
+    void Reset();
+
+    // Feed the samples without the GIL.
+    void Accept(std::vector<float> wav);
 
   private:
     std::unique_ptr<paddleaudio::kaldi::Fbank> fbank_;
+    std::vector<float> frames_;
+    std::mutex mutex_;
 };
 
+// Feed a chunk of samples to each of the streams and return their new frames.
+// The streams are computed by num_threads threads without the GIL, all the
+// hardware threads if num_threads <= 0.
+std::vector<py::array_t<float>> ComputeFbankBatch(
+    const std::vector<KaldiFeatureWrapper*>& streams,
+    const std::vector<py::array_t<float>>& wavs,
+    int num_threads);
+
 }  // namespace kaldi
 }  // namespace paddleaudio
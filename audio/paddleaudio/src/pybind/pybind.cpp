@@ -89,6 +89,25 @@ PYBIND11_MODULE(_paddleaudio, m) {
 
 #ifdef INCLUDE_KALDI
     m.def("ComputeFbank", &paddleaudio::kaldi::ComputeFbank, "compute fbank");
+    py::class_<paddleaudio::kaldi::KaldiFeatureWrapper>(m, "FbankExtractor")
+        .def(py::init(&paddleaudio::kaldi::CreateFbank))
+        .def("accept_waveform",
+             &paddleaudio::kaldi::KaldiFeatureWrapper::AcceptWaveform,
+             "feed the samples of the stream")
+        .def("get_frames",
+             &paddleaudio::kaldi::KaldiFeatureWrapper::GetFrames,
+             "get the frames computed since the last call")
+        .def("compute",
+             &paddleaudio::kaldi::KaldiFeatureWrapper::ComputeFbank,
+             "feed the samples and get the new frames")
+        .def("reset", &paddleaudio::kaldi::KaldiFeatureWrapper::Reset)
+        .def("dim", &paddleaudio::kaldi::KaldiFeatureWrapper::Dim);
+    m.def("ComputeFbankBatch",
+          &paddleaudio::kaldi::ComputeFbankBatch,
+          "feed the samples of each stream and get their new frames",
+          py::arg("streams"),
+          py::arg("wavs"),
+          py::arg("num_threads") = 0);
     //py::class_<kaldi::PitchExtractionOptions>(m, "PitchExtractionOptions")
         //.def(py::init<>())
         //.def_readwrite("samp_freq", &kaldi::PitchExtractionOptions::samp_freq)
@@ -0,0 +1,61 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+
+import numpy as np
+import pytest
+from paddleaudio.kaldi import fbank_batch
+from paddleaudio.kaldi import StreamingFbank
+
+# 16 streams of 10s, fed in chunks of 100ms like the sessions of a server
+num_streams = 16
+chunk_size = 1600
+waveforms = (np.random.RandomState(0).randn(num_streams, 16000 * 10) *
+             1000).astype(np.float32)
+
+
+def feed_batch(num_threads):
+    streams = [StreamingFbank(num_bins=80) for _ in range(num_streams)]
+    for start in range(0, waveforms.shape[1], chunk_size):
+        fbank_batch(
+            streams, waveforms[:, start:start + chunk_size],
+            num_threads=num_threads)
+
+
+def feed_threads(num_threads):
+    def run(indices):
+        for i in indices:
+            stream = StreamingFbank(num_bins=80)
+            for start in range(0, waveforms.shape[1], chunk_size):
+                stream(waveforms[i, start:start + chunk_size])
+
+    threads = [
+        threading.Thread(
+            target=run, args=(range(k, num_streams, num_threads), ))
+        for k in range(num_threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+@pytest.mark.parametrize("num_threads", [1, 2, 4, 8])
+def test_fbank_batch(benchmark, num_threads):
+    benchmark(feed_batch, num_threads)
+
+
+@pytest.mark.parametrize("num_threads", [1, 2, 4, 8])
+def test_fbank_python_threads(benchmark, num_threads):
+    benchmark(feed_threads, num_threads)
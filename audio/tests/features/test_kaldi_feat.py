@@ -18,6 +18,8 @@ import kaldiio
 import numpy as np
 from kaldiio import ReadHelper
 from paddleaudio.kaldi import fbank as fbank
+from paddleaudio.kaldi import fbank_batch
+from paddleaudio.kaldi import StreamingFbank
 #from paddleaudio.kaldi import pitch as pitch
 
 # the groundtruth feats computed in kaldi command below.
@@ -37,6 +39,43 @@ class TestKaldiFbank(unittest.TestCase):
         fbank_check = fbank_groundtruth['test_wav']
         np.testing.assert_array_almost_equal(fbank_feat, fbank_check, decimal=4)
 
+    def test_streaming_fbank(self):
+        wav_rate, wav = kaldiio.wavio.read_wav('testdata/test.wav')
+        wav = wav.astype(np.float32)
+        fbank_feat = fbank(wav)
+
+        rng = np.random.RandomState(0)
+        # two streams fed alternately do not share any state
+        streams = [StreamingFbank(), StreamingFbank()]
+        feats = [[], []]
+        start = 0
+        while start < len(wav):
+            end = start + rng.randint(1, 3000)
+            for stream, feat in zip(streams, feats):
+                feat.append(stream(wav[start:end]))
+            start = end
+        for feat in feats:
+            np.testing.assert_array_equal(np.concatenate(feat), fbank_feat)
+
+        streams[0].reset()
+        streams[0].accept_waveform(wav)
+        np.testing.assert_array_equal(streams[0].get_frames(), fbank_feat)
+
+    def test_fbank_batch(self):
+        wav_rate, wav = kaldiio.wavio.read_wav('testdata/test.wav')
+        wav = wav.astype(np.float32)
+        fbank_feat = fbank(wav, num_bins=80)
+
+        streams = [StreamingFbank(num_bins=80) for _ in range(4)]
+        feats = [[] for _ in streams]
+        for start in range(0, len(wav), 1600):
+            chunks = [wav[start:start + 1600]] * len(streams)
+            for feat, frames in zip(feats,
+                                    fbank_batch(streams, chunks, num_threads=2)):
+                feat.append(frames)
+        for feat in feats:
+            np.testing.assert_array_equal(np.concatenate(feat), fbank_feat)
+
     #def test_pitch(self):
     #    pitch_groundtruth = {}
     #    if platform.system() != "Linux":
@@ -59,23 +59,27 @@ class TTS:
         phone_ids = input_ids["phone_ids"]
         wav_list = []
         for i in range(len(phone_ids)):
-            orig_hs = self.engine.executor.am_encoder_infer_sess.run(
-                None, input_feed={'text': phone_ids[i].numpy()})
+            executor = self.engine.executor
+            with executor.am_encoder_infer_sess_pool.checkout() as sess:
+                orig_hs = sess.run(
+                    None, input_feed={'text': phone_ids[i].numpy()})
             hs = orig_hs[0]
-            am_decoder_output = self.engine.executor.am_decoder_sess.run(
-                None, input_feed={'xs': hs})
-            am_postnet_output = self.engine.executor.am_postnet_sess.run(
-                None,
-                input_feed={
-                    'xs': np.transpose(am_decoder_output[0], (0, 2, 1))
-                })
+            with executor.am_decoder_sess_pool.checkout() as sess:
+                am_decoder_output = sess.run(None, input_feed={'xs': hs})
+            with executor.am_postnet_sess_pool.checkout() as sess:
+                am_postnet_output = sess.run(
+                    None,
+                    input_feed={
+                        'xs': np.transpose(am_decoder_output[0], (0, 2, 1))
+                    })
             am_output_data = am_decoder_output + np.transpose(
                 am_postnet_output[0], (0, 2, 1))
             normalized_mel = am_output_data[0][0]
             mel = denorm(normalized_mel, self.engine.executor.am_mu,
                          self.engine.executor.am_std)
-            wav = self.engine.executor.voc_sess.run(
-                output_names=None, input_feed={'logmel': mel})[0]
+            with executor.voc_sess_pool.checkout() as sess:
+                wav = sess.run(
+                    output_names=None, input_feed={'logmel': mel})[0]
             wav_list.append(wav)
         wavs = np.concatenate(wav_list)
         return wavs
@@ -97,8 +101,10 @@ class TTS:
             # fastspeech2_csmsc
             if self.config.am == "fastspeech2_csmsc_onnx":
                 # am 
-                mel = self.executor.am_sess.run(
-                    output_names=None, input_feed={'text': part_phone_ids})
+                with self.executor.am_sess_pool.checkout() as sess:
+                    mel = sess.run(
+                        output_names=None,
+                        input_feed={'text': part_phone_ids})
                 mel = mel[0]
 
                 # voc streaming
@@ -106,8 +112,9 @@ class TTS:
                                         self.config.voc_pad, "voc")
                 voc_chunk_num = len(mel_chunks)
                 for i, mel_chunk in enumerate(mel_chunks):
-                    sub_wav = self.executor.voc_sess.run(
-                        output_names=None, input_feed={'logmel': mel_chunk})
+                    with self.executor.voc_sess_pool.checkout() as sess:
+                        sub_wav = sess.run(
+                            output_names=None, input_feed={'logmel': mel_chunk})
                     sub_wav = self.depadding(
                         sub_wav[0], voc_chunk_num, i, self.config.voc_block,
                         self.config.voc_pad, self.config.voc_upsample)
@@ -117,8 +124,10 @@ class TTS:
             # fastspeech2_cnndecoder_csmsc 
             elif self.config.am == "fastspeech2_cnndecoder_csmsc_onnx":
                 # am 
-                orig_hs = self.executor.am_encoder_infer_sess.run(
-                    None, input_feed={'text': part_phone_ids})
+                with self.executor.am_encoder_infer_sess_pool.checkout(
+                ) as sess:
+                    orig_hs = sess.run(
+                        None, input_feed={'text': part_phone_ids})
                 orig_hs = orig_hs[0]
 
                 # streaming voc chunk info
@@ -132,13 +141,16 @@ class TTS:
                                  self.config.am_pad, "am")
                 am_chunk_num = len(hss)
                 for i, hs in enumerate(hss):
-                    am_decoder_output = self.executor.am_decoder_sess.run(
-                        None, input_feed={'xs': hs})
-                    am_postnet_output = self.executor.am_postnet_sess.run(
-                        None,
-                        input_feed={
-                            'xs': np.transpose(am_decoder_output[0], (0, 2, 1))
-                        })
+                    with self.executor.am_decoder_sess_pool.checkout() as sess:
+                        am_decoder_output = sess.run(
+                            None, input_feed={'xs': hs})
+                    with self.executor.am_postnet_sess_pool.checkout() as sess:
+                        am_postnet_output = sess.run(
+                            None,
+                            input_feed={
+                                'xs': np.transpose(am_decoder_output[0],
+                                                   (0, 2, 1))
+                            })
                     am_output_data = am_decoder_output + np.transpose(
                         am_postnet_output[0], (0, 2, 1))
                     normalized_mel = am_output_data[0][0]
@@ -161,8 +173,10 @@ class TTS:
                            voc_chunk_id < voc_chunk_num):
                         voc_chunk = mel_streaming[start:end, :]
 
-                        sub_wav = self.executor.voc_sess.run(
-                            output_names=None, input_feed={'logmel': voc_chunk})
+                        with self.executor.voc_sess_pool.checkout() as sess:
+                            sub_wav = sess.run(
+                                output_names=None,
+                                input_feed={'logmel': voc_chunk})
                         sub_wav = self.depadding(
                             sub_wav[0], voc_chunk_num, voc_chunk_id,
                             self.config.voc_block, self.config.voc_pad,
@@ -15,6 +15,8 @@ from .extradatasets import MockDataset
 from .extradatasets import with_epoch
 from .extradatasets import with_length
 from .filters import associate
+from .filters import audio_batch_compute_fbank
+from .filters import audio_batch_spec_aug
 from .filters import audio_cmvn
 from .filters import audio_compute_fbank
 from .filters import audio_data_filter
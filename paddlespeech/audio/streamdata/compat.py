@@ -110,6 +110,12 @@ class FluidInterface:
     def audio_padding(self):
         return self.compose(filters.audio_padding())
 
+    def audio_batch_compute_fbank(self, *args, **kw):
+        return self.compose(filters.audio_batch_compute_fbank(*args, **kw))
+
+    def audio_batch_spec_aug(self, *args, **kw):
+        return self.compose(filters.audio_batch_spec_aug(*args, **kw))
+
     def audio_cmvn(self, cmvn_file):
         return self.compose(filters.audio_cmvn(cmvn_file))
 
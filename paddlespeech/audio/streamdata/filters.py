@@ -21,7 +21,9 @@ import time
 from fnmatch import fnmatch
 from functools import reduce
 
+import numpy as np
 import paddle
+import scipy.fft
 from paddleaudio import backends
 from paddleaudio.compliance import kaldi
 
@@ -867,6 +869,15 @@ def _audio_spec_aug(
 audio_spec_aug = pipelinefilter(_audio_spec_aug)
 
 
+def _sample_length(sample):
+    """ The number of frames of the feature, or of samples of the waveform
+        if the features are computed after batching.
+    """
+    if 'feat' in sample:
+        return sample['feat'].shape[0]
+    return sample['wav'].shape[-1]
+
+
 def _sort(source, sort_size=500):
     """ Sort the data by feature length.
         Sort is used after shuffle and before batch, so we can group
@@ -874,23 +885,23 @@ def _sort(source, sort_size=500):
         be less than `shuffle_size`
 
         Args:
-            source: Iterable[{fname, feat, label}]
+            source: Iterable[{fname, feat, label}] or Iterable[{fname, wav, label}]
             sort_size: buffer size for sort
 
         Returns:
-            Iterable[{fname, feat, label}]
+            Iterable[{fname, feat, label}] or Iterable[{fname, wav, label}]
     """
 
     buf = []
     for sample in source:
         buf.append(sample)
         if len(buf) >= sort_size:
-            buf.sort(key=lambda x: x['feat'].shape[0])
+            buf.sort(key=_sample_length)
             for x in buf:
                 yield x
             buf = []
     # The sample left over
-    buf.sort(key=lambda x: x['feat'].shape[0])
+    buf.sort(key=_sample_length)
     for x in buf:
         yield x
 
@@ -953,20 +964,28 @@ def dynamic_batched(source, max_frames_in_batch=12000):
 def _audio_padding(source):
     """ Padding the data into training data
 
+        The samples without `feat`, of which the features are computed after
+        batching by `audio_batch_compute_fbank`, are padded by `wav` instead.
+
         Args:
-            source: Iterable[List[{fname, feat, label}]]
+            source: Iterable[List[{fname, feat, label}]] or Iterable[List[{fname, wav, label}]]
 
         Returns:
-            Iterable[Tuple(fname, feats, labels, feats lengths, label lengths)]
+            Iterable[Tuple(fname, feats, labels, feats lengths, label lengths)],
+            feats are the padded waveforms (B, T) without `feat`.
     """
     for sample in source:
         assert isinstance(sample, list)
         feats_length = paddle.to_tensor(
-            [x['feat'].shape[0] for x in sample], dtype="int64")
+            [_sample_length(x) for x in sample], dtype="int64")
         order = paddle.argsort(feats_length, descending=True)
         feats_lengths = paddle.to_tensor(
-            [sample[i]['feat'].shape[0] for i in order], dtype="int64")
-        sorted_feats = [sample[i]['feat'] for i in order]
+            [_sample_length(sample[i]) for i in order], dtype="int64")
+        if 'feat' in sample[0]:
+            sorted_feats = [sample[i]['feat'] for i in order]
+        else:
+            # (1, T) of one channel
+            sorted_feats = [sample[i]['wav'][0] for i in order]
         sorted_keys = [sample[i]['fname'] for i in order]
         sorted_labels = [
             paddle.to_tensor(sample[i]['label'], dtype="int32") for i in order
@@ -985,13 +1004,278 @@ def _audio_padding(source):
 audio_padding = pipelinefilter(_audio_padding)
 
 
+class _BatchFbank():
+    """ The kaldi fbank of a padded batch of waveforms at once, the same as
+        `kaldi.fbank` of each row with the options of `audio_compute_fbank`.
+
+        The frames inside the rows are strided views of the padded batch, so
+        the frames of all the rows are computed together, and the frames
+        beyond the lengths are zero. It runs in numpy, of which the
+        elementwise ops are faster than those of paddle on cpu, and skips the
+        log energy, which `kaldi.fbank` always computes.
+    """
+
+    def __init__(self,
+                 num_mel_bins=80,
+                 frame_length=25,
+                 frame_shift=10,
+                 dither=0.0,
+                 sample_rate=16000):
+        self.window_shift = int(sample_rate * frame_shift * 0.001)
+        self.window_size = int(sample_rate * frame_length * 0.001)
+        self.padded_window_size = 1 << (self.window_size - 1).bit_length()
+        self.num_mel_bins = num_mel_bins
+        self.dither = dither
+        self.preemph_coeff = np.float32(0.97)
+        self.window = kaldi._feature_window_function(
+            "povey", self.window_size, 0.42, paddle.float32).numpy()
+        mel_banks, _ = kaldi._get_mel_banks(num_mel_bins,
+                                            self.padded_window_size,
+                                            sample_rate, 20.0, 0.0, 100.0,
+                                            -500.0, 1.0)
+        # (padded_window_size // 2 + 1, num_mel_bins), no weight of nyquist
+        self.mel_banks = np.pad(mel_banks.numpy(), ((0, 0), (0, 1))).T
+        self.epsilon = np.finfo(np.float32).eps
+
+    def __call__(self, waveforms, lengths):
+        """
+        Args:
+            waveforms: np.ndarray (B, T)
+            lengths: np.ndarray (B,), number of samples of each row
+
+        Returns:
+            Tuple(np.ndarray (B, T', num_mel_bins), np.ndarray (B,))
+        """
+        # snip_edges: the frames which fit in the row
+        feats_lengths = np.maximum(
+            (lengths - self.window_size) // self.window_shift + 1, 0)
+        max_frames = max(int(feats_lengths.max(initial=0)), 1)
+        batch_size, num_samples = waveforms.shape
+        num_needed = (max_frames - 1) * self.window_shift + self.window_size
+        waveforms = np.ascontiguousarray(waveforms, dtype=np.float32)
+        if num_samples < num_needed:
+            waveforms = np.pad(waveforms,
+                               ((0, 0), (0, num_needed - num_samples)))
+
+        itemsize = waveforms.itemsize
+        frames = np.lib.stride_tricks.as_strided(
+            waveforms, (batch_size, max_frames, self.window_size),
+            (waveforms.strides[0], self.window_shift * itemsize, itemsize),
+            writeable=False)
+        valid = np.arange(max_frames)[None, :] < feats_lengths[:, None]
+        frames = frames[valid]
+
+        if self.dither != 0.0:
+            frames = frames + np.random.randn(*frames.shape).astype(
+                np.float32) * np.float32(self.dither)
+        frames = frames - frames.mean(axis=1, keepdims=True)
+        preemph = np.empty_like(frames)
+        preemph[:, 1:] = frames[:, 1:] - self.preemph_coeff * frames[:, :-1]
+        preemph[:, 0] = frames[:, 0] * (1 - self.preemph_coeff)
+        preemph *= self.window
+        spectrum = scipy.fft.rfft(preemph, n=self.padded_window_size, axis=1)
+        power = spectrum.real**2 + spectrum.imag**2
+        mat = np.log(np.maximum(power @ self.mel_banks, self.epsilon))
+
+        feats = np.zeros(
+            [batch_size, max_frames, self.num_mel_bins], dtype=np.float32)
+        feats[valid] = mat
+        return feats, feats_lengths
+
+
+def _audio_batch_compute_fbank(source,
+                               num_mel_bins=80,
+                               frame_length=25,
+                               frame_shift=10,
+                               dither=0.0,
+                               sample_rate=16000):
+    """ Extract fbank of a padded batch of waveforms, the same as
+        `audio_compute_fbank` of the samples, in one call
+
+        Args:
+            source: Iterable[Tuple(fname, wavs, wav lengths, labels, label lengths)]
+            num_mel_bins: number of mel filter bank
+            frame_length: length of one frame (ms)
+            frame_shift: length of frame shift (ms)
+            dither: value of dither
+            sample_rate: sample rate of the waveforms, see `audio_resample`
+
+        Returns:
+            Iterable[Tuple(fname, feats, feats lengths, labels, label lengths)]
+    """
+    fbank = _BatchFbank(
+        num_mel_bins=num_mel_bins,
+        frame_length=frame_length,
+        frame_shift=frame_shift,
+        dither=dither,
+        sample_rate=sample_rate)
+    for batch in source:
+        sorted_keys, padded_wavs, wavs_lengths, padding_labels, label_lengths = batch
+        padded_feats, feats_lengths = fbank(padded_wavs.numpy() * (1 << 15),
+                                            wavs_lengths.numpy())
+        yield (sorted_keys, paddle.to_tensor(padded_feats),
+               paddle.to_tensor(feats_lengths, dtype="int64"),
+               padding_labels, label_lengths)
+
+
+audio_batch_compute_fbank = pipelinefilter(_audio_batch_compute_fbank)
+
+
+def _batch_time_warp(x, lengths, max_time_warp=5):
+    """ Time warp of a padded batch, the same as `time_warp` of "linear"
+        mode of each row.
+
+        The frames before a random center are stretched to a random length
+        and those after to the rest, by linear interpolation of the frames.
+        The rows no longer than twice the window are left as they are.
+
+        Args:
+            x: np.ndarray (B, T, D)
+            lengths: np.ndarray (B,)
+
+        Returns:
+            np.ndarray (B, T, D)
+    """
+    window = max_time_warp
+    batch_size, num_frames, _ = x.shape
+    if window == 0 or num_frames == 0:
+        return x
+    valid = lengths - window > window
+    # the same draws as randrange(window, t - window) and
+    # randrange(center - window, center + window) + 1
+    center = window + np.floor(
+        np.random.rand(batch_size) * np.maximum(lengths - 2 * window, 1))
+    warped = center - window + np.floor(
+        np.random.rand(batch_size) * 2 * window) + 1
+    # the rows left as they are take no stretch
+    center = np.where(valid, center, np.maximum(lengths, 1))[:, None]
+    warped = np.where(valid, warped, np.maximum(lengths, 1))[:, None]
+    lengths = lengths[:, None]
+
+    # the source position of every frame, with the pixel centers of a resize
+    t = np.arange(num_frames)[None, :]
+    left = np.clip((t + 0.5) * center / warped - 0.5, 0, center - 1)
+    right = center + (t - warped + 0.5) * (lengths - center) / np.maximum(
+        lengths - warped, 1) - 0.5
+    right = np.clip(right, center, np.maximum(lengths - 1, center))
+    src = np.where(t < warped, left, right)
+    src = np.where((t < lengths) & valid[:, None], src, t)
+
+    low = np.floor(src).astype(np.int64)
+    high = np.minimum(low + 1, num_frames - 1)
+    weight = (src - low)[..., None].astype(x.dtype)
+    return (np.take_along_axis(x, low[..., None], 1) * (1 - weight) +
+            np.take_along_axis(x, high[..., None], 1) * weight)
+
+
+def _batch_mask(sizes, max_width, n_mask):
+    """ Draw `n_mask` masks of each row, the same as `freq_mask` and
+        `time_mask`: the width of a mask is drawn from [0, max_width) to
+        place it, and its end is its start plus another draw.
+
+        Args:
+            sizes: np.ndarray (B,), the number of the frames or bins of each row
+
+        Returns:
+            Tuple(np.ndarray (B, n_mask), np.ndarray (B, n_mask)), begin and end of the masks
+    """
+    widths = np.random.randint(0, max_width, size=(len(sizes), n_mask, 2))
+    width, end = widths[..., 0], widths[..., 1]
+    sizes = sizes[:, None]
+    begin = np.floor(
+        np.random.rand(len(sizes), n_mask) * np.maximum(sizes - width, 1))
+    # the masks which do not fit, or of no width, are skipped
+    skip = (sizes - width <= 0) | (width == 0)
+    begin = np.where(skip, 0, begin)
+    end = np.where(skip, 0, begin + end)
+    return begin, end
+
+
+def _ranges_to_mask(begin, end, size):
+    """ (B, n_mask) ranges to a mask (B, size) of their union """
+    index = np.arange(size)[None, None, :]
+    return ((index >= begin[..., None]) & (index < end[..., None])).any(1)
+
+
+def _audio_batch_spec_aug(
+        source,
+        max_w=5,
+        w_inplace=True,
+        w_mode="linear",
+        max_f=30,
+        num_f_mask=2,
+        f_inplace=True,
+        f_replace_with_zero=False,
+        max_t=40,
+        num_t_mask=2,
+        t_inplace=True,
+        t_replace_with_zero=False, ):
+    """ Do spec augmentation of a padded batch, the same as `audio_spec_aug`
+        of the samples, with the random draws of all the rows at once.
+        The masks not replaced with zero are filled with the mean of each
+        row after the time warp. The arguments about inplace are ignored.
+
+        The time warp interpolates the frames linearly, which is the "linear"
+        mode of `time_warp`, not the bicubic resize of "PIL" mode. Set
+        `mode: linear` of `time_warp` in the preprocess config to use it.
+
+        Args:
+            source: Iterable[Tuple(fname, feats, feats lengths, labels, label lengths)]
+            max_w: max width of time warp
+            w_inplace: not used
+            w_mode: time warp mode, only "linear"
+            max_f: max width of freq mask
+            num_f_mask: number of freq mask to apply
+            f_inplace: not used
+            f_replace_with_zero: use zero to mask
+            max_t: max width of time mask
+            num_t_mask: number of time mask to apply
+            t_inplace: not used
+            t_replace_with_zero: use zero to mask
+
+        Returns
+            Iterable[Tuple(fname, feats, feats lengths, labels, label lengths)]
+     """
+    if w_mode != "linear":
+        raise NotImplementedError(
+            "unknown resize mode of the batch time warp: " + w_mode +
+            ", only linear is supported, set `mode: linear` of time_warp.")
+    for batch in source:
+        sorted_keys, padded_feats, feats_lengths, padding_labels, label_lengths = batch
+        x = padded_feats.numpy()
+        lengths = feats_lengths.numpy()
+        batch_size, num_frames, num_bins = x.shape
+        x = _batch_time_warp(x, lengths, max_w)
+
+        valid = np.arange(num_frames)[None, :] < lengths[:, None]
+        mean = x.sum(axis=(1, 2)) / np.maximum(lengths * num_bins, 1)
+        mean = mean.astype(x.dtype)[:, None, None]
+
+        begin, end = _batch_mask(
+            np.full([batch_size], num_bins), max_f, num_f_mask)
+        mask = _ranges_to_mask(begin, end, num_bins)[:, None, :] & valid[...,
+                                                                        None]
+        x = np.where(mask, 0 if f_replace_with_zero else mean, x)
+
+        begin, end = _batch_mask(lengths, max_t, num_t_mask)
+        mask = _ranges_to_mask(begin, end, num_frames) & valid
+        x = np.where(mask[..., None], 0 if t_replace_with_zero else mean, x)
+        padded_feats = paddle.to_tensor(x, dtype=paddle.float32)
+        yield (sorted_keys, padded_feats, feats_lengths, padding_labels,
+               label_lengths)
+
+
+audio_batch_spec_aug = pipelinefilter(_audio_batch_spec_aug)
+
+
 def _audio_cmvn(source, cmvn_file):
     global_cmvn = GlobalCMVN(cmvn_file)
+    # one broadcast op of a batch
+    mean = paddle.to_tensor(global_cmvn.mean, dtype=paddle.float32)
+    std = paddle.to_tensor(global_cmvn.std, dtype=paddle.float32)
     for batch in source:
         sorted_keys, padded_feats, feats_lengths, padding_labels, label_lengths = batch
-        padded_feats = padded_feats.numpy()
-        padded_feats = global_cmvn(padded_feats)
-        padded_feats = paddle.to_tensor(padded_feats, dtype=paddle.float32)
+        padded_feats = (padded_feats - mean) / std
         yield (sorted_keys, padded_feats, feats_lengths, padding_labels,
                label_lengths)
 
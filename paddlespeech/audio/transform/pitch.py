@@ -0,0 +1,576 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Kaldi pitch features in NumPy.
+
+A port of `compute-kaldi-pitch-feats` and `process-kaldi-pitch-feats` of Kaldi
+(src/feat/pitch-functions.cc), to compute the features in the process rather
+than by spawning the binaries. A waveform is processed offline as a whole,
+like the binaries do: the NCCF of all the frames are computed at once, and the
+Viterbi search of the pitch runs over the frames of a batch of utterances
+together.
+"""
+import math
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+import numpy as np
+
+from .add_deltas import delta
+from .spectrogram import LogMelSpectrogramKaldi
+
+__all__ = [
+    "compute_kaldi_pitch", "process_pitch", "KaldiPitch",
+    "LogMelSpectrogramKaldiPitch"
+]
+
+
+def _filter_func(t, cutoff, num_zeros):
+    """The windowed sinc filter of the resamplers of Kaldi."""
+    t = np.asarray(t, dtype=np.float64)
+    window = np.where(
+        np.abs(t) < num_zeros / (2.0 * cutoff),
+        0.5 * (1 + np.cos(2 * math.pi * cutoff / num_zeros * t)), 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sinc = np.where(t != 0,
+                        np.sin(2 * math.pi * cutoff * t) / (math.pi * t),
+                        2 * cutoff)
+    return sinc.astype(np.float32) * window.astype(np.float32)
+
+
+def _num_resampled(num_samples, orig_freq, new_freq, cutoff, num_zeros,
+                   flush):
+    """The number of output samples of `LinearResample` of Kaldi."""
+    tick_freq = orig_freq * new_freq // math.gcd(orig_freq, new_freq)
+    num_ticks = num_samples * (tick_freq // orig_freq)
+    if not flush:
+        num_ticks -= math.floor(num_zeros / (2.0 * cutoff) * tick_freq)
+    if num_ticks <= 0:
+        return 0
+    ticks_per_output = tick_freq // new_freq
+    return (num_ticks + ticks_per_output - 1) // ticks_per_output
+
+
+def _linear_resample(wave, orig_freq, new_freq, cutoff, num_zeros):
+    """Resample a whole waveform like `LinearResample` of Kaldi, flushed at the
+    end, i.e. the waveform is padded with zeros on both sides."""
+    base_freq = math.gcd(orig_freq, new_freq)
+    input_in_unit = orig_freq // base_freq
+    output_in_unit = new_freq // base_freq
+    num_output = _num_resampled(
+        len(wave), orig_freq, new_freq, cutoff, num_zeros, flush=True)
+
+    window_width = num_zeros / (2.0 * cutoff)
+    output = np.zeros(num_output, dtype=np.float32)
+    for i in range(min(output_in_unit, num_output)):
+        output_t = i / new_freq
+        first_index = math.ceil((output_t - window_width) * orig_freq)
+        last_index = math.floor((output_t + window_width) * orig_freq)
+        input_t = np.arange(first_index, last_index + 1) / orig_freq
+        weights = _filter_func(input_t - output_t, cutoff,
+                               num_zeros) / np.float32(orig_freq)
+
+        samp_out = np.arange(i, num_output, output_in_unit)
+        start = first_index + (samp_out // output_in_unit) * input_in_unit
+        pad_left = max(0, -start[0])
+        pad_right = max(0, start[-1] + len(weights) - len(wave))
+        padded = np.pad(wave, (pad_left, pad_right))
+        frames = np.lib.stride_tricks.sliding_window_view(padded,
+                                                          len(weights))
+        output[samp_out] = frames[start + pad_left] @ weights
+    return output
+
+
+def _select_lags(min_f0, max_f0, delta_pitch):
+    """The lags of the pitch candidates, in seconds."""
+    lags = []
+    lag = np.float32(1.0 / max_f0)
+    max_lag = np.float32(1.0 / min_f0)
+    while lag <= max_lag:
+        lags.append(lag)
+        lag = np.float32(lag * (1.0 + float(np.float32(delta_pitch))))
+    return np.array(lags, dtype=np.float32)
+
+
+def _nccf_resample_weights(num_samples_in, samp_rate, cutoff, sample_points,
+                           num_zeros):
+    """The weights of `ArbitraryResample` of Kaldi as a matrix, which upsamples
+    the NCCF measured at integer lags to the lags of the pitch candidates."""
+    samp_rate = np.float32(samp_rate)
+    filter_width = np.float32(num_zeros / (2.0 * cutoff))
+    weights = np.zeros([num_samples_in, len(sample_points)], dtype=np.float32)
+    for i, t in enumerate(sample_points):
+        first_index = max(0, math.ceil(samp_rate * (t - filter_width)))
+        last_index = min(num_samples_in - 1,
+                         math.floor(samp_rate * (t + filter_width)))
+        index = np.arange(first_index, last_index + 1)
+        delta_t = t - (index.astype(np.float32) / samp_rate)
+        weights[index, i] = _filter_func(delta_t, cutoff, num_zeros) / samp_rate
+    return weights
+
+
+def _mean_square(wave):
+    wave = wave.astype(np.float64)
+    return np.dot(wave, wave) / len(wave) - (wave.sum() / len(wave))**2
+
+
+def _approx_equal(a, b, tol):
+    return a == b or abs(a - b) <= tol * (abs(a) + abs(b))
+
+
+class _PitchExtractor():
+    """The resamplers and the lags, shared by the utterances of a batch."""
+
+    def __init__(self, sr, frame_length, frame_shift, min_f0, max_f0,
+                 soft_min_f0, penalty_factor, lowpass_cutoff,
+                 resample_frequency, delta_pitch, nccf_ballast,
+                 lowpass_filter_width, upsample_filter_width,
+                 recompute_frame):
+        self.sr = int(sr)
+        self.resample_frequency = int(resample_frequency)
+        self.lowpass_cutoff = lowpass_cutoff
+        self.lowpass_filter_width = lowpass_filter_width
+        self.soft_min_f0 = np.float32(soft_min_f0)
+        self.nccf_ballast = nccf_ballast
+        self.recompute_frame = recompute_frame
+
+        self.frame_shift = int(resample_frequency * frame_shift / 1000.0)
+        self.frame_length = int(resample_frequency * frame_length / 1000.0)
+        # the range of the lags of the NCCF, wide enough to upsample
+        outer_min_lag = 1.0 / max_f0 - upsample_filter_width / (
+            2.0 * resample_frequency)
+        outer_max_lag = 1.0 / min_f0 + upsample_filter_width / (
+            2.0 * resample_frequency)
+        self.first_lag = math.ceil(resample_frequency * outer_min_lag)
+        self.last_lag = math.floor(resample_frequency * outer_max_lag)
+
+        self.lags = _select_lags(min_f0, max_f0, delta_pitch)
+        self.nccf_weights = _nccf_resample_weights(
+            self.last_lag - self.first_lag + 1, resample_frequency,
+            resample_frequency * 0.5,
+            self.lags - np.float32(self.first_lag / resample_frequency),
+            upsample_filter_width)
+
+        num_states = len(self.lags)
+        inter_frame_factor = np.float32(
+            np.float32(math.log(1.0 + delta_pitch)**2) *
+            np.float32(penalty_factor))
+        steps = np.arange(num_states)
+        # the cost of the transition from the state j to the state i
+        self.transition_cost = np.float32(
+            (steps[:, None] - steps[None, :])**2) * inter_frame_factor
+
+    def local_cost(self, wave: np.ndarray) -> (np.ndarray, np.ndarray):
+        """Compute the local costs of the pitch candidates of the frames of a
+        waveform, and the NCCF for the probability of voicing."""
+        downsampled = _linear_resample(
+            wave.astype(np.float32), self.sr, self.resample_frequency,
+            self.lowpass_cutoff, self.lowpass_filter_width)
+        num_samples = len(downsampled)
+        frame_length = self.frame_length
+        full_length = frame_length + self.last_lag
+        if num_samples < frame_length:
+            num_states = len(self.lags)
+            return (np.zeros([0, num_states], dtype=np.float32),
+                    np.zeros([0, num_states], dtype=np.float32))
+        num_frames = (num_samples - frame_length) // self.frame_shift + 1
+
+        # Kaldi processes the frames with the full window in the waveform
+        # before the input is finished, i.e. before the resampler is flushed,
+        # with the energy of the samples up to then as the ballast term.
+        num_first_samples = _num_resampled(
+            len(wave), self.sr, self.resample_frequency, self.lowpass_cutoff,
+            self.lowpass_filter_width, False)
+        if num_first_samples < full_length:
+            num_first_frames = 0
+        else:
+            num_first_frames = min(
+                num_frames,
+                (num_first_samples - full_length) // self.frame_shift + 1)
+        mean_square = np.full([num_frames], _mean_square(downsampled))
+        if num_first_frames > 0:
+            mean_square[:num_first_frames] = _mean_square(
+                downsampled[:num_first_samples])
+
+        # the frames are padded with zeros at the end of the waveform
+        padded = np.pad(downsampled, (0, max(0, (
+            num_frames - 1) * self.frame_shift + full_length - num_samples)))
+        windows = np.lib.stride_tricks.sliding_window_view(
+            padded, full_length)[::self.frame_shift][:num_frames]
+        mean = windows[:, :frame_length].sum(
+            axis=1, dtype=np.float32) / np.float32(frame_length)
+        windows = windows - mean[:, None]
+        frames = windows[:, :frame_length]
+        lagged = np.lib.stride_tricks.sliding_window_view(
+            windows, frame_length,
+            axis=1)[:, self.first_lag:self.last_lag + 1]
+        inner_prod = np.einsum('tn,tln->tl', frames, lagged)
+        norm_prod = np.einsum('tn,tn->t', frames, frames)[:, None] * np.einsum(
+            'tln,tln->tl', lagged, lagged)
+
+        def _nccf(ballast):
+            denominator = np.sqrt(norm_prod + ballast[:, None])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                nccf = np.where(denominator != 0, inner_prod / denominator, 0)
+            return nccf.astype(np.float32) @ self.nccf_weights
+
+        ballast = ((mean_square * frame_length)**2 *
+                   self.nccf_ballast).astype(np.float32)
+        nccf_pitch = _nccf(ballast)
+        nccf_pov = _nccf(np.zeros_like(ballast))
+
+        # Kaldi recomputes the first frames with the energy of the whole
+        # waveform, if it is not known when they are processed, by scaling
+        # the NCCF as the ballast term changes.
+        if num_first_frames < self.recompute_frame:
+            num_recompute = min(num_frames, self.recompute_frame)
+            old_mean_square = mean_square[:num_recompute].astype(np.float32)
+            new_mean_square = np.float32(mean_square[-1])
+            if not all(
+                    _approx_equal(m, new_mean_square, 0.01)
+                    for m in old_mean_square):
+                old_ballast = ((old_mean_square * frame_length)**2 *
+                               self.nccf_ballast).astype(np.float32)
+                new_ballast = np.float32(
+                    (new_mean_square * frame_length)**2 * self.nccf_ballast)
+                avg_norm_prod = norm_prod[:num_recompute].mean(axis=1)
+                nccf_pitch[:num_recompute] *= np.sqrt(
+                    (old_ballast + avg_norm_prod) /
+                    (new_ballast + avg_norm_prod))[:, None]
+
+        local_cost = np.float32(1.0) - nccf_pitch
+        local_cost += self.soft_min_f0 * self.lags * nccf_pitch
+        return local_cost, nccf_pov
+
+    def viterbi(self, local_costs: List[np.ndarray]) -> List[np.ndarray]:
+        """Find the best pitch candidates of the frames of utterances, the
+        frames of the same index of the utterances are searched together."""
+        lengths = np.array([len(cost) for cost in local_costs])
+        order = np.argsort(-lengths, kind='stable')
+        num_states = len(self.lags)
+        forward_cost = np.zeros([len(order), num_states], dtype=np.float32)
+        backpointers = [[] for _ in order]
+        for t in range(lengths.max(initial=0)):
+            # the utterances longer than t, which are a prefix of the order
+            batch = order[lengths[order] > t]
+            cost = forward_cost[:len(batch), None, :] + self.transition_cost
+            best = cost.argmin(axis=2)
+            cost = np.take_along_axis(cost, best[..., None], axis=2)[..., 0]
+            cost += np.stack([local_costs[i][t] for i in batch])
+            # renormalize so that the smallest cost is zero
+            cost -= cost.min(axis=1, keepdims=True)
+            forward_cost[:len(batch)] = cost
+            for k, i in enumerate(batch):
+                backpointers[i].append(best[k])
+
+        states = [None] * len(order)
+        for k, i in enumerate(order):
+            path = np.zeros([lengths[i]], dtype=np.int64)
+            if lengths[i] > 0:
+                path[-1] = forward_cost[k].argmin()
+                for t in range(lengths[i] - 1, 0, -1):
+                    path[t - 1] = backpointers[i][t][path[t]]
+            states[i] = path
+        return states
+
+
+def compute_kaldi_pitch(waveforms: Sequence[np.ndarray],
+                        sr: int=16000,
+                        frame_length: float=25.0,
+                        frame_shift: float=10.0,
+                        min_f0: float=50.0,
+                        max_f0: float=400.0,
+                        soft_min_f0: float=10.0,
+                        penalty_factor: float=0.1,
+                        lowpass_cutoff: float=1000.0,
+                        resample_frequency: float=4000.0,
+                        delta_pitch: float=0.005,
+                        nccf_ballast: float=7000.0,
+                        lowpass_filter_width: int=1,
+                        upsample_filter_width: int=5,
+                        recompute_frame: int=500) -> List[np.ndarray]:
+    """Compute the pitch features of a batch of waveforms, the same as
+    `compute-kaldi-pitch-feats` of Kaldi with the options of the same names.
+
+    Args:
+        waveforms (Sequence[np.ndarray]): the waveforms, (Ti,), in the scale of int16 like Kaldi.
+        sr (int, optional): sample rate of the waveforms. Defaults to 16000.
+        frame_length (float, optional): frame length in milliseconds. Defaults to 25.0.
+        frame_shift (float, optional): frame shift in milliseconds. Defaults to 10.0.
+        min_f0 (float, optional): minimum F0 to search for in Hz. Defaults to 50.0.
+        max_f0 (float, optional): maximum F0 to search for in Hz. Defaults to 400.0.
+        soft_min_f0 (float, optional): minimum F0 applied in soft way, must not exceed min_f0. Defaults to 10.0.
+        penalty_factor (float, optional): cost factor for F0 change. Defaults to 0.1.
+        lowpass_cutoff (float, optional): cutoff frequency of the lowpass filter in Hz. Defaults to 1000.0.
+        resample_frequency (float, optional): frequency to resample the waveform to before computing the NCCF in Hz. Defaults to 4000.0.
+        delta_pitch (float, optional): the smallest relative change in pitch that the algorithm measures. Defaults to 0.005.
+        nccf_ballast (float, optional): increasing this factor reduces the NCCF for quiet frames. Defaults to 7000.0.
+        lowpass_filter_width (int, optional): integer that determines the filter width of the lowpass filter. Defaults to 1.
+        upsample_filter_width (int, optional): integer that determines the filter width when upsampling the NCCF. Defaults to 5.
+        recompute_frame (int, optional): the first frames, whose NCCF are recomputed with the energy of the whole waveform. Defaults to 500.
+
+    Returns:
+        List[np.ndarray]: the (NCCF, pitch in Hz) of the frames of each waveform, (T, 2).
+    """
+    extractor = _PitchExtractor(
+        sr, frame_length, frame_shift, min_f0, max_f0, soft_min_f0,
+        penalty_factor, lowpass_cutoff, resample_frequency, delta_pitch,
+        nccf_ballast, lowpass_filter_width, upsample_filter_width,
+        recompute_frame)
+    local_costs, nccf_povs = zip(
+        *[extractor.local_cost(np.asarray(wave)) for wave in waveforms])
+    states = extractor.viterbi(local_costs)
+    pitch = []
+    for path, nccf_pov in zip(states, nccf_povs):
+        nccf = nccf_pov[np.arange(len(path)), path]
+        pitch.append(
+            np.stack([nccf, (1.0 / extractor.lags[path]).astype(np.float32)],
+                     axis=1))
+    return pitch
+
+
+def _nccf_to_pov(nccf):
+    """The approximate probability of voicing of the NCCF."""
+    nccf = np.minimum(np.abs(nccf), 1.0).astype(np.float64)
+    r = (-5.2 + 5.4 * np.exp(7.5 * (nccf - 1.0)) + 4.8 * nccf - 2.0 *
+         np.exp(-10.0 * nccf) + 4.2 * np.exp(20.0 * (nccf - 1.0)))
+    return (1.0 / (1.0 + np.exp(-r))).astype(np.float32)
+
+
+def process_pitch(pitch: np.ndarray,
+                  pitch_scale: float=2.0,
+                  pov_scale: float=2.0,
+                  pov_offset: float=0.0,
+                  delta_pitch_scale: float=10.0,
+                  delta_pitch_noise_stddev: float=0.0,
+                  normalization_left_context: int=75,
+                  normalization_right_context: int=75,
+                  delta_window: int=2,
+                  add_pov_feature: bool=True,
+                  add_normalized_log_pitch: bool=True,
+                  add_delta_pitch: bool=True,
+                  add_raw_log_pitch: bool=False,
+                  rng: Optional[np.random.RandomState]=None) -> np.ndarray:
+    """Post-process the (NCCF, pitch) of `compute_kaldi_pitch` into the
+    features, the same as `process-kaldi-pitch-feats` of Kaldi with the options
+    of the same names.
+
+    Kaldi adds a gaussian noise of stddev 0.005 to the delta pitch by default,
+    which is random, so it is off by default here.
+
+    Args:
+        pitch (np.ndarray): the (NCCF, pitch) of the frames, (T, 2).
+        pitch_scale (float, optional): scaling factor for the normalized log pitch. Defaults to 2.0.
+        pov_scale (float, optional): scaling factor for the probability of voicing. Defaults to 2.0.
+        pov_offset (float, optional): offset added to the probability of voicing after scaling. Defaults to 0.0.
+        delta_pitch_scale (float, optional): scaling factor for the delta log pitch. Defaults to 10.0.
+        delta_pitch_noise_stddev (float, optional): stddev of the noise added to the delta pitch. Defaults to 0.0.
+        normalization_left_context (int, optional): left context in frames of the moving window to normalize the log pitch. Defaults to 75.
+        normalization_right_context (int, optional): right context in frames of the moving window to normalize the log pitch. Defaults to 75.
+        delta_window (int, optional): number of frames on each side to compute the delta pitch. Defaults to 2.
+        add_pov_feature (bool, optional): add the warped NCCF, the probability of voicing. Defaults to True.
+        add_normalized_log_pitch (bool, optional): add the log pitch normalized with the weighted mean of the window. Defaults to True.
+        add_delta_pitch (bool, optional): add the delta log pitch. Defaults to True.
+        add_raw_log_pitch (bool, optional): add the log pitch. Defaults to False.
+        rng (np.random.RandomState, optional): random state of the noise of the delta pitch. Defaults to None.
+
+    Returns:
+        np.ndarray: the features of the frames, (T, D).
+    """
+    nccf = pitch[:, 0]
+    log_pitch = np.log(pitch[:, 1]).astype(np.float32)
+    num_frames = len(pitch)
+    feats = []
+    if add_pov_feature:
+        pov_feature = np.power(1.0001 - np.clip(nccf, -1.0, 1.0), 0.15) - 1.0
+        feats.append(pov_scale * pov_feature + pov_offset)
+    if add_normalized_log_pitch:
+        # the mean of the log pitch of the window weighted by the probability
+        # of voicing
+        pov = _nccf_to_pov(nccf)
+        sum_pov = np.concatenate([[0.0], np.cumsum(pov, dtype=np.float64)])
+        sum_log_pitch = np.concatenate(
+            [[0.0], np.cumsum(pov * log_pitch, dtype=np.float64)])
+        t = np.arange(num_frames)
+        begin = np.maximum(0, t - normalization_left_context)
+        end = np.minimum(num_frames, t + normalization_right_context + 1)
+        mean_log_pitch = (sum_log_pitch[end] - sum_log_pitch[begin]) / (
+            sum_pov[end] - sum_pov[begin])
+        feats.append(
+            (log_pitch - mean_log_pitch.astype(np.float32)) * pitch_scale)
+    if add_delta_pitch:
+        delta_pitch = delta(log_pitch[:, None], delta_window)[:, 0]
+        if delta_pitch_noise_stddev > 0:
+            rng = rng or np.random
+            delta_pitch = delta_pitch + rng.normal(
+                scale=delta_pitch_noise_stddev, size=num_frames)
+        feats.append(delta_pitch * delta_pitch_scale)
+    if add_raw_log_pitch:
+        feats.append(log_pitch)
+    return np.stack(feats, axis=1).astype(np.float32)
+
+
+class KaldiPitch():
+    def __init__(self,
+                 fs=16000,
+                 n_shift=160,
+                 win_length=400,
+                 min_f0=50.0,
+                 max_f0=400.0):
+        """
+        The Kaldi pitch features, (probability of voicing, normalized log pitch, delta log pitch)
+        Args:
+            fs (int): sample rate of the audio
+            n_shift (int): number of points in a frame shift
+            win_length (int): number of points in a frame windows
+            min_f0 (float): minimum F0 to search for in Hz
+            max_f0 (float): maximum F0 to search for in Hz
+
+        Returns:
+            KaldiPitch
+        """
+        self.fs = fs
+        num_point_ms = fs / 1000
+        self.n_frame_length = win_length / num_point_ms
+        self.n_frame_shift = n_shift / num_point_ms
+        self.min_f0 = min_f0
+        self.max_f0 = max_f0
+
+    def __repr__(self):
+        return (
+            "{name}(fs={fs}, n_frame_shift={n_frame_shift}, "
+            "n_frame_length={n_frame_length}, min_f0={min_f0}, "
+            "max_f0={max_f0})".format(
+                name=self.__class__.__name__,
+                fs=self.fs,
+                n_frame_shift=self.n_frame_shift,
+                n_frame_length=self.n_frame_length,
+                min_f0=self.min_f0,
+                max_f0=self.max_f0, ))
+
+    def batch(self, xs):
+        """
+        Args:
+            xs (List[np.ndarray]): the waveforms, (Ti,), in the scale of int16.
+
+        Returns:
+            List[np.ndarray]: (T, 3)
+        """
+        pitch = compute_kaldi_pitch(
+            xs,
+            sr=self.fs,
+            frame_length=self.n_frame_length,
+            frame_shift=self.n_frame_shift,
+            min_f0=self.min_f0,
+            max_f0=self.max_f0)
+        return [process_pitch(p) for p in pitch]
+
+    def __call__(self, x, train=False):
+        """
+        Args:
+            x (np.ndarray): shape (Ti,)
+            train (bool): True, train mode.
+
+        Raises:
+            ValueError: not support (Ti, C)
+
+        Returns:
+            np.ndarray: (T, 3)
+        """
+        if x.ndim != 1:
+            raise ValueError("Not support x: [Time, Channel]")
+        return self.batch([x])[0]
+
+
+class LogMelSpectrogramKaldiPitch():
+    def __init__(
+            self,
+            fs=16000,
+            n_mels=80,
+            n_shift=160,  # unit:sample, 10ms
+            win_length=400,  # unit:sample, 25ms
+            energy_floor=0.0,
+            dither=0.1,
+            min_f0=50.0,
+            max_f0=400.0):
+        """
+        The Kaldi fbank and pitch features, the same as `paste-feats` of
+        `compute-fbank-feats` and `compute-kaldi-pitch-feats | process-kaldi-pitch-feats`
+        Args:
+            fs (int): sample rate of the audio
+            n_mels (int): number of mel filter banks
+            n_shift (int): number of points in a frame shift
+            win_length (int): number of points in a frame windows
+            energy_floor (float): Floor on energy in Spectrogram computation (absolute)
+            dither (float): Dithering constant of the fbank in train mode
+            min_f0 (float): minimum F0 to search for in Hz
+            max_f0 (float): maximum F0 to search for in Hz
+
+        Returns:
+            LogMelSpectrogramKaldiPitch
+        """
+        self.fbank = LogMelSpectrogramKaldi(
+            fs=fs,
+            n_mels=n_mels,
+            n_shift=n_shift,
+            win_length=win_length,
+            energy_floor=energy_floor,
+            dither=dither)
+        self.pitch = KaldiPitch(
+            fs=fs,
+            n_shift=n_shift,
+            win_length=win_length,
+            min_f0=min_f0,
+            max_f0=max_f0)
+
+    def __repr__(self):
+        return "{name}(fbank={fbank}, pitch={pitch})".format(
+            name=self.__class__.__name__, fbank=self.fbank, pitch=self.pitch)
+
+    def batch(self, xs, train=False):
+        """
+        Args:
+            xs (List[np.ndarray]): the waveforms, (Ti,), in the scale of int16.
+            train (bool): True, train mode.
+
+        Returns:
+            List[np.ndarray]: (T, n_mels + 3)
+        """
+        feats = []
+        for x, pitch in zip(xs, self.pitch.batch(xs)):
+            fbank = self.fbank(x, train)
+            if fbank.ndim == 1:
+                fbank = fbank[None, :]
+            # the frames of the features may differ by one at the end
+            num_frames = min(len(fbank), len(pitch))
+            feats.append(
+                np.concatenate(
+                    [fbank[:num_frames], pitch[:num_frames]], axis=1))
+        return feats
+
+    def __call__(self, x, train=False):
+        """
+        Args:
+            x (np.ndarray): shape (Ti,)
+            train (bool): True, train mode.
+
+        Raises:
+            ValueError: not support (Ti, C)
+
+        Returns:
+            np.ndarray: (T, n_mels + 3)
+        """
+        if x.ndim != 1:
+            raise ValueError("Not support x: [Time, Channel]")
+        return self.batch([x], train)[0]
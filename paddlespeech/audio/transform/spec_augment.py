@@ -21,6 +21,17 @@ from PIL import Image
 from .functional import FuncTrans
 
 
+def _linear_resize(x, size):
+    """resize the frames of x (time, freq) to size frames by the linear
+    interpolation of the neighbouring frames, with the pixel centers of PIL"""
+    src = (numpy.arange(size) + 0.5) * x.shape[0] / size - 0.5
+    src = numpy.clip(src, 0, x.shape[0] - 1)
+    low = numpy.floor(src).astype(numpy.int64)
+    high = numpy.minimum(low + 1, x.shape[0] - 1)
+    weight = (src - low)[:, None].astype(x.dtype)
+    return x[low] * (1 - weight) + x[high] * weight
+
+
 def time_warp(x, max_time_warp=80, inplace=False, mode="PIL"):
     """time warp for spec augment
 
@@ -28,7 +39,9 @@ def time_warp(x, max_time_warp=80, inplace=False, mode="PIL"):
     :param numpy.ndarray x: spectrogram (time, freq)
     :param int max_time_warp: maximum time frames to warp
     :param bool inplace: overwrite x with the result
-    :param str mode: "PIL" (default, fast, not differentiable) or "sparse_image_warp"
+    :param str mode: "PIL" (default, fast, not differentiable, bicubic),
+        "linear" (fast, not differentiable, linear interpolation of the frames,
+        the mode of the batch time warp of streamdata) or "sparse_image_warp"
         (slow, differentiable)
     :returns numpy.ndarray: time warped spectrogram (time, freq)
     """
@@ -36,7 +49,7 @@ def time_warp(x, max_time_warp=80, inplace=False, mode="PIL"):
     if window == 0:
         return x
 
-    if mode == "PIL":
+    if mode in ("PIL", "linear"):
         t = x.shape[0]
         if t - window <= window:
             return x
@@ -45,10 +58,14 @@ def time_warp(x, max_time_warp=80, inplace=False, mode="PIL"):
         warped = random.randrange(center - window, center +
                                   window) + 1  # 1 ... t - 1
 
-        left = Image.fromarray(x[:center]).resize((x.shape[1], warped),
-                                                  Image.BICUBIC)
-        right = Image.fromarray(x[center:]).resize((x.shape[1], t - warped),
-                                                   Image.BICUBIC)
+        if mode == "PIL":
+            left = Image.fromarray(x[:center]).resize((x.shape[1], warped),
+                                                      Image.BICUBIC)
+            right = Image.fromarray(x[center:]).resize(
+                (x.shape[1], t - warped), Image.BICUBIC)
+        else:
+            left = _linear_resize(x[:center], warped)
+            right = _linear_resize(x[center:], t - warped)
         if inplace:
             x[:warped] = left
             x[warped:] = right
@@ -63,7 +80,7 @@ def time_warp(x, max_time_warp=80, inplace=False, mode="PIL"):
         return spec_augment.time_warp(paddle.to_tensor(x), window).numpy()
     else:
         raise NotImplementedError("unknown resize mode: " + mode +
-                                  ", choose one from (PIL, sparse_image_warp).")
+                                  ", choose one from (PIL, linear, sparse_image_warp).")
 
 
 class TimeWarp(FuncTrans):
@@ -18,6 +18,8 @@ import paddle
 from paddleaudio.compliance import kaldi
 from python_speech_features import logfbank
 
+from ..utils import RingBuffer
+
 
 def stft(x,
          n_fft,
@@ -381,6 +383,84 @@ class LogMelSpectrogramKaldi():
         return mat
 
 
+class StreamingLogMelSpectrogramKaldi(LogMelSpectrogramKaldi):
+    def __init__(
+            self,
+            fs=16000,
+            n_mels=80,
+            n_shift=160,  # unit:sample, 10ms
+            win_length=400,  # unit:sample, 25ms
+            energy_floor=0.0,
+            dither=0.1,
+            buffer_size=16000):
+        """
+        The streaming version of LogMelSpectrogramKaldi, the waveform is fed
+        packet by packet and only the new complete frames are computed.
+        The samples not covered by a complete frame are kept in a ring buffer
+        for the next packet. Since every kaldi fbank frame only depends on its
+        own window (snip_edges), the output is the same as LogMelSpectrogramKaldi
+        on the whole waveform.
+        Args:
+            fs (int): sample rate of the audio
+            n_mels (int): number of mel filter banks
+            n_shift (int): number of points in a frame shift
+            win_length (int): number of points in a frame windows
+            energy_floor (float): Floor on energy in Spectrogram computation (absolute)
+            dither (float): Dithering constant
+            buffer_size (int): number of samples preallocated in the ring buffer
+
+        Returns:
+            StreamingLogMelSpectrogramKaldi
+        """
+        super().__init__(
+            fs=fs,
+            n_mels=n_mels,
+            n_shift=n_shift,
+            win_length=win_length,
+            energy_floor=energy_floor,
+            dither=dither)
+        self.n_shift = n_shift
+        self.win_length = win_length
+        self.remained_wav = RingBuffer(
+            max(buffer_size, win_length), dtype=np.float32)
+
+    def reset(self):
+        self.remained_wav.clear()
+
+    def accept_waveform(self, x, train):
+        """
+        Args:
+            x (np.ndarray): shape (Ti,), one packet of the waveform
+            train (bool): True, train mode.
+
+        Raises:
+            ValueError: not support (Ti, C)
+
+        Returns:
+            np.ndarray: (T, D), the new frames, T may be 0.
+        """
+        if x.ndim != 1:
+            raise ValueError("Not support x: [Time, Channel]")
+        self.remained_wav.push(x)
+
+        num_samples = len(self.remained_wav)
+        if num_samples < self.win_length:
+            return np.zeros([0, self.n_mels], dtype=np.float32)
+
+        num_frames = 1 + (num_samples - self.win_length) // self.n_shift
+        end = (num_frames - 1) * self.n_shift + self.win_length
+        wav = self.remained_wav.view(0, end)
+        if num_frames == 1:
+            # the single row matmul takes another kernel whose result differs
+            # in the last bit, so pad one more frame to keep bit-identical
+            # with the offline features
+            wav = np.concatenate(
+                [wav, np.zeros([self.n_shift], dtype=wav.dtype)])
+        mat = self(wav, train)
+        self.remained_wav.pop(num_frames * self.n_shift)
+        return mat.reshape([-1, self.n_mels])[:num_frames]
+
+
 class WavProcess():
     def __init__(self):
         """
@@ -14,8 +14,12 @@
 # Modified from espnet(https://github.com/espnet/espnet)
 """Transformation module."""
 import copy
+import hashlib
 import io
+import json
 import logging
+import os
+import threading
 from collections import OrderedDict
 from collections.abc import Sequence
 from inspect import signature
@@ -48,6 +52,8 @@ import_alias = dict(
     wpe="paddlespeech.audio.transform.wpe:WPE",
     channel_selector="paddlespeech.audio.transform.channel_selector:ChannelSelector",
     fbank_kaldi="paddlespeech.audio.transform.spectrogram:LogMelSpectrogramKaldi",
+    pitch_kaldi="paddlespeech.audio.transform.pitch:KaldiPitch",
+    fbank_pitch_kaldi="paddlespeech.audio.transform.pitch:LogMelSpectrogramKaldiPitch",
     cmvn_json="paddlespeech.audio.transform.cmvn:GlobalCMVN")
 
 
@@ -104,6 +110,15 @@ class Transformation():
             raise NotImplementedError(
                 "Not supporting mode={}".format(self.conf["mode"]))
 
+        # resolve the args of each function once, rather than on every call
+        self.params = OrderedDict()
+        for idx, func in self.functions.items():
+            try:
+                self.params[idx] = frozenset(signature(func).parameters)
+            except ValueError:
+                # Some function, e.g. built-in function, are failed
+                self.params[idx] = frozenset()
+
     def __repr__(self):
         rep = "\n" + "\n".join("    {}: {}".format(k, v)
                                for k, v in self.functions.items())
@@ -112,6 +127,9 @@ class Transformation():
     def __call__(self, xs, uttid_list=None, **kwargs):
         """Return new mini-batch
 
+        A list of arrays is processed stage by stage, each function is applied
+        to all the arrays before the next one.
+
         :param Union[Sequence[np.ndarray], np.ndarray] xs:
         :param Union[Sequence[str], str] uttid_list:
         :return: batch:
@@ -127,15 +145,10 @@ class Transformation():
             uttid_list = [uttid_list for _ in range(len(xs))]
 
         if self.conf.get("mode", "sequential") == "sequential":
-            for idx in range(len(self.conf["process"])):
-                func = self.functions[idx]
+            for idx, func in self.functions.items():
                 # TODO(karita): use TrainingTrans and UttTrans to check __call__ args
                 # Derive only the args which the func has
-                try:
-                    param = signature(func).parameters
-                except ValueError:
-                    # Some function, e.g. built-in function, are failed
-                    param = {}
+                param = self.params[idx]
                 _kwargs = {k: v for k, v in kwargs.items() if k in param}
                 try:
                     if uttid_list is not None and "uttid" in param:
@@ -157,3 +170,48 @@ class Transformation():
             return xs
         else:
             return xs[0]
+
+
+# the pipelines built by `get_transformation`, keyed by the hash of the config
+_TRANSFORMATIONS = OrderedDict()
+_TRANSFORMATIONS_LOCK = threading.Lock()
+_MAX_CACHED_TRANSFORMATIONS = 32
+
+
+def _config_key(conffile):
+    if conffile is None:
+        return None
+    if isinstance(conffile, dict):
+        conf = json.dumps(conffile, sort_keys=True, default=str)
+    else:
+        path = os.path.abspath(conffile)
+        conf = "{}:{}".format(path, os.path.getmtime(path))
+    return hashlib.md5(conf.encode("utf-8")).hexdigest()
+
+
+def get_transformation(conffile=None):
+    """Get the Transformation of a config, which is built once and shared
+    by the callers with the same config, e.g. the requests and the
+    connections of a server, instead of building the functions each time.
+
+    The shared pipeline must not be modified by the callers. The functions
+    are expected to be stateless, which holds for the feature extraction and
+    normalization ones.
+
+    :param Union[dict, str] conffile: the config dict or yaml file
+    :return: the transformation
+    :rtype: Transformation
+    """
+    key = _config_key(conffile)
+    with _TRANSFORMATIONS_LOCK:
+        if key in _TRANSFORMATIONS:
+            _TRANSFORMATIONS.move_to_end(key)
+            return _TRANSFORMATIONS[key]
+
+    transformation = Transformation(conffile)
+    with _TRANSFORMATIONS_LOCK:
+        transformation = _TRANSFORMATIONS.setdefault(key, transformation)
+        _TRANSFORMATIONS.move_to_end(key)
+        while len(_TRANSFORMATIONS) > _MAX_CACHED_TRANSFORMATIONS:
+            _TRANSFORMATIONS.popitem(last=False)
+    return transformation
@@ -21,5 +21,7 @@ from .log import Logger
 from .log import logger
 from .numeric import depth_convert
 from .numeric import pcm16to32
+from .ring_buffer import RingBuffer
 from .time import seconds_to_hms
 from .time import Timer
+from .vad import EnergyVAD
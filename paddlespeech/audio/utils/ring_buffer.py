@@ -0,0 +1,100 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+
+__all__ = ["RingBuffer"]
+
+
+class RingBuffer():
+    """FIFO buffer of array rows (samples or feature frames) in a
+    preallocated array.
+
+    Rows are pushed at the tail and popped from the head. Unlike a classic
+    ring buffer the live rows never wrap around, they are moved back to the
+    front of the storage when the tail reaches the end, so that `view` always
+    returns a contiguous zero-copy array. Since only the rows not consumed
+    yet are moved, the cost of a push is O(rows pushed) amortized, no matter
+    how long the stream is.
+
+    Args:
+        capacity (int): number of rows preallocated, the storage grows when
+            the live rows exceed it.
+        shape (Tuple[int], optional): shape of one row. Defaults to () for a 1-D buffer.
+        dtype (Union[str, np.dtype], optional): data type. Defaults to "float32".
+    """
+
+    def __init__(self,
+                 capacity: int,
+                 shape: Tuple[int, ...]=(),
+                 dtype: Union[str, np.dtype]="float32"):
+        assert capacity > 0, capacity
+        self._data = np.empty((capacity, ) + tuple(shape), dtype=dtype)
+        self._head = 0
+        self._tail = 0
+
+    def __len__(self):
+        return self._tail - self._head
+
+    @property
+    def capacity(self) -> int:
+        return self._data.shape[0]
+
+    def push(self, x: np.ndarray):
+        """Append rows at the tail.
+
+        Args:
+            x (np.ndarray): (N, *shape) rows.
+        """
+        num = x.shape[0]
+        if self._tail + num > self.capacity:
+            size = len(self)
+            if size + num > self.capacity:
+                # grow the storage
+                data = np.empty(
+                    (max(2 * self.capacity, size + num), ) +
+                    self._data.shape[1:],
+                    dtype=self._data.dtype)
+            else:
+                data = self._data
+            # move the live rows to the front, the ranges may overlap
+            data[:size] = self._data[self._head:self._tail]
+            self._data = data
+            self._head = 0
+            self._tail = size
+        self._data[self._tail:self._tail + num] = x
+        self._tail += num
+
+    def view(self, start: int=0, end: int=None) -> np.ndarray:
+        """Zero-copy view of the live rows [start, end).
+        The view is only valid until the next `push`.
+        """
+        size = len(self)
+        end = size if end is None else min(end, size)
+        return self._data[self._head + start:self._head + end]
+
+    def pop(self, num: int):
+        """Drop `num` rows from the head.
+        """
+        assert 0 <= num <= len(self), (num, len(self))
+        self._head += num
+        if self._head == self._tail:
+            self._head = 0
+            self._tail = 0
+
+    def clear(self):
+        self._head = 0
+        self._tail = 0
@@ -0,0 +1,169 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import List
+from typing import Tuple
+
+import numpy as np
+
+from .ring_buffer import RingBuffer
+
+__all__ = ["EnergyVAD"]
+
+
+class EnergyVAD():
+    """Split a long audio into segments at silences, by the energy of
+    non-overlapping frames.
+
+    The audio is pushed block by block and a segment is returned as soon as
+    it is closed, so the memory is bounded by `max_segment_s` rather than the
+    length of the audio. A segment is closed in the middle of the first
+    silence of `min_silence_ms` after `min_segment_s`, or at the frame of the
+    lowest energy when it reaches `max_segment_s`. Segments without any voiced
+    frame are dropped.
+
+    Args:
+        sample_rate (int, optional): sample rate of the audio. Defaults to 16000.
+        frame_ms (int, optional): frame length in ms. Defaults to 10.
+        silence_db (float, optional): frames below this energy, in dB relative
+            to the full scale of int16, are silence. Defaults to -40.0.
+        min_silence_ms (int, optional): min length of a silence to split at.
+            Defaults to 300.
+        min_segment_s (float, optional): min length of a segment. Defaults to 5.0.
+        max_segment_s (float, optional): max length of a segment. Defaults to 30.0.
+    """
+
+    def __init__(self,
+                 sample_rate: int=16000,
+                 frame_ms: int=10,
+                 silence_db: float=-40.0,
+                 min_silence_ms: int=300,
+                 min_segment_s: float=5.0,
+                 max_segment_s: float=30.0):
+        assert 0 < min_segment_s < max_segment_s, (min_segment_s,
+                                                   max_segment_s)
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.silence_db = silence_db
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.min_segment_frames = int(min_segment_s * 1000 / frame_ms)
+        self.max_segment_frames = int(max_segment_s * 1000 / frame_ms)
+
+        max_samples = (self.max_segment_frames + 1) * self.frame_length
+        self._samples = RingBuffer(max_samples, dtype="int16")
+        self._energies = RingBuffer(self.max_segment_frames + 1)
+        self.reset()
+
+    def reset(self):
+        self._samples.clear()
+        self._energies.clear()
+        # absolute sample offset of the head of the buffer
+        self._offset = 0
+        # silent frames at the end of the buffer
+        self._silence_run = 0
+
+    def push(self, samples: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+        """Append int16 samples.
+
+        Args:
+            samples (np.ndarray): (N, ) mono int16 samples.
+
+        Returns:
+            List[Tuple[int, np.ndarray]]: the closed segments, (start sample
+                in the whole audio, int16 samples of the segment).
+        """
+        segments = []
+        start = 0
+        while start < len(samples):
+            # never buffer more than one max segment
+            room = (self.max_segment_frames + 1
+                    ) * self.frame_length - len(self._samples)
+            block = samples[start:start + room]
+            start += len(block)
+
+            num_frames = len(self._energies)
+            self._samples.push(block)
+            new_frames = len(self._samples) // self.frame_length - num_frames
+            if new_frames <= 0:
+                continue
+            frames = self._samples.view(
+                num_frames * self.frame_length,
+                (num_frames + new_frames) * self.frame_length).reshape(
+                    [new_frames, self.frame_length])
+            self._energies.push(self._energy(frames).astype(np.float32))
+            segments.extend(self._split(num_frames))
+        return segments
+
+    def flush(self) -> List[Tuple[int, np.ndarray]]:
+        """Close the last segment at the end of the audio.
+        """
+        segments = []
+        samples = self._samples.view()
+        # the samples of the last incomplete frame count as one frame
+        tail = samples[len(self._energies) * self.frame_length:]
+        voiced = np.any(self._energies.view() >= self.silence_db) or (
+            len(tail) > 0 and self._energy(tail) >= self.silence_db)
+        if voiced:
+            segments.append((self._offset, samples.copy()))
+        self._offset += len(samples)
+        self._samples.clear()
+        self._energies.clear()
+        self._silence_run = 0
+        return segments
+
+    @staticmethod
+    def _energy(frames: np.ndarray) -> np.ndarray:
+        """Energy in dB relative to the full scale of int16, of the last axis.
+        """
+        frames = frames.astype(np.float32) / 32768.0
+        return 10 * np.log10(np.mean(np.square(frames), axis=-1) + 1e-10)
+
+    def _split(self, start_frame: int) -> List[Tuple[int, np.ndarray]]:
+        """Scan the frames from `start_frame` and close the segments.
+        """
+        segments = []
+        frame = start_frame
+        while frame < len(self._energies):
+            if self._energies.view()[frame] < self.silence_db:
+                self._silence_run += 1
+            else:
+                self._silence_run = 0
+            frame += 1
+
+            if (self._silence_run >= self.min_silence_frames and
+                    frame >= self.min_segment_frames):
+                # the middle of the silence
+                cut = frame - self._silence_run // 2
+            elif frame >= self.max_segment_frames:
+                energies = self._energies.view(self.min_segment_frames, frame)
+                cut = self.min_segment_frames + int(np.argmin(energies)) + 1
+            else:
+                continue
+
+            segment = self._cut(cut)
+            if segment is not None:
+                segments.append(segment)
+            # rescan the frames after the cut
+            frame = 0
+            self._silence_run = 0
+        return segments
+
+    def _cut(self, num_frames: int) -> Tuple[int, np.ndarray]:
+        num_samples = num_frames * self.frame_length
+        voiced = np.any(self._energies.view(0, num_frames) >= self.silence_db)
+        segment = (self._offset, self._samples.view(0, num_samples).copy()
+                   ) if voiced else None
+        self._samples.pop(num_samples)
+        self._energies.pop(num_frames)
+        self._offset += num_samples
+        return segment
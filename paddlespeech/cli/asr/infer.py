@@ -17,8 +17,12 @@ import os
 import sys
 import time
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 import librosa
@@ -34,7 +38,9 @@ from ..log import logger
 from ..utils import CLI_TIMER
 from ..utils import stats_wrapper
 from ..utils import timer_register
+from paddlespeech.audio.transform.transformation import get_transformation
 from paddlespeech.audio.transform.transformation import Transformation
+from paddlespeech.audio.utils.vad import EnergyVAD
 from paddlespeech.s2t.frontend.featurizer.text_featurizer import TextFeaturizer
 from paddlespeech.s2t.utils.utility import UpdateConfig
 
@@ -118,6 +124,18 @@ class ASRExecutor(BaseExecutor):
             type=str,
             default=paddle.get_device(),
             help='Choose device to execute model inference.')
+        self.parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=1,
+            help='Batch size of a job input, the utterances are sorted by length and decoded in padded batches.'
+        )
+        self.parser.add_argument(
+            '--num_workers',
+            type=int,
+            default=4,
+            help='Number of threads which read and resample the audios of a job input.'
+        )
         self.parser.add_argument(
             '-d',
             '--job_dump_result',
@@ -142,11 +160,11 @@ class ASRExecutor(BaseExecutor):
         Init model and other resources from a specific path.
         """
         logger.debug("start to init the model")
-        # default max_len: unit:second
-        self.max_len = 50
         if hasattr(self, 'model'):
             logger.debug('Model had been initialized.')
             return
+        # default max_len: unit:second
+        self.max_len = 50
 
         if cfg_path is None or ckpt_path is None:
             sample_rate_str = '16k' if sample_rate == 16000 else '8k'
@@ -246,16 +264,14 @@ class ASRExecutor(BaseExecutor):
 
         # Get the object for feature extraction
         if "deepspeech2" in model_type or "conformer" in model_type or "transformer" in model_type:
-            logger.debug("get the preprocess conf")
-            preprocess_conf = self.config.preprocess_config
             preprocess_args = {"train": False}
-            preprocessing = Transformation(preprocess_conf)
+            preprocessing = self._get_preprocessing()
             logger.debug("read the audio file")
             audio, audio_sample_rate = soundfile.read(
                 audio_file, dtype="int16", always_2d=True)
             if self.change_format:
                 if audio.shape[1] >= 2:
-                    audio = audio.mean(axis=1, dtype=np.int16)
+                    audio = self._downmix(audio)
                 else:
                     audio = audio[:, 0]
                 # pcm16 -> pcm 32
@@ -292,9 +308,40 @@ class ASRExecutor(BaseExecutor):
         Model inference and result stored in self.output.
         """
         logger.debug("start to infer the model to get the output")
-        cfg = self.config.decode
         audio = self._inputs["audio"]
         audio_len = self._inputs["audio_len"]
+        if "deepspeech2" in model_type:
+            self._outputs["result"] = self._decode(model_type, audio,
+                                                   audio_len)[0]
+
+        elif "conformer" in model_type or "transformer" in model_type:
+            logger.debug(
+                f"we will use the transformer like model : {model_type}")
+            try:
+                self._outputs["result"] = self._decode(model_type, audio,
+                                                       audio_len)[0]
+            except Exception as e:
+                logger.exception(e)
+
+        else:
+            raise Exception("invalid model name")
+
+    def _decode(self,
+                model_type: str,
+                audio: paddle.Tensor,
+                audio_len: paddle.Tensor) -> List[str]:
+        """
+        Decode a batch of features.
+
+        Args:
+            model_type (str): model type
+            audio (paddle.Tensor): (B, T, D) padded features
+            audio_len (paddle.Tensor): (B, ) feature lengths
+
+        Returns:
+            List[str]: the transcript of each utterance
+        """
+        cfg = self.config.decode
         if "deepspeech2" in model_type:
             decode_batch_size = audio.shape[0]
             self.model.decoder.init_decoder(
@@ -305,28 +352,339 @@ class ASRExecutor(BaseExecutor):
 
             result_transcripts = self.model.decode(audio, audio_len)
             self.model.decoder.del_decoder()
-            self._outputs["result"] = result_transcripts[0]
+            return result_transcripts
+
+        result_transcripts = self.model.decode(
+            audio,
+            audio_len,
+            text_feature=self.text_feature,
+            decoding_method=cfg.decoding_method,
+            beam_size=cfg.beam_size,
+            ctc_weight=cfg.ctc_weight,
+            decoding_chunk_size=cfg.decoding_chunk_size,
+            num_decoding_left_chunks=cfg.num_decoding_left_chunks,
+            simulate_streaming=cfg.simulate_streaming)
+        return result_transcripts[0]
 
-        elif "conformer" in model_type or "transformer" in model_type:
-            logger.debug(
-                f"we will use the transformer like model : {model_type}")
-            try:
-                result_transcripts = self.model.decode(
-                    audio,
-                    audio_len,
-                    text_feature=self.text_feature,
-                    decoding_method=cfg.decoding_method,
-                    beam_size=cfg.beam_size,
-                    ctc_weight=cfg.ctc_weight,
-                    decoding_chunk_size=cfg.decoding_chunk_size,
-                    num_decoding_left_chunks=cfg.num_decoding_left_chunks,
-                    simulate_streaming=cfg.simulate_streaming)
-                self._outputs["result"] = result_transcripts[0][0]
-            except Exception as e:
-                logger.exception(e)
+    @paddle.no_grad()
+    def batch_infer(self,
+                    model_type: str,
+                    task_source: Dict[str, Union[str, os.PathLike]],
+                    batch_size: int=8,
+                    num_workers: int=4,
+                    force_yes: bool=False,
+                    rtf: bool=False) -> Tuple[Dict[str, str], bool]:
+        """
+        Recognize the audios of a job input in batches. The audios are read
+        and resampled ahead by a thread pool, a window of utterances is sorted
+        by length and decoded in padded batches while the next window is
+        being read.
+
+        Args:
+            model_type (str): model type
+            task_source (Dict[str, Union[str, os.PathLike]]): utterance id to audio file
+            batch_size (int, optional): number of utterances decoded together. Defaults to 8.
+            num_workers (int, optional): number of threads which read the audios. Defaults to 4.
+            force_yes (bool, optional): resample the audios whose sample rate
+                is not the one of the model. Defaults to False.
+            rtf (bool, optional): record the time of each utterance in
+                `CLI_TIMER`, the time of a batch is shared by its utterances
+                in proportion to their durations. Defaults to False.
+
+        Returns:
+            Dict[str, str]: the result of each utterance, in the input order
+            bool: whether any utterance failed
+        """
+        results = OrderedDict((id_, None) for id_ in task_source)
+        ids = list(task_source.keys())
+        # utterances sorted together
+        window = batch_size * 8
+        has_exceptions = False
+        audio_duration = 0.0
+        durations = {}
+        timer = CLI_TIMER[self.__class__.__name__]
+
+        def record(utt_ids: List[str], start: float, end: float):
+            if not rtf:
+                return
+            total = sum(durations[id_] for id_ in utt_ids)
+            for id_ in utt_ids:
+                share = (end - start) * durations[id_] / max(total, 1e-6)
+                timer['start'].append(start)
+                timer['end'].append(start + share)
+                timer['extra'].append(durations[id_])
+                start += share
+
+        st = time.time()
+
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+
+            def load(start: int):
+                return [(id_, pool.submit(self._load_audio, task_source[id_],
+                                          force_yes))
+                        for id_ in ids[start:start + window]]
+
+            pending = load(0)
+            for start in range(0, len(ids), window):
+                loading, pending = pending, load(start + window)
+
+                utts = []
+                for id_, future in loading:
+                    try:
+                        audio, duration = future.result()
+                        audio_duration += duration
+                        durations[id_] = duration
+                        if audio is None:
+                            # longer than max_len, recognized by segments
+                            utt_st = time.time()
+                            audio_file = task_source[id_]
+                            self.change_format = soundfile.info(
+                                audio_file).samplerate != self.sample_rate
+                            self._long_audio_postprocess(
+                                list(self.infer_long_audio(audio_file)))
+                            results[id_] = self._outputs["result"]
+                            record([id_], utt_st, time.time())
+                        else:
+                            utts.append((id_, audio))
+                    except Exception as e:
+                        has_exceptions = True
+                        results[id_] = f'{e.__class__.__name__}: {e}'
+
+                utts.sort(key=lambda utt: len(utt[1]), reverse=True)
+                for i in range(0, len(utts), batch_size):
+                    batch = utts[i:i + batch_size]
+                    try:
+                        batch_st = time.time()
+                        texts = self._decode_audios(
+                            model_type, [audio for _, audio in batch])
+                        for (id_, _), text in zip(batch, texts):
+                            results[id_] = text
+                        record([id_ for id_, _ in batch], batch_st,
+                               time.time())
+                    except Exception as e:
+                        logger.exception(e)
+                        has_exceptions = True
+                        for id_, _ in batch:
+                            results[id_] = f'{e.__class__.__name__}: {e}'
+
+        elapsed = time.time() - st
+        logger.info(
+            f"Recognized {len(ids)} utterances of {audio_duration:.2f}s in {elapsed:.2f}s, "
+            f"RTF: {elapsed / max(audio_duration, 1e-6)}")
+        return results, has_exceptions
+
+    def _load_audio(self, audio_file: Union[str, os.PathLike],
+                    force_yes: bool) -> Tuple[Optional[np.ndarray], float]:
+        """
+        Read an audio as mono int16 samples at the sample rate of the model,
+        run in the loader threads of `batch_infer`.
 
+        Returns:
+            Optional[np.ndarray]: the samples, None if the audio is longer than
+                `max_len` and will be recognized by segments.
+            float: duration of the audio in seconds.
+        """
+        audio_info = soundfile.info(audio_file)
+        audio_sample_rate = audio_info.samplerate
+        if audio_sample_rate != self.sample_rate and not force_yes:
+            raise ValueError(
+                f"the sample rate of the audio is {audio_sample_rate}, not {self.sample_rate}, use --yes to resample it"
+            )
+        if audio_info.duration > self.max_len:
+            if not hasattr(self.model, "decode_with_time_stamps"):
+                raise ValueError(
+                    f"the audio is longer than {self.max_len} seconds")
+            return None, audio_info.duration
+
+        audio, audio_sample_rate = soundfile.read(
+            audio_file, dtype="int16", always_2d=True)
+        if audio_sample_rate != self.sample_rate:
+            if audio.shape[1] >= 2:
+                audio = self._downmix(audio)
+            else:
+                audio = audio[:, 0]
+            audio = self._pcm32to16(
+                librosa.resample(
+                    self._pcm16to32(audio),
+                    orig_sr=audio_sample_rate,
+                    target_sr=self.sample_rate))
         else:
-            raise Exception("invalid model name")
+            audio = audio[:, 0]
+        return audio, audio_info.duration
+
+    def _decode_audios(self, model_type: str,
+                       audios: List[np.ndarray]) -> List[str]:
+        """
+        Extract the features of the audios and decode them in one padded batch.
+        """
+        return self._decode(model_type, *self._extract_batch(audios))
+
+    def _extract_batch(self, audios: List[np.ndarray]
+                       ) -> Tuple[paddle.Tensor, paddle.Tensor]:
+        """
+        Extract the features of the audios into a padded batch.
+
+        Returns:
+            paddle.Tensor: (B, T, D) padded features
+            paddle.Tensor: (B, ) feature lengths
+        """
+        preprocessing = self._get_preprocessing()
+        feats = [preprocessing(audio, train=False) for audio in audios]
+        feats_lengths = [feat.shape[0] for feat in feats]
+        batch = np.zeros(
+            (len(feats), max(feats_lengths), feats[0].shape[1]),
+            dtype='float32')
+        for i, feat in enumerate(feats):
+            batch[i, :feat.shape[0]] = feat
+        return paddle.to_tensor(batch), paddle.to_tensor(
+            feats_lengths, dtype='int64')
+
+    def _get_preprocessing(self) -> Transformation:
+        """
+        The feature pipeline of the model, shared by the executors of the same
+        preprocess config.
+        """
+        return get_transformation(self.config.preprocess_config)
+
+    @paddle.no_grad()
+    def infer_long_audio(self, audio_file: Union[str, os.PathLike, io.BytesIO],
+                         batch_size: int=8) -> Iterator[Dict]:
+        """
+        Recognize an audio longer than `max_len`. The audio is read block by
+        block and split at the silences, the segments are decoded in padded
+        batches and the result of each segment is yielded in order as soon as
+        its batch is decoded, so the memory is bounded by the segment length
+        and the batch size, not the length of the audio.
+
+        Args:
+            audio_file (Union[str, os.PathLike, io.BytesIO]): the audio file
+            batch_size (int, optional): number of segments decoded together. Defaults to 8.
+
+        Yields:
+            Dict: the result of a segment, {"start": sec, "end": sec, "text": str,
+                "words": [{"w": word, "bg": sec, "ed": sec}, ...]}, the times
+                are relative to the beginning of the audio.
+        """
+        if isinstance(audio_file, io.BytesIO):
+            audio_file.seek(0)
+        audio_sample_rate = soundfile.info(audio_file).samplerate
+        if isinstance(audio_file, io.BytesIO):
+            audio_file.seek(0)
+
+        max_segment_s = min(30.0, self.max_len)
+        vad = EnergyVAD(
+            sample_rate=audio_sample_rate,
+            min_segment_s=min(5.0, max_segment_s / 2),
+            max_segment_s=max_segment_s)
+        segments = []
+        for block in soundfile.blocks(
+                audio_file,
+                blocksize=audio_sample_rate,
+                dtype="int16",
+                always_2d=True):
+            if self.change_format and block.shape[1] >= 2:
+                block = self._downmix(block)
+            else:
+                block = block[:, 0]
+            segments.extend(vad.push(block))
+            while len(segments) >= batch_size:
+                yield from self._decode_segments(segments[:batch_size],
+                                                 audio_sample_rate)
+                segments = segments[batch_size:]
+        segments.extend(vad.flush())
+        while segments:
+            yield from self._decode_segments(segments[:batch_size],
+                                             audio_sample_rate)
+            segments = segments[batch_size:]
+
+    def _decode_segments(self,
+                         segments: List[Tuple[int, np.ndarray]],
+                         audio_sample_rate: int) -> List[Dict]:
+        """
+        Decode the segments of a long audio in one padded batch.
+        """
+        cfg = self.config.decode
+        audios = []
+        for _, samples in segments:
+            if self.change_format:
+                samples = self._pcm32to16(
+                    librosa.resample(
+                        self._pcm16to32(samples),
+                        orig_sr=audio_sample_rate,
+                        target_sr=self.sample_rate))
+            audios.append(samples)
+        audio, audio_len = self._extract_batch(audios)
+
+        res, res_tokenids, res_frames = self.model.decode_with_time_stamps(
+            audio,
+            audio_len,
+            text_feature=self.text_feature,
+            decoding_method=cfg.decoding_method,
+            beam_size=cfg.beam_size,
+            ctc_weight=cfg.ctc_weight,
+            decoding_chunk_size=cfg.decoding_chunk_size,
+            num_decoding_left_chunks=cfg.num_decoding_left_chunks,
+            simulate_streaming=cfg.simulate_streaming)
+
+        # decoding frame to second
+        frame_shift_in_sec = self.model.encoder.embed.subsampling_rate * (
+            self.config.preprocess_config.process[0]['n_shift'] /
+            self.sample_rate)
+        results = []
+        for i, (start, samples) in enumerate(segments):
+            offset = start / audio_sample_rate
+            duration = len(samples) / audio_sample_rate
+            result = {
+                "start": offset,
+                "end": offset + duration,
+                "text": res[i],
+                "words": self._word_time_stamps(
+                    res_tokenids[i], res_frames[i],
+                    duration / frame_shift_in_sec, offset, frame_shift_in_sec),
+            }
+            logger.info(
+                f"segment [{result['start']:.2f}s, {result['end']:.2f}s]: {result['text']}"
+            )
+            results.append(result)
+        return results
+
+    def _word_time_stamps(self,
+                          token_ids: List[int],
+                          frames: List[int],
+                          num_frames: float,
+                          offset: float,
+                          frame_shift_in_sec: float) -> List[Dict]:
+        """
+        The begin and end of a token are the middle points between its frame
+        and the frames of its neighbours, as the online asr engine does. The
+        sentencepiece tokens are merged into words.
+        """
+        words = []
+        for idx, token_id in enumerate(token_ids):
+            start = (frames[idx - 1] + frames[idx]) / 2.0 if idx > 0 else 0
+            end = (frames[idx] + frames[idx + 1]
+                   ) / 2.0 if idx < len(frames) - 1 else num_frames
+            start = offset + start * frame_shift_in_sec
+            end = offset + end * frame_shift_in_sec
+
+            token = self.text_feature.vocab_list[token_id]
+            if self.text_feature.unit_type == 'spm':
+                if not token.startswith("\u2581") and words:
+                    words[-1]["w"] += token
+                    words[-1]["ed"] = end
+                    continue
+                token = token.lstrip("\u2581")
+            words.append({"w": token, "bg": start, "ed": end})
+        return words
+
+    def _long_audio_postprocess(self, segments: List[Dict]):
+        """
+        Stitch the results of the segments of a long audio.
+        """
+        sep = "" if self.text_feature.unit_type == 'char' else " "
+        self._outputs["result"] = sep.join(
+            segment["text"] for segment in segments if segment["text"])
+        self._outputs["segments"] = segments
 
     def postprocess(self) -> Union[str, os.PathLike]:
         """
@@ -348,6 +706,14 @@ class ASRExecutor(BaseExecutor):
         audio = audio / (2**(bits - 1))
         return audio
 
+    @staticmethod
+    def _downmix(audio):
+        """Average the channels of int16 audio (N, C) to (N, ), in float32,
+        since the int16 sum of the channels overflows."""
+        audio = np.round(audio.mean(axis=1, dtype=np.float32))
+        info = np.iinfo(np.int16)
+        return np.clip(audio, info.min, info.max).astype(np.int16)
+
     def _pcm32to16(self, audio):
         assert (audio.dtype == np.float32)
         bits = np.iinfo(np.int16).bits
@@ -370,15 +736,21 @@ class ASRExecutor(BaseExecutor):
             audio_file.seek(0)
 
         logger.debug("checking the audio file format......")
+        self.long_audio = False
         try:
-            audio, audio_sample_rate = soundfile.read(
-                audio_file, dtype="int16", always_2d=True)
-            audio_duration = audio.shape[0] / audio_sample_rate
+            audio_info = soundfile.info(audio_file)
+            audio_sample_rate = audio_info.samplerate
+            audio_duration = audio_info.duration
             if audio_duration > self.max_len:
-                logger.error(
-                    f"Please input audio file less then {self.max_len} seconds.\n"
+                if not hasattr(self.model, "decode_with_time_stamps"):
+                    logger.error(
+                        f"Please input audio file less then {self.max_len} seconds.\n"
+                    )
+                    return False
+                logger.info(
+                    f"The audio is longer than {self.max_len} seconds, it will be split at the silences and recognized by segments."
                 )
-                return False
+                self.long_audio = True
         except Exception as e:
             logger.exception(e)
             logger.error(
@@ -442,6 +814,8 @@ class ASRExecutor(BaseExecutor):
         force_yes = parser_args.yes
         rtf = parser_args.rtf
         device = parser_args.device
+        batch_size = parser_args.batch_size
+        num_workers = parser_args.num_workers
 
         if not parser_args.verbose:
             self.disable_task_loggers()
@@ -450,6 +824,34 @@ class ASRExecutor(BaseExecutor):
         task_results = OrderedDict()
         has_exceptions = False
 
+        if self._is_job_input(parser_args.input) and batch_size > 1:
+            if sample_rate not in (8000, 16000):
+                logger.error(
+                    "invalid sample rate, please input --sr 8000 or --sr 16000")
+                return False
+            paddle.set_device(device)
+            self.sample_rate = sample_rate
+            self._init_from_path(
+                model,
+                lang,
+                codeswitch,
+                sample_rate,
+                config,
+                decode_method,
+                ckpt_path=ckpt_path)
+            task_results, has_exceptions = self.batch_infer(
+                model,
+                task_source,
+                batch_size=batch_size,
+                num_workers=num_workers,
+                force_yes=force_yes,
+                rtf=rtf)
+            if rtf:
+                self.show_rtf(CLI_TIMER[self.__class__.__name__])
+            self.process_task_results(parser_args.input, task_results,
+                                      parser_args.job_dump_result)
+            return not has_exceptions
+
         for id_, input_ in task_source.items():
             try:
                 res = self(
@@ -507,14 +909,16 @@ class ASRExecutor(BaseExecutor):
             k = self.__class__.__name__
             CLI_TIMER[k]['start'].append(time.time())
 
-        self.preprocess(model, audio_file)
-        self.infer(model)
+        if self.long_audio:
+            self._long_audio_postprocess(
+                list(self.infer_long_audio(audio_file)))
+        else:
+            self.preprocess(model, audio_file)
+            self.infer(model)
         res = self.postprocess()  # Retrieve result of asr.
 
         if rtf:
             CLI_TIMER[k]['end'].append(time.time())
-            audio, audio_sample_rate = soundfile.read(
-                audio_file, dtype="int16", always_2d=True)
-            CLI_TIMER[k]['extra'].append(audio.shape[0] / audio_sample_rate)
+            CLI_TIMER[k]['extra'].append(soundfile.info(audio_file).duration)
 
         return res
@@ -33,7 +33,7 @@ from ..log import logger
 from ..utils import CLI_TIMER
 from ..utils import stats_wrapper
 from ..utils import timer_register
-from paddlespeech.audio.transform.transformation import Transformation
+from paddlespeech.audio.transform.transformation import get_transformation
 from paddlespeech.s2t.frontend.featurizer.text_featurizer import TextFeaturizer
 from paddlespeech.s2t.utils.utility import UpdateConfig
 
@@ -230,7 +230,7 @@ class SSLExecutor(BaseExecutor):
         logger.debug("get the preprocess conf")
         preprocess_conf = self.config.preprocess_config
         preprocess_args = {"train": False}
-        preprocessing = Transformation(preprocess_conf)
+        preprocessing = get_transformation(preprocess_conf)
         logger.debug("read the audio file")
         audio, audio_sample_rate = soundfile.read(
             audio_file, dtype="int16", always_2d=True)
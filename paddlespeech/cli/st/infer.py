@@ -13,41 +13,30 @@
 # limitations under the License.
 import argparse
 import os
-import subprocess
 from collections import OrderedDict
 from typing import List
 from typing import Optional
 from typing import Union
 
-import kaldiio
 import numpy as np
 import paddle
 import soundfile
-from kaldiio import WriteHelper
 from yacs.config import CfgNode
 
-from ...utils.env import MODEL_HOME
 from ..executor import BaseExecutor
 from ..log import logger
-from ..utils import download_and_decompress
 from ..utils import stats_wrapper
+from paddlespeech.audio.transform.cmvn import CMVN
+from paddlespeech.audio.transform.pitch import LogMelSpectrogramKaldiPitch
 from paddlespeech.s2t.frontend.featurizer.text_featurizer import TextFeaturizer
 from paddlespeech.s2t.utils.utility import UpdateConfig
 
 __all__ = ["STExecutor"]
 
-kaldi_bins = {
-    "url":
-    "https://paddlespeech.bj.bcebos.com/s2t/ted_en_zh/st1/kaldi_bins.tar.gz",
-    "md5":
-    "c0682303b3f3393dbf6ed4c4e35a53eb",
-}
-
 
 class STExecutor(BaseExecutor):
     def __init__(self):
         super().__init__(task='st')
-        self.kaldi_bins = kaldi_bins
 
         self.parser = argparse.ArgumentParser(
             prog="paddlespeech.st", add_help=True)
@@ -104,20 +93,6 @@ class STExecutor(BaseExecutor):
             action='store_true',
             help='Increase logger verbosity of current task.')
 
-    def _set_kaldi_bins(self) -> os.PathLike:
-        """
-            Download and returns kaldi_bins resources path of current task.
-        """
-        decompressed_path = download_and_decompress(self.kaldi_bins, MODEL_HOME)
-        decompressed_path = os.path.abspath(decompressed_path)
-        logger.debug("Kaldi_bins stored in: {}".format(decompressed_path))
-        if "LD_LIBRARY_PATH" in os.environ:
-            os.environ["LD_LIBRARY_PATH"] += f":{decompressed_path}"
-        else:
-            os.environ["LD_LIBRARY_PATH"] = f"{decompressed_path}"
-        os.environ["PATH"] += f":{decompressed_path}"
-        return decompressed_path
-
     def _init_from_path(self,
                         model_type: str="fat_st_ted",
                         src_lang: str="en",
@@ -176,8 +151,11 @@ class STExecutor(BaseExecutor):
         model_dict = paddle.load(params_path)
         self.model.set_state_dict(model_dict)
 
-        # set kaldi bins
-        self._set_kaldi_bins()
+        # fbank + pitch + global cmvn, the same as the kaldi recipe
+        self.feature_extractor = LogMelSpectrogramKaldiPitch(
+            fs=16000, n_mels=80, dither=0.0)
+        self.cmvn = CMVN(
+            self.config.cmvn_path, norm_means=True, norm_vars=True)
 
     def _check(self, audio_file: str, sample_rate: int):
         _, audio_sample_rate = soundfile.read(
@@ -195,67 +173,23 @@ class STExecutor(BaseExecutor):
         logger.debug("Preprocess audio_file:" + audio_file)
 
         if "fat_st" in model_type:
-            cmvn = self.config.cmvn_path
-            utt_name = "_tmp"
-
-            # Get the object for feature extraction
-            fbank_extract_command = [
-                "compute-fbank-feats", "--num-mel-bins=80", "--verbose=2",
-                "--sample-frequency=16000", "scp:-", "ark:-"
-            ]
-            fbank_extract_process = subprocess.Popen(
-                fbank_extract_command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE)
-            fbank_extract_process.stdin.write(
-                f"{utt_name} {wav_file}".encode("utf8"))
-            fbank_extract_process.stdin.close()
-            fbank_feat = dict(
-                kaldiio.load_ark(fbank_extract_process.stdout))[utt_name]
-
-            extract_command = ["compute-kaldi-pitch-feats", "scp:-", "ark:-"]
-            pitch_extract_process = subprocess.Popen(
-                extract_command,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE)
-            pitch_extract_process.stdin.write(
-                f"{utt_name} {wav_file}".encode("utf8"))
-            process_command = ["process-kaldi-pitch-feats", "ark:", "ark:-"]
-            pitch_process = subprocess.Popen(
-                process_command,
-                stdin=pitch_extract_process.stdout,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE)
-            pitch_extract_process.stdin.close()
-            pitch_feat = dict(kaldiio.load_ark(pitch_process.stdout))[utt_name]
-            concated_feat = np.concatenate((fbank_feat, pitch_feat), axis=1)
-            raw_feat = f"{utt_name}.raw"
-            with WriteHelper(
-                    f"ark,scp:{raw_feat}.ark,{raw_feat}.scp") as writer:
-                writer(utt_name, concated_feat)
-            cmvn_command = [
-                "apply-cmvn", "--norm-vars=true", cmvn, f"scp:{raw_feat}.scp",
-                "ark:-"
-            ]
-            cmvn_process = subprocess.Popen(
-                cmvn_command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            process_command = [
-                "copy-feats", "--compress=true", "ark:-", "ark:-"
-            ]
-            process = subprocess.Popen(
-                process_command,
-                stdin=cmvn_process.stdout,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE)
-            norm_feat = dict(kaldiio.load_ark(process.stdout))[utt_name]
+            waveform, _ = soundfile.read(audio_file, dtype="int16")
+            norm_feat = self.extract_features([waveform])[0]
             self._inputs["audio"] = paddle.to_tensor(norm_feat).unsqueeze(0)
             self._inputs["audio_len"] = paddle.to_tensor(
                 self._inputs["audio"].shape[1:2], dtype="int64")
         else:
             raise ValueError("Wrong model type.")
 
+    def extract_features(self,
+                         waveforms: List[np.ndarray]) -> List[np.ndarray]:
+        """
+            Extract the normalized fbank and pitch features of a batch of waveforms in the scale of int16.
+        """
+        feats = self.feature_extractor.batch(
+            [waveform.astype(np.float32) for waveform in waveforms])
+        return [self.cmvn(feat).astype(np.float32) for feat in feats]
+
     @paddle.no_grad()
     def infer(self, model_type: str):
         """
@@ -30,6 +30,7 @@ from ..executor import BaseExecutor
 from ..log import logger
 from ..utils import stats_wrapper
 from paddlespeech.resource import CommonTaskResource
+from paddlespeech.t2s.exps.syn_utils import batch_synthesize
 from paddlespeech.t2s.exps.syn_utils import get_am_inference
 from paddlespeech.t2s.exps.syn_utils import get_frontend
 from paddlespeech.t2s.exps.syn_utils import get_sess
@@ -173,6 +174,12 @@ class TTSExecutor(BaseExecutor):
             help='Choose device to execute model inference.')
 
         self.parser.add_argument('--cpu_threads', type=int, default=2)
+        self.parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=1,
+            help='number of sentences synthesized at a time, only for fastspeech2.'
+        )
 
         self.parser.add_argument(
             '--output', type=str, default='output.wav', help='output file name')
@@ -457,9 +464,12 @@ class TTSExecutor(BaseExecutor):
               text: str,
               lang: str='zh',
               am: str='fastspeech2_csmsc',
-              spk_id: int=0):
+              spk_id: int=0,
+              batch_size: int=1):
         """
         Model inference and result stored in self.output.
+        The sentences are synthesized `batch_size` at a time by the acoustic
+        models which support it, i.e. fastspeech2.
         """
         am_name = am[:am.rindex('_')]
         am_dataset = am[am.rindex('_') + 1:]
@@ -477,8 +487,23 @@ class TTSExecutor(BaseExecutor):
         self.frontend_time = time.time() - frontend_st
         self.am_time = 0
         self.voc_time = 0
-        flags = 0
         phone_ids = frontend_dict['phone_ids']
+        if am_name == 'fastspeech2' and hasattr(self.am_inference,
+                                                'batch_inference'):
+            # multi speaker
+            if am_dataset in {'aishell3', 'vctk', 'mix', 'canton'}:
+                batch_spk_id = spk_id
+            else:
+                batch_spk_id = None
+            self._outputs['wav'], self.am_time, self.voc_time = batch_synthesize(
+                self.am_inference,
+                self.voc_inference,
+                phone_ids,
+                batch_size=batch_size,
+                spk_id=batch_spk_id)
+            return
+
+        wavs = []
         for i in range(len(phone_ids)):
             am_st = time.time()
             part_phone_ids = phone_ids[i]
@@ -497,14 +522,9 @@ class TTSExecutor(BaseExecutor):
             self.am_time += (time.time() - am_st)
             # voc
             voc_st = time.time()
-            wav = self.voc_inference(mel)
-            if flags == 0:
-                wav_all = wav
-                flags = 1
-            else:
-                wav_all = paddle.concat([wav_all, wav])
+            wavs.append(self.voc_inference(mel))
             self.voc_time += (time.time() - voc_st)
-        self._outputs['wav'] = wav_all
+        self._outputs['wav'] = paddle.concat(wavs)
 
     def infer_onnx(self,
                    text: str,
@@ -530,7 +550,7 @@ class TTSExecutor(BaseExecutor):
         phone_ids = frontend_dict['phone_ids']
         self.am_time = 0
         self.voc_time = 0
-        flags = 0
+        wavs = []
         for i in range(len(phone_ids)):
             am_st = time.time()
             part_phone_ids = phone_ids[i]
@@ -552,15 +572,10 @@ class TTSExecutor(BaseExecutor):
             voc_st = time.time()
             wav = self.voc_sess.run(
                 output_names=None, input_feed={'logmel': mel})
-            wav = wav[0]
-            if flags == 0:
-                wav_all = wav
-                flags = 1
-            else:
-                wav_all = np.concatenate([wav_all, wav])
+            wavs.append(wav[0])
             self.voc_time += (time.time() - voc_st)
 
-        self._outputs['wav'] = wav_all
+        self._outputs['wav'] = np.concatenate(wavs)
 
     def postprocess(self, output: str='output.wav') -> Union[str, os.PathLike]:
         """
@@ -613,6 +628,7 @@ class TTSExecutor(BaseExecutor):
         use_onnx = args.use_onnx
         cpu_threads = args.cpu_threads
         fs = args.fs
+        batch_size = args.batch_size
 
         if not args.verbose:
             self.disable_task_loggers()
@@ -652,7 +668,8 @@ class TTSExecutor(BaseExecutor):
                     output=output,
                     use_onnx=use_onnx,
                     cpu_threads=cpu_threads,
-                    fs=fs)
+                    fs=fs,
+                    batch_size=batch_size)
                 task_results[id_] = res
             except Exception as e:
                 has_exceptions = True
@@ -687,7 +704,8 @@ class TTSExecutor(BaseExecutor):
                  output: str='output.wav',
                  use_onnx: bool=False,
                  cpu_threads: int=2,
-                 fs: int=24000):
+                 fs: int=24000,
+                 batch_size: int=1):
         """
         Python API to call an executor.
         """
@@ -707,7 +725,12 @@ class TTSExecutor(BaseExecutor):
                 voc_stat=voc_stat,
                 lang=lang)
 
-            self.infer(text=text, lang=lang, am=am, spk_id=spk_id)
+            self.infer(
+                text=text,
+                lang=lang,
+                am=am,
+                spk_id=spk_id,
+                batch_size=batch_size)
             res = self.postprocess(output=output)
             return res
         else:
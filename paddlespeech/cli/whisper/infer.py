@@ -103,6 +103,12 @@ class WhisperExecutor(BaseExecutor):
             default='ctc_prefix_beam_search',
             choices=['ctc_greedy_search', 'ctc_prefix_beam_search'],
             help='only support transformer and conformer model')
+        self.parser.add_argument(
+            '--batch_size',
+            type=int,
+            default=1,
+            help='Number of 30-second windows decoded at once. If > 1, the windows are cut up front and decoded in batch, without the previous text as the prompt.'
+        )
         self.parser.add_argument(
             '--ckpt_path',
             type=str,
@@ -262,7 +268,7 @@ class WhisperExecutor(BaseExecutor):
         logger.debug("audio feat process success")
 
     @paddle.no_grad()
-    def infer(self, model_type: str):
+    def infer(self, model_type: str, batch_size: int=1):
         """
         Model inference and result stored in self.output.
         """
@@ -276,8 +282,7 @@ class WhisperExecutor(BaseExecutor):
         else:
             temperature = [cfg.temperature]
 
-        self._outputs["result"] = self.model.transcribe(
-            audio,
+        options = dict(
             verbose=cfg.verbose,
             task=self.task,
             language=self.language,
@@ -290,8 +295,15 @@ class WhisperExecutor(BaseExecutor):
             patience=cfg.patience,
             length_penalty=cfg.length_penalty,
             initial_prompt=cfg.initial_prompt,
-            condition_on_previous_text=cfg.condition_on_previous_text,
             no_speech_threshold=cfg.no_speech_threshold)
+        if batch_size > 1:
+            self._outputs["result"] = self.model.batch_transcribe(
+                audio, batch_size=batch_size, **options)
+        else:
+            self._outputs["result"] = self.model.transcribe(
+                audio,
+                condition_on_previous_text=cfg.condition_on_previous_text,
+                **options)
 
     def postprocess(self) -> Union[str, os.PathLike]:
         """
@@ -400,6 +412,7 @@ class WhisperExecutor(BaseExecutor):
         config = parser_args.config
         ckpt_path = parser_args.ckpt_path
         decode_method = parser_args.decode_method
+        batch_size = parser_args.batch_size
         force_yes = parser_args.yes
         rtf = parser_args.rtf
         device = parser_args.device
@@ -424,6 +437,7 @@ class WhisperExecutor(BaseExecutor):
                     config=config,
                     ckpt_path=ckpt_path,
                     decode_method=decode_method,
+                    batch_size=batch_size,
                     force_yes=force_yes,
                     rtf=rtf,
                     device=device)
@@ -456,6 +470,7 @@ class WhisperExecutor(BaseExecutor):
                  ckpt_path: os.PathLike=None,
                  decode_method: str='attention_rescoring',
                  num_decoding_left_chunks: int=-1,
+                 batch_size: int=1,
                  force_yes: bool=False,
                  rtf: bool=False,
                  device=paddle.get_device()):
@@ -474,7 +489,7 @@ class WhisperExecutor(BaseExecutor):
             CLI_TIMER[k]['start'].append(time.time())
 
         self.preprocess(model, audio_file)
-        self.infer(model)
+        self.infer(model, batch_size)
         res = self.postprocess()  # Retrieve result of asr.
 
         if rtf:
@@ -12,7 +12,345 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # Reference espnet Apache 2.0 (http://www.apache.org/licenses/LICENSE-2.0)
+"""Parallel beam search module."""
+from itertools import chain
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Tuple
 
+import paddle
 
-class BatchBeamSearch():
-    pass
+from .beam_search import BeamSearch
+from .beam_search import Hypothesis
+from paddlespeech.audio.utils.tensor_utils import pad_sequence
+from paddlespeech.s2t.utils.log import Log
+
+logger = Log(__name__).getlog()
+
+__all__ = ["BatchHypothesis", "BatchBeamSearch"]
+
+
+class BatchHypothesis(NamedTuple):
+    """Batchfied/Vectorized hypothesis data type."""
+
+    yseq: paddle.Tensor = None  # (batch, maxlen)
+    score: paddle.Tensor = None  # (batch,)
+    length: paddle.Tensor = None  # (batch,)
+    scores: Dict[str, paddle.Tensor] = dict()  # values: (batch,)
+    states: Dict[str, List[Any]] = dict()
+
+    def __len__(self) -> int:
+        """Return a batch size."""
+        return 0 if self.length is None else len(self.length)
+
+
+class BatchBeamSearch(BeamSearch):
+    """Batch beam search implementation.
+
+    All the running hypotheses of one utterance are scored at once, which
+    requires the full scorers to implement `BatchScorerInterface` and the
+    partial scorers `BatchPartialScorerInterface`.
+    """
+
+    def batchfy(self, hyps: List[Hypothesis]) -> BatchHypothesis:
+        """Convert list to batch."""
+        if len(hyps) == 0:
+            return BatchHypothesis()
+        return BatchHypothesis(
+            yseq=pad_sequence(
+                [h.yseq for h in hyps],
+                batch_first=True,
+                padding_value=self.eos),
+            length=paddle.to_tensor(
+                [len(h.yseq) for h in hyps], dtype=paddle.int64),
+            score=paddle.to_tensor([float(h.score) for h in hyps]),
+            scores={
+                k: paddle.to_tensor([float(h.scores[k]) for h in hyps])
+                for k in self.scorers
+            },
+            states={k: [h.states[k] for h in hyps]
+                    for k in self.scorers}, )
+
+    def _batch_select(self, hyps: BatchHypothesis,
+                      ids: List[int]) -> BatchHypothesis:
+        if len(ids) == 0:
+            return BatchHypothesis()
+        index = paddle.to_tensor(ids, dtype=paddle.int64)
+        return BatchHypothesis(
+            yseq=paddle.index_select(hyps.yseq, index, axis=0),
+            score=paddle.index_select(hyps.score, index, axis=0),
+            length=paddle.index_select(hyps.length, index, axis=0),
+            scores={
+                k: paddle.index_select(v, index, axis=0)
+                for k, v in hyps.scores.items()
+            },
+            states={
+                k: [self.scorers[k].select_state(v, i) for i in ids]
+                for k, v in hyps.states.items()
+            }, )
+
+    def _select(self, hyps: BatchHypothesis, i: int) -> Hypothesis:
+        return Hypothesis(
+            yseq=hyps.yseq[i, :int(hyps.length[i])],
+            score=hyps.score[i],
+            scores={k: v[i]
+                    for k, v in hyps.scores.items()},
+            states={
+                k: self.scorers[k].select_state(v, i)
+                for k, v in hyps.states.items()
+            }, )
+
+    def unbatchfy(self, batch_hyps: BatchHypothesis) -> List[Hypothesis]:
+        """Revert batch to list."""
+        return [
+            Hypothesis(
+                yseq=batch_hyps.yseq[i][:int(batch_hyps.length[i])],
+                score=batch_hyps.score[i],
+                scores={k: batch_hyps.scores[k][i]
+                        for k in self.scorers},
+                states={
+                    k: v.select_state(batch_hyps.states[k], i)
+                    for k, v in self.scorers.items()
+                }, ) for i in range(len(batch_hyps.length))
+        ]
+
+    def batch_beam(self, weighted_scores: paddle.Tensor
+                   ) -> Tuple[List[int], List[int], List[int], List[int]]:
+        """Batch-compute topk full token ids and partial token ids.
+
+        Args:
+            weighted_scores (paddle.Tensor): The weighted sum scores for each tokens.
+                Its shape is `(n_beam, self.vocab_size)`.
+
+        Returns:
+            Tuple[List[int], List[int], List[int], List[int]]:
+                The topk full (prev_hyp, new_token) ids
+                and partial (prev_hyp, new_token) ids.
+                Their lengths are `(self.beam_size,)`.
+        """
+        top_ids = weighted_scores.flatten().topk(self.beam_size)[1]
+        # Because of the flatten above, `top_ids` is organized as:
+        # [hyp1 * V + token1, hyp2 * V + token2, ..., hypK * V + tokenK],
+        # where V is `self.n_vocab` and K is `self.beam_size`
+        prev_hyp_ids = (top_ids // self.n_vocab).tolist()
+        new_token_ids = (top_ids % self.n_vocab).tolist()
+        return prev_hyp_ids, new_token_ids, prev_hyp_ids, new_token_ids
+
+    def init_hyp(self, x: paddle.Tensor) -> BatchHypothesis:
+        """Get an initial hypothesis data.
+
+        Args:
+            x (paddle.Tensor): The encoder output feature, (T, D)
+
+        Returns:
+            BatchHypothesis: The initial hypothesis.
+        """
+        init_states = dict()
+        init_scores = dict()
+        for k, d in self.scorers.items():
+            init_states[k] = d.batch_init_state(x)
+            init_scores[k] = 0.0
+        return self.batchfy([
+            Hypothesis(
+                score=0.0,
+                scores=init_scores,
+                states=init_states,
+                yseq=paddle.to_tensor([self.sos], place=x.place), )
+        ])
+
+    def score_full(self, hyp: BatchHypothesis, x: paddle.Tensor
+                   ) -> Tuple[Dict[str, paddle.Tensor], Dict[str, Any]]:
+        """Score new hypothesis by `self.full_scorers`.
+
+        Args:
+            hyp (BatchHypothesis): Hypothesis with prefix tokens to score
+            x (paddle.Tensor): Corresponding input feature, (n_beam, T, D)
+
+        Returns:
+            Tuple[Dict[str, paddle.Tensor], Dict[str, Any]]: Tuple of
+                score dict of `hyp` that has string keys of `self.full_scorers`
+                and tensor score values of shape: `(n_beam, self.n_vocab)`,
+                and state dict that has string keys
+                and state values of `self.full_scorers`
+        """
+        scores = dict()
+        states = dict()
+        for k, d in self.full_scorers.items():
+            scores[k], states[k] = d.batch_score(hyp.yseq, hyp.states[k], x)
+        return scores, states
+
+    def score_partial(self,
+                      hyp: BatchHypothesis,
+                      ids: paddle.Tensor,
+                      x: paddle.Tensor
+                      ) -> Tuple[Dict[str, paddle.Tensor], Dict[str, Any]]:
+        """Score new hypothesis by `self.part_scorers`.
+
+        Args:
+            hyp (BatchHypothesis): Hypothesis with prefix tokens to score
+            ids (paddle.Tensor): 2D tensor of new partial tokens to score, (n_beam, pre_beam_size)
+            x (paddle.Tensor): Corresponding input feature, (T, D)
+
+        Returns:
+            Tuple[Dict[str, paddle.Tensor], Dict[str, Any]]: Tuple of
+                score dict of `hyp` that has string keys of `self.part_scorers`
+                and tensor score values of shape: `(n_beam, self.n_vocab)`,
+                and state dict that has string keys
+                and state values of `self.part_scorers`
+        """
+        scores = dict()
+        states = dict()
+        for k, d in self.part_scorers.items():
+            scores[k], states[k] = d.batch_score_partial(hyp.yseq, ids,
+                                                         hyp.states[k], x)
+        return scores, states
+
+    def merge_states(self, states: Any, part_states: Any, part_idx: int) -> Any:
+        """Merge states for new hypothesis.
+
+        Args:
+            states: states of `self.full_scorers`
+            part_states: states of `self.part_scorers`, already selected
+            part_idx (int): The new token id for `part_scores`
+
+        Returns:
+            Dict[str, paddle.Tensor]: The new score dict.
+                Its keys are names of `self.full_scorers` and `self.part_scorers`.
+                Its values are states of the scorers.
+        """
+        new_states = dict()
+        for k, v in states.items():
+            new_states[k] = v
+        for k, v in part_states.items():
+            new_states[k] = v
+        return new_states
+
+    def search(self, running_hyps: BatchHypothesis,
+               x: paddle.Tensor) -> BatchHypothesis:
+        """Search new tokens for running hypotheses and encoded speech x.
+
+        Args:
+            running_hyps (BatchHypothesis): Running hypotheses on beam
+            x (paddle.Tensor): Encoded speech feature (T, D)
+
+        Returns:
+            BatchHypothesis: Best sorted hypotheses
+        """
+        n_batch = len(running_hyps)
+        part_ids = None  # no pre-beam
+        # batch scoring
+        weighted_scores = paddle.zeros([n_batch, self.n_vocab], dtype=x.dtype)
+        scores, states = self.score_full(running_hyps,
+                                         x.expand([n_batch] + x.shape))
+        for k in self.full_scorers:
+            weighted_scores += self.weights[k] * scores[k]
+        # partial scoring
+        if self.do_pre_beam:
+            pre_beam_scores = (weighted_scores
+                               if self.pre_beam_score_key == "full" else
+                               scores[self.pre_beam_score_key])
+            part_ids = paddle.topk(pre_beam_scores, self.pre_beam_size,
+                                   axis=-1)[1]
+        # NOTE(takaaki-hori): Unlike BeamSearch, we assume that score_partial returns
+        # full-size score matrices, which has non-zero scores for part_ids and zeros
+        # for others.
+        part_scores, part_states = self.score_partial(running_hyps, part_ids,
+                                                      x)
+        for k in self.part_scorers:
+            weighted_scores += self.weights[k] * part_scores[k]
+        # add previous hyp scores
+        weighted_scores += running_hyps.score.astype(x.dtype).unsqueeze(1)
+
+        # update hyps
+        best_hyps = []
+        prev_hyps = self.unbatchfy(running_hyps)
+        for (full_prev_hyp_id, full_new_token_id, part_prev_hyp_id,
+             part_new_token_id) in zip(*self.batch_beam(weighted_scores)):
+            prev_hyp = prev_hyps[full_prev_hyp_id]
+            best_hyps.append(
+                Hypothesis(
+                    score=weighted_scores[full_prev_hyp_id, full_new_token_id],
+                    yseq=self.append_token(prev_hyp.yseq, full_new_token_id),
+                    scores=self.merge_scores(
+                        prev_hyp.scores,
+                        {k: v[full_prev_hyp_id]
+                         for k, v in scores.items()},
+                        full_new_token_id,
+                        {k: v[part_prev_hyp_id]
+                         for k, v in part_scores.items()},
+                        part_new_token_id, ),
+                    states=self.merge_states(
+                        {
+                            k: self.full_scorers[k].select_state(
+                                v, full_prev_hyp_id)
+                            for k, v in states.items()
+                        },
+                        {
+                            k: self.part_scorers[k].select_state(
+                                v, part_prev_hyp_id, part_new_token_id)
+                            for k, v in part_states.items()
+                        },
+                        part_new_token_id, ), ))
+        return self.batchfy(best_hyps)
+
+    def post_process(
+            self,
+            i: int,
+            maxlen: int,
+            maxlenratio: float,
+            running_hyps: BatchHypothesis,
+            ended_hyps: List[Hypothesis], ) -> BatchHypothesis:
+        """Perform post-processing of beam search iterations.
+
+        Args:
+            i (int): The length of hypothesis tokens.
+            maxlen (int): The maximum length of tokens in beam search.
+            maxlenratio (int): The maximum length ratio in beam search.
+            running_hyps (BatchHypothesis): The running hypotheses in beam search.
+            ended_hyps (List[Hypothesis]): The ended hypotheses in beam search.
+
+        Returns:
+            BatchHypothesis: The new running hypotheses.
+        """
+        n_batch = len(running_hyps)
+        logger.debug(f"the number of running hypothes: {n_batch}")
+        if self.token_list is not None:
+            logger.debug("best hypo: " + "".join([
+                self.token_list[x]
+                for x in running_hyps.yseq[0, 1:int(running_hyps.length[0])]
+            ]))
+        # add eos in the final loop to avoid that there are no ended hyps
+        if i == maxlen - 1:
+            logger.info("adding <eos> in the last position in the loop")
+            yseq_eos = paddle.concat(
+                (running_hyps.yseq, paddle.full(
+                    [n_batch, 1], self.eos, dtype=running_hyps.yseq.dtype)),
+                axis=1)
+            # `_replace` can not be used, since `__len__` is the batch size
+            running_hyps = BatchHypothesis(
+                score=running_hyps.score,
+                yseq=yseq_eos,
+                length=paddle.full(
+                    [n_batch], yseq_eos.shape[1], dtype=paddle.int64),
+                scores=running_hyps.scores,
+                states=running_hyps.states)
+
+        # add ended hypotheses to a final list, and removed them from current hypotheses
+        # (this will be a probmlem, number of hyps < beam)
+        lengths = running_hyps.length.tolist()
+        yseq = running_hyps.yseq.tolist()
+        is_eos = [yseq[b][lengths[b] - 1] == self.eos for b in range(n_batch)]
+        for b in range(n_batch):
+            if is_eos[b]:
+                hyp = self._select(running_hyps, b)
+                # e.g., Word LM needs to add final <eos> score
+                for k, d in chain(self.full_scorers.items(),
+                                  self.part_scorers.items()):
+                    s = d.final_score(hyp.states[k])
+                    hyp.scores[k] += s
+                    hyp = hyp._replace(score=hyp.score + self.weights[k] * s)
+                ended_hyps.append(hyp)
+        remained_ids = [b for b in range(n_batch) if not is_eos[b]]
+        return self._batch_select(running_hyps, remained_ids)
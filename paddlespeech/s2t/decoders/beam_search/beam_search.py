@@ -159,7 +159,9 @@ class BeamSearch(paddle.nn.Layer):
             paddle.Tensor: (T+1,), New tensor contains: xs + [x] with xs.dtype and xs.device
 
         """
-        x = paddle.to_tensor([x], dtype=xs.dtype) if isinstance(x, int) else x
+        # x is a 0-D tensor when iterating over the topk ids
+        x = paddle.to_tensor(
+            [x], dtype=xs.dtype) if isinstance(x, int) else x.reshape([1])
         return paddle.concat((xs, x))
 
     def score_full(self, hyp: Hypothesis, x: paddle.Tensor
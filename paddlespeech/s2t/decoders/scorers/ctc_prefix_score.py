@@ -33,31 +33,29 @@ class CTCPrefixScorePD():
         self.logzero = -10000000000.0
         self.blank = blank
         self.eos = eos
-        self.batch = paddle.shape(x)[0]
-        self.input_length = paddle.shape(x)[1]
-        self.odim = paddle.shape(x)[2]
+        self.batch = x.shape[0]
+        self.input_length = x.shape[1]
+        self.odim = x.shape[2]
         self.dtype = x.dtype
 
         # Pad the rest of posteriors in the batch
         # TODO(takaaki-hori): need a better way without for-loops
+        xlens = [int(l) for l in xlens]
         for i, l in enumerate(xlens):
             if l < self.input_length:
                 x[i, l:, :] = self.logzero
                 x[i, l:, blank] = 0
         # Reshape input x
         xn = x.transpose([1, 0, 2])  # (B, T, O) -> (T, B, O)
-        xb = xn[:, :, self.blank].unsqueeze(2).expand(-1, -1,
-                                                      self.odim)  # (T,B,O)
+        xb = xn[:, :, self.blank].unsqueeze(2).expand(
+            [-1, -1, self.odim])  # (T,B,O)
         self.x = paddle.stack([xn, xb])  # (2, T, B, O)
-        self.end_frames = paddle.to_tensor(xlens) - 1  # (B,)
+        self.end_frames = [l - 1 for l in xlens]  # (B,)
 
         # Setup CTC windowing
         self.margin = margin
         if margin > 0:
             self.frame_ids = paddle.arange(self.input_length, dtype=self.dtype)
-        # Base indices for index conversion
-        # B idx, hyp idx. shape (B*W, 1)
-        self.idx_bh = None
         # B idx. shape (B,)
         self.idx_b = paddle.arange(self.batch)
         # B idx, O idx. shape (B, 1)
@@ -73,10 +71,10 @@ class CTCPrefixScorePD():
         :return new_state, ctc_local_scores (BW, O)
         """
         output_length = len(y[0]) - 1  # ignore sos
-        last_ids = [yi[-1] for yi in y]  # last output label ids
+        last_ids = [int(yi[-1]) for yi in y]  # last output label ids
         n_bh = len(last_ids)  # batch * hyps
         n_hyps = n_bh // self.batch  # assuming each utterance has the same # of hyps
-        self.scoring_num = paddle.shape(scoring_ids)[
+        self.scoring_num = scoring_ids.shape[
             -1] if scoring_ids is not None else 0
         # prepare state info
         if state is None:
@@ -86,7 +84,7 @@ class CTCPrefixScorePD():
                 dtype=self.dtype, )  # (T, 2, B, W)
             r_prev[:, 1] = paddle.cumsum(self.x[0, :, :, self.blank],
                                          0).unsqueeze(2)
-            r_prev = r_prev.view(-1, 2, n_bh)  # (T, 2, BW)
+            r_prev = r_prev.reshape([-1, 2, n_bh])  # (T, 2, BW)
             s_prev = 0.0  # score
             f_min_prev = 0  # eq. 22-23
             f_max_prev = 1  # eq. 22-23
@@ -95,28 +93,27 @@ class CTCPrefixScorePD():
 
         # select input dimensions for scoring
         if self.scoring_num > 0:
-            # (BW, O)
-            scoring_idmap = paddle.full(
-                (n_bh, self.odim), -1, dtype=paddle.long)
             snum = self.scoring_num
-            if self.idx_bh is None or n_bh > len(self.idx_bh):
-                self.idx_bh = paddle.arange(n_bh).view(-1, 1)  # (BW, 1)
-            scoring_idmap[self.idx_bh[:n_bh], scoring_ids] = paddle.arange(snum)
+            # (BW, O)
+            scoring_idmap = paddle.put_along_axis(
+                paddle.full((n_bh, self.odim), -1, dtype='int64'),
+                scoring_ids,
+                paddle.arange(snum).unsqueeze(0).expand([n_bh, snum]), 1)
             scoring_idx = (
-                scoring_ids + self.idx_bo.repeat(1, n_hyps).view(-1,
-                                                                 1)  # (BW,1)
-            ).view(-1)  # (BWO)
+                scoring_ids + self.idx_bo.tile([1, n_hyps]).reshape(
+                    [-1, 1])  # (BW,1)
+            ).reshape([-1])  # (BWO)
             # x_ shape (2, T, B*W, O)
             x_ = paddle.index_select(
-                self.x.view(2, -1, self.batch * self.odim), scoring_idx,
-                2).view(2, -1, n_bh, snum)
+                self.x.reshape([2, -1, self.batch * self.odim]), scoring_idx,
+                2).reshape([2, -1, n_bh, snum])
         else:
             scoring_ids = None
             scoring_idmap = None
             snum = self.odim
             # x_ shape (2, T, B*W, O)
-            x_ = self.x.unsqueeze(3).repeat(1, 1, 1, n_hyps, 1).view(2, -1,
-                                                                     n_bh, snum)
+            x_ = self.x.unsqueeze(3).tile([1, 1, 1, n_hyps, 1]).reshape(
+                [2, -1, n_bh, snum])
 
         # new CTC forward probs are prepared as a (T x 2 x BW x S) tensor
         # that corresponds to r_t^n(h) and r_t^b(h) in a batch.
@@ -128,10 +125,11 @@ class CTCPrefixScorePD():
             r[0, 0] = x_[0, 0]
 
         r_sum = paddle.logsumexp(r_prev, 1)  #(T,BW)
-        log_phi = r_sum.unsqueeze(2).repeat(1, 1, snum)  # (T, BW, O)
+        log_phi = r_sum.unsqueeze(2).tile([1, 1, snum])  # (T, BW, O)
         if scoring_ids is not None:
+            idmap = scoring_idmap.numpy()
             for idx in range(n_bh):
-                pos = scoring_idmap[idx, last_ids[idx]]
+                pos = int(idmap[idx, last_ids[idx]])
                 if pos >= 0:
                     log_phi[:, idx, pos] = r_prev[:, 1, idx]
         else:
@@ -141,8 +139,8 @@ class CTCPrefixScorePD():
         # decide start and end frames based on attention weights
         if att_w is not None and self.margin > 0:
             f_arg = paddle.matmul(att_w, self.frame_ids)
-            f_min = max(int(f_arg.min().cpu()), f_min_prev)
-            f_max = max(int(f_arg.max().cpu()), f_max_prev)
+            f_min = max(int(f_arg.min()), f_min_prev)
+            f_max = max(int(f_arg.max()), f_max_prev)
             start = min(f_max_prev, max(f_min - self.margin, output_length, 1))
             end = min(f_max + self.margin, self.input_length)
         else:
@@ -154,32 +152,26 @@ class CTCPrefixScorePD():
         # compute forward probabilities log(r_t^n(h)) and log(r_t^b(h))
         for t in range(start, end):
             rp = r[t - 1]  # (2 x BW x O')
-            rr = paddle.stack([rp[0], log_phi[t - 1], rp[0], rp[1]]).view(
-                2, 2, n_bh, snum)  # (2,2,BW,O')
+            rr = paddle.stack([rp[0], log_phi[t - 1], rp[0], rp[1]]).reshape(
+                [2, 2, n_bh, snum])  # (2,2,BW,O')
             r[t] = paddle.logsumexp(rr, 1) + x_[:, t]
 
         # compute log prefix probabilities log(psi)
         log_phi_x = paddle.concat(
             (log_phi[0].unsqueeze(0), log_phi[:-1]), axis=0) + x_[0]
+        log_psi = paddle.logsumexp(
+            paddle.concat(
+                (log_phi_x[start:end], r[start - 1, 0].unsqueeze(0)), axis=0),
+            axis=0, )
         if scoring_ids is not None:
-            log_psi = paddle.full(
-                (n_bh, self.odim), self.logzero, dtype=self.dtype)
-            log_psi_ = paddle.logsumexp(
-                paddle.concat(
-                    (log_phi_x[start:end], r[start - 1, 0].unsqueeze(0)),
-                    axis=0),
-                axis=0, )
-            for si in range(n_bh):
-                log_psi[si, scoring_ids[si]] = log_psi_[si]
-        else:
-            log_psi = paddle.logsumexp(
-                paddle.concat(
-                    (log_phi_x[start:end], r[start - 1, 0].unsqueeze(0)),
-                    axis=0),
-                axis=0, )
+            log_psi = paddle.put_along_axis(
+                paddle.full((n_bh, self.odim), self.logzero, dtype=self.dtype),
+                scoring_ids, log_psi, 1)
 
-        for si in range(n_bh):
-            log_psi[si, self.eos] = r_sum[self.end_frames[si // n_hyps], si]
+        end_frames = paddle.to_tensor(
+            [self.end_frames[si // n_hyps] for si in range(n_bh)])
+        log_psi[:, self.eos] = paddle.gather_nd(
+            r_sum, paddle.stack([end_frames, paddle.arange(n_bh)], axis=1))
 
         # exclude blank probs
         log_psi[:, self.blank] = self.logzero
@@ -198,24 +190,27 @@ class CTCPrefixScorePD():
         n_bh = len(s)
         n_hyps = n_bh // self.batch
         vidx = (best_ids + (self.idx_b *
-                            (n_hyps * self.odim)).view(-1, 1)).view(-1)
+                            (n_hyps * self.odim)).reshape([-1, 1])).reshape([-1])
         # select hypothesis scores
-        s_new = paddle.index_select(s.view(-1), vidx, 0)
-        s_new = s_new.view(-1, 1).repeat(1, self.odim).view(n_bh, self.odim)
+        s_new = paddle.index_select(s.reshape([-1]), vidx, 0)
+        s_new = s_new.reshape([-1, 1]).tile([1, self.odim]).reshape(
+            [n_bh, self.odim])
         # convert ids to BHS space (S: scoring_num)
         if scoring_idmap is not None:
             snum = self.scoring_num
             hyp_idx = (best_ids // self.odim +
-                       (self.idx_b * n_hyps).view(-1, 1)).view(-1)
-            label_ids = paddle.fmod(best_ids, self.odim).view(-1)
-            score_idx = scoring_idmap[hyp_idx, label_ids]
-            score_idx[score_idx == -1] = 0
+                       (self.idx_b * n_hyps).reshape([-1, 1])).reshape([-1])
+            label_ids = paddle.mod(best_ids, self.odim).reshape([-1])
+            score_idx = paddle.gather_nd(
+                scoring_idmap, paddle.stack([hyp_idx, label_ids], axis=1))
+            score_idx = paddle.where(score_idx == -1,
+                                     paddle.zeros_like(score_idx), score_idx)
             vidx = score_idx + hyp_idx * snum
         else:
             snum = self.odim
         # select forward probabilities
-        r_new = paddle.index_select(r.view(-1, 2, n_bh * snum), vidx, 2).view(
-            -1, 2, n_bh)
+        r_new = paddle.index_select(
+            r.reshape([-1, 2, n_bh * snum]), vidx, 2).reshape([-1, 2, n_bh])
         return r_new, s_new, f_min, f_max
 
     def extend_prob(self, x):
@@ -227,18 +222,18 @@ class CTCPrefixScorePD():
         if self.x.shape[1] < x.shape[1]:  # self.x (2,T,B,O); x (B,T,O)
             # Pad the rest of posteriors in the batch
             # TODO(takaaki-hori): need a better way without for-loops
-            xlens = [paddle.shape(x)[1]]
+            xlens = [x.shape[1]]
             for i, l in enumerate(xlens):
                 if l < self.input_length:
                     x[i, l:, :] = self.logzero
                     x[i, l:, self.blank] = 0
             tmp_x = self.x
             xn = x.transpose([1, 0, 2])  # (B, T, O) -> (T, B, O)
-            xb = xn[:, :, self.blank].unsqueeze(2).expand(-1, -1, self.odim)
+            xb = xn[:, :, self.blank].unsqueeze(2).expand([-1, -1, self.odim])
             self.x = paddle.stack([xn, xb])  # (2, T, B, O)
             self.x[:, :tmp_x.shape[1], :, :] = tmp_x
-            self.input_length = paddle.shape(x)[1]
-            self.end_frames = paddle.to_tensor(xlens) - 1
+            self.input_length = x.shape[1]
+            self.end_frames = [l - 1 for l in xlens]
 
     def extend_state(self, state):
         """Compute CTC prefix state.
@@ -107,7 +107,8 @@ class StreamDataLoader():
                  prefetch_factor: int=2,
                  dist_sampler: bool=False,
                  cmvn_file="data/mean_std.json",
-                 vocab_filepath='data/lang_char/vocab.txt'):
+                 vocab_filepath='data/lang_char/vocab.txt',
+                 batch_feature: bool=False):
         self.manifest_file = manifest_file
         self.train_model = train_mode
         self.batch_size = batch_size
@@ -157,6 +158,33 @@ class StreamDataLoader():
                 streamdata.split_by_worker,
                 streamdata.tarfile_to_samples(streamdata.reraise_exception))
 
+        if batch_feature:
+            # compute the features of a padded batch at once, rather than
+            # one sample at a time
+            sample_feature_stages = []
+            batch_feature_stages = [
+                streamdata.audio_batch_compute_fbank(
+                    num_mel_bins=num_mel_bins,
+                    frame_length=frame_length,
+                    frame_shift=frame_shift,
+                    dither=dither,
+                    sample_rate=resample_rate),
+                streamdata.audio_batch_spec_aug(**augment_conf)
+                if train_mode else streamdata.placeholder(),
+            ]
+        else:
+            sample_feature_stages = [
+                streamdata.audio_compute_fbank(
+                    num_mel_bins=num_mel_bins,
+                    frame_length=frame_length,
+                    frame_shift=frame_shift,
+                    dither=dither),
+                streamdata.audio_spec_aug(**augment_conf)
+                if train_mode else streamdata.placeholder(
+                ),  # num_t_mask=2, num_f_mask=2, max_t=40, max_f=30, max_w=80)
+            ]
+            batch_feature_stages = []
+
         self.dataset = base_dataset.append_list(
             streamdata.audio_tokenize(symbol_table),
             streamdata.audio_data_filter(
@@ -166,18 +194,12 @@ class StreamDataLoader():
                 token_max_length=maxlen_out,
                 token_min_length=minlen_out),
             streamdata.audio_resample(resample_rate=resample_rate),
-            streamdata.audio_compute_fbank(
-                num_mel_bins=num_mel_bins,
-                frame_length=frame_length,
-                frame_shift=frame_shift,
-                dither=dither),
-            streamdata.audio_spec_aug(**augment_conf)
-            if train_mode else streamdata.placeholder(
-            ),  # num_t_mask=2, num_f_mask=2, max_t=40, max_f=30, max_w=80)
+            *sample_feature_stages,
             streamdata.shuffle(shuffle_size),
             streamdata.sort(sort_size=sort_size),
             streamdata.batched(batch_size),
             streamdata.audio_padding(),
+            *batch_feature_stages,
             streamdata.audio_cmvn(cmvn_file))
 
         if paddle.__version__ >= '2.3.2':
@@ -395,7 +417,8 @@ class DataLoaderFactory():
                 prefetch_factor=config.prefetch_factor,
                 dist_sampler=config.dist_sampler,
                 cmvn_file=config.cmvn_file,
-                vocab_filepath=config.vocab_filepath, )
+                vocab_filepath=config.vocab_filepath,
+                batch_feature=config.get("batch_feature", False), )
         else:
             if mode == 'train':
                 config['manifest'] = config.train_manifest
@@ -17,7 +17,6 @@
 Unified Streaming and Non-streaming Two-pass End-to-end Model for Speech Recognition
 (https://arxiv.org/pdf/2012.05481.pdf)
 """
-import sys
 import time
 from collections import defaultdict
 from typing import Dict
@@ -50,9 +49,9 @@ from paddlespeech.s2t.modules.loss import LabelSmoothingLoss
 from paddlespeech.s2t.modules.mask import make_pad_mask
 from paddlespeech.s2t.modules.mask import mask_finished_preds
 from paddlespeech.s2t.modules.mask import mask_finished_scores
-from paddlespeech.s2t.modules.mask import subsequent_mask
 from paddlespeech.s2t.utils import checkpoint
 from paddlespeech.s2t.utils import layer_tools
+from paddlespeech.s2t.utils.ctc_utils import ctc_token_frames
 from paddlespeech.s2t.utils.ctc_utils import remove_duplicates_and_blank
 from paddlespeech.s2t.utils.log import Log
 from paddlespeech.s2t.utils.utility import log_add
@@ -219,7 +218,21 @@ class U2BaseModel(ASRInterface, nn.Layer):
         """
         # Let's assume B = batch_size
         # 1. Encoder
-        if simulate_streaming and decoding_chunk_size > 0:
+        if simulate_streaming and decoding_chunk_size > 0 and speech.shape[
+                0] > 1:
+            # streaming forward is done utterance by utterance
+            outputs = []
+            for i in range(speech.shape[0]):
+                encoder_out, _ = self.encoder.forward_chunk_by_chunk(
+                    speech[i:i + 1, :int(speech_lengths[i])],
+                    decoding_chunk_size=decoding_chunk_size,
+                    num_decoding_left_chunks=num_decoding_left_chunks)
+                outputs.append(encoder_out.squeeze(0))
+            encoder_out = pad_sequence(outputs, batch_first=True)
+            encoder_lens = paddle.to_tensor(
+                [output.shape[0] for output in outputs], dtype=paddle.int64)
+            encoder_mask = ~make_pad_mask(encoder_lens).unsqueeze(1)
+        elif simulate_streaming and decoding_chunk_size > 0:
             encoder_out, encoder_mask = self.encoder.forward_chunk_by_chunk(
                 speech,
                 decoding_chunk_size=decoding_chunk_size,
@@ -259,45 +272,59 @@ class U2BaseModel(ASRInterface, nn.Layer):
         """
         assert speech.shape[0] == speech_lengths.shape[0]
         assert decoding_chunk_size != 0
-        device = speech.place
-        batch_size = speech.shape[0]
 
-        # Let's assume B = batch_size and N = beam_size
         # 1. Encoder
         encoder_out, encoder_mask = self._forward_encoder(
             speech, speech_lengths, decoding_chunk_size,
             num_decoding_left_chunks,
             simulate_streaming)  # (B, maxlen, encoder_dim)
+        return self._recognize(encoder_out, encoder_mask, beam_size)
+
+    def _recognize(self,
+                   encoder_out: paddle.Tensor,
+                   encoder_mask: paddle.Tensor,
+                   beam_size: int=10) -> paddle.Tensor:
+        """ Apply beam search on attention decoder with the encoder output
+        Args:
+            encoder_out (paddle.Tensor): (batch, maxlen, encoder_dim)
+            encoder_mask (paddle.Tensor): (batch, 1, maxlen)
+            beam_size (int): beam size for beam search
+        Returns:
+            paddle.Tensor: decoding result, (batch, max_result_len)
+        """
+        batch_size = encoder_out.shape[0]
+
+        # Let's assume B = batch_size and N = beam_size
         maxlen = encoder_out.shape[1]
-        encoder_dim = encoder_out.shape[2]
         running_size = batch_size * beam_size
-        encoder_out = encoder_out.unsqueeze(1).repeat(1, beam_size, 1, 1).view(
-            running_size, maxlen, encoder_dim)  # (B*N, maxlen, encoder_dim)
-        encoder_mask = encoder_mask.unsqueeze(1).repeat(
-            1, beam_size, 1, 1).view(running_size, 1,
-                                     maxlen)  # (B*N, 1, max_len)
-
-        hyps = paddle.ones(
-            [running_size, 1], dtype=paddle.long).fill_(self.sos)  # (B*N, 1)
+        beam_index = paddle.arange(batch_size).unsqueeze(1).tile(
+            [1, beam_size]).reshape([-1])
+        encoder_out = paddle.index_select(
+            encoder_out, beam_index, axis=0)  # (B*N, maxlen, encoder_dim)
+        encoder_mask = paddle.index_select(
+            encoder_mask.astype(paddle.int32), beam_index,
+            axis=0).astype(paddle.bool)  # (B*N, 1, max_len)
+        # key and value of the encoder output are computed once
+        memory_kv = self.decoder.init_kv_cache(encoder_out)
+
+        hyps = paddle.full(
+            [running_size, 1], self.sos, dtype=paddle.int64)  # (B*N, 1)
         # log scale score
         scores = paddle.to_tensor(
-            [0.0] + [-float('inf')] * (beam_size - 1), dtype=paddle.float)
-        scores = scores.to(device).repeat(batch_size).unsqueeze(1).to(
-            device)  # (B*N, 1)
+            [0.0] + [-float('inf')] * (beam_size - 1), dtype=paddle.float32)
+        scores = scores.tile([batch_size]).unsqueeze(1)  # (B*N, 1)
         end_flag = paddle.zeros_like(scores, dtype=paddle.bool)  # (B*N, 1)
-        cache: Optional[List[paddle.Tensor]] = None
+        cache: Optional[paddle.Tensor] = None
         # 2. Decoder forward step by step
         for i in range(1, maxlen + 1):
             # Stop if all batch and all beam produce eos
             if end_flag.sum() == running_size:
                 break
 
-            # 2.1 Forward decoder step
-            hyps_mask = subsequent_mask(i).unsqueeze(0).repeat(
-                running_size, 1, 1).to(device)  # (B*N, i, i)
+            # 2.1 Forward decoder step, only the last token is computed
             # logp: (B*N, vocab)
-            logp, cache = self.decoder.forward_one_step(
-                encoder_out, encoder_mask, hyps, hyps_mask, cache)
+            logp, cache = self.decoder.forward_one_step_kv(
+                memory_kv, encoder_mask, hyps, cache)
             # 2.2 First beam prune: select topk best prob at current time
             top_k_logp, top_k_index = logp.topk(beam_size)  # (B*N, N)
             top_k_logp = mask_finished_scores(top_k_logp, end_flag)
@@ -305,38 +332,40 @@ class U2BaseModel(ASRInterface, nn.Layer):
 
             # 2.3 Seconde beam prune: select topk score with history
             scores = scores + top_k_logp  # (B*N, N), broadcast add
-            scores = scores.view(batch_size, beam_size * beam_size)  # (B, N*N)
+            scores = scores.reshape(
+                [batch_size, beam_size * beam_size])  # (B, N*N)
             scores, offset_k_index = scores.topk(k=beam_size)  # (B, N)
-            scores = scores.view(-1, 1)  # (B*N, 1)
+            scores = scores.reshape([-1, 1])  # (B*N, 1)
 
             # 2.4. Compute base index in top_k_index,
             # regard top_k_index as (B*N*N),regard offset_k_index as (B*N),
             # then find offset_k_index in top_k_index
-            base_k_index = paddle.arange(batch_size).view(-1, 1).repeat(
-                1, beam_size)  # (B, N)
+            base_k_index = beam_index.reshape([batch_size, beam_size])  # (B, N)
             base_k_index = base_k_index * beam_size * beam_size
-            best_k_index = base_k_index.view(-1) + offset_k_index.view(
-                -1)  # (B*N)
+            best_k_index = base_k_index.reshape([-1]) + offset_k_index.reshape(
+                [-1])  # (B*N)
 
             # 2.5 Update best hyps
             best_k_pred = paddle.index_select(
-                top_k_index.view(-1), index=best_k_index, axis=0)  # (B*N)
+                top_k_index.reshape([-1]), index=best_k_index, axis=0)  # (B*N)
             best_hyps_index = best_k_index // beam_size
             last_best_k_hyps = paddle.index_select(
                 hyps, index=best_hyps_index, axis=0)  # (B*N, i)
-            hyps = paddle.cat(
-                (last_best_k_hyps, best_k_pred.view(-1, 1)),
-                dim=1)  # (B*N, i+1)
+            hyps = paddle.concat(
+                (last_best_k_hyps, best_k_pred.reshape([-1, 1])),
+                axis=1)  # (B*N, i+1)
+            # reorder the self-attention cache of all the layers at once
+            cache = paddle.index_select(cache, index=best_hyps_index, axis=2)
 
             # 2.6 Update end flag
-            end_flag = paddle.equal(hyps[:, -1], self.eos).view(-1, 1)
+            end_flag = paddle.equal(hyps[:, -1], self.eos).reshape([-1, 1])
 
         # 3. Select best of best
-        scores = scores.view(batch_size, beam_size)
+        scores = scores.reshape([batch_size, beam_size])
         # TODO: length normalization
-        best_index = paddle.argmax(scores, axis=-1).long()  # (B)
+        best_index = paddle.argmax(scores, axis=-1)  # (B)
         best_hyps_index = best_index + paddle.arange(
-            batch_size, dtype=paddle.long) * beam_size
+            batch_size, dtype=paddle.int64) * beam_size
         best_hyps = paddle.index_select(hyps, index=best_hyps_index, axis=0)
         best_hyps = best_hyps[:, 1:]
         return best_hyps
@@ -365,7 +394,6 @@ class U2BaseModel(ASRInterface, nn.Layer):
         """
         assert speech.shape[0] == speech_lengths.shape[0]
         assert decoding_chunk_size != 0
-        batch_size = speech.shape[0]
 
         # Let's assume B = batch_size
         # encoder_out: (B, maxlen, encoder_dim)
@@ -374,12 +402,25 @@ class U2BaseModel(ASRInterface, nn.Layer):
         encoder_out, encoder_mask = self._forward_encoder(
             speech, speech_lengths, decoding_chunk_size,
             num_decoding_left_chunks, simulate_streaming)
+        return self._ctc_greedy_search(encoder_out, encoder_mask)
+
+    def _ctc_greedy_search(self,
+                           encoder_out: paddle.Tensor,
+                           encoder_mask: paddle.Tensor) -> List[List[int]]:
+        """ Apply CTC greedy search with the encoder output
+        Args:
+            encoder_out (paddle.Tensor): (batch, maxlen, encoder_dim)
+            encoder_mask (paddle.Tensor): (batch, 1, maxlen)
+        Returns:
+            List[List[int]]: best path result
+        """
+        batch_size = encoder_out.shape[0]
         maxlen = encoder_out.shape[1]
         encoder_out_lens = encoder_mask.squeeze(1).sum(1)
         ctc_probs = self.ctc.log_softmax(encoder_out)  # (B, maxlen, vocab_size)
 
         topk_prob, topk_index = ctc_probs.topk(1, axis=2)  # (B, maxlen, 1)
-        topk_index = topk_index.view(batch_size, maxlen)  # (B, maxlen)
+        topk_index = topk_index.reshape([batch_size, maxlen])  # (B, maxlen)
         pad_mask = make_pad_mask(encoder_out_lens)  # (B, maxlen)
         topk_index = topk_index.masked_fill_(pad_mask, self.eos)  # (B, maxlen)
 
@@ -413,11 +454,44 @@ class U2BaseModel(ASRInterface, nn.Layer):
             paddle.Tensor: encoder output, (1, max_len, encoder_dim),
                 it will be used for rescoring in attention rescoring mode
         """
+        # For CTC prefix beam search, we only support batch_size=1
+        assert speech.shape[0] == 1
+        batch_hyps, encoder_out, _ = self._batch_ctc_prefix_beam_search(
+            speech, speech_lengths, beam_size, decoding_chunk_size,
+            num_decoding_left_chunks, simulate_streaming, blank_id)
+        return batch_hyps[0], encoder_out
+
+    def _batch_ctc_prefix_beam_search(
+            self,
+            speech: paddle.Tensor,
+            speech_lengths: paddle.Tensor,
+            beam_size: int,
+            decoding_chunk_size: int=-1,
+            num_decoding_left_chunks: int=-1,
+            simulate_streaming: bool=False,
+            blank_id: int=0, ) -> Tuple[List[List[Tuple[int, float]]], paddle.
+                                        Tensor, paddle.Tensor]:
+        """ CTC prefix beam search of a batch, the encoder forwards the padded
+            batch at once, then each utterance is searched on its own frames.
+        Args:
+            speech (paddle.Tensor): (batch, max_len, feat_dim)
+            speech_length (paddle.Tensor): (batch, )
+            beam_size (int): beam size for beam search
+            decoding_chunk_size (int): decoding chunk for dynamic chunk
+                trained model.
+                <0: for decoding, use full chunk.
+                >0: for decoding, use fixed chunk size as set.
+                0: used for training, it's prohibited here
+            simulate_streaming (bool): whether do encoder forward in a
+                streaming fashion
+        Returns:
+            List[List[Tuple[int, float]]]: nbest results of each utterance, (B, N), (text, likelihood)
+            paddle.Tensor: encoder output, (B, max_len, encoder_dim),
+                it will be used for rescoring in attention rescoring mode
+            paddle.Tensor: encoder mask, (B, 1, max_len)
+        """
         assert speech.shape[0] == speech_lengths.shape[0]
         assert decoding_chunk_size != 0
-        batch_size = speech.shape[0]
-        # For CTC prefix beam search, we only support batch_size=1
-        assert batch_size == 1
 
         # Let's assume B = batch_size and N = beam_size
         # 1. Encoder forward and get CTC score
@@ -425,10 +499,29 @@ class U2BaseModel(ASRInterface, nn.Layer):
             speech, speech_lengths, decoding_chunk_size,
             num_decoding_left_chunks,
             simulate_streaming)  # (B, maxlen, encoder_dim)
-        maxlen = encoder_out.shape[1]
-        ctc_probs = self.ctc.log_softmax(encoder_out)  # (1, maxlen, vocab_size)
-        ctc_probs = ctc_probs.squeeze(0)
+        encoder_out_lens = encoder_mask.squeeze(1).sum(1).tolist()
+        ctc_probs = self.ctc.log_softmax(encoder_out)  # (B, maxlen, vocab_size)
 
+        batch_hyps = []
+        for i, maxlen in enumerate(encoder_out_lens):
+            batch_hyps.append(
+                self._ctc_prefix_beam_search_one(ctc_probs[i, :maxlen],
+                                                 beam_size, blank_id))
+        return batch_hyps, encoder_out, encoder_mask
+
+    def _ctc_prefix_beam_search_one(self,
+                                    ctc_probs: paddle.Tensor,
+                                    beam_size: int,
+                                    blank_id: int=0
+                                    ) -> List[Tuple[int, float]]:
+        """ CTC prefix beam search of one utterance
+        Args:
+            ctc_probs (paddle.Tensor): ctc log probs, (maxlen, vocab_size)
+            beam_size (int): beam size for beam search
+        Returns:
+            List[Tuple[int, float]]: nbest results, (N,1), (text, likelihood)
+        """
+        maxlen = ctc_probs.shape[0]
         # cur_hyps: (prefix, (blank_ending_score, none_blank_ending_score))
         # blank_ending_score and  none_blank_ending_score in ln domain
         cur_hyps = [(tuple(), (0.0, -float('inf')))]
@@ -472,7 +565,7 @@ class U2BaseModel(ASRInterface, nn.Layer):
             cur_hyps = next_hyps[:beam_size]
 
         hyps = [(y[0], log_add([y[1][0], y[1][1]])) for y in cur_hyps]
-        return hyps, encoder_out
+        return hyps
 
     def ctc_prefix_beam_search(
             self,
@@ -529,21 +622,67 @@ class U2BaseModel(ASRInterface, nn.Layer):
         Returns:
             List[int]: Attention rescoring result
         """
+        # For attention rescoring we only support batch_size=1
+        assert speech.shape[0] == 1
+        return self._batch_attention_rescoring(
+            speech,
+            speech_lengths,
+            beam_size,
+            decoding_chunk_size=decoding_chunk_size,
+            num_decoding_left_chunks=num_decoding_left_chunks,
+            ctc_weight=ctc_weight,
+            simulate_streaming=simulate_streaming,
+            reverse_weight=reverse_weight)[0][0]
+
+    def _batch_attention_rescoring(self,
+                                   speech: paddle.Tensor,
+                                   speech_lengths: paddle.Tensor,
+                                   beam_size: int,
+                                   decoding_chunk_size: int=-1,
+                                   num_decoding_left_chunks: int=-1,
+                                   ctc_weight: float=0.0,
+                                   simulate_streaming: bool=False,
+                                   reverse_weight: float=0.0
+                                   ) -> Tuple[List[List[int]], paddle.Tensor,
+                                              paddle.Tensor]:
+        """ Attention rescoring of a batch, the nbest of all the utterances
+            are rescored together with one attention decoder forward.
+        Args:
+            speech (paddle.Tensor): (batch, max_len, feat_dim)
+            speech_length (paddle.Tensor): (batch, )
+            beam_size (int): beam size for beam search
+            decoding_chunk_size (int): decoding chunk for dynamic chunk
+                trained model.
+                <0: for decoding, use full chunk.
+                >0: for decoding, use fixed chunk size as set.
+                0: used for training, it's prohibited here
+            simulate_streaming (bool): whether do encoder forward in a
+                streaming fashion
+            reverse_weight (float): reverse deocder weight.
+        Returns:
+            List[List[int]]: Attention rescoring result of each utterance
+            paddle.Tensor: encoder output, (B, max_len, encoder_dim)
+            paddle.Tensor: encoder mask, (B, 1, max_len)
+        """
         assert speech.shape[0] == speech_lengths.shape[0]
         assert decoding_chunk_size != 0
         if reverse_weight > 0.0:
             # decoder should be a bitransformer decoder if reverse_weight > 0.0
             assert hasattr(self.decoder, 'right_decoder')
         device = speech.place
-        batch_size = speech.shape[0]
-        # For attention rescoring we only support batch_size=1
-        assert batch_size == 1
 
-        # len(hyps) = beam_size, encoder_out: (1, maxlen, encoder_dim)
-        hyps, encoder_out = self._ctc_prefix_beam_search(
+        # len(batch_hyps) = batch_size, len(batch_hyps[i]) <= beam_size
+        # encoder_out: (B, maxlen, encoder_dim), encoder_mask: (B, 1, maxlen)
+        batch_hyps, encoder_out, encoder_mask = self._batch_ctc_prefix_beam_search(
             speech, speech_lengths, beam_size, decoding_chunk_size,
             num_decoding_left_chunks, simulate_streaming)
-        assert len(hyps) == beam_size
+
+        # all the nbest of all the utterances, (sum(N),)
+        hyps = [hyp for nbest in batch_hyps for hyp in nbest]
+        utt_index = paddle.to_tensor(
+            [i for i, nbest in enumerate(batch_hyps) for _ in nbest],
+            place=device,
+            dtype=paddle.long)
 
         hyp_list = []
         for hyp in hyps:
@@ -557,56 +696,68 @@ class U2BaseModel(ASRInterface, nn.Layer):
         hyps_pad = pad_sequence(hyp_list, True, self.ignore_id)
         hyps_lens = paddle.to_tensor(
             [len(hyp[0]) for hyp in hyps], place=device,
-            dtype=paddle.long)  # (beam_size,)
+            dtype=paddle.long)  # (sum(N),)
         hyps_pad, _ = add_sos_eos(hyps_pad, self.sos, self.eos, self.ignore_id)
         hyps_lens = hyps_lens + 1  # Add <sos> at beginning
         logger.debug(
             f"hyps pad: {hyps_pad} {self.sos} {self.eos} {self.ignore_id}")
 
         # ctc score in ln domain
-        # (beam_size, max_hyps_len, vocab_size)
-        decoder_out, r_decoder_out = self.forward_attention_decoder(
-            hyps_pad, hyps_lens, encoder_out, reverse_weight)
+        # (sum(N), max_hyps_len, vocab_size)
+        decoder_out, r_decoder_out = self._forward_attention_decoder(
+            hyps_pad, hyps_lens,
+            paddle.index_select(encoder_out, utt_index, axis=0),
+            paddle.index_select(
+                encoder_mask.astype(paddle.int32), utt_index,
+                axis=0).astype(paddle.bool),
+            reverse_weight)
 
         decoder_out = decoder_out.numpy()
         # r_decoder_out will be 0.0, if reverse_weight is 0.0 or decoder is a
         # conventional transformer decoder.
         r_decoder_out = r_decoder_out.numpy()
 
-        # Only use decoder score for rescoring
-        best_score = -float('inf')
-        best_index = 0
-        # hyps is List[(Text=List[int], Score=float)], len(hyps)=beam_size
-        for i, hyp in enumerate(hyps):
-            score = 0.0
-            for j, w in enumerate(hyp[0]):
-                score += decoder_out[i][j][w]
-            # last decoder output token is `eos`, for laste decoder input token.
-            score += decoder_out[i][len(hyp[0])][self.eos]
-
-            logger.debug(
-                f"hyp {i} len {len(hyp[0])} l2r score: {score} ctc_score: {hyp[1]} reverse_weight: {reverse_weight}"
-            )
-
-            if reverse_weight > 0:
-                r_score = 0.0
+        results = []
+        offset = 0
+        for nbest in batch_hyps:
+            # Only use decoder score for rescoring
+            best_score = -float('inf')
+            best_index = 0
+            # hyps is List[(Text=List[int], Score=float)], len(hyps)=beam_size
+            for i, hyp in enumerate(nbest):
+                score = 0.0
                 for j, w in enumerate(hyp[0]):
-                    r_score += r_decoder_out[i][len(hyp[0]) - j - 1][w]
-                r_score += r_decoder_out[i][len(hyp[0])][self.eos]
+                    score += decoder_out[offset + i][j][w]
+                # last decoder output token is `eos`, for laste decoder input token.
+                score += decoder_out[offset + i][len(hyp[0])][self.eos]
 
                 logger.debug(
-                    f"hyp {i} len {len(hyp[0])} r2l score: {r_score} ctc_score: {hyp[1]} reverse_weight: {reverse_weight}"
+                    f"hyp {i} len {len(hyp[0])} l2r score: {score} ctc_score: {hyp[1]} reverse_weight: {reverse_weight}"
                 )
 
-                score = score * (1 - reverse_weight) + r_score * reverse_weight
-            # add ctc score (which in ln domain)
-            score += hyp[1] * ctc_weight
-            if score > best_score:
-                best_score = score
-                best_index = i
-
-        logger.debug(f"result: {hyps[best_index]}")
-        return hyps[best_index][0]
+                if reverse_weight > 0:
+                    r_score = 0.0
+                    for j, w in enumerate(hyp[0]):
+                        r_score += r_decoder_out[offset + i][len(hyp[0]) - j -
+                                                             1][w]
+                    r_score += r_decoder_out[offset + i][len(hyp[0])][self.eos]
+
+                    logger.debug(
+                        f"hyp {i} len {len(hyp[0])} r2l score: {r_score} ctc_score: {hyp[1]} reverse_weight: {reverse_weight}"
+                    )
+
+                    score = score * (1 - reverse_weight
+                                     ) + r_score * reverse_weight
+                # add ctc score (which in ln domain)
+                score += hyp[1] * ctc_weight
+                if score > best_score:
+                    best_score = score
+                    best_index = i
+
+            logger.debug(f"result: {nbest[best_index]}")
+            results.append(nbest[best_index][0])
+            offset += len(nbest)
+        return results, encoder_out, encoder_mask
 
     @jit.to_static(property=True)
     def subsampling_rate(self) -> int:
@@ -721,7 +872,28 @@ class U2BaseModel(ASRInterface, nn.Layer):
         # (B, 1, T)
         encoder_mask = paddle.ones(
             [num_hyps, 1, encoder_out.shape[1]], dtype=paddle.bool)
+        return self._forward_attention_decoder(hyps, hyps_lens, encoder_out,
+                                               encoder_mask, reverse_weight)
 
+    def _forward_attention_decoder(
+            self,
+            hyps: paddle.Tensor,
+            hyps_lens: paddle.Tensor,
+            encoder_out: paddle.Tensor,
+            encoder_mask: paddle.Tensor,
+            reverse_weight: float=0.0) -> Tuple[paddle.Tensor, paddle.Tensor]:
+        """ Forward decoder with multiple hypothesis, each of which has its
+            own encoder output
+        Args:
+            hyps (paddle.Tensor): hyps from ctc prefix beam search, already
+                pad sos at the beginning, (B, T)
+            hyps_lens (paddle.Tensor): length of each hyp in hyps, (B)
+            encoder_out (paddle.Tensor): encoder output of each hyp, (B, T, D)
+            encoder_mask (paddle.Tensor): encoder output mask, (B, 1, T)
+        Returns:
+            paddle.Tensor: decoder output, (B, L, vocab_size)
+            paddle.Tensor: right to left decoder output, (B, L, vocab_size)
+        """
         # input for right to left decoder
         # this hyps_lens has count <sos> token, we need minus it.
         r_hyps_lens = hyps_lens - 1
@@ -776,46 +948,97 @@ class U2BaseModel(ASRInterface, nn.Layer):
         Returns:
             List[List[int]]: transcripts.
         """
-        batch_size = feats.shape[0]
-        if decoding_method in ['ctc_prefix_beam_search',
-                               'attention_rescoring'] and batch_size > 1:
-            logger.error(
-                f'decoding mode {decoding_method} must be running with batch_size == 1'
-            )
-            logger.error(f"current batch_size is {batch_size}")
-            sys.exit(1)
+        hyps, _, _ = self._decode(
+            feats, feats_lengths, decoding_method, beam_size, ctc_weight,
+            decoding_chunk_size, num_decoding_left_chunks, simulate_streaming,
+            reverse_weight)
+        res = [text_feature.defeaturize(hyp) for hyp in hyps]
+        res_tokenids = [hyp for hyp in hyps]
+        return res, res_tokenids
+
+    def decode_with_time_stamps(self,
+                                feats: paddle.Tensor,
+                                feats_lengths: paddle.Tensor,
+                                text_feature: Dict[str, int],
+                                decoding_method: str,
+                                beam_size: int,
+                                ctc_weight: float=0.0,
+                                decoding_chunk_size: int=-1,
+                                num_decoding_left_chunks: int=-1,
+                                simulate_streaming: bool=False,
+                                reverse_weight: float=0.0):
+        """u2 decoding, with the encoder frame of each token.
+
+        The frames are the first frame of each token in the best ctc alignment
+        of the result, computed on the same encoder output as the decoding.
+        The args are the same as `decode`.
+
+        Returns:
+            List[str]: transcripts.
+            List[List[int]]: token ids of the transcripts, which end before the
+                first `eos`.
+            List[List[int]]: encoder frame index of each token.
+        """
+        hyps, encoder_out, encoder_mask = self._decode(
+            feats, feats_lengths, decoding_method, beam_size, ctc_weight,
+            decoding_chunk_size, num_decoding_left_chunks, simulate_streaming,
+            reverse_weight)
+        encoder_out_lens = encoder_mask.squeeze(1).sum(1).tolist()
+        ctc_probs = self.ctc.log_softmax(encoder_out).numpy()
+
+        res, res_tokenids, res_frames = [], [], []
+        for i, hyp in enumerate(hyps):
+            hyp = list(hyp)
+            if self.eos in hyp:
+                hyp = hyp[:hyp.index(self.eos)]
+            res.append(text_feature.defeaturize(hyp))
+            res_tokenids.append(hyp)
+            res_frames.append(
+                ctc_token_frames(ctc_probs[i, :encoder_out_lens[i]], hyp,
+                                 self.ctc.blank_id))
+        return res, res_tokenids, res_frames
+
+    def _decode(self,
+                feats: paddle.Tensor,
+                feats_lengths: paddle.Tensor,
+                decoding_method: str,
+                beam_size: int,
+                ctc_weight: float=0.0,
+                decoding_chunk_size: int=-1,
+                num_decoding_left_chunks: int=-1,
+                simulate_streaming: bool=False,
+                reverse_weight: float=0.0
+                ) -> Tuple[List[List[int]], paddle.Tensor, paddle.Tensor]:
+        """Decode the token ids, see `decode`.
+
+        Returns:
+            List[List[int]]: token ids of each utterance.
+            paddle.Tensor: encoder output, (B, max_len, encoder_dim)
+            paddle.Tensor: encoder mask, (B, 1, max_len)
+        """
+        assert decoding_chunk_size != 0
         if decoding_method == 'attention':
-            hyps = self.recognize(
-                feats,
-                feats_lengths,
-                beam_size=beam_size,
-                decoding_chunk_size=decoding_chunk_size,
-                num_decoding_left_chunks=num_decoding_left_chunks,
-                simulate_streaming=simulate_streaming)
+            encoder_out, encoder_mask = self._forward_encoder(
+                feats, feats_lengths, decoding_chunk_size,
+                num_decoding_left_chunks, simulate_streaming)
+            hyps = self._recognize(encoder_out, encoder_mask, beam_size)
             hyps = [hyp.tolist() for hyp in hyps]
         elif decoding_method == 'ctc_greedy_search':
-            hyps = self.ctc_greedy_search(
-                feats,
-                feats_lengths,
-                decoding_chunk_size=decoding_chunk_size,
-                num_decoding_left_chunks=num_decoding_left_chunks,
-                simulate_streaming=simulate_streaming)
-        # ctc_prefix_beam_search and attention_rescoring only return one
-        # result in List[int], change it to List[List[int]] for compatible
-        # with other batch decoding mode
+            encoder_out, encoder_mask = self._forward_encoder(
+                feats, feats_lengths, decoding_chunk_size,
+                num_decoding_left_chunks, simulate_streaming)
+            hyps = self._ctc_greedy_search(encoder_out, encoder_mask)
         elif decoding_method == 'ctc_prefix_beam_search':
-            assert feats.shape[0] == 1
-            hyp = self.ctc_prefix_beam_search(
+            batch_hyps, encoder_out, encoder_mask = self._batch_ctc_prefix_beam_search(
                 feats,
                 feats_lengths,
                 beam_size,
                 decoding_chunk_size=decoding_chunk_size,
                 num_decoding_left_chunks=num_decoding_left_chunks,
                 simulate_streaming=simulate_streaming)
-            hyps = [hyp]
+            hyps = [nbest[0][0] for nbest in batch_hyps]
         elif decoding_method == 'attention_rescoring':
-            assert feats.shape[0] == 1
-            hyp = self.attention_rescoring(
+            hyps, encoder_out, encoder_mask = self._batch_attention_rescoring(
                 feats,
                 feats_lengths,
                 beam_size,
@@ -824,13 +1047,9 @@ class U2BaseModel(ASRInterface, nn.Layer):
                 ctc_weight=ctc_weight,
                 simulate_streaming=simulate_streaming,
                 reverse_weight=reverse_weight)
-            hyps = [hyp]
         else:
             raise ValueError(f"Not support decoding method: {decoding_method}")
-
-        res = [text_feature.defeaturize(hyp) for hyp in hyps]
-        res_tokenids = [hyp for hyp in hyps]
-        return res, res_tokenids
+        return hyps, encoder_out, encoder_mask
 
 
 class U2DecodeModel(U2BaseModel):
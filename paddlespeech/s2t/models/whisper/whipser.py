@@ -90,36 +90,57 @@ class MultiHeadAttention(nn.Layer):
         if kv_cache is None or xa is None or self.key not in kv_cache:
             # hooks, if installed (i.e. kv_cache is not None), will prepend the cached kv tensors;
             # otherwise, perform key/value projections for self- or cross-attention as usual.
-            k = self.key(x if xa is None else xa)
-            v = self.value(x if xa is None else xa)
+            k = self.split_heads(self.key(x if xa is None else xa))
+            v = self.split_heads(self.value(x if xa is None else xa))
+            if kv_cache is not None and xa is not None:
+                # cache the keys and values of cross-attention with the heads split
+                kv_cache[self.key] = k
+                kv_cache[self.value] = v
         else:
             # for cross-attention, calculate keys and values once and reuse in subsequent calls.
             k = kv_cache[self.key]
             v = kv_cache[self.value]
 
-        wv = self.qkv_attention(q, k, v, mask)
+        wv = self.qkv_attention(self.split_heads(q), k, v, mask)
         return self.out(wv)
 
+    def split_heads(self, x: paddle.Tensor) -> paddle.Tensor:
+        """
+        x : paddle.Tensor, shape = (n_batch, n_ctx, n_state)
+
+        Returns a contiguous tensor of shape (n_batch, n_head, n_ctx, n_state // n_head)
+        """
+        n_batch, n_ctx, _ = x.shape
+        x = paddle.transpose(
+            x.reshape([n_batch, n_ctx, self.n_head, -1]), (0, 2, 1, 3))
+        # the 3-D reshape copies the transposed tensor once, so the 3-D reshapes
+        # in qkv_attention, e.g. of the cached cross-attention keys, are free
+        return x.reshape([n_batch * self.n_head, n_ctx, -1]).reshape(
+            [n_batch, self.n_head, n_ctx, -1])
+
     def qkv_attention(self,
                       q: paddle.Tensor,
                       k: paddle.Tensor,
                       v: paddle.Tensor,
                       mask: Optional[paddle.Tensor]=None):
-        n_batch, n_ctx, n_state = q.shape
-        scale = (n_state // self.n_head)**-0.25
-        q = paddle.transpose(
-            q.view(*q.shape[:2], self.n_head, -1), (0, 2, 1, 3)) * scale
-        k = paddle.transpose(
-            k.view(*k.shape[:2], self.n_head, -1), (0, 2, 3, 1)) * scale
-        v = paddle.transpose(
-            v.view(*v.shape[:2], self.n_head, -1), (0, 2, 1, 3))
-
-        qk = q @ k
+        """
+        q, k, v : paddle.Tensor, shape = (n_batch, n_head, *, n_state // n_head)
+            the queries, keys and values with the heads split by `split_heads`
+        """
+        n_batch, n_head, n_ctx, d_head = q.shape
+        # the 3-D batched matmul is much faster than the 4-D one, and scaling q by
+        # d_head**-0.5 equals scaling both q and k by d_head**-0.25
+        q = q.reshape([n_batch * n_head, n_ctx, d_head]) * d_head**-0.5
+        k = k.reshape([n_batch * n_head, -1, d_head])
+        v = v.reshape([n_batch * n_head, -1, d_head])
+
+        qk = paddle.matmul(q, k, transpose_y=True)
         if mask is not None:
             qk = qk + mask[:n_ctx, :n_ctx]
 
         w = F.softmax(qk.float(), axis=-1).to(q.dtype)
-        return paddle.transpose((w @ v), (0, 2, 1, 3)).flatten(start_axis=2)
+        wv = (w @ v).reshape([n_batch, n_head, n_ctx, d_head])
+        return paddle.transpose(wv, (0, 2, 1, 3)).flatten(start_axis=2)
 
 
 class ResidualAttentionBlock(nn.Layer):
@@ -388,7 +409,8 @@ def detect_language(
         mel = mel.unsqueeze(0)
 
     # skip encoder forward pass if already-encoded audio features were given
-    if mel.shape[-2:] != (model.dims.n_audio_ctx, model.dims.n_audio_state):
+    if tuple(mel.shape[-2:]) != (model.dims.n_audio_ctx,
+                                 model.dims.n_audio_state):
         mel = model.encoder(mel)
 
     # forward pass using a single token, startoftranscript
@@ -415,6 +437,62 @@ def detect_language(
     return language_tokens, language_probs
 
 
+def _set_language(model: "Whisper",
+                  mel: paddle.Tensor,
+                  resource_path: str,
+                  verbose: Optional[bool],
+                  decode_options: dict) -> str:
+    """Set the language of `decode_options`, which is detected from the first
+    30 seconds of `mel` if not given, and return it.
+    """
+    dtype = np.float32  #paddle only support float32
+
+    if dtype == np.float32:
+        decode_options["fp16"] = False
+
+    if decode_options.get(
+            "language") == 'None' or decode_options.get("language", None) is None:
+        if not model.is_multilingual:
+            decode_options["language"] = "en"
+        else:
+            if verbose:
+                print(
+                    "Detecting language using up to the first 30 seconds. Use `--language` to specify the language"
+                )
+            segment = pad_or_trim(mel, N_FRAMES)
+            _, probs = model.detect_language(segment, resource_path)
+            decode_options["language"] = max(probs, key=probs.get)
+            if verbose is not None:
+                print(
+                    f"Detected language: {LANGUAGES[decode_options['language']].title()}"
+                )
+
+    return decode_options["language"]
+
+
+def _decoding_options(decode_options: dict,
+                      temperature: float) -> DecodingOptions:
+    kwargs = {**decode_options}
+    if temperature > 0:
+        # disable beam_size and patience when t > 0
+        kwargs.pop("beam_size", None)
+        kwargs.pop("patience", None)
+    else:
+        # disable best_of when t == 0
+        kwargs.pop("best_of", None)
+    return DecodingOptions(**kwargs, temperature=temperature)
+
+
+def _needs_fallback(result: DecodingResult,
+                    compression_ratio_threshold: Optional[float],
+                    logprob_threshold: Optional[float]) -> bool:
+    if compression_ratio_threshold is not None and result.compression_ratio > compression_ratio_threshold:
+        return True  # too repetitive
+    if logprob_threshold is not None and result.avg_logprob < logprob_threshold:
+        return True  # average log probability is too low
+    return False
+
+
 def transcribe(
         model: "Whisper",
         mel: paddle.Tensor,
@@ -470,29 +548,8 @@ def transcribe(
     A dictionary containing the resulting text ("text") and segment-level details ("segments"), and
     the spoken language ("language"), which is detected when `decode_options["language"]` is None.
     """
-    dtype = np.float32  #paddle only support float32
-
-    if dtype == np.float32:
-        decode_options["fp16"] = False
-
-    if decode_options.get(
-            "language") == 'None' or decode_options.get("language", None) is None:
-        if not model.is_multilingual:
-            decode_options["language"] = "en"
-        else:
-            if verbose:
-                print(
-                    "Detecting language using up to the first 30 seconds. Use `--language` to specify the language"
-                )
-            segment = pad_or_trim(mel, N_FRAMES)
-            _, probs = model.detect_language(segment, resource_path)
-            decode_options["language"] = max(probs, key=probs.get)
-            if verbose is not None:
-                print(
-                    f"Detected language: {LANGUAGES[decode_options['language']].title()}"
-                )
-
-    language = decode_options["language"]
+    language = _set_language(model, mel, resource_path, verbose,
+                             decode_options)
     task = decode_options.get("task", "transcribe")
     tokenizer = get_tokenizer(
         model.is_multilingual,
@@ -506,25 +563,11 @@ def transcribe(
         decode_result = None
 
         for t in temperatures:
-            kwargs = {**decode_options}
-            if t > 0:
-                # disable beam_size and patience when t > 0
-                kwargs.pop("beam_size", None)
-                kwargs.pop("patience", None)
-            else:
-                # disable best_of when t == 0
-                kwargs.pop("best_of", None)
-
-            options = DecodingOptions(**kwargs, temperature=t)
+            options = _decoding_options(decode_options, t)
             decode_result = model.decode(segment, options, resource_path)
 
-            needs_fallback = False
-            if compression_ratio_threshold is not None and decode_result.compression_ratio > compression_ratio_threshold:
-                needs_fallback = True  # too repetitive
-            if logprob_threshold is not None and decode_result.avg_logprob < logprob_threshold:
-                needs_fallback = True  # average log probability is too low
-
-            if not needs_fallback:
+            if not _needs_fallback(decode_result, compression_ratio_threshold,
+                                   logprob_threshold):
                 break
 
         return decode_result
@@ -661,6 +704,257 @@ def transcribe(
         language=language)
 
 
+def split_windows(mel: paddle.Tensor,
+                  search_frames: int=0) -> List[Tuple[int, int]]:
+    """
+    Cut the Mel spectrogram into windows of at most 30 seconds up front, so they
+    can be decoded in batch.
+
+    Parameters
+    ----------
+    mel: paddle.Tensor, shape = (80, n_frames)
+        The Mel spectrogram of the whole audio
+
+    search_frames: int
+        Each window ends at the quietest frame of its last `search_frames` frames, a cheap
+        voice activity detection so that the windows are not cut in the middle of a word.
+        If 0, the windows have a fixed stride of 30 seconds.
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        The begin and end frames of the windows
+    """
+    assert 0 <= search_frames < N_FRAMES, \
+        f"search_frames should be in [0, {N_FRAMES}), but got {search_frames}"
+    num_frames = mel.shape[-1]
+    energy = None
+    if search_frames > 0 and num_frames > N_FRAMES:
+        # mean log-Mel energy of each frame, smoothed over 0.1 second
+        energy = np.convolve(
+            mel.mean(axis=0).numpy(), np.ones(10) / 10, mode="same")
+
+    windows = []
+    begin = 0
+    while num_frames - begin > N_FRAMES:
+        end = begin + N_FRAMES
+        if energy is not None:
+            search_begin = end - search_frames
+            end = search_begin + int(np.argmin(energy[search_begin:end]))
+        windows.append((begin, end))
+        begin = end
+    if begin < num_frames:
+        windows.append((begin, num_frames))
+    return windows
+
+
+def _window_segments(tokens: List[int],
+                     tokenizer: Tokenizer,
+                     begin: float,
+                     end: float,
+                     time_precision: float) -> List[Tuple[float, float, List[
+        int]]]:
+    """Split the tokens decoded from a window into (start, end, text tokens) by
+    the timestamp tokens. Unlike `transcribe`, the next window does not start
+    at the last timestamp, so the text after it is kept till the window end.
+    """
+    timestamp_begin = tokenizer.timestamp_begin
+
+    def timestamp(token):
+        return min(begin + (token - timestamp_begin) * time_precision, end)
+
+    is_timestamp = [token >= timestamp_begin for token in tokens]
+    # two consecutive timestamp tokens end a segment and start the next one
+    slices = [
+        i + 1 for i in range(len(tokens) - 1)
+        if is_timestamp[i] and is_timestamp[i + 1]
+    ] + [len(tokens)]
+
+    segments = []
+    last_slice = 0
+    for current_slice in slices:
+        sliced_tokens = tokens[last_slice:current_slice]
+        text_tokens = [
+            token for token in sliced_tokens if token < tokenizer.eot
+        ]
+        if text_tokens:
+            start = timestamp(sliced_tokens[0]) if is_timestamp[
+                last_slice] else begin
+            stop = timestamp(sliced_tokens[-1]) if len(
+                sliced_tokens) > 1 and is_timestamp[current_slice -
+                                                    1] else end
+            segments.append((start, stop, text_tokens))
+        last_slice = current_slice
+    return segments
+
+
+def batch_transcribe(
+        model: "Whisper",
+        mel: paddle.Tensor,
+        resource_path: str,
+        *,
+        batch_size: int=8,
+        boundary_search: float=5.0,
+        verbose: Optional[bool]=None,
+        temperature: Union[float, Tuple[float, ...]]=(0.0, 0.2, 0.4, 0.6, 0.8,
+                                                      1.0),
+        compression_ratio_threshold: Optional[float]=2.4,
+        logprob_threshold: Optional[float]=-1.0,
+        no_speech_threshold: Optional[float]=0.6,
+        **decode_options, ):
+    """
+    Transcribe a long audio using Whisper, decoding a batch of 30-second windows at once
+
+    Unlike `transcribe`, the windows are cut up front by `split_windows` instead of at the last
+    timestamp of the previous window, and the previous text is not used as the prompt, so the
+    windows are independent. The temperature fallback only decodes again the windows which fail,
+    from their encoded audio features.
+
+    Parameters
+    ----------
+    model: Whisper
+        The Whisper model instance
+
+    mel: paddle.Tensor
+        The audio feature
+
+    batch_size: int
+        The number of windows decoded at once
+
+    boundary_search: float
+        Seconds at the end of each window to search for the quietest frame to cut the window at,
+        0 for a fixed stride of 30 seconds
+
+    verbose: bool
+        Whether to display the text being decoded to the console. If True, displays all the details,
+        If False, displays minimal details. If None, does not display anything
+
+    temperature: Union[float, Tuple[float, ...]]
+        Temperature for sampling. It can be a tuple of temperatures, which will be successfully used
+        upon failures according to either `compression_ratio_threshold` or `logprob_threshold`.
+
+    compression_ratio_threshold: float
+        If the gzip compression ratio is above this value, treat as failed
+
+    logprob_threshold: float
+        If the average log probability over sampled tokens is below this value, treat as failed
+
+    no_speech_threshold: float
+        If the no_speech probability is higher than this value AND the average log probability
+        over sampled tokens is below `logprob_threshold`, consider the segment as silent
+
+    decode_options: dict
+        Keyword arguments to construct `DecodingOptions` instances, `initial_prompt` is the prompt
+        of every window
+
+    Returns
+    -------
+    A dictionary containing the resulting text ("text") and segment-level details ("segments"), and
+    the spoken language ("language"), which is detected when `decode_options["language"]` is None.
+    """
+    language = _set_language(model, mel, resource_path, verbose,
+                             decode_options)
+    task = decode_options.get("task", "transcribe")
+    tokenizer = get_tokenizer(
+        model.is_multilingual,
+        resource_path=resource_path,
+        language=language,
+        task=task)
+
+    temperatures = [temperature] if isinstance(temperature, (
+        int, float)) else temperature
+    input_stride = utils.exact_div(
+        N_FRAMES, model.dims.n_audio_ctx)  # mel frames per output token: 2
+    time_precision = (input_stride * HOP_LENGTH /
+                      SAMPLE_RATE)  # time per output token: 0.02 (seconds)
+    frame_time = HOP_LENGTH / SAMPLE_RATE
+
+    initial_prompt = decode_options.pop("initial_prompt", None) or []
+    if initial_prompt:
+        initial_prompt = tokenizer.encode(" " +
+                                          initial_prompt.strip()).input_ids
+    decode_options["prompt"] = initial_prompt
+
+    windows = split_windows(
+        mel, int(boundary_search * SAMPLE_RATE / HOP_LENGTH))
+    all_tokens = []
+    all_segments = []
+
+    # show the progress bar when verbose is False (otherwise the transcribed text will be printed)
+    with tqdm.tqdm(
+            total=mel.shape[-1], unit='frames',
+            disable=verbose is not False) as pbar:
+        for i in range(0, len(windows), batch_size):
+            batch_windows = windows[i:i + batch_size]
+            inputs = paddle.stack([
+                pad_or_trim(mel[:, begin:end], N_FRAMES)
+                for begin, end in batch_windows
+            ])
+
+            # decode the windows which need fallback again at the next temperature
+            results: List[DecodingResult] = [None] * len(batch_windows)
+            pending = list(range(len(batch_windows)))
+            for t in temperatures:
+                options = _decoding_options(decode_options, t)
+                failed = []
+                for j, result in zip(pending,
+                                     model.decode(inputs, options,
+                                                  resource_path)):
+                    results[j] = result
+                    if _needs_fallback(result, compression_ratio_threshold,
+                                       logprob_threshold):
+                        failed.append(j)
+                if not failed:
+                    break
+                pending = failed
+                # reuse the encoded audio features
+                inputs = paddle.stack(
+                    [results[j].audio_features for j in pending])
+
+            for (begin, end), result in zip(batch_windows, results):
+                if no_speech_threshold is not None:
+                    # no voice activity check
+                    should_skip = result.no_speech_prob > no_speech_threshold
+                    if logprob_threshold is not None and result.avg_logprob > logprob_threshold:
+                        # don't skip if the logprob is high enough, despite the no_speech_prob
+                        should_skip = False
+                    if should_skip:
+                        continue
+
+                all_tokens.extend(
+                    [token for token in result.tokens if token < tokenizer.eot])
+                for start, stop, text_tokens in _window_segments(
+                        result.tokens, tokenizer, begin * frame_time,
+                        end * frame_time, time_precision):
+                    text = tokenizer.decode(text_tokens)
+                    if len(text.strip()) == 0:  # skip empty text output
+                        continue
+                    all_segments.append({
+                        "id": len(all_segments),
+                        "seek": begin,
+                        "start": start,
+                        "end": stop,
+                        "text": text,
+                        "tokens": result.tokens,
+                        "temperature": result.temperature,
+                        "avg_logprob": result.avg_logprob,
+                        "compression_ratio": result.compression_ratio,
+                        "no_speech_prob": result.no_speech_prob,
+                    })
+                    if verbose:
+                        print(
+                            f"[{utils.format_timestamp(start)} --> {utils.format_timestamp(stop)}] {text}"
+                        )
+
+            # update progress bar
+            pbar.update(batch_windows[-1][1] - batch_windows[0][0])
+
+    return dict(
+        text=tokenizer.decode(all_tokens) if all_tokens else "",
+        segments=all_segments,
+        language=language)
+
+
 class SequenceRanker:
     def rank(self,
              tokens: List[List[paddle.Tensor]],
@@ -1110,8 +1404,8 @@ class DecodingTask:
         #if self.options.fp16:
         #    mel = mel.half()
 
-        if mel.shape[-2:] == (self.model.dims.n_audio_ctx,
-                              self.model.dims.n_audio_state):
+        if tuple(mel.shape[-2:]) == (self.model.dims.n_audio_ctx,
+                                     self.model.dims.n_audio_state):
             # encoded audio features are given; skip audio encoding
             audio_features = mel
         else:
@@ -1184,17 +1478,8 @@ class DecodingTask:
         audio_features: paddle.Tensor = self._get_audio_features(
             mel)  # encoder forward pass
 
-        tokens: paddle.Tensor
-        if batch_size > 1:
-            for i in range(batch_size):
-                tokens = paddle.concat(
-                    x=[
-                        paddle.to_tensor([self.initial_tokens]),
-                        paddle.to_tensor([self.initial_tokens])
-                    ],
-                    axis=0)
-        elif batch_size == 1:
-            tokens = paddle.to_tensor([self.initial_tokens])
+        tokens: paddle.Tensor = paddle.to_tensor(
+            [self.initial_tokens] * batch_size)
 
         # detect language if requested, overwriting the language token
         languages, language_probs = self._detect_language(
@@ -1377,6 +1662,7 @@ class Whisper(nn.Layer):
 
     detect_language = detect_language
     transcribe = transcribe
+    batch_transcribe = batch_transcribe
     decode = decode
 
 
@@ -89,6 +89,49 @@ class MultiHeadedAttention(nn.Layer):
 
         return q, k, v
 
+    def forward_kv(self, x: paddle.Tensor
+                   ) -> Tuple[paddle.Tensor, paddle.Tensor]:
+        """Transform key and value, which can be cached and reused by
+        `forward_cached_kv`.
+        Args:
+            x (paddle.Tensor): Key and value tensor (#batch, time2, size).
+        Returns:
+            paddle.Tensor: Transformed key tensor, size
+                (#batch, n_head, time2, d_k).
+            paddle.Tensor: Transformed value tensor, size
+                (#batch, n_head, time2, d_k).
+        """
+        n_batch = x.shape[0]
+        k = self.linear_k(x).reshape([n_batch, -1, self.h, self.d_k])
+        v = self.linear_v(x).reshape([n_batch, -1, self.h, self.d_k])
+        return k.transpose([0, 2, 1, 3]), v.transpose([0, 2, 1, 3])
+
+    def forward_cached_kv(
+            self,
+            query: paddle.Tensor,
+            key: paddle.Tensor,
+            value: paddle.Tensor,
+            mask: paddle.Tensor=paddle.ones([0, 0, 0], dtype=paddle.bool)
+    ) -> paddle.Tensor:
+        """Compute scaled dot product attention with transformed key and value.
+        Args:
+            query (paddle.Tensor): Query tensor (#batch, time1, size).
+            key (paddle.Tensor): Transformed key tensor from `forward_kv`,
+                size (#batch, n_head, time2, d_k), or (1, n_head, time2, d_k)
+                to be shared by the batch.
+            value (paddle.Tensor): Transformed value tensor from `forward_kv`,
+                the same size as key.
+            mask (paddle.Tensor): Mask tensor (#batch or 1, 1, time2) or
+                (#batch, time1, time2), (0, 0, 0) means fake mask.
+        Returns:
+            paddle.Tensor: Output tensor (#batch, time1, d_model).
+        """
+        n_batch = query.shape[0]
+        q = self.linear_q(query).reshape([n_batch, -1, self.h, self.d_k])
+        q = q.transpose([0, 2, 1, 3])  # (batch, head, time1, d_k)
+        scores = paddle.matmul(q, key, transpose_y=True) / math.sqrt(self.d_k)
+        return self.forward_attention(value, scores, mask)
+
     def forward_attention(
             self,
             value: paddle.Tensor,
@@ -107,7 +150,8 @@ class MultiHeadedAttention(nn.Layer):
             paddle.Tensor: Transformed value (#batch, time1, d_model)
                 weighted by the attention score (#batch, time1, time2).
         """
-        n_batch = value.shape[0]
+        # value may be shared by the batch, see `forward_cached_kv`
+        n_batch = scores.shape[0]
 
         # When `if mask.size(2) > 0` be True:
         # 1. training.
@@ -193,23 +193,88 @@ class TransformerDecoder(BatchScorerInterface, nn.Layer):
             y = paddle.log_softmax(self.output_layer(y), axis=-1)
         return y, new_cache
 
+    def init_kv_cache(self, memory: paddle.Tensor) -> paddle.Tensor:
+        """Transform the key and value of the encoded memory for all the
+            layers once, they are reused by every `forward_one_step_kv`.
+        Args:
+            memory: encoded memory, float32  (batch, maxlen_in, feat)
+        Returns:
+            memory_kv: (num_blocks, 2, batch, head, maxlen_in, d_k)
+        """
+        return paddle.stack([
+            paddle.stack(decoder.src_attn.forward_kv(memory))
+            for decoder in self.decoders
+        ])
+
+    def forward_one_step_kv(
+            self,
+            memory_kv: paddle.Tensor,
+            memory_mask: paddle.Tensor,
+            tgt: paddle.Tensor,
+            cache: Optional[paddle.Tensor]=None,
+    ) -> Tuple[paddle.Tensor, paddle.Tensor]:
+        """Forward one step with key/value caches.
+            Only the last token is computed, so the cost of a step does not
+            grow with the prefix length. This is only used for decoding.
+        Args:
+            memory_kv: key and value of the encoded memory from
+                `init_kv_cache`, (num_blocks, 2, batch or 1, head, maxlen_in, d_k)
+            memory_mask: encoded memory mask, (batch or 1, 1, maxlen_in)
+            tgt: input token ids, int64 (batch, maxlen_out), only the last
+                token is fed
+            cache: self-attention key and value of the previous tokens,
+                (num_blocks, 2, batch, head, maxlen_out - 1, d_k).
+                The hyps are reordered by one
+                `paddle.index_select(cache, index, axis=2)`.
+        Returns:
+            y, cache: NN output value (batch, token) and the cache including
+                the last token, (num_blocks, 2, batch, head, maxlen_out, d_k)
+        """
+        embed, pos_enc = self.embed[0], self.embed[1]
+        x, _ = pos_enc(embed(tgt[:, -1:]), offset=tgt.shape[1] - 1)
+        new_cache = []
+        for i, decoder in enumerate(self.decoders):
+            x, kv = decoder.forward_one_step(
+                x,
+                memory_kv[i],
+                memory_mask,
+                self_kv=None if cache is None else cache[i])
+            new_cache.append(kv)
+        if self.normalize_before:
+            y = self.after_norm(x[:, -1])
+        else:
+            y = x[:, -1]
+        if self.use_output_layer:
+            y = paddle.log_softmax(self.output_layer(y), axis=-1)
+        return y, paddle.stack(new_cache)
+
     # beam search API (see ScorerInterface)
+    def init_state(self, x: paddle.Tensor) -> Tuple:
+        """Get an initial state for decoding.
+        x: (xlen, n_feat)
+
+        The state of a hyp is (memory_kv, memory_mask, cache, index), where
+        `cache[:, :, index]` is the self-attention cache of the hyp, so the
+        hyps scored together share one cache tensor.
+        """
+        memory = x.unsqueeze(0)
+        memory_kv = self.init_kv_cache(memory)
+        memory_mask = make_xs_mask(memory).unsqueeze(1)  # (B=1,1,T)
+        return memory_kv, memory_mask, None, 0
+
     def score(self, ys, state, x):
         """Score.
         ys: (ylen,)
         x: (xlen, n_feat)
         """
-        ys_mask = subsequent_mask(len(ys)).unsqueeze(0)  # (B,L,L)
-        x_mask = make_xs_mask(x.unsqueeze(0)).unsqueeze(1)  # (B,1,T)
-        if self.selfattention_layer_type != "selfattn":
-            # TODO(karita): implement cache
-            logging.warning(
-                f"{self.selfattention_layer_type} does not support cached decoding."
-            )
-            state = None
-        logp, state = self.forward_one_step(
-            x.unsqueeze(0), x_mask, ys.unsqueeze(0), ys_mask, cache=state)
-        return logp.squeeze(0), state
+        if state is None:
+            state = self.init_state(x)
+        memory_kv, memory_mask, cache, index = state
+        if cache is not None:
+            cache = cache[:, :, index:index + 1]
+        logp, cache = self.forward_one_step_kv(
+            memory_kv, memory_mask, ys.unsqueeze(0), cache=cache)
+        return logp.squeeze(0), (memory_kv, memory_mask, cache, 0)
 
     # batch beam search API (see BatchScorerInterface)
     def batch_score(self,
@@ -230,26 +295,29 @@ class TransformerDecoder(BatchScorerInterface, nn.Layer):
                 and next state list for ys.
 
         """
-        # merge states
         n_batch = len(ys)
-        n_layers = len(self.decoders)
         if states[0] is None:
-            batch_state = None
-        else:
-            # transpose state of [batch, layer] into [layer, batch]
-            batch_state = [
-                paddle.stack([states[b][i] for b in range(n_batch)])
-                for i in range(n_layers)
-            ]
-
-        # batch decoding
-        ys_mask = subsequent_mask(ys.shape[-1]).unsqueeze(0)  # (B,L,L)
-        xs_mask = make_xs_mask(xs).unsqueeze(1)  # (B,1,T)
-        logp, states = self.forward_one_step(
-            xs, xs_mask, ys, ys_mask, cache=batch_state)
-
-        # transpose state of [layer, batch] into [batch, layer]
-        state_list = [[states[i][b] for i in range(n_layers)]
+            states = [self.init_state(xs[0])] * n_batch
+        # the hyps of one utterance share the memory key and value
+        memory_kv, memory_mask, cache, _ = states[0]
+        if cache is not None:
+            if all(state[2] is cache for state in states):
+                # reorder the selected hyps with one gather
+                index = paddle.to_tensor(
+                    [state[3] for state in states], dtype='int64')
+                cache = paddle.index_select(cache, index, axis=2)
+            else:
+                cache = paddle.concat(
+                    [
+                        state[2][:, :, state[3]:state[3] + 1]
+                        for state in states
+                    ],
+                    axis=2)
+
+        logp, cache = self.forward_one_step_kv(
+            memory_kv, memory_mask, ys, cache=cache)
+
+        state_list = [(memory_kv, memory_mask, cache, b)
                       for b in range(n_batch)]
         return logp, state_list
 
@@ -368,3 +436,35 @@ class BiTransformerDecoder(BatchScorerInterface, nn.Layer):
         """
         return self.left_decoder.forward_one_step(memory, memory_mask, tgt,
                                                   tgt_mask, cache)
+
+    def init_kv_cache(self, memory: paddle.Tensor) -> paddle.Tensor:
+        """Transform the key and value of the encoded memory, see
+        `TransformerDecoder.init_kv_cache`, only the left decoder is used.
+        """
+        return self.left_decoder.init_kv_cache(memory)
+
+    def forward_one_step_kv(
+            self,
+            memory_kv: paddle.Tensor,
+            memory_mask: paddle.Tensor,
+            tgt: paddle.Tensor,
+            cache: Optional[paddle.Tensor]=None,
+    ) -> Tuple[paddle.Tensor, paddle.Tensor]:
+        """Forward one step with key/value caches, see
+        `TransformerDecoder.forward_one_step_kv`, only the left decoder is used.
+        """
+        return self.left_decoder.forward_one_step_kv(memory_kv, memory_mask,
+                                                     tgt, cache)
+
+    # beam search API (see ScorerInterface), only the left decoder is used
+    def init_state(self, x: paddle.Tensor) -> Tuple:
+        return self.left_decoder.init_state(x)
+
+    def score(self, ys, state, x):
+        return self.left_decoder.score(ys, state, x)
+
+    def batch_score(self,
+                    ys: paddle.Tensor,
+                    states: List[Any],
+                    xs: paddle.Tensor) -> Tuple[paddle.Tensor, List[Any]]:
+        return self.left_decoder.batch_score(ys, states, xs)
@@ -150,3 +150,64 @@ class DecoderLayer(nn.Layer):
             x = paddle.cat([cache, x], dim=1)
 
         return x, tgt_mask, memory, memory_mask
+
+    def forward_one_step(
+            self,
+            tgt: paddle.Tensor,
+            memory_kv: paddle.Tensor,
+            memory_mask: paddle.Tensor,
+            self_kv: Optional[paddle.Tensor]=None,
+    ) -> Tuple[paddle.Tensor, paddle.Tensor]:
+        """Compute decoded features of the last token with key/value caches.
+        Args:
+            tgt (paddle.Tensor): Input tensor of the last token
+                (#batch, 1, size).
+            memory_kv (paddle.Tensor): Transformed key and value of the
+                encoded memory from `src_attn.forward_kv`,
+                (2, #batch or 1, head, maxlen_in, d_k).
+            memory_mask (paddle.Tensor): Encoded memory mask
+                (#batch or 1, 1, maxlen_in).
+            self_kv (paddle.Tensor): Self-attention key and value of the
+                previous tokens, (2, #batch, head, maxlen_out - 1, d_k).
+        Returns:
+            paddle.Tensor: Output tensor (#batch, 1, size).
+            paddle.Tensor: Self-attention key and value including the last
+                token, (2, #batch, head, maxlen_out, d_k).
+        """
+        residual = tgt
+        if self.normalize_before:
+            tgt = self.norm1(tgt)
+
+        k, v = self.self_attn.forward_kv(tgt)
+        if self_kv is not None:
+            k = paddle.concat([self_kv[0], k], axis=2)
+            v = paddle.concat([self_kv[1], v], axis=2)
+        # the last token attends to all the tokens, no mask is needed
+        x = self.self_attn.forward_cached_kv(tgt, k, v)
+        if self.concat_after:
+            x = residual + self.concat_linear1(paddle.concat([tgt, x], axis=-1))
+        else:
+            x = residual + self.dropout(x)
+        if not self.normalize_before:
+            x = self.norm1(x)
+
+        residual = x
+        if self.normalize_before:
+            x = self.norm2(x)
+        src = self.src_attn.forward_cached_kv(x, memory_kv[0], memory_kv[1],
+                                              memory_mask)
+        if self.concat_after:
+            x = residual + self.concat_linear2(paddle.concat([x, src], axis=-1))
+        else:
+            x = residual + self.dropout(src)
+        if not self.normalize_before:
+            x = self.norm2(x)
+
+        residual = x
+        if self.normalize_before:
+            x = self.norm3(x)
+        x = residual + self.dropout(self.feed_forward(x))
+        if not self.normalize_before:
+            x = self.norm3(x)
+
+        return x, paddle.stack([k, v])
@@ -16,6 +16,7 @@
 """Positonal Encoding Module."""
 import math
 from typing import Tuple
+from typing import Union
 
 import paddle
 from paddle import nn
@@ -103,24 +104,47 @@ class PositionalEncoding(nn.Layer, PositionalEncodingInterface):
         self.pe[:, :, 0::2] = paddle.sin(position * div_term)
         self.pe[:, :, 1::2] = paddle.cos(position * div_term)
 
-    def forward(self, x: paddle.Tensor,
-                offset: int=0) -> Tuple[paddle.Tensor, paddle.Tensor]:
+    def forward(self, x: paddle.Tensor, offset: Union[int, paddle.Tensor]=0
+                ) -> Tuple[paddle.Tensor, paddle.Tensor]:
         """Add positional encoding.
         Args:
             x (paddle.Tensor): Input. Its shape is (batch, time, ...)
-            offset (int): position offset
+            offset (int or paddle.Tensor): position offset, or (batch,)
+                offsets for batched streaming decoding.
         Returns:
             paddle.Tensor: Encoded tensor. Its shape is (batch, time, ...)
             paddle.Tensor: for compatibility to RelPositionalEncoding, (batch=1, time, ...)
         """
-        assert offset + x.shape[
-            1] < self.max_len, "offset: {} + x.shape[1]: {} is larger than the max_len: {}".format(
-                offset, x.shape[1], self.max_len)
-        pos_emb = self.pe[:, offset:offset + x.shape[1]]
+        pos_emb = self._get_pos_emb(offset, x.shape[1])
         x = x * self.xscale + pos_emb
         return self.dropout(x), self.dropout(pos_emb)
 
-    def position_encoding(self, offset: int, size: int) -> paddle.Tensor:
+    def _get_pos_emb(self, offset: Union[int, paddle.Tensor],
+                     size: int) -> paddle.Tensor:
+        """Slice the position encoding table.
+        Args:
+            offset (int or paddle.Tensor): start offset, int or (B,) tensor.
+            size (int): requried size of position encoding
+        Returns:
+            paddle.Tensor: position encoding, [1, T, D] for int offset,
+                [B, T, D] for tensor offset.
+        """
+        if isinstance(offset, int):
+            assert offset + size < self.max_len, "offset: {} + size: {} is larger than the max_len: {}".format(
+                offset, size, self.max_len)
+            return self.pe[:, offset:offset + size]
+
+        # for batched streaming decoding, each utterance has its own offset
+        assert int(offset.max()) + size < self.max_len
+        # (B, T)
+        index = offset.unsqueeze(1) + paddle.arange(
+            0, size, dtype=offset.dtype)
+        # positions before 0 are padding, which will be masked out
+        index = paddle.clip(index, min=0)
+        return paddle.nn.functional.embedding(index, self.pe[0])
+
+    def position_encoding(self, offset: Union[int, paddle.Tensor],
+                          size: int) -> paddle.Tensor:
         """ For getting encoding in a streaming fashion
         Attention!!!!!
         we apply dropout only once at the whole utterance level in a none
@@ -128,13 +152,13 @@ class PositionalEncoding(nn.Layer, PositionalEncodingInterface):
         increasing input size in a streaming scenario, so the dropout will
         be applied several times.
         Args:
-            offset (int): start offset
+            offset (int or paddle.Tensor): start offset, or (B,) offsets for
+                batched streaming decoding
             size (int): requried size of position encoding
         Returns:
-            paddle.Tensor: Corresponding position encoding, #[1, T, D].
+            paddle.Tensor: Corresponding position encoding, #[1, T, D] or #[B, T, D].
         """
-        assert offset + size < self.max_len
-        return self.dropout(self.pe[:, offset:offset + size])
+        return self.dropout(self._get_pos_emb(offset, size))
 
 
 class RelPositionalEncoding(PositionalEncoding):
@@ -152,21 +176,20 @@ class RelPositionalEncoding(PositionalEncoding):
         super().__init__(d_model, dropout_rate, max_len, reverse=True)
         logger.info(f"max len: {max_len}")
 
-    def forward(self, x: paddle.Tensor,
-                offset: int=0) -> Tuple[paddle.Tensor, paddle.Tensor]:
+    def forward(self, x: paddle.Tensor, offset: Union[int, paddle.Tensor]=0
+                ) -> Tuple[paddle.Tensor, paddle.Tensor]:
         """Compute positional encoding.
         Args:
             x (paddle.Tensor): Input tensor (batch, time, `*`).
+            offset (int or paddle.Tensor): position offset, or (batch,)
+                offsets for batched streaming decoding.
         Returns:
             paddle.Tensor: Encoded tensor (batch, time, `*`).
-            paddle.Tensor: Positional embedding tensor (1, time, `*`).
+            paddle.Tensor: Positional embedding tensor (1, time, `*`) or
+                (batch, time, `*`).
         """
-        assert offset + x.shape[
-            1] < self.max_len, "offset: {} + x.shape[1]: {} is larger than the max_len: {}".format(
-                offset, x.shape[1], self.max_len)
-
         x = x * self.xscale
-        pos_emb = self.pe[:, offset:offset + x.shape[1]]
+        pos_emb = self._get_pos_emb(offset, x.shape[1])
         return self.dropout(x), self.dropout(pos_emb)
 
 
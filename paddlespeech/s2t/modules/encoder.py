@@ -282,6 +282,82 @@ class BaseEncoder(nn.Layer):
         r_cnn_cache = paddle.stack(r_cnn_cache, axis=0)
         return xs, r_att_cache, r_cnn_cache
 
+    def forward_chunk_batch(
+            self,
+            xs: paddle.Tensor,
+            offsets: paddle.Tensor,
+            att_cache_lens: paddle.Tensor,
+            att_cache: paddle.Tensor=paddle.zeros([0, 0, 0, 0, 0]),
+            cnn_cache: paddle.Tensor=paddle.zeros([0, 0, 0, 0])
+    ) -> Tuple[paddle.Tensor, paddle.Tensor, paddle.Tensor]:
+        """ Forward one chunk of several independent streams at once.
+        Each stream has its own offset and attention cache length, the
+        attention caches are left padded to the same length and the padded
+        key positions are masked out, so the output of every stream is the
+        same as running `forward_chunk` on it alone.
+        Args:
+            xs (paddle.Tensor): chunk audio feat input, [B, T, D], all streams
+                must have the same chunk length.
+            offsets (paddle.Tensor): (B,), int64, current offset of each stream
+                in encoder output time stamp.
+            att_cache_lens (paddle.Tensor): (B,), int64, valid length of the
+                attention cache of each stream.
+            att_cache (paddle.Tensor): left padded cache tensor for key & val,
+                (elayers, B, head, cache_t1, d_k * 2), (0, 0, 0, 0, 0) means
+                no stream has history yet.
+            cnn_cache (paddle.Tensor): cache tensor for cnn_module in conformer,
+                (elayers, B, hidden-dim, cache_t2), (0, 0, 0, 0) means fake cache.
+        Returns:
+            paddle.Tensor: output of current input xs, (B, chunk_size, hidden-dim)
+            paddle.Tensor: new left padded attention cache, which is not sliced
+                by `required_cache_size`, (elayers, B, head, cache_t1 + chunk_size, d_k*2)
+            paddle.Tensor: new conformer cnn cache, (elayers, B, hidden-dim, cache_t2)
+        """
+        batch_size = xs.shape[0]
+        tmp_masks = paddle.ones([batch_size, 1, xs.shape[1]], dtype=paddle.bool)
+
+        if self.global_cmvn is not None:
+            xs = self.global_cmvn(xs)
+
+        # xs=(B, chunk_size, hidden-dim)
+        xs, _, _ = self.embed(xs, tmp_masks, offset=offsets)
+
+        elayers = att_cache.shape[0]
+        cache_t1 = att_cache.shape[3] if elayers > 0 else 0
+        chunk_size = xs.shape[1]
+        attention_key_size = cache_t1 + chunk_size
+
+        # (B, attention_key_size, hidden-dim)
+        pos_emb = self.embed.position_encoding(
+            offset=offsets - cache_t1, size=attention_key_size)
+
+        # mask out the left padding of the attention cache, (B, 1, key_size)
+        pad_lens = cache_t1 - att_cache_lens
+        att_mask = paddle.arange(
+            attention_key_size,
+            dtype=pad_lens.dtype).unsqueeze(0) >= pad_lens.unsqueeze(1)
+        att_mask = att_mask.unsqueeze(1)
+
+        r_att_cache = []
+        r_cnn_cache = []
+        for i, layer in enumerate(self.encoders):
+            xs, _, new_att_cache, new_cnn_cache = layer(
+                xs,
+                att_mask,
+                pos_emb,
+                att_cache=att_cache[i] if elayers > 0 else paddle.zeros(
+                    [0, 0, 0, 0]),
+                cnn_cache=cnn_cache[i:i + 1], )
+            r_att_cache.append(new_att_cache)
+            r_cnn_cache.append(new_cnn_cache)
+
+        if self.normalize_before:
+            xs = self.after_norm(xs)
+
+        r_att_cache = paddle.stack(r_att_cache, axis=0)
+        r_cnn_cache = paddle.stack(r_cnn_cache, axis=0)
+        return xs, r_att_cache, r_cnn_cache
+
     def forward_chunk_by_chunk(
             self,
             xs: paddle.Tensor,
@@ -142,7 +142,7 @@ class Conv2dSubsampling4(Conv2dSubsampling):
         b, c, t, f = x.shape
         x = self.out(x.transpose([0, 2, 1, 3]).reshape([b, -1, c * f]))
         x, pos_emb = self.pos_enc(x, offset)
-        return x, pos_emb, x_mask[:, :, :-2:2][:, :, :-2:2]
+        return x, pos_emb, x_mask[:, :, 2::2][:, :, 2::2]
 
 
 class Conv2dSubsampling6(Conv2dSubsampling):
@@ -195,7 +195,7 @@ class Conv2dSubsampling6(Conv2dSubsampling):
         b, c, t, f = x.shape
         x = self.linear(x.transpose([0, 2, 1, 3]).reshape([b, -1, c * f]))
         x, pos_emb = self.pos_enc(x, offset)
-        return x, pos_emb, x_mask[:, :, :-2:2][:, :, :-4:3]
+        return x, pos_emb, x_mask[:, :, 2::2][:, :, 4::3]
 
 
 class Conv2dSubsampling8(Conv2dSubsampling):
@@ -248,7 +248,7 @@ class Conv2dSubsampling8(Conv2dSubsampling):
         b, c, t, f = x.shape
         x = self.linear(x.transpose([0, 2, 1, 3]).reshape([b, -1, c * f]))
         x, pos_emb = self.pos_enc(x, offset)
-        return x, pos_emb, x_mask[:, :, :-2:2][:, :, :-2:2][:, :, :-2:2]
+        return x, pos_emb, x_mask[:, :, 2::2][:, :, 2::2][:, :, 2::2]
 
 
 class DepthwiseConv2DSubsampling4(BaseSubsampling):
@@ -312,4 +312,4 @@ class DepthwiseConv2DSubsampling4(BaseSubsampling):
         x = x.transpose([0, 2, 1, 3]).reshape([b, -1, c * f])
         x, pos_emb = self.pos_enc(x, offset)
         x = self.input_proj(x)
-        return x, pos_emb, x_mask[:, :, :-2:2][:, :, :-2:2]
+        return x, pos_emb, x_mask[:, :, 2::2][:, :, 2::2]
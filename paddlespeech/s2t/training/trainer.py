@@ -433,6 +433,9 @@ class Trainer():
     @mp_tools.rank_zero_only
     def destory(self):
         """Close visualizer to avoid hanging after training"""
+        # wait for the checkpoint being saved
+        if getattr(self, "checkpoint", None):
+            self.checkpoint.wait()
         # https://github.com/pytorch/fairseq/issues/2357
         if self.visualizer:
             self.visualizer.close()
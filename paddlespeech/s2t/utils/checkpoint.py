@@ -16,6 +16,7 @@ import json
 import os
 import re
 from pathlib import Path
+from typing import List
 from typing import Text
 from typing import Union
 
@@ -25,6 +26,8 @@ from paddle.optimizer import Optimizer
 
 from paddlespeech.s2t.utils import mp_tools
 from paddlespeech.s2t.utils.log import Log
+from paddlespeech.utils.checkpoint_writer import CheckpointWriter
+from paddlespeech.utils.checkpoint_writer import to_host
 
 logger = Log(__name__).getlog()
 
@@ -32,12 +35,28 @@ __all__ = ["Checkpoint"]
 
 
 class Checkpoint():
-    def __init__(self, kbest_n: int=5, latest_n: int=1):
+    """Keep the kbest_n best and latest_n latest checkpoints.
+
+    The parameters are copied to host memory on the training thread, and
+    written to disk in a background thread, after which the outdated
+    checkpoints are removed and the record files are updated.
+
+    Args:
+        kbest_n (int, optional): number of the best checkpoints to keep, -1 to keep all. Defaults to 5.
+        latest_n (int, optional): number of the latest checkpoints to keep. Defaults to 1.
+        async_save (bool, optional): write checkpoints in a background thread. Defaults to True.
+    """
+
+    def __init__(self,
+                 kbest_n: int=5,
+                 latest_n: int=1,
+                 async_save: bool=True):
         self.best_records: Mapping[Path, float] = {}
         self.latest_records = []
         self.kbest_n = kbest_n
         self.latest_n = latest_n
         self._save_all = (kbest_n == -1)
+        self.writer = CheckpointWriter(asynchronous=async_save)
 
     def save_parameters(self,
                         checkpoint_dir,
@@ -56,22 +75,34 @@ class Checkpoint():
             infos (dict or None)):  any info you want to save.
             metric_type (str, optional): metric type. Defaults to "val_loss".
         """
+        # the records are updated by the pending checkpoint
+        self.wait()
         if (metric_type not in infos.keys()):
             self._save_parameters(checkpoint_dir, tag_or_iteration, model,
                                   optimizer, infos)
             return
 
+        to_del = []
         #save best
         if self._should_save_best(infos[metric_type]):
-            self._save_best_checkpoint_and_update(
-                infos[metric_type], checkpoint_dir, tag_or_iteration, model,
-                optimizer, infos)
+            to_del += self._update_best_records(infos[metric_type],
+                                                tag_or_iteration)
         #save latest
-        self._save_latest_checkpoint_and_update(
-            checkpoint_dir, tag_or_iteration, model, optimizer, infos)
-
-        if isinstance(tag_or_iteration, int):
-            self._save_checkpoint_record(checkpoint_dir, tag_or_iteration)
+        to_del += self._update_latest_records(tag_or_iteration)
+
+        # remove the old ones and update the records after the new one is saved
+        self._save_parameters(
+            checkpoint_dir,
+            tag_or_iteration,
+            model,
+            optimizer,
+            infos,
+            to_del=to_del,
+            save_record=isinstance(tag_or_iteration, int))
+
+    def wait(self):
+        """Wait for the pending checkpoint to be saved."""
+        self.writer.wait()
 
     def load_parameters(self,
                         model,
@@ -93,6 +124,7 @@ class Checkpoint():
             configs (dict): epoch or step, lr and other meta info should be saved.
         """
         configs = {}
+        self.wait()
 
         if checkpoint_path:
             pass
@@ -185,9 +217,10 @@ class Checkpoint():
     def _latest_full(self):
         return len(self.latest_records) == self.latest_n
 
-    def _save_best_checkpoint_and_update(self, metric, checkpoint_dir,
-                                         tag_or_iteration, model, optimizer,
-                                         infos):
+    def _update_best_records(self, metric, tag_or_iteration) -> List:
+        """Add the new checkpoint to the best records, and return the
+        checkpoints to remove."""
+        to_del = []
         # remove the worst
         if self._best_full():
             worst_record_path = max(self.best_records,
@@ -196,26 +229,25 @@ class Checkpoint():
             if (worst_record_path not in self.latest_records):
                 logger.info(
                     "remove the worst checkpoint: {}".format(worst_record_path))
-                self._del_checkpoint(checkpoint_dir, worst_record_path)
+                to_del.append(worst_record_path)
 
         # add the new one
-        self._save_parameters(checkpoint_dir, tag_or_iteration, model,
-                              optimizer, infos)
         self.best_records[tag_or_iteration] = metric
+        return to_del
 
-    def _save_latest_checkpoint_and_update(
-            self, checkpoint_dir, tag_or_iteration, model, optimizer, infos):
+    def _update_latest_records(self, tag_or_iteration) -> List:
+        """Add the new checkpoint to the latest records, and return the
+        checkpoints to remove."""
+        to_del = []
         # remove the old
         if self._latest_full():
             to_del_fn = self.latest_records.pop(0)
             if (to_del_fn not in self.best_records.keys()):
                 logger.info(
                     "remove the latest checkpoint: {}".format(to_del_fn))
-                self._del_checkpoint(checkpoint_dir, to_del_fn)
+                to_del.append(to_del_fn)
         self.latest_records.append(tag_or_iteration)
-
-        self._save_parameters(checkpoint_dir, tag_or_iteration, model,
-                              optimizer, infos)
+        return to_del
 
     def _del_checkpoint(self, checkpoint_dir, tag_or_iteration):
         checkpoint_path = os.path.join(checkpoint_dir,
@@ -265,8 +297,13 @@ class Checkpoint():
                          tag_or_iteration: Union[int, str],
                          model: paddle.nn.Layer,
                          optimizer: Optimizer=None,
-                         infos: dict=None):
+                         infos: dict=None,
+                         to_del: List=None,
+                         save_record: bool=False):
         """Checkpoint the latest trained model parameters.
+
+        The parameters are copied to host memory, and saved in the background
+        after the pending checkpoint.
         Args:
             checkpoint_dir (str): the directory where checkpoint is saved.
             tag_or_iteration (int or str): the latest iteration(step or epoch) number.
@@ -274,25 +311,35 @@ class Checkpoint():
             optimizer (Optimizer, optional): optimizer to be checkpointed.
                 Defaults to None.
             infos (dict or None): any info you want to save.
+            to_del (list, optional): checkpoints to remove after saving.
+                Defaults to None.
+            save_record (bool, optional): whether to update the record files
+                after saving. Defaults to False.
         Returns:
             None
         """
         checkpoint_path = os.path.join(checkpoint_dir,
                                        "{}".format(tag_or_iteration))
 
-        model_dict = model.state_dict()
         params_path = checkpoint_path + ".pdparams"
-        paddle.save(model_dict, params_path)
-        logger.info("Saved model to {}".format(params_path))
-
+        objs = {params_path: to_host(model.state_dict())}
         if optimizer:
-            opt_dict = optimizer.state_dict()
             optimizer_path = checkpoint_path + ".pdopt"
-            paddle.save(opt_dict, optimizer_path)
-            logger.info("Saved optimzier state to {}".format(optimizer_path))
+            objs[optimizer_path] = to_host(optimizer.state_dict())
 
         info_path = re.sub('.pdparams$', '.json', params_path)
         infos = {} if infos is None else infos
-        with open(info_path, 'w') as fout:
-            data = json.dumps(infos)
-            fout.write(data)
+        data = json.dumps(infos)
+
+        def _on_saved():
+            with open(info_path + ".tmp", 'w') as fout:
+                fout.write(data)
+            os.replace(info_path + ".tmp", info_path)
+            for tag in to_del or []:
+                # a tag saved again is not outdated
+                if tag != tag_or_iteration:
+                    self._del_checkpoint(checkpoint_dir, tag)
+            if save_record:
+                self._save_checkpoint_record(checkpoint_dir, tag_or_iteration)
+
+        self.writer.submit(objs, callback=_on_saved)
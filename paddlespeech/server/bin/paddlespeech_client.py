@@ -197,6 +197,13 @@ class TTSOnlineClientExecutor(BaseExecutor):
             help='Client saves synthesized audio')
         self.parser.add_argument(
             "--play", type=bool, help="whether to play audio", default=False)
+        self.parser.add_argument(
+            '--audio_format',
+            type=str,
+            default="pcm16",
+            choices=["base64", "pcm16", "float32"],
+            help='audio format of the websocket protocol, base64 pcm16 in json messages, or raw pcm16 / float32 in binary messages'
+        )
 
     def execute(self, argv: List[str]) -> bool:
         args = self.parser.parse_args(argv)
@@ -207,6 +214,7 @@ class TTSOnlineClientExecutor(BaseExecutor):
         spk_id = args.spk_id
         output = args.output
         play = args.play
+        audio_format = args.audio_format
 
         try:
             self(
@@ -216,7 +224,8 @@ class TTSOnlineClientExecutor(BaseExecutor):
                 protocol=protocol,
                 spk_id=spk_id,
                 output=output,
-                play=play)
+                play=play,
+                audio_format=audio_format)
             return True
         except Exception as e:
             logger.error("Failed to synthesized audio.")
@@ -231,7 +240,8 @@ class TTSOnlineClientExecutor(BaseExecutor):
                  protocol: str="http",
                  spk_id: int=0,
                  output: str=None,
-                 play: bool=False):
+                 play: bool=False,
+                 audio_format: str="pcm16"):
         """
         Python API to call an executor.
         """
@@ -248,7 +258,7 @@ class TTSOnlineClientExecutor(BaseExecutor):
         elif protocol == "websocket":
             from paddlespeech.server.utils.audio_handler import TTSWsHandler
             logger.info("tts websocket client start")
-            handler = TTSWsHandler(server_ip, port, play)
+            handler = TTSWsHandler(server_ip, port, play, audio_format)
             loop = asyncio.get_event_loop()
             first_response, final_response, duration, save_audio_success, receive_time_list, chunk_duration_list = loop.run_until_complete(
                 handler.run(input, spk_id, output))
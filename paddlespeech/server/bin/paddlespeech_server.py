@@ -25,6 +25,7 @@ from paddlespeech.server.engine.engine_pool import init_engine_pool
 from paddlespeech.server.engine.engine_warmup import warm_up
 from paddlespeech.server.restful.api import setup_router as setup_http_router
 from paddlespeech.server.utils.config import get_config
+from paddlespeech.server.utils.inference_executor import init_inference_executor
 from paddlespeech.server.ws.api import setup_router as setup_ws_router
 from prettytable import PrettyTable
 from starlette.middleware.cors import CORSMiddleware
@@ -77,7 +78,11 @@ class ServerExecutor(BaseExecutor):
             bool: 
         """
         # init api
-        api_list = list(engine.split("_")[0] for engine in config.engine_list)
+        # a task may have several engines, e.g. asr_python and asr_python_en
+        defaults = {}
+        for engine_and_type in config.engine_list:
+            defaults.setdefault(engine_and_type.split("_")[0], engine_and_type)
+        api_list = list(defaults.keys())
         if config.protocol == "websocket":
             api_router = setup_ws_router(api_list)
         elif config.protocol == "http":
@@ -88,9 +93,10 @@ class ServerExecutor(BaseExecutor):
         logger.info("start to init the engine")
         if not init_engine_pool(config):
             return False
+        init_inference_executor(config)
 
-        # warm up
-        for engine_and_type in config.engine_list:
+        # warm up the default engine of each task
+        for engine_and_type in defaults.values():
             if not warm_up(engine_and_type):
                 return False
 
@@ -0,0 +1,300 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+import paddle
+
+from paddlespeech.cli.log import logger
+from paddlespeech.s2t.modules.attention import RoPERelPositionMultiHeadedAttention
+from paddlespeech.s2t.modules.embedding import PositionalEncoding
+from paddlespeech.s2t.modules.embedding import RelPositionalEncoding
+from paddlespeech.s2t.modules.encoder import BaseEncoder
+
+__all__ = ['ChunkBatchSchedulerOpt', 'ChunkBatchScheduler']
+
+
+@dataclass
+class ChunkBatchSchedulerOpt:
+    # max number of chunks forwarded by the encoder at once
+    max_batch_size: int = 16
+    # max time the first chunk of a batch waits for other sessions
+    max_wait_ms: float = 5.0
+
+
+@dataclass
+class ChunkRequest:
+    session_id: int
+    xs: paddle.Tensor  # (1, T, D)
+    offset: int
+    required_cache_size: int
+    att_cache: paddle.Tensor  # (elayers, head, cache_t1, d_k * 2)
+    cnn_cache: paddle.Tensor  # (elayers, 1, hidden-dim, cache_t2)
+    future: Future = field(default_factory=Future)
+    submit_time: float = field(default_factory=time.time)
+
+
+@dataclass
+class SessionLatency:
+    num_chunks: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    total_batch_size: int = 0
+
+    def update(self, latency_ms: float, batch_size: int):
+        self.num_chunks += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        self.total_batch_size += batch_size
+
+    def to_dict(self) -> dict:
+        num_chunks = max(self.num_chunks, 1)
+        return {
+            "chunks": self.num_chunks,
+            "avg_ms": self.total_ms / num_chunks,
+            "max_ms": self.max_ms,
+            "avg_batch_size": self.total_batch_size / num_chunks,
+        }
+
+
+class ChunkBatchScheduler:
+    """Cross-session dynamic batching for the streaming encoder.
+
+    Connection handlers hand their ready chunks to the scheduler instead of
+    calling `encoder.forward_chunk` themselves. A worker thread collects
+    chunks from many sessions, up to `max_batch_size` or until the first
+    chunk has waited `max_wait_ms`, and forwards them with one
+    `encoder.forward_chunk_batch` call. The attention/cnn caches and the
+    offset stay with each session, so a session can move between batches of
+    different sizes freely.
+    """
+
+    def __init__(self, encoder: BaseEncoder, opts: ChunkBatchSchedulerOpt):
+        self.encoder = encoder
+        self.opts = opts
+        logger.info(f"Chunk batch scheduler opts: {opts}")
+
+        self._queue = queue.Queue()
+        self._latency: Dict[int, SessionLatency] = defaultdict(SessionLatency)
+        self._latency_lock = threading.Lock()
+
+        self._stopped = False
+        self._worker = threading.Thread(
+            target=self._loop, name="asr-chunk-batch-scheduler", daemon=True)
+        self._worker.start()
+
+    @staticmethod
+    def is_supported(encoder: BaseEncoder) -> bool:
+        """Whether the encoder can forward chunks of different streams at once.
+        """
+        if type(encoder).forward_chunk is not BaseEncoder.forward_chunk:
+            return False
+        if type(encoder.embed.pos_enc) not in (PositionalEncoding,
+                                               RelPositionalEncoding):
+            return False
+        return not any(
+            isinstance(layer.self_attn, RoPERelPositionMultiHeadedAttention)
+            for layer in encoder.encoders)
+
+    def forward_chunk(
+            self,
+            session_id: int,
+            xs: paddle.Tensor,
+            offset: int,
+            required_cache_size: int,
+            att_cache: paddle.Tensor,
+            cnn_cache: paddle.Tensor,
+    ) -> Tuple[paddle.Tensor, paddle.Tensor, paddle.Tensor]:
+        """Same as `encoder.forward_chunk`, but batched with other sessions.
+        It blocks the caller until the batch containing this chunk is done.
+
+        Args:
+            session_id (int): the session which this chunk belongs to.
+            xs (paddle.Tensor): chunk audio feat, (B=1, T, D)
+            offset (int): current offset in encoder output time stamp
+            required_cache_size (int): cache size required for next chunk
+            att_cache (paddle.Tensor): (elayers, head, cache_t1, d_k * 2)
+            cnn_cache (paddle.Tensor): (elayers, B=1, hidden-dim, cache_t2)
+
+        Returns:
+            paddle.Tensor: output of current input xs, (B=1, chunk_size, hidden-dim)
+            paddle.Tensor: new attention cache of this session
+            paddle.Tensor: new conformer cnn cache of this session
+        """
+        assert xs.shape[0] == 1  # one chunk per session
+        assert not self._stopped, "chunk batch scheduler is stopped"
+        request = ChunkRequest(
+            session_id=session_id,
+            xs=xs,
+            offset=offset,
+            required_cache_size=required_cache_size,
+            att_cache=att_cache,
+            cnn_cache=cnn_cache)
+        self._queue.put(request)
+        return request.future.result()
+
+    def get_latency(self, session_id: int) -> dict:
+        """Latency of the chunks of one session, from submission to result.
+        """
+        with self._latency_lock:
+            return self._latency[session_id].to_dict()
+
+    def release(self, session_id: int):
+        """Drop the statistics of a finished session.
+        """
+        with self._latency_lock:
+            self._latency.pop(session_id, None)
+
+    def stop(self):
+        self._stopped = True
+        self._queue.put(None)
+        self._worker.join()
+
+    def _collect(self) -> List[ChunkRequest]:
+        """Block for the first chunk, then gather more until the batch is full
+        or the first chunk has waited long enough.
+        """
+        first = self._queue.get()
+        if first is None:
+            return []
+
+        requests = [first]
+        deadline = first.submit_time + self.opts.max_wait_ms / 1000.0
+        while len(requests) < self.opts.max_batch_size:
+            timeout = deadline - time.time()
+            try:
+                request = self._queue.get(
+                    timeout=timeout) if timeout > 0 else self._queue.get_nowait(
+                    )
+            except queue.Empty:
+                break
+            if request is None:
+                # stop after this batch
+                self._queue.put(None)
+                break
+            requests.append(request)
+        return requests
+
+    def _loop(self):
+        while True:
+            requests = self._collect()
+            if not requests:
+                break
+
+            # chunks of different length or cache config can not be batched,
+            # e.g. the last chunk of a session
+            groups = defaultdict(list)
+            for request in requests:
+                groups[(request.xs.shape[1],
+                        request.required_cache_size)].append(request)
+
+            for group in groups.values():
+                try:
+                    results = self._forward_batch(group)
+                except Exception as e:
+                    logger.exception(e)
+                    for request in group:
+                        request.future.set_exception(e)
+                    continue
+
+                done_time = time.time()
+                with self._latency_lock:
+                    for request in group:
+                        self._latency[request.session_id].update(
+                            (done_time - request.submit_time) * 1000.0,
+                            len(group))
+                for request, result in zip(group, results):
+                    request.future.set_result(result)
+
+    @paddle.no_grad()
+    def _forward_batch(self, requests: List[ChunkRequest]
+                       ) -> List[Tuple[paddle.Tensor, paddle.Tensor, paddle.
+                                       Tensor]]:
+        if len(requests) == 1:
+            request = requests[0]
+            return [
+                self.encoder.forward_chunk(
+                    request.xs,
+                    request.offset,
+                    request.required_cache_size,
+                    att_cache=request.att_cache,
+                    cnn_cache=request.cnn_cache)
+            ]
+
+        logger.debug(f"forward {len(requests)} chunks in one batch")
+        xs = paddle.concat([request.xs for request in requests], axis=0)
+        offsets = paddle.to_tensor(
+            [request.offset for request in requests], dtype='int64')
+
+        # left pad the attention caches to the same length, (elayers, B, head, cache_t1, d_k * 2)
+        cache_lens = [request.att_cache.shape[2] for request in requests]
+        max_cache_len = max(cache_lens)
+        if max_cache_len > 0:
+            ref_cache = requests[cache_lens.index(max_cache_len)].att_cache
+            elayers, head, _, d_k2 = ref_cache.shape
+            att_caches = []
+            for request, cache_len in zip(requests, cache_lens):
+                pad = paddle.zeros(
+                    [elayers, head, max_cache_len - cache_len, d_k2],
+                    dtype=ref_cache.dtype)
+                if cache_len > 0:
+                    pad = paddle.concat([pad, request.att_cache], axis=2)
+                att_caches.append(pad)
+            att_cache = paddle.stack(att_caches, axis=1)
+        else:
+            att_cache = paddle.zeros([0, 0, 0, 0, 0])
+        att_cache_lens = paddle.to_tensor(cache_lens, dtype='int64')
+
+        # zero cnn cache is the same as the left padding of the first chunk,
+        # (elayers, B, hidden-dim, cache_t2)
+        ref_cnn_cache = next((request.cnn_cache for request in requests
+                              if request.cnn_cache.shape[-1] > 0), None)
+        if ref_cnn_cache is not None:
+            cnn_cache = paddle.concat(
+                [
+                    request.cnn_cache if request.cnn_cache.shape[-1] > 0 else
+                    paddle.zeros_like(ref_cnn_cache) for request in requests
+                ],
+                axis=1)
+        else:
+            cnn_cache = paddle.zeros([0, 0, 0, 0])
+
+        ys, r_att_cache, r_cnn_cache = self.encoder.forward_chunk_batch(
+            xs, offsets, att_cache_lens, att_cache=att_cache, cnn_cache=cnn_cache)
+
+        results = []
+        key_size = r_att_cache.shape[3]
+        chunk_size = ys.shape[1]
+        for i, (request, cache_len) in enumerate(zip(requests, cache_lens)):
+            # same as `next_cache_start` of `encoder.forward_chunk`
+            valid_len = cache_len + chunk_size
+            if request.required_cache_size < 0:
+                keep = valid_len
+            else:
+                keep = min(valid_len, request.required_cache_size)
+            new_att_cache = r_att_cache[:, i, :, key_size - keep:, :]
+            if r_cnn_cache.shape[-1] > 0:
+                new_cnn_cache = r_cnn_cache[:, i:i + 1]
+            else:
+                new_cnn_cache = r_cnn_cache
+            results.append((ys[i:i + 1], new_att_cache, new_cnn_cache))
+        return results
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from dataclasses import dataclass
+from dataclasses import field
 
 import numpy as np
 
@@ -38,13 +39,21 @@ class OnlineCTCEndpoingOpt:
     # that rule to a very large number.
 
     # rule1 times out after 5 seconds of silence, even if we decoded nothing.
-    rule1: OnlineCTCEndpointRule = OnlineCTCEndpointRule(False, 5000, 0)
+    rule1: OnlineCTCEndpointRule = field(
+        default_factory=lambda: OnlineCTCEndpointRule(False, 5000, 0))
     # rule2 times out after 1.0 seconds of silence after decoding something,
     # even if we did not reach a final-state at all.
-    rule2: OnlineCTCEndpointRule = OnlineCTCEndpointRule(True, 1000, 0)
+    rule2: OnlineCTCEndpointRule = field(
+        default_factory=lambda: OnlineCTCEndpointRule(True, 1000, 0))
     # rule3 times out after the utterance is 20 seconds long, regardless of
     # anything else.
-    rule3: OnlineCTCEndpointRule = OnlineCTCEndpointRule(False, 0, 20000)
+    rule3: OnlineCTCEndpointRule = field(
+        default_factory=lambda: OnlineCTCEndpointRule(False, 0, 20000))
+
+    # the segment is also terminated after this many decoded frames, which
+    # bounds the encoder outputs and the search state kept for one segment,
+    # even in the middle of speech. -1 for no limit.
+    max_num_frames: int = -1
 
 
 class OnlineCTCEndpoint:
@@ -59,12 +68,15 @@ class OnlineCTCEndpoint:
 
         self.num_frames_decoded = 0
         self.trailing_silence_frames = 0
+        # whether the endpoint is forced by max_num_frames, not by silence
+        self.max_num_frames_reached = False
 
         self.reset()
 
     def reset(self):
         self.num_frames_decoded = 0
         self.trailing_silence_frames = 0
+        self.max_num_frames_reached = False
 
     def rule_activated(self,
                        rule: OnlineCTCEndpointRule,
@@ -118,4 +130,9 @@ class OnlineCTCEndpoint:
         if self.rule_activated(self.opts.rule3, 'rule3', decoding_something,
                                trailing_silence, utterance_length):
             return True
+        if 0 < self.opts.max_num_frames <= self.num_frames_decoded:
+            logger.info(
+                f"Endpoint: max num frames {self.opts.max_num_frames} reached")
+            self.max_num_frames_reached = True
+            return True
         return False
@@ -11,20 +11,99 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
-from collections import defaultdict
+from typing import Dict
+from typing import Tuple
 
+import numpy as np
 import paddle
 
 from paddlespeech.cli.log import logger
-from paddlespeech.s2t.utils.utility import log_add
 
 __all__ = ['CTCPrefixBeamSearch']
 
 
+def _log_add(*args: np.ndarray) -> np.ndarray:
+    """Elementwise stable log add, the same as `log_add` of each element.
+    """
+    a_max = args[0]
+    for a in args[1:]:
+        a_max = np.maximum(a_max, a)
+    with np.errstate(invalid='ignore'):
+        lsp = np.exp(args[0] - a_max)
+        for a in args[1:]:
+            lsp = lsp + np.exp(a - a_max)
+        return np.where(a_max == -np.inf, -np.inf, a_max + np.log(lsp))
+
+
+class _Tree:
+    """Nodes of (parent, value) in arrays, the root is node 0.
+
+    The prefixes of the hyps are hash-consed in a trie, so that the same
+    prefix is always the same node, and the time stamps are stored as linked
+    lists sharing their heads, so that a hyp is extended without copying.
+    """
+
+    def __init__(self, capacity: int=1024, hash_cons: bool=False):
+        self.parent = np.zeros([capacity], dtype=np.int64)
+        self.value = np.full([capacity], -1, dtype=np.int64)
+        self.size = 1
+        self._children = {} if hash_cons else None
+        self._paths = {0: ()}
+
+    def _grow(self, size: int):
+        if size > self.parent.shape[0]:
+            capacity = max(size, 2 * self.parent.shape[0])
+            self.parent = np.resize(self.parent, capacity)
+            self.value = np.resize(self.value, capacity)
+
+    def add(self, parent: int, value: int) -> int:
+        """Add one node, or get the existed one in a hash-consed tree.
+        """
+        if self._children is not None:
+            key = (parent, value)
+            node = self._children.get(key)
+            if node is not None:
+                return node
+            self._children[key] = self.size
+        self._grow(self.size + 1)
+        self.parent[self.size] = parent
+        self.value[self.size] = value
+        self.size += 1
+        return self.size - 1
+
+    def add_batch(self, parents: np.ndarray, value: int) -> np.ndarray:
+        """Add nodes of the same value, not hash-consed.
+        """
+        num = parents.shape[0]
+        self._grow(self.size + num)
+        nodes = np.arange(self.size, self.size + num)
+        self.parent[nodes] = parents
+        self.value[nodes] = value
+        self.size += num
+        return nodes
+
+    def path(self, node: int) -> Tuple[int, ...]:
+        """Values from the root to the node.
+        """
+        start, values = node, []
+        while node not in self._paths:
+            values.append(int(self.value[node]))
+            node = int(self.parent[node])
+        path = self._paths[node] + tuple(reversed(values))
+        if self._children is not None and values:
+            # prefixes are shared by many hyps and frames
+            self._paths[start] = path
+        return path
+
+
 class CTCPrefixBeamSearch:
     def __init__(self, config):
-        """Implement the ctc prefix beam search
+        """Implement the ctc prefix beam search.
+
+        All the hyps of a frame are extended at once with numpy. The scores
+        of the hyps are kept in arrays, the prefixes in a hash-consed trie and
+        the time stamps in linked lists. It gives the same results as the
+        search step by step in pure python.
 
         Args:
             config (yacs.config.CfgNode): the ctc prefix beam search configuration
@@ -40,7 +119,6 @@ class CTCPrefixBeamSearch:
         )
 
         # state
-        self.cur_hyps = None
         self.hyps = None
         self.abs_time_step = 0
 
@@ -49,27 +127,44 @@ class CTCPrefixBeamSearch:
     def reset(self):
         """Rest the search cache value
         """
-        self.cur_hyps = None
         self.hyps = None
         self.abs_time_step = 0
 
+        self.prefixes = _Tree(hash_cons=True)
+        self.times = _Tree()
+        # the beam, prefix node, scores and time stamp nodes of the hyps:
+        # 0. blank_ending_score,
+        # 1. none_blank_ending_score,
+        # 2. viterbi_blank ending score,
+        # 3. viterbi_non_blank score,
+        # 4. current_token_prob,
+        # 5. times_viterbi_blank, times_b
+        # 6. times_titerbi_non_blank, times_nb
+        self.beam: Dict[str, np.ndarray] = {
+            "prefix": np.zeros([1], dtype=np.int64),
+            "pb": np.zeros([1]),
+            "pnb": np.full([1], -np.inf),
+            "v_b": np.zeros([1]),
+            "v_nb": np.zeros([1]),
+            "cur_token_prob": np.full([1], -np.inf),
+            "times_b": np.zeros([1], dtype=np.int64),
+            "times_nb": np.zeros([1], dtype=np.int64),
+        }
+
     @paddle.no_grad()
     def search(self, ctc_probs, device, blank_id=0):
         """ctc prefix beam search method decode a chunk feature
 
         Args:
-            xs (paddle.Tensor): feature data
-            ctc_probs (paddle.Tensor): the ctc probability of all the tokens
+            ctc_probs (paddle.Tensor): the ctc probability of all the tokens, (T, vocab_size)
             device (paddle.fluid.core_avx.Place): the feature host device, such as CUDAPlace(0).
             blank_id (int, optional): the blank id in the vocab. Defaults to 0.
 
         Returns:
             list: the search result
         """
-        # decode 
         logger.info("start to ctc prefix search")
         assert len(ctc_probs.shape) == 2
-        batch_size = 1
 
         vocab_size = ctc_probs.shape[1]
         first_beam_size = min(self.first_beam_size, vocab_size)
@@ -78,110 +173,28 @@ class CTCPrefixBeamSearch:
             f"effect first and second beam size: {self.first_beam_size}, {self.second_beam_size}"
         )
 
-        maxlen = ctc_probs.shape[0]
+        # 1. First beam prune of all the frames: select topk best
+        if ctc_probs.shape[0] > 0:
+            top_k_logp, top_k_index = ctc_probs.topk(first_beam_size, axis=-1)
+            top_k_logp = top_k_logp.numpy().astype(np.float64)
+            top_k_index = top_k_index.numpy()
 
-        # cur_hyps: (prefix, (blank_ending_score, none_blank_ending_score))
-        # 0. blank_ending_score,
-        # 1. none_blank_ending_score, 
-        # 2. viterbi_blank ending score, 
-        # 3. viterbi_non_blank score, 
-        # 4. current_token_prob, 
-        # 5. times_viterbi_blank, times_b
-        # 6. times_titerbi_non_blank, times_nb
-        if self.cur_hyps is None:
-            self.cur_hyps = [(tuple(), (0.0, -float('inf'), 0.0, 0.0,
-                                        -float('inf'), [], []))]
-            # self.cur_hyps = [(tuple(), (0.0, -float('inf')))]
         # 2. CTC beam search step by step
-        for t in range(0, maxlen):
-            logp = ctc_probs[t]  # (vocab_size,)
-            # next_hyps = defaultdict(lambda: (-float('inf'), -float('inf')))
-            next_hyps = defaultdict(
-                        lambda: (-float('inf'), -float('inf'), -float('inf'), -float('inf'), -float('inf'), [], []))
-
-            # 2.1 First beam prune: select topk best
-            #     do token passing process
-            top_k_logp, top_k_index = logp.topk(
-                first_beam_size)  # (first_beam_size,)
-            for s in top_k_index:
-                s = s.item()
-                ps = logp[s].item()
-                for prefix, (pb, pnb, v_b_s, v_nb_s, cur_token_prob, times_b,
-                             times_nb) in self.cur_hyps:
-                    last = prefix[-1] if len(prefix) > 0 else None
-                    if s == blank_id:  # blank
-                        n_pb, n_pnb, n_v_b, n_v_nb, n_cur_token_prob, n_times_b, n_times_nb = next_hyps[
-                            prefix]
-                        n_pb = log_add([n_pb, pb + ps, pnb + ps])
-
-                        pre_times = times_b if v_b_s > v_nb_s else times_nb
-                        n_times_b = copy.deepcopy(pre_times)
-                        viterbi_score = v_b_s if v_b_s > v_nb_s else v_nb_s
-                        n_v_b = viterbi_score + ps
-                        next_hyps[prefix] = (n_pb, n_pnb, n_v_b, n_v_nb,
-                                             n_cur_token_prob, n_times_b,
-                                             n_times_nb)
-                    elif s == last:
-                        #  Update *ss -> *s;
-                        # case1: *a + a => *a
-                        n_pb, n_pnb, n_v_b, n_v_nb, n_cur_token_prob, n_times_b, n_times_nb = next_hyps[
-                            prefix]
-                        n_pnb = log_add([n_pnb, pnb + ps])
-                        if n_v_nb < v_nb_s + ps:
-                            n_v_nb = v_nb_s + ps
-                            if n_cur_token_prob < ps:
-                                n_cur_token_prob = ps
-                                n_times_nb = copy.deepcopy(times_nb)
-                                n_times_nb[
-                                    -1] = self.abs_time_step  # 注意，这里要重新使用绝对时间
-                        next_hyps[prefix] = (n_pb, n_pnb, n_v_b, n_v_nb,
-                                             n_cur_token_prob, n_times_b,
-                                             n_times_nb)
-
-                        # Update *s-s -> *ss, - is for blank
-                        # Case 2: *aε + a => *aa
-                        n_prefix = prefix + (s, )
-                        n_pb, n_pnb, n_v_b, n_v_nb, n_cur_token_prob, n_times_b, n_times_nb = next_hyps[
-                            n_prefix]
-                        if n_v_nb < v_b_s + ps:
-                            n_v_nb = v_b_s + ps
-                            n_cur_token_prob = ps
-                            n_times_nb = copy.deepcopy(times_b)
-                            n_times_nb.append(self.abs_time_step)
-                        n_pnb = log_add([n_pnb, pb + ps])
-                        next_hyps[n_prefix] = (n_pb, n_pnb, n_v_b, n_v_nb,
-                                               n_cur_token_prob, n_times_b,
-                                               n_times_nb)
-                    else:
-                        # Case 3: *a + b => *ab, *aε + b => *ab
-                        n_prefix = prefix + (s, )
-                        n_pb, n_pnb, n_v_b, n_v_nb, n_cur_token_prob, n_times_b, n_times_nb = next_hyps[
-                            n_prefix]
-                        viterbi_score = v_b_s if v_b_s > v_nb_s else v_nb_s
-                        pre_times = times_b if v_b_s > v_nb_s else times_nb
-                        if n_v_nb < viterbi_score + ps:
-                            n_v_nb = viterbi_score + ps
-                            n_cur_token_prob = ps
-                            n_times_nb = copy.deepcopy(pre_times)
-                            n_times_nb.append(self.abs_time_step)
-
-                        n_pnb = log_add([n_pnb, pb + ps, pnb + ps])
-                        next_hyps[n_prefix] = (n_pb, n_pnb, n_v_b, n_v_nb,
-                                               n_cur_token_prob, n_times_b,
-                                               n_times_nb)
-
-            # 2.2 Second beam prune
-            next_hyps = sorted(
-                next_hyps.items(),
-                key=lambda x: log_add([x[1][0], x[1][1]]),
-                reverse=True)
-            self.cur_hyps = next_hyps[:second_beam_size]
-
-            # 2.3 update the absolute time step
+        for t in range(ctc_probs.shape[0]):
+            self._search_frame(top_k_logp[t], top_k_index[t], second_beam_size,
+                               blank_id)
+            # update the absolute time step
             self.abs_time_step += 1
 
-        self.hyps = [(y[0], log_add([y[1][0], y[1][1]]), y[1][2], y[1][3],
-                      y[1][4], y[1][5], y[1][6]) for y in self.cur_hyps]
+        beam = self.beam
+        scores = _log_add(beam["pb"], beam["pnb"])
+        self.hyps = [(self.prefixes.path(int(beam["prefix"][i])),
+                      float(scores[i]), float(beam["v_b"][i]),
+                      float(beam["v_nb"][i]),
+                      float(beam["cur_token_prob"][i]),
+                      list(self.times.path(int(beam["times_b"][i]))),
+                      list(self.times.path(int(beam["times_nb"][i]))))
+                     for i in range(len(scores))]
 
         logger.info("ctc prefix search success")
         return self.hyps
@@ -206,3 +219,187 @@ class CTCPrefixBeamSearch:
         """do nothing in ctc_prefix_beam_search
         """
         pass
+
+    def _search_frame(self,
+                      logp: np.ndarray,
+                      tokens: np.ndarray,
+                      beam_size: int,
+                      blank_id: int):
+        """Extend all the hyps with the topk tokens of one frame.
+
+        Each new prefix gets its scores from at most three extensions: the
+        blank and the repeated last token of the same prefix, and the last
+        token of the hyp one token shorter. They are applied in the same
+        order as the loop over tokens then hyps.
+
+        Args:
+            logp (np.ndarray): (K,) log prob of the topk tokens.
+            tokens (np.ndarray): (K,) topk tokens.
+            beam_size (int): second beam size.
+            blank_id (int): the blank id in the vocab.
+        """
+        beam = self.beam
+        prefix = beam["prefix"]
+        pb, pnb = beam["pb"], beam["pnb"]
+        v_b, v_nb = beam["v_b"], beam["v_nb"]
+        num_hyps, num_tokens = prefix.shape[0], tokens.shape[0]
+        neg_inf = np.full([num_hyps], -np.inf)
+
+        last = self.prefixes.value[prefix]
+        # (H, K), the token is the last one of the prefix
+        same = last[:, None] == tokens[None, :]
+        is_blank = tokens == blank_id
+        # order of the first update of a new prefix in the loop over tokens then hyps
+        order = (np.arange(num_tokens)[None, :] * num_hyps +
+                 np.arange(num_hyps)[:, None]) * 2
+
+        # the best viterbi path of the hyps
+        b_better = v_b > v_nb
+        viterbi_score = np.where(b_better, v_b, v_nb)
+        pre_times = np.where(b_better, beam["times_b"], beam["times_nb"])
+
+        # extend every hyp with every non blank token, (H, K)
+        # Case 2: *aε + a => *aa, Case 3: *a + b => *ab, *aε + b => *ab
+        ext_pnb_1 = pb[:, None] + logp[None, :]
+        ext_pnb_2 = np.where(same, -np.inf, pnb[:, None] + logp[None, :])
+        ext_v = np.where(same, v_b[:, None], viterbi_score[:, None]) + logp
+        ext_times = np.where(same, beam["times_b"][:, None], pre_times[:, None])
+        ext_order = order + same
+
+        # new scores of the old prefixes, (H,)
+        n_pb, n_v_b = neg_inf, neg_inf
+        n_times_b = np.zeros([num_hyps], dtype=np.int64)
+        n_pnb, n_v_nb, n_cur_token_prob = neg_inf, neg_inf, neg_inf
+        # time stamps of non blank, a new node after `n_times_nb_ref` if `n_times_nb_new`
+        n_times_nb_ref = np.zeros([num_hyps], dtype=np.int64)
+        n_times_nb_new = np.zeros([num_hyps], dtype=bool)
+        first_order = np.full([num_hyps], np.iinfo(np.int64).max)
+
+        # blank
+        if is_blank.any():
+            k = np.argmax(is_blank)
+            n_pb = _log_add(neg_inf, pb + logp[k], pnb + logp[k])
+            n_v_b = viterbi_score + logp[k]
+            n_times_b = pre_times
+            first_order = order[:, k]
+
+        # Case 1: *a + a => *a, the same prefix
+        has_same = same.any(axis=1)
+        k_same = np.argmax(same, axis=1)
+        logp_same = logp[k_same]
+        first_order = np.where(has_same,
+                               np.minimum(first_order, order[np.arange(
+                                   num_hyps), k_same]), first_order)
+
+        # Case 2 and 3 from the hyp one token shorter
+        # (H, H), hyp i is the prefix of hyp j without the last token
+        is_parent = prefix[:, None] == self.prefixes.parent[prefix][None, :]
+        has_parent = has_same & (prefix != 0) & is_parent.any(axis=0)
+        i_parent = np.argmax(is_parent, axis=0)
+        ext_from_parent = (i_parent, k_same)
+        first_order = np.where(
+            has_parent,
+            np.minimum(first_order, ext_order[ext_from_parent]), first_order)
+        same_first = has_same & ~(has_parent & (ext_order[ext_from_parent] <
+                                                order[np.arange(num_hyps),
+                                                      k_same]))
+
+        def update_same(mask):
+            nonlocal n_pnb, n_v_nb, n_cur_token_prob, n_times_nb_ref, n_times_nb_new
+            n_pnb = np.where(mask, _log_add(n_pnb, pnb + logp_same, neg_inf),
+                             n_pnb)
+            update = mask & (n_v_nb < v_nb + logp_same)
+            n_v_nb = np.where(update, v_nb + logp_same, n_v_nb)
+            update &= n_cur_token_prob < logp_same
+            n_cur_token_prob = np.where(update, logp_same, n_cur_token_prob)
+            # replace the last time stamp
+            n_times_nb_ref = np.where(update,
+                                      self.times.parent[beam["times_nb"]],
+                                      n_times_nb_ref)
+            n_times_nb_new |= update
+
+        def update_parent(mask):
+            nonlocal n_pnb, n_v_nb, n_cur_token_prob, n_times_nb_ref, n_times_nb_new
+            n_pnb = np.where(mask,
+                             _log_add(n_pnb, ext_pnb_1[ext_from_parent],
+                                      ext_pnb_2[ext_from_parent]), n_pnb)
+            update = mask & (n_v_nb < ext_v[ext_from_parent])
+            n_v_nb = np.where(update, ext_v[ext_from_parent], n_v_nb)
+            n_cur_token_prob = np.where(update, logp_same, n_cur_token_prob)
+            n_times_nb_ref = np.where(update, ext_times[ext_from_parent],
+                                      n_times_nb_ref)
+            n_times_nb_new |= update
+
+        update_same(same_first)
+        update_parent(has_parent)
+        update_same(has_same & ~same_first)
+
+        # new prefixes extended from the hyps, except the ones of old prefixes
+        is_ext = np.broadcast_to(~is_blank, same.shape).copy()
+        is_ext[ext_from_parent[0][has_parent],
+               ext_from_parent[1][has_parent]] = False
+        ext_i, ext_k = np.nonzero(is_ext)
+        ext_v = ext_v[ext_i, ext_k]
+        ext_update = -np.inf < ext_v
+
+        # 2.2 Second beam prune
+        is_old = first_order < np.iinfo(np.int64).max
+        old_i = np.nonzero(is_old)[0]
+        num_old = old_i.shape[0]
+        scores = np.concatenate([
+            _log_add(n_pb[old_i], n_pnb[old_i]), _log_add(
+                np.full(ext_i.shape, -np.inf), ext_pnb_1[ext_i, ext_k],
+                ext_pnb_2[ext_i, ext_k])
+        ])
+        orders = np.concatenate([first_order[old_i], ext_order[ext_i, ext_k]])
+        # sorted by score, then by the order of the first update
+        best = np.lexsort((orders, -scores))[:beam_size]
+        is_best_old = best < num_old
+        best_old = old_i[best[is_best_old]]
+        best_ext = best[~is_best_old] - num_old
+
+        n_times_nb = np.empty([best.shape[0]], dtype=np.int64)
+        times_nb_ref = np.concatenate([
+            n_times_nb_ref[best_old],
+            np.where(ext_update[best_ext], ext_times[ext_i[best_ext],
+                                                     ext_k[best_ext]], 0)
+        ])
+        times_nb_new = np.concatenate(
+            [n_times_nb_new[best_old], ext_update[best_ext]])
+        n_times_nb[:] = times_nb_ref
+        n_times_nb[times_nb_new] = self.times.add_batch(
+            times_nb_ref[times_nb_new], self.abs_time_step)
+
+        ext_best_k = ext_k[best_ext]
+        self.beam = {
+            "prefix": np.concatenate([
+                prefix[best_old],
+                np.array(
+                    [
+                        self.prefixes.add(int(prefix[i]), int(tokens[k]))
+                        for i, k in zip(ext_i[best_ext], ext_best_k)
+                    ],
+                    dtype=np.int64)
+            ]),
+            "pb": np.concatenate(
+                [n_pb[best_old], np.full(best_ext.shape, -np.inf)]),
+            "pnb": np.concatenate([
+                n_pnb[best_old], scores[num_old:][best_ext]
+            ]),
+            "v_b": np.concatenate(
+                [n_v_b[best_old], np.full(best_ext.shape, -np.inf)]),
+            "v_nb": np.concatenate([n_v_nb[best_old], ext_v[best_ext]]),
+            "cur_token_prob": np.concatenate([
+                n_cur_token_prob[best_old],
+                np.where(ext_update[best_ext], logp[ext_best_k], -np.inf)
+            ]),
+            "times_b": np.concatenate([
+                n_times_b[best_old], np.zeros(best_ext.shape, dtype=np.int64)
+            ]),
+            "times_nb": n_times_nb,
+        }
+        # keep the order of the beam
+        order_in_best = np.concatenate(
+            [np.nonzero(is_best_old)[0], np.nonzero(~is_best_old)[0]])
+        inverse = np.argsort(order_in_best)
+        self.beam = {key: value[inverse] for key, value in self.beam.items()}
@@ -21,7 +21,7 @@ import paddle
 from numpy import float32
 from yacs.config import CfgNode
 
-from paddlespeech.audio.transform.transformation import Transformation
+from paddlespeech.audio.transform.transformation import get_transformation
 from paddlespeech.cli.asr.infer import ASRExecutor
 from paddlespeech.cli.log import logger
 from paddlespeech.resource import CommonTaskResource
@@ -29,7 +29,7 @@ from paddlespeech.s2t.frontend.featurizer.text_featurizer import TextFeaturizer
 from paddlespeech.s2t.modules.ctc import CTCDecoder
 from paddlespeech.s2t.utils.utility import UpdateConfig
 from paddlespeech.server.engine.base_engine import BaseEngine
-from paddlespeech.server.utils import onnx_infer
+from paddlespeech.server.utils.predictor_pool import get_sess_pool
 from paddlespeech.utils.env import MODEL_HOME
 
 __all__ = ['PaddleASRConnectionHanddler', 'ASRServerExecutor', 'ASREngine']
@@ -60,7 +60,7 @@ class PaddleASRConnectionHanddler:
         # extract feat, new only fbank in conformer model
         self.preprocess_conf = self.model_config.preprocess_config
         self.preprocess_args = {"train": False}
-        self.preprocessing = Transformation(self.preprocess_conf)
+        self.preprocessing = get_transformation(self.preprocess_conf)
 
         # frame window and frame shift, in samples unit
         self.win_length = self.preprocess_conf.process[0]['win_length']
@@ -78,7 +78,7 @@ class PaddleASRConnectionHanddler:
     def init_decoder(self):
         if "deepspeech2" in self.model_type:
             assert self.continuous_decoding is False, "ds2 model not support endpoint"
-            self.am_predictor = self.asr_engine.executor.am_predictor
+            self.am_predictor_pool = self.asr_engine.executor.am_predictor_pool
 
             self.decoder = CTCDecoder(
                 odim=self.model_config.output_dim,  # <blank> is in  vocab
@@ -297,22 +297,23 @@ class PaddleASRConnectionHanddler:
         logger.info("start to decoce one chunk for deepspeech2")
         # state_c, state_h, audio_lens, audio
         # 'chunk_state_c_box', 'chunk_state_h_box', 'audio_chunk_lens', 'audio_chunk'
-        input_names = [n.name for n in self.am_predictor.get_inputs()]
-        logger.info(f"ort inputs: {input_names}")
-        # 'softmax_0.tmp_0', 'tmp_5', 'concat_0.tmp_0', 'concat_1.tmp_0'
-        # audio, audio_lens, state_h, state_c
-        output_names = [n.name for n in self.am_predictor.get_outputs()]
-        logger.info(f"ort outpus: {output_names}")
-        assert (len(input_names) == len(output_names))
-        assert isinstance(input_names[0], str)
-
-        input_datas = [
-            self.chunk_state_c_box, self.chunk_state_h_box, x_chunk_lens,
-            x_chunk
-        ]
-        feeds = dict(zip(input_names, input_datas))
-
-        outputs = self.am_predictor.run([*output_names], {**feeds})
+        with self.am_predictor_pool.checkout() as am_predictor:
+            input_names = [n.name for n in am_predictor.get_inputs()]
+            logger.info(f"ort inputs: {input_names}")
+            # 'softmax_0.tmp_0', 'tmp_5', 'concat_0.tmp_0', 'concat_1.tmp_0'
+            # audio, audio_lens, state_h, state_c
+            output_names = [n.name for n in am_predictor.get_outputs()]
+            logger.info(f"ort outpus: {output_names}")
+            assert (len(input_names) == len(output_names))
+            assert isinstance(input_names[0], str)
+
+            input_datas = [
+                self.chunk_state_c_box, self.chunk_state_h_box, x_chunk_lens,
+                x_chunk
+            ]
+            feeds = dict(zip(input_names, input_datas))
+
+            outputs = am_predictor.run([*output_names], {**feeds})
 
         output_chunk_probs, output_chunk_lens, self.chunk_state_h_box, self.chunk_state_c_box = outputs
         self.decoder.next(output_chunk_probs, output_chunk_lens)
@@ -368,8 +369,10 @@ class ASRServerExecutor(ASRExecutor):
         if "deepspeech2" in self.model_type:
             # AM predictor
             logger.debug("ASR engine start to init the am predictor")
-            self.am_predictor = onnx_infer.get_sess(
-                model_path=self.am_model, sess_conf=self.am_predictor_conf)
+            self.am_predictor_pool = get_sess_pool(
+                model_path=self.am_model,
+                sess_conf=self.am_predictor_conf,
+                name="asr_online_am")
         else:
             raise NotImplementedError(
                 f"{self.model_type} not support paddleinference.")
@@ -455,9 +458,6 @@ class ASRServerExecutor(ASRExecutor):
 
 class ASREngine(BaseEngine):
     """ASR model resource
-
-    Args:
-        metaclass: Defaults to Singleton.
     """
 
     def __init__(self):
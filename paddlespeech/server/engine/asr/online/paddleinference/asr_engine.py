@@ -21,7 +21,7 @@ import paddle
 from numpy import float32
 from yacs.config import CfgNode
 
-from paddlespeech.audio.transform.transformation import Transformation
+from paddlespeech.audio.transform.transformation import get_transformation
 from paddlespeech.cli.asr.infer import ASRExecutor
 from paddlespeech.cli.log import logger
 from paddlespeech.resource import CommonTaskResource
@@ -29,7 +29,7 @@ from paddlespeech.s2t.frontend.featurizer.text_featurizer import TextFeaturizer
 from paddlespeech.s2t.modules.ctc import CTCDecoder
 from paddlespeech.s2t.utils.utility import UpdateConfig
 from paddlespeech.server.engine.base_engine import BaseEngine
-from paddlespeech.server.utils.paddle_predictor import init_predictor
+from paddlespeech.server.utils.predictor_pool import init_predictor_pool
 from paddlespeech.utils.env import MODEL_HOME
 
 __all__ = ['PaddleASRConnectionHanddler', 'ASRServerExecutor', 'ASREngine']
@@ -60,7 +60,7 @@ class PaddleASRConnectionHanddler:
         # extract feat, new only fbank in conformer model
         self.preprocess_conf = self.model_config.preprocess_config
         self.preprocess_args = {"train": False}
-        self.preprocessing = Transformation(self.preprocess_conf)
+        self.preprocessing = get_transformation(self.preprocess_conf)
 
         # frame window and frame shift, in samples unit
         self.win_length = self.preprocess_conf.process[0]['win_length']
@@ -78,7 +78,7 @@ class PaddleASRConnectionHanddler:
     def init_decoder(self):
         if "deepspeech2" in self.model_type:
             assert self.continuous_decoding is False, "ds2 model not support endpoint"
-            self.am_predictor = self.asr_engine.executor.am_predictor
+            self.am_predictor_pool = self.asr_engine.executor.am_predictor_pool
 
             self.decoder = CTCDecoder(
                 odim=self.model_config.output_dim,  # <blank> is in  vocab
@@ -295,39 +295,40 @@ class PaddleASRConnectionHanddler:
             logprob: poster probability.
         """
         logger.debug("start to decoce one chunk for deepspeech2")
-        input_names = self.am_predictor.get_input_names()
-        audio_handle = self.am_predictor.get_input_handle(input_names[0])
-        audio_len_handle = self.am_predictor.get_input_handle(input_names[1])
-        h_box_handle = self.am_predictor.get_input_handle(input_names[2])
-        c_box_handle = self.am_predictor.get_input_handle(input_names[3])
+        with self.am_predictor_pool.checkout() as am_predictor:
+            input_names = am_predictor.get_input_names()
+            audio_handle = am_predictor.get_input_handle(input_names[0])
+            audio_len_handle = am_predictor.get_input_handle(input_names[1])
+            h_box_handle = am_predictor.get_input_handle(input_names[2])
+            c_box_handle = am_predictor.get_input_handle(input_names[3])
 
-        audio_handle.reshape(x_chunk.shape)
-        audio_handle.copy_from_cpu(x_chunk)
+            audio_handle.reshape(x_chunk.shape)
+            audio_handle.copy_from_cpu(x_chunk)
 
-        audio_len_handle.reshape(x_chunk_lens.shape)
-        audio_len_handle.copy_from_cpu(x_chunk_lens)
+            audio_len_handle.reshape(x_chunk_lens.shape)
+            audio_len_handle.copy_from_cpu(x_chunk_lens)
 
-        h_box_handle.reshape(self.chunk_state_h_box.shape)
-        h_box_handle.copy_from_cpu(self.chunk_state_h_box)
+            h_box_handle.reshape(self.chunk_state_h_box.shape)
+            h_box_handle.copy_from_cpu(self.chunk_state_h_box)
 
-        c_box_handle.reshape(self.chunk_state_c_box.shape)
-        c_box_handle.copy_from_cpu(self.chunk_state_c_box)
+            c_box_handle.reshape(self.chunk_state_c_box.shape)
+            c_box_handle.copy_from_cpu(self.chunk_state_c_box)
 
-        output_names = self.am_predictor.get_output_names()
-        output_handle = self.am_predictor.get_output_handle(output_names[0])
-        output_lens_handle = self.am_predictor.get_output_handle(
-            output_names[1])
-        output_state_h_handle = self.am_predictor.get_output_handle(
-            output_names[2])
-        output_state_c_handle = self.am_predictor.get_output_handle(
-            output_names[3])
+            output_names = am_predictor.get_output_names()
+            output_handle = am_predictor.get_output_handle(output_names[0])
+            output_lens_handle = am_predictor.get_output_handle(
+                output_names[1])
+            output_state_h_handle = am_predictor.get_output_handle(
+                output_names[2])
+            output_state_c_handle = am_predictor.get_output_handle(
+                output_names[3])
 
-        self.am_predictor.run()
+            am_predictor.run()
 
-        output_chunk_probs = output_handle.copy_to_cpu()
-        output_chunk_lens = output_lens_handle.copy_to_cpu()
-        self.chunk_state_h_box = output_state_h_handle.copy_to_cpu()
-        self.chunk_state_c_box = output_state_c_handle.copy_to_cpu()
+            output_chunk_probs = output_handle.copy_to_cpu()
+            output_chunk_lens = output_lens_handle.copy_to_cpu()
+            self.chunk_state_h_box = output_state_h_handle.copy_to_cpu()
+            self.chunk_state_c_box = output_state_c_handle.copy_to_cpu()
 
         self.decoder.next(output_chunk_probs, output_chunk_lens)
         trans_best, trans_beam = self.decoder.decode()
@@ -382,10 +383,11 @@ class ASRServerExecutor(ASRExecutor):
         if "deepspeech2" in self.model_type:
             # AM predictor
             logger.debug("ASR engine start to init the am predictor")
-            self.am_predictor = init_predictor(
+            self.am_predictor_pool = init_predictor_pool(
                 model_file=self.am_model,
                 params_file=self.am_params,
-                predictor_conf=self.am_predictor_conf)
+                predictor_conf=self.am_predictor_conf,
+                name="asr_online_am")
         else:
             raise NotImplementedError(
                 f"{self.model_type} not support paddleinference.")
@@ -471,9 +473,6 @@ class ASRServerExecutor(ASRExecutor):
 
 class ASREngine(BaseEngine):
     """ASR model resource
-
-    Args:
-        metaclass: Defaults to Singleton.
     """
 
     def __init__(self):
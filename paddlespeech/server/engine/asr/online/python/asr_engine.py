@@ -21,7 +21,9 @@ import paddle
 from numpy import float32
 from yacs.config import CfgNode
 
-from paddlespeech.audio.transform.transformation import Transformation
+from paddlespeech.audio.transform.spectrogram import StreamingLogMelSpectrogramKaldi
+from paddlespeech.audio.transform.transformation import get_transformation
+from paddlespeech.audio.utils import RingBuffer
 from paddlespeech.cli.asr.infer import ASRExecutor
 from paddlespeech.cli.log import logger
 from paddlespeech.resource import CommonTaskResource
@@ -30,11 +32,13 @@ from paddlespeech.s2t.modules.ctc import CTCDecoder
 from paddlespeech.s2t.utils.tensor_utils import add_sos_eos
 from paddlespeech.s2t.utils.tensor_utils import pad_sequence
 from paddlespeech.s2t.utils.utility import UpdateConfig
+from paddlespeech.server.engine.asr.online.batch_scheduler import ChunkBatchScheduler
+from paddlespeech.server.engine.asr.online.batch_scheduler import ChunkBatchSchedulerOpt
 from paddlespeech.server.engine.asr.online.ctc_endpoint import OnlineCTCEndpoingOpt
 from paddlespeech.server.engine.asr.online.ctc_endpoint import OnlineCTCEndpoint
 from paddlespeech.server.engine.asr.online.ctc_search import CTCPrefixBeamSearch
 from paddlespeech.server.engine.base_engine import BaseEngine
-from paddlespeech.server.utils.paddle_predictor import init_predictor
+from paddlespeech.server.utils.predictor_pool import init_predictor_pool
 from paddlespeech.utils.env import MODEL_HOME
 
 __all__ = ['PaddleASRConnectionHanddler', 'ASRServerExecutor', 'ASREngine']
@@ -65,11 +69,21 @@ class PaddleASRConnectionHanddler:
         # extract feat, new only fbank in conformer model
         self.preprocess_conf = self.model_config.preprocess_config
         self.preprocess_args = {"train": False}
-        self.preprocessing = Transformation(self.preprocess_conf)
+        # streaming fbank with the samples of last package cached,
+        # and the other frame level processes of the preprocess config
+        fbank_conf = dict(self.preprocess_conf.process[0])
+        assert fbank_conf.pop('type') == 'fbank_kaldi', fbank_conf
+        self.feat_extractor = StreamingLogMelSpectrogramKaldi(**fbank_conf)
+        self.preprocessing = get_transformation({
+            "process": list(self.preprocess_conf.process[1:])
+        })
 
         # frame window and frame shift, in samples unit
         self.win_length = self.preprocess_conf.process[0]['win_length']
         self.n_shift = self.preprocess_conf.process[0]['n_shift']
+        self.n_mels = self.preprocess_conf.process[0]['n_mels']
+        # (T, D), the frames not decoded yet
+        self.cached_feat = RingBuffer(1024, shape=(self.n_mels, ))
 
         assert self.preprocess_conf.process[0]['fs'] == self.sample_rate, (
             self.sample_rate, self.preprocess_conf.process[0]['fs'])
@@ -77,13 +91,15 @@ class PaddleASRConnectionHanddler:
             self.n_shift / self.preprocess_conf.process[0]['fs'] * 1000)
 
         self.continuous_decoding = self.config.get("continuous_decoding", False)
+        # max encoder output frames retained for one segment, -1 for no limit
+        self.max_retained_frames = self.config.get("max_retained_frames", -1)
         self.init_decoder()
         self.reset()
 
     def init_decoder(self):
         if "deepspeech2" in self.model_type:
             assert self.continuous_decoding is False, "ds2 model not support endpoint"
-            self.am_predictor = self.asr_engine.executor.am_predictor
+            self.am_predictor_pool = self.asr_engine.executor.am_predictor_pool
 
             self.decoder = CTCDecoder(
                 odim=self.model_config.output_dim,  # <blank> is in  vocab
@@ -114,20 +130,31 @@ class PaddleASRConnectionHanddler:
             self.searcher = CTCPrefixBeamSearch(self.ctc_decode_config)
 
             # ctc endpoint
+            # the segment is committed when max_retained_frames is reached,
+            # in both modes, so that the memory of a long session is bounded
+            # by the segment
             self.endpoint_opt = OnlineCTCEndpoingOpt(
-                frame_shift_in_ms=self.frame_shift_in_ms, blank=0)
+                frame_shift_in_ms=self.frame_shift_in_ms,
+                blank=0,
+                max_num_frames=self.max_retained_frames)
             self.endpointer = OnlineCTCEndpoint(self.endpoint_opt)
         else:
             raise ValueError(f"Not supported: {self.model_type}")
 
     def model_reset(self):
         # cache for audio and feat
-        self.remained_wav = None
-        self.cached_feat = None
+        self.feat_extractor.reset()
+        self.cached_feat.clear()
 
         if "deepspeech2" in self.model_type:
             return
 
+        self.segment_reset()
+
+    def segment_reset(self):
+        """Release the encoder outputs and caches of the segment, the samples
+        and frames not decoded yet are kept.
+        """
         ## conformer
         # cache for conformer online
         self.att_cache = paddle.zeros([0, 0, 0, 0])
@@ -153,12 +180,28 @@ class PaddleASRConnectionHanddler:
         # one best timestamp viterbi prob is large.
         self.time_stamp = []
 
+        # the result and token timestamp of the committed segments, which
+        # are kept when the segment is cut by max_retained_frames without
+        # continuous decoding
+        self.committed_transcript = ''
+        self.committed_word_time_stamp = []
+
     def reset_continuous_decoding(self):
         """
         when in continous decoding, reset for next utterance.
+        It also commits the segment cut by max_retained_frames without continuous decoding.
+        The result and time stamps of the segment have been committed by `rescoring`,
+        the encoder outputs, the attention caches and the ctc prefix state
+        of the segment are released here, while the samples and the frames
+        not decoded yet are kept for the next segment.
         """
-        self.global_frame_offset = self.num_frames
-        self.model_reset()
+        if not self.continuous_decoding:
+            # the results of the session go on after the segment
+            self.committed_transcript = self.get_result()
+            self.committed_word_time_stamp = self.word_time_stamp
+        # the first frame not decoded yet
+        self.global_frame_offset = self.num_frames - len(self.cached_feat)
+        self.segment_reset()
         self.searcher.reset()
         self.endpointer.reset()
 
@@ -194,6 +237,8 @@ class PaddleASRConnectionHanddler:
 
         ## endpoint
         self.endpoint_state = False  # True for detect endpoint
+        # True if the endpoint is forced by max_retained_frames
+        self.endpoint_forced = False
 
         ## conformer
         self.model_reset()
@@ -211,52 +256,33 @@ class PaddleASRConnectionHanddler:
             f"This package receive {samples.shape[0]} pcm data. Global samples:{self.num_samples}"
         )
 
-        # self.reamined_wav stores all the samples,
-        # include the original remained_wav and this package samples
-        if self.remained_wav is None:
-            self.remained_wav = samples
-        else:
-            assert self.remained_wav.ndim == 1  # (T,)
-            self.remained_wav = np.concatenate([self.remained_wav, samples])
-        logger.debug(
-            f"The concatenation of remain and now audio samples length is: {self.remained_wav.shape}"
-        )
-
-        if len(self.remained_wav) < self.win_length:
+        # fbank of the new complete frames,
+        # the remained samples are cached in the feat extractor
+        x_chunk = self.feat_extractor.accept_waveform(samples,
+                                                      **self.preprocess_args)
+        if x_chunk.shape[0] == 0:
             # samples not enough for feature window
             return 0
-
-        # fbank
-        x_chunk = self.preprocessing(self.remained_wav, **self.preprocess_args)
-        x_chunk = paddle.to_tensor(x_chunk, dtype="float32").unsqueeze(axis=0)
+        x_chunk = self.preprocessing(x_chunk, **self.preprocess_args)
 
         # feature cache
-        if self.cached_feat is None:
-            self.cached_feat = x_chunk
-        else:
-            assert (len(x_chunk.shape) == 3)  # (B,T,D)
-            assert (len(self.cached_feat.shape) == 3)  # (B,T,D)
-            self.cached_feat = paddle.concat(
-                [self.cached_feat, x_chunk], axis=1)
+        self.cached_feat.push(x_chunk)
 
         # set the feat device
         if self.device is None:
-            self.device = self.cached_feat.place
+            self.device = paddle.get_device()
 
         # cur frame step
-        num_frames = x_chunk.shape[1]
+        num_frames = x_chunk.shape[0]
 
         # global frame step
         self.num_frames += num_frames
 
-        # update remained wav
-        self.remained_wav = self.remained_wav[self.n_shift * num_frames:]
-
         logger.debug(
-            f"process the audio feature success, the cached feat shape: {self.cached_feat.shape}"
+            f"process the audio feature success, the cached feat shape: {len(self.cached_feat)}"
         )
         logger.debug(
-            f"After extract feat, the cached remain the audio samples: {self.remained_wav.shape}"
+            f"After extract feat, the cached remain the audio samples: {len(self.feat_extractor.remained_wav)}"
         )
         logger.debug(f"global samples: {self.num_samples}")
         logger.debug(f"global frames: {self.num_frames}")
@@ -282,11 +308,11 @@ class PaddleASRConnectionHanddler:
             # decoding stride for model, in audio frame unit
             stride = subsampling * decoding_chunk_size
 
-            if self.cached_feat is None:
+            if len(self.cached_feat) == 0:
                 logger.debug("no audio feat, please input more pcm data")
                 return
 
-            num_frames = self.cached_feat.shape[1]
+            num_frames = len(self.cached_feat)
             logger.debug(
                 f"Required decoding window {decoding_window} frames, and the connection has {num_frames} frames"
             )
@@ -319,7 +345,7 @@ class PaddleASRConnectionHanddler:
                 end = min(cur + decoding_window, num_frames)
 
                 # extract the audio
-                x_chunk = self.cached_feat[:, cur:end, :].numpy()
+                x_chunk = self.cached_feat.view(cur, end)[np.newaxis, :, :]
                 x_chunk_lens = np.array([x_chunk.shape[1]])
 
                 trans_best = self.decode_one_chunk(x_chunk, x_chunk_lens)
@@ -327,7 +353,7 @@ class PaddleASRConnectionHanddler:
             self.result_transcripts = [trans_best]
 
             # update feat cache
-            self.cached_feat = self.cached_feat[:, end - cached_feature_num:, :]
+            self.cached_feat.pop(end - cached_feature_num)
 
             # return trans_best[0]
         elif "conformer" in self.model_type or "transformer" in self.model_type:
@@ -355,39 +381,40 @@ class PaddleASRConnectionHanddler:
             logprob: poster probability.
         """
         logger.debug("start to decoce one chunk for deepspeech2")
-        input_names = self.am_predictor.get_input_names()
-        audio_handle = self.am_predictor.get_input_handle(input_names[0])
-        audio_len_handle = self.am_predictor.get_input_handle(input_names[1])
-        h_box_handle = self.am_predictor.get_input_handle(input_names[2])
-        c_box_handle = self.am_predictor.get_input_handle(input_names[3])
+        with self.am_predictor_pool.checkout() as am_predictor:
+            input_names = am_predictor.get_input_names()
+            audio_handle = am_predictor.get_input_handle(input_names[0])
+            audio_len_handle = am_predictor.get_input_handle(input_names[1])
+            h_box_handle = am_predictor.get_input_handle(input_names[2])
+            c_box_handle = am_predictor.get_input_handle(input_names[3])
 
-        audio_handle.reshape(x_chunk.shape)
-        audio_handle.copy_from_cpu(x_chunk)
+            audio_handle.reshape(x_chunk.shape)
+            audio_handle.copy_from_cpu(x_chunk)
 
-        audio_len_handle.reshape(x_chunk_lens.shape)
-        audio_len_handle.copy_from_cpu(x_chunk_lens)
+            audio_len_handle.reshape(x_chunk_lens.shape)
+            audio_len_handle.copy_from_cpu(x_chunk_lens)
 
-        h_box_handle.reshape(self.chunk_state_h_box.shape)
-        h_box_handle.copy_from_cpu(self.chunk_state_h_box)
+            h_box_handle.reshape(self.chunk_state_h_box.shape)
+            h_box_handle.copy_from_cpu(self.chunk_state_h_box)
 
-        c_box_handle.reshape(self.chunk_state_c_box.shape)
-        c_box_handle.copy_from_cpu(self.chunk_state_c_box)
+            c_box_handle.reshape(self.chunk_state_c_box.shape)
+            c_box_handle.copy_from_cpu(self.chunk_state_c_box)
 
-        output_names = self.am_predictor.get_output_names()
-        output_handle = self.am_predictor.get_output_handle(output_names[0])
-        output_lens_handle = self.am_predictor.get_output_handle(
-            output_names[1])
-        output_state_h_handle = self.am_predictor.get_output_handle(
-            output_names[2])
-        output_state_c_handle = self.am_predictor.get_output_handle(
-            output_names[3])
+            output_names = am_predictor.get_output_names()
+            output_handle = am_predictor.get_output_handle(output_names[0])
+            output_lens_handle = am_predictor.get_output_handle(
+                output_names[1])
+            output_state_h_handle = am_predictor.get_output_handle(
+                output_names[2])
+            output_state_c_handle = am_predictor.get_output_handle(
+                output_names[3])
 
-        self.am_predictor.run()
+            am_predictor.run()
 
-        output_chunk_probs = output_handle.copy_to_cpu()
-        output_chunk_lens = output_lens_handle.copy_to_cpu()
-        self.chunk_state_h_box = output_state_h_handle.copy_to_cpu()
-        self.chunk_state_c_box = output_state_c_handle.copy_to_cpu()
+            output_chunk_probs = output_handle.copy_to_cpu()
+            output_chunk_lens = output_lens_handle.copy_to_cpu()
+            self.chunk_state_h_box = output_state_h_handle.copy_to_cpu()
+            self.chunk_state_c_box = output_state_c_handle.copy_to_cpu()
 
         self.decoder.next(output_chunk_probs, output_chunk_lens)
         trans_best, trans_beam = self.decoder.decode()
@@ -401,6 +428,7 @@ class PaddleASRConnectionHanddler:
 
         # reset endpiont state
         self.endpoint_state = False
+        self.endpoint_forced = False
 
         logger.debug(
             "Conformer/Transformer: start to decode with advanced_decoding method"
@@ -426,12 +454,12 @@ class PaddleASRConnectionHanddler:
         # decoding stride, in audio frame unit
         stride = subsampling * decoding_chunk_size
 
-        if self.cached_feat is None:
+        if len(self.cached_feat) == 0:
             logger.debug("no audio feat, please input more pcm data")
             return
 
-        # (B=1,T,D)
-        num_frames = self.cached_feat.shape[1]
+        # (T,D)
+        num_frames = len(self.cached_feat)
         logger.debug(
             f"Required decoding window {decoding_window} frames, and the connection has {num_frames} frames"
         )
@@ -472,15 +500,12 @@ class PaddleASRConnectionHanddler:
             # global chunk_num
             self.chunk_num += 1
             # cur chunk
-            chunk_xs = self.cached_feat[:, cur:end, :]
+            chunk_xs = paddle.to_tensor(
+                self.cached_feat.view(cur, end),
+                dtype="float32").unsqueeze(axis=0)
             # forward chunk
-            (y, self.att_cache,
-             self.cnn_cache) = self.model.encoder.forward_chunk(
-                 chunk_xs,
-                 self.offset,
-                 required_cache_size,
-                 att_cache=self.att_cache,
-                 cnn_cache=self.cnn_cache)
+            (y, self.att_cache, self.cnn_cache) = self.forward_chunk(
+                chunk_xs, required_cache_size)
             outputs.append(y)
 
             # update the global offset, in decoding frame unit
@@ -501,7 +526,7 @@ class PaddleASRConnectionHanddler:
 
         ## decoding
         # advance decoding
-        self.searcher.search(ctc_probs, self.cached_feat.place)
+        self.searcher.search(ctc_probs, self.device)
         # get one best hyps
         self.hyps = self.searcher.get_one_best_hyps()
 
@@ -515,16 +540,60 @@ class PaddleASRConnectionHanddler:
             if self.endpointer.endpoint_detected(ctc_probs.numpy(),
                                                  decoding_something):
                 self.endpoint_state = True
+                self.endpoint_forced = self.endpointer.max_num_frames_reached
                 logger.debug(
                     f"Endpoint is detected at {self.num_frames} frame.")
 
         # advance cache of feat
-        assert self.cached_feat.shape[0] == 1  #(B=1,T,D)
         assert end >= cached_feature_num
-        self.cached_feat = self.cached_feat[:, end - cached_feature_num:, :]
-        assert len(
-            self.cached_feat.shape
-        ) == 3, f"current cache feat shape is: {self.cached_feat.shape}"
+        self.cached_feat.pop(end - cached_feature_num)
+
+    def forward_chunk(self, chunk_xs, required_cache_size):
+        """Forward one chunk with the encoder, batched with the chunks of
+        other connections if the engine has a chunk batch scheduler.
+
+        Args:
+            chunk_xs (paddle.Tensor): (B=1, T, D), chunk audio feat
+            required_cache_size (int): cache size required for next chunk
+
+        Returns:
+            paddle.Tensor: encoder output of the chunk
+            paddle.Tensor: new attention cache
+            paddle.Tensor: new cnn cache
+        """
+        if self.asr_engine.scheduler is None:
+            return self.model.encoder.forward_chunk(
+                chunk_xs,
+                self.offset,
+                required_cache_size,
+                att_cache=self.att_cache,
+                cnn_cache=self.cnn_cache)
+
+        return self.asr_engine.scheduler.forward_chunk(
+            id(self),
+            chunk_xs,
+            self.offset,
+            required_cache_size,
+            att_cache=self.att_cache,
+            cnn_cache=self.cnn_cache)
+
+    def get_latency(self):
+        """return the chunk latency of the connection in the batch scheduler.
+
+        Returns:
+            dict: chunk num, average/max latency in ms and average batch size,
+                None if the chunk batch scheduler is disabled.
+        """
+        if self.asr_engine.scheduler is None:
+            return None
+        return self.asr_engine.scheduler.get_latency(id(self))
+
+    def release(self):
+        """release the resource of the connection held by the engine.
+        """
+        if self.asr_engine.scheduler is not None:
+            logger.info(f"chunk latency: {self.get_latency()}")
+            self.asr_engine.scheduler.release(id(self))
 
     def update_result(self):
         """Conformer/Transformer hyps to result.
@@ -534,7 +603,8 @@ class PaddleASRConnectionHanddler:
 
         # output results and tokenids
         self.result_transcripts = [
-            self.text_feature.defeaturize(hyp) for hyp in hyps
+            self.committed_transcript + self.text_feature.defeaturize(hyp)
+            for hyp in hyps
         ]
         self.result_tokenids = [hyp for hyp in hyps]
 
@@ -681,6 +751,9 @@ class PaddleASRConnectionHanddler:
         global_offset_in_sec = self.global_frame_offset * self.frame_shift_in_ms / 1000.0
         logger.info(f"global offset: {global_offset_in_sec} sec.")
 
+        # the text of the segment
+        transcript = self.result_transcripts[0][len(
+            self.committed_transcript):]
         word_time_stamp = []
         for idx, _ in enumerate(self.time_stamp):
             start = (self.time_stamp[idx - 1] + self.time_stamp[idx]
@@ -692,12 +765,12 @@ class PaddleASRConnectionHanddler:
 
             end = end * decode_frame_shift_in_sec
             word_time_stamp.append({
-                "w": self.result_transcripts[0][idx],
+                "w": transcript[idx],
                 "bg": global_offset_in_sec + start,
                 "ed": global_offset_in_sec + end
             })
 
-        self.word_time_stamp = word_time_stamp
+        self.word_time_stamp = self.committed_word_time_stamp + word_time_stamp
         logger.info(f"word time stamp: {self.word_time_stamp}")
 
 
@@ -750,10 +823,11 @@ class ASRServerExecutor(ASRExecutor):
         if "deepspeech2" in self.model_type:
             # AM predictor
             logger.debug("ASR engine start to init the am predictor")
-            self.am_predictor = init_predictor(
+            self.am_predictor_pool = init_predictor_pool(
                 model_file=self.am_model,
                 params_file=self.am_params,
-                predictor_conf=self.am_predictor_conf)
+                predictor_conf=self.am_predictor_conf,
+                name="asr_online_am")
         elif "conformer" in self.model_type or "transformer" in self.model_type:
             # load model
             # model_type: {model_name}_{dataset}
@@ -848,13 +922,11 @@ class ASRServerExecutor(ASRExecutor):
 
 class ASREngine(BaseEngine):
     """ASR server resource
-
-    Args:
-        metaclass: Defaults to Singleton.
     """
 
     def __init__(self):
         super(ASREngine, self).__init__()
+        self.scheduler = None
 
     def init_model(self) -> bool:
         if not self.executor._init_from_path(
@@ -901,11 +973,39 @@ class ASREngine(BaseEngine):
             )
             return False
 
+        self.init_scheduler()
+
         logger.info("Initialize ASR server engine successfully on device: %s." %
                     (self.device))
 
         return True
 
+    def init_scheduler(self):
+        """Create the chunk batch scheduler shared by all the connections,
+        which batches the encoder forward of concurrent connections.
+        """
+        self.scheduler = None
+        scheduler_conf = self.config.get("batch_scheduler_conf", None)
+        if not scheduler_conf or not scheduler_conf.get("enable", False):
+            return
+
+        model_type = self.config.model_type
+        if "conformer" not in model_type and "transformer" not in model_type:
+            logger.warning(
+                f"chunk batch scheduler is not supported by {model_type}")
+            return
+        encoder = self.executor.model.encoder
+        if not ChunkBatchScheduler.is_supported(encoder):
+            logger.warning(
+                f"chunk batch scheduler is not supported by {type(encoder).__name__}"
+            )
+            return
+
+        opts = ChunkBatchSchedulerOpt(
+            max_batch_size=scheduler_conf.get("max_batch_size", 16),
+            max_wait_ms=scheduler_conf.get("max_wait_ms", 5.0))
+        self.scheduler = ChunkBatchScheduler(encoder, opts)
+
     def new_handler(self):
         """New handler from model.
 
@@ -26,8 +26,8 @@ from paddlespeech.s2t.frontend.featurizer.text_featurizer import TextFeaturizer
 from paddlespeech.s2t.modules.ctc import CTCDecoder
 from paddlespeech.s2t.utils.utility import UpdateConfig
 from paddlespeech.server.engine.base_engine import BaseEngine
-from paddlespeech.server.utils.paddle_predictor import init_predictor
 from paddlespeech.server.utils.paddle_predictor import run_model
+from paddlespeech.server.utils.predictor_pool import init_predictor_pool
 from paddlespeech.utils.env import MODEL_HOME
 
 __all__ = ['ASREngine', 'PaddleASRConnectionHandler']
@@ -106,10 +106,11 @@ class ASRServerExecutor(ASRExecutor):
 
         # AM predictor
         self.am_predictor_conf = am_predictor_conf
-        self.am_predictor = init_predictor(
+        self.am_predictor_pool = init_predictor_pool(
             model_file=self.am_model,
             params_file=self.am_params,
-            predictor_conf=self.am_predictor_conf)
+            predictor_conf=self.am_predictor_conf,
+            name="asr_am")
 
         # decoder
         self.decoder = CTCDecoder(
@@ -138,7 +139,7 @@ class ASRServerExecutor(ASRExecutor):
                 cfg.beam_size, cfg.cutoff_prob, cfg.cutoff_top_n,
                 cfg.num_proc_bsearch)
 
-            output_data = run_model(self.am_predictor,
+            output_data = run_model(self.am_predictor_pool,
                                     [audio.numpy(), audio_len.numpy()])
 
             probs = output_data[0]
@@ -160,9 +161,6 @@ class ASRServerExecutor(ASRExecutor):
 
 class ASREngine(BaseEngine):
     """ASR server engine
-
-    Args:
-        metaclass: Defaults to Singleton.
     """
 
     def __init__(self):
@@ -224,7 +222,7 @@ class PaddleASRConnectionHandler(ASRServerExecutor):
         self.config = self.executor.config
         self.max_len = self.executor.max_len
         self.decoder = self.executor.decoder
-        self.am_predictor = self.executor.am_predictor
+        self.am_predictor_pool = self.executor.am_predictor_pool
         self.text_feature = self.executor.text_feature
 
     def run(self, audio_data):
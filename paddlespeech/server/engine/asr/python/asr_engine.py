@@ -32,9 +32,6 @@ class ASRServerExecutor(ASRExecutor):
 
 class ASREngine(BaseEngine):
     """ASR server engine
-
-    Args:
-        metaclass: Defaults to Singleton.
     """
 
     def __init__(self):
@@ -114,10 +111,15 @@ class PaddleASRConnectionHandler(ASRServerExecutor):
                     io.BytesIO(audio_data), self.asr_engine.config.sample_rate,
                     self.asr_engine.config.force_yes):
                 logger.debug("start run asr engine")
-                self.preprocess(self.asr_engine.config.model,
-                                io.BytesIO(audio_data))
                 st = time.time()
-                self.infer(self.asr_engine.config.model)
+                if self.long_audio:
+                    self._long_audio_postprocess(
+                        list(self.infer_long_audio(io.BytesIO(audio_data))))
+                else:
+                    self.preprocess(self.asr_engine.config.model,
+                                    io.BytesIO(audio_data))
+                    st = time.time()
+                    self.infer(self.asr_engine.config.model)
                 infer_time = time.time() - st
                 self.output = self.postprocess()  # Retrieve result of asr.
             else:
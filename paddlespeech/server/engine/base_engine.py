@@ -14,12 +14,10 @@
 import os
 from typing import Union
 
-from pattern_singleton import Singleton
-
 __all__ = ['BaseEngine']
 
 
-class BaseEngine(metaclass=Singleton):
+class BaseEngine():
     """
         An base engine class
     """
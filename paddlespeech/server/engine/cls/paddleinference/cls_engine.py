@@ -25,8 +25,8 @@ from paddlespeech.cli.cls.infer import CLSExecutor
 from paddlespeech.cli.log import logger
 from paddlespeech.resource import CommonTaskResource
 from paddlespeech.server.engine.base_engine import BaseEngine
-from paddlespeech.server.utils.paddle_predictor import init_predictor
 from paddlespeech.server.utils.paddle_predictor import run_model
+from paddlespeech.server.utils.predictor_pool import init_predictor_pool
 
 __all__ = ['CLSEngine', 'PaddleCLSConnectionHandler']
 
@@ -86,10 +86,11 @@ class CLSServerExecutor(CLSExecutor):
 
         # Create predictor
         self.predictor_conf = predictor_conf
-        self.predictor = init_predictor(
+        self.predictor_pool = init_predictor_pool(
             model_file=self.model_path,
             params_file=self.params_path,
-            predictor_conf=self.predictor_conf)
+            predictor_conf=self.predictor_conf,
+            name="cls")
         logger.debug("Create predictor successfully.")
 
     @paddle.no_grad()
@@ -97,15 +98,13 @@ class CLSServerExecutor(CLSExecutor):
         """
         Model inference and result stored in self.output.
         """
-        output = run_model(self.predictor, [self._inputs['feats'].numpy()])
+        output = run_model(self.predictor_pool,
+                           [self._inputs['feats'].numpy()])
         self._outputs['logits'] = output[0]
 
 
 class CLSEngine(BaseEngine):
     """CLS server engine
-
-    Args:
-        metaclass: Defaults to Singleton.
     """
 
     def __init__(self):
@@ -170,7 +169,7 @@ class PaddleCLSConnectionHandler(CLSServerExecutor):
         self.executor = self.cls_engine.executor
         self._conf = self.executor._conf
         self._label_list = self.executor._label_list
-        self.predictor = self.executor.predictor
+        self.predictor_pool = self.executor.predictor_pool
 
     def run(self, audio_data):
         """engine run 
@@ -32,9 +32,6 @@ class CLSServerExecutor(CLSExecutor):
 
 class CLSEngine(BaseEngine):
     """CLS server engine
-
-    Args:
-        metaclass: Defaults to Singleton.
     """
 
     def __init__(self):
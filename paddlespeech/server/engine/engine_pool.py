@@ -11,10 +11,261 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import gc
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+import paddle
+
+from paddlespeech.cli.log import logger
+from paddlespeech.server.engine.base_engine import BaseEngine
 from paddlespeech.server.engine.engine_factory import EngineFactory
+from paddlespeech.server.utils.errors import ErrorCode
+from paddlespeech.server.utils.exception import ServerBaseException
+
+__all__ = [
+    'EngineKey', 'EngineRegistry', 'get_engine_pool', 'get_engine_registry',
+    'get_engine', 'init_engine_pool'
+]
 
 # global value
+# the default engine of each task
 ENGINE_POOL = {}
+ENGINE_REGISTRY = None
+
+
+class EngineKey(NamedTuple):
+    task: str
+    model: Optional[str]
+    lang: Optional[str]
+    engine_type: str
+
+
+def _rss_mb() -> float:
+    """Resident memory of the process in MB, 0 if it is unknown.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class _EngineEntry:
+    def __init__(self, name: str, key: EngineKey, config, pinned: bool):
+        self.name = name
+        self.key = key
+        self.config = config
+        self.pinned = pinned
+        self.replicas = max(1, config.get("replicas", None) or 1)
+        # the measured memory is used when it is not configured
+        self.memory_mb = config.get("memory_mb", None) or 0.0
+        self.engines = []
+        self.next_replica = 0
+        self.lock = threading.Lock()
+
+
+class EngineRegistry:
+    """The engines of a server, keyed by (task, model, lang, engine_type).
+
+    Several models of a task can be served at the same time, e.g. the
+    Mandarin, English and code-switch asr models. An engine is loaded on its
+    first use, and the least recently used engines are unloaded when the
+    memory of the loaded ones exceeds `max_memory_mb`. An engine may have
+    several replicas, which are used in turn by the requests.
+
+    The memory of an engine is the growth of the resident memory (RSS) of the
+    process when it is loaded, unless `memory_mb` is configured, so the GPU
+    memory of the engines is not counted in the budget.
+
+    Args:
+        max_memory_mb (float, optional): memory budget of the engines in MB,
+            no budget if None. Defaults to None.
+    """
+
+    def __init__(self, max_memory_mb: Optional[float]=None):
+        self.max_memory_mb = max_memory_mb
+        self._entries = OrderedDict()
+        # loaded entries, from the least recently used one
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, name: str, config, pinned: bool=False) -> EngineKey:
+        """Register an engine of the `engine_list` of the server config.
+
+        Args:
+            name (str): `{task}_{engine_type}` or `{task}_{engine_type}_{suffix}`,
+                the section name of the engine in the server config
+            config (CfgNode): the engine config, with optional `replicas`,
+                `memory_mb` and `lazy_load`
+            pinned (bool, optional): never unload the engine. Defaults to False.
+
+        Returns:
+            EngineKey: the key of the engine
+        """
+        task, engine_type = name.split("_")[:2]
+        model = None
+        for field in ("model", "model_type", "am"):
+            if config.get(field, None):
+                model = config[field]
+                break
+        key = EngineKey(task, model, config.get("lang", None), engine_type)
+        assert key not in self._entries, f"duplicated engine {name}: {key}"
+        self._entries[key] = _EngineEntry(name, key, config, pinned)
+        logger.info(f"register engine {name}: {key}")
+        return key
+
+    def keys(self) -> List[EngineKey]:
+        return list(self._entries.keys())
+
+    def find(self,
+             task: str,
+             model: Optional[str]=None,
+             lang: Optional[str]=None,
+             engine_type: Optional[str]=None) -> EngineKey:
+        """Find the engine of a request. `model` matches the model name or the
+        section name of the engine, the first registered engine of the task
+        is chosen when nothing else matches.
+
+        Raises:
+            ServerBaseException: no engine of the task, or no engine of `model`
+        """
+        candidates = [
+            entry for key, entry in self._entries.items()
+            if key.task == task and (engine_type is None or key.engine_type ==
+                                     engine_type)
+        ]
+        if not candidates:
+            raise ServerBaseException(ErrorCode.SERVER_TASK_NOT_EXIST,
+                                      f"no {task} engine")
+        if model is not None:
+            candidates = [
+                entry for entry in candidates
+                if model in (entry.key.model, entry.name)
+            ]
+            if not candidates:
+                raise ServerBaseException(ErrorCode.SERVER_PARAM_ERR,
+                                          f"no {task} engine of model {model}")
+        if lang is not None:
+            # the language is a hint, it does not exclude the other engines
+            candidates = [
+                entry for entry in candidates if entry.key.lang == lang
+            ] or candidates
+        return candidates[0].key
+
+    def get(self,
+            task: str,
+            model: Optional[str]=None,
+            lang: Optional[str]=None,
+            engine_type: Optional[str]=None) -> BaseEngine:
+        """Get an engine of a request, which is loaded if it is not yet, see
+        `find` for the args.
+
+        Returns:
+            BaseEngine: one of the replicas of the engine, in turn
+        """
+        entry = self._entries[self.find(task, model, lang, engine_type)]
+        engines = self.load(entry.key)
+        with entry.lock:
+            engine = engines[entry.next_replica % len(engines)]
+            entry.next_replica += 1
+        return engine
+
+    def load(self, key: EngineKey) -> List[BaseEngine]:
+        """Load the replicas of an engine if they are not loaded.
+
+        Raises:
+            ServerBaseException: failed to init the engine
+
+        Returns:
+            List[BaseEngine]: the replicas
+        """
+        entry = self._entries[key]
+        with entry.lock:
+            if not entry.engines:
+                self._make_room(entry)
+                logger.info(
+                    f"load {entry.replicas} replicas of engine {entry.name}")
+                rss = _rss_mb()
+                engines = []
+                for _ in range(entry.replicas):
+                    engine = EngineFactory.get_engine(
+                        engine_name=key.task, engine_type=key.engine_type)
+                    if engine is None or not engine.init(config=entry.config):
+                        raise ServerBaseException(
+                            ErrorCode.SERVER_INTERNAL_ERR,
+                            f"failed to init engine {entry.name}")
+                    engines.append(engine)
+                if not entry.config.get("memory_mb", None):
+                    entry.memory_mb = max(_rss_mb() - rss, 0.0)
+                entry.engines = engines
+                logger.info(
+                    f"engine {entry.name} loaded, memory: {entry.memory_mb:.1f} MB"
+                )
+            engines = entry.engines
+
+        with self._lock:
+            self._loaded[key] = entry
+            self._loaded.move_to_end(key)
+        return engines
+
+    def unload(self, key: EngineKey):
+        """Unload an engine, the requests which hold it finish normally.
+        """
+        entry = self._entries[key]
+        with self._lock:
+            self._loaded.pop(key, None)
+        entry.engines = []
+        gc.collect()
+        if paddle.device.is_compiled_with_cuda():
+            paddle.device.cuda.empty_cache()
+        logger.info(f"engine {entry.name} unloaded")
+
+    def _make_room(self, entry: _EngineEntry):
+        """Unload the least recently used engines, until the memory of the
+        loaded engines and `entry` is within the budget.
+        """
+        if self.max_memory_mb is None:
+            return
+        with self._lock:
+            loaded = list(self._loaded.values())
+        used = sum(e.memory_mb for e in loaded)
+        for victim in loaded:
+            if used + entry.memory_mb <= self.max_memory_mb:
+                break
+            if victim.pinned or victim is entry:
+                continue
+            # skip the engines being loaded or unloaded by another thread
+            if victim.lock.acquire(blocking=False):
+                try:
+                    self.unload(victim.key)
+                finally:
+                    victim.lock.release()
+                used -= victim.memory_mb
+        if used + entry.memory_mb > self.max_memory_mb:
+            logger.warning(
+                f"load engine {entry.name} over the memory budget: "
+                f"{used + entry.memory_mb:.1f} > {self.max_memory_mb} MB")
+
+    def stats(self) -> Dict[str, dict]:
+        """The engines and whether they are loaded.
+        """
+        return {
+            entry.name: {
+                "key": entry.key._asdict(),
+                "loaded": bool(entry.engines),
+                "replicas": entry.replicas,
+                "memory_mb": entry.memory_mb,
+                "pinned": entry.pinned,
+            }
+            for entry in self._entries.values()
+        }
 
 
 def get_engine_pool() -> dict:
@@ -24,18 +275,49 @@ def get_engine_pool() -> dict:
     return ENGINE_POOL
 
 
+def get_engine_registry() -> EngineRegistry:
+    """ Get engine registry
+    """
+    return ENGINE_REGISTRY
+
+
+def get_engine(task: str,
+               model: Optional[str]=None,
+               lang: Optional[str]=None,
+               engine_type: Optional[str]=None) -> BaseEngine:
+    """ Get the engine of a request, see `EngineRegistry.get`
+    """
+    return ENGINE_REGISTRY.get(task, model, lang, engine_type)
+
+
 def init_engine_pool(config) -> bool:
     """ Init engine pool
+
+    The first engine of each task in `engine_list` is its default one, which
+    is loaded now and never unloaded. The other engines are loaded on first
+    use, unless `lazy_load` of the engine config is False.
     """
     global ENGINE_POOL
+    global ENGINE_REGISTRY
+
+    registry_conf = config.get("engine_registry_conf", None) or {}
+    ENGINE_REGISTRY = EngineRegistry(
+        max_memory_mb=registry_conf.get("max_memory_mb", None))
 
     for engine_and_type in config.engine_list:
         engine = engine_and_type.split("_")[0]
-        engine_type = engine_and_type.split("_")[1]
-        ENGINE_POOL[engine] = EngineFactory.get_engine(
-            engine_name=engine, engine_type=engine_type)
+        engine_conf = config[engine_and_type]
+        default = engine not in ENGINE_POOL
+        key = ENGINE_REGISTRY.register(
+            engine_and_type, engine_conf, pinned=default)
 
-        if not ENGINE_POOL[engine].init(config=config[engine_and_type]):
-            return False
+        if default or not engine_conf.get("lazy_load", True):
+            try:
+                engines = ENGINE_REGISTRY.load(key)
+            except ServerBaseException as e:
+                logger.error(e)
+                return False
+            if default:
+                ENGINE_POOL[engine] = engines[0]
 
     return True
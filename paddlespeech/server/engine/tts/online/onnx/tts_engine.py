@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import base64
 import math
 import os
 import time
@@ -24,8 +23,8 @@ from paddlespeech.cli.log import logger
 from paddlespeech.cli.tts.infer import TTSExecutor
 from paddlespeech.resource import CommonTaskResource
 from paddlespeech.server.engine.base_engine import BaseEngine
-from paddlespeech.server.utils.audio_process import float2pcm
-from paddlespeech.server.utils.onnx_infer import get_sess
+from paddlespeech.server.utils.audio_process import encode_audio
+from paddlespeech.server.utils.predictor_pool import get_sess_pool
 from paddlespeech.server.utils.util import denorm
 from paddlespeech.server.utils.util import get_chunks
 from paddlespeech.t2s.frontend.en_frontend import English
@@ -58,10 +57,11 @@ class TTSServerExecutor(TTSExecutor):
         Init model and other resources from a specific path.
         """
 
-        if (hasattr(self, 'am_sess') or
-            (hasattr(self, 'am_encoder_infer_sess') and
-             hasattr(self, 'am_decoder_sess') and hasattr(
-                 self, 'am_postnet_sess'))) and hasattr(self, 'voc_inference'):
+        if (hasattr(self, 'am_sess_pool') or
+            (hasattr(self, 'am_encoder_infer_sess_pool') and
+             hasattr(self, 'am_decoder_sess_pool') and hasattr(
+                 self, 'am_postnet_sess_pool'))) and hasattr(
+                     self, 'voc_sess_pool'):
             logger.debug('Models had been initialized.')
             return
 
@@ -89,7 +89,8 @@ class TTSServerExecutor(TTSExecutor):
                 self.am_res_path = os.path.dirname(os.path.abspath(am_ckpt))
 
             # create am sess
-            self.am_sess = get_sess(self.am_ckpt, am_sess_conf)
+            self.am_sess_pool = get_sess_pool(
+                self.am_ckpt, am_sess_conf, name="tts_online_am")
 
         elif am == "fastspeech2_cnndecoder_csmsc_onnx":
             if am_ckpt is None or am_stat is None or phones_dict is None:
@@ -122,10 +123,14 @@ class TTSServerExecutor(TTSExecutor):
                 self.am_res_path = os.path.dirname(os.path.abspath(am_ckpt[0]))
 
             # create am sess
-            self.am_encoder_infer_sess = get_sess(self.am_encoder_infer,
-                                                  am_sess_conf)
-            self.am_decoder_sess = get_sess(self.am_decoder, am_sess_conf)
-            self.am_postnet_sess = get_sess(self.am_postnet, am_sess_conf)
+            self.am_encoder_infer_sess_pool = get_sess_pool(
+                self.am_encoder_infer,
+                am_sess_conf,
+                name="tts_online_am_encoder_infer")
+            self.am_decoder_sess_pool = get_sess_pool(
+                self.am_decoder, am_sess_conf, name="tts_online_am_decoder")
+            self.am_postnet_sess_pool = get_sess_pool(
+                self.am_postnet, am_sess_conf, name="tts_online_am_postnet")
 
             self.am_mu, self.am_std = np.load(self.am_stat)
 
@@ -151,7 +156,8 @@ class TTSServerExecutor(TTSExecutor):
         logger.debug(self.voc_res_path)
 
         # create voc sess
-        self.voc_sess = get_sess(self.voc_ckpt, voc_sess_conf)
+        self.voc_sess_pool = get_sess_pool(
+            self.voc_ckpt, voc_sess_conf, name="tts_online_voc")
         logger.debug("Create voc sess successfully.")
 
         with open(self.phones_dict, "r", encoding='utf-8') as f:
@@ -173,9 +179,6 @@ class TTSServerExecutor(TTSExecutor):
 
 class TTSEngine(BaseEngine):
     """TTS server engine
-
-    Args:
-        metaclass: Defaults to Singleton.
     """
 
     def __init__(self, name=None):
@@ -340,8 +343,10 @@ class PaddleTTSConnectionHandler:
             # fastspeech2_csmsc
             if am == "fastspeech2_csmsc_onnx":
                 # am 
-                mel = self.executor.am_sess.run(
-                    output_names=None, input_feed={'text': part_phone_ids})
+                with self.executor.am_sess_pool.checkout() as am_sess:
+                    mel = am_sess.run(
+                        output_names=None,
+                        input_feed={'text': part_phone_ids})
                 mel = mel[0]
                 if first_flag == 1:
                     first_am_et = time.time()
@@ -353,8 +358,9 @@ class PaddleTTSConnectionHandler:
                 voc_chunk_num = len(mel_chunks)
                 voc_st = time.time()
                 for i, mel_chunk in enumerate(mel_chunks):
-                    sub_wav = self.executor.voc_sess.run(
-                        output_names=None, input_feed={'logmel': mel_chunk})
+                    with self.executor.voc_sess_pool.checkout() as voc_sess:
+                        sub_wav = voc_sess.run(
+                            output_names=None, input_feed={'logmel': mel_chunk})
                     sub_wav = self.depadding(sub_wav[0], voc_chunk_num, i,
                                              self.voc_block, self.voc_pad,
                                              self.voc_upsample)
@@ -369,8 +375,10 @@ class PaddleTTSConnectionHandler:
             # fastspeech2_cnndecoder_csmsc 
             elif am == "fastspeech2_cnndecoder_csmsc_onnx":
                 # am 
-                orig_hs = self.executor.am_encoder_infer_sess.run(
-                    None, input_feed={'text': part_phone_ids})
+                with self.executor.am_encoder_infer_sess_pool.checkout(
+                ) as am_encoder_infer_sess:
+                    orig_hs = am_encoder_infer_sess.run(
+                        None, input_feed={'text': part_phone_ids})
                 orig_hs = orig_hs[0]
 
                 # streaming voc chunk info
@@ -383,13 +391,18 @@ class PaddleTTSConnectionHandler:
                 hss = get_chunks(orig_hs, self.am_block, self.am_pad, "am")
                 am_chunk_num = len(hss)
                 for i, hs in enumerate(hss):
-                    am_decoder_output = self.executor.am_decoder_sess.run(
-                        None, input_feed={'xs': hs})
-                    am_postnet_output = self.executor.am_postnet_sess.run(
-                        None,
-                        input_feed={
-                            'xs': np.transpose(am_decoder_output[0], (0, 2, 1))
-                        })
+                    with self.executor.am_decoder_sess_pool.checkout(
+                    ) as am_decoder_sess:
+                        am_decoder_output = am_decoder_sess.run(
+                            None, input_feed={'xs': hs})
+                    with self.executor.am_postnet_sess_pool.checkout(
+                    ) as am_postnet_sess:
+                        am_postnet_output = am_postnet_sess.run(
+                            None,
+                            input_feed={
+                                'xs': np.transpose(am_decoder_output[0],
+                                                   (0, 2, 1))
+                            })
                     am_output_data = am_decoder_output + np.transpose(
                         am_postnet_output[0], (0, 2, 1))
                     normalized_mel = am_output_data[0][0]
@@ -415,8 +428,11 @@ class PaddleTTSConnectionHandler:
                             self.first_am_infer = first_am_et - frontend_et
                         voc_chunk = mel_streaming[start:end, :]
 
-                        sub_wav = self.executor.voc_sess.run(
-                            output_names=None, input_feed={'logmel': voc_chunk})
+                        with self.executor.voc_sess_pool.checkout(
+                        ) as voc_sess:
+                            sub_wav = voc_sess.run(
+                                output_names=None,
+                                input_feed={'logmel': voc_chunk})
                         sub_wav = self.depadding(
                             sub_wav[0], voc_chunk_num, voc_chunk_id,
                             self.voc_block, self.voc_pad, self.voc_upsample)
@@ -442,17 +458,18 @@ class PaddleTTSConnectionHandler:
 
         self.final_response_time = time.time() - frontend_st
 
-    def run(self, sentence: str, spk_id: int=0):
+    def run(self, sentence: str, spk_id: int=0, audio_format: str='base64'):
         """ run include inference and postprocess.
 
         Args:
             sentence (str): text to be synthesized
             spk_id (int, optional): speaker id for multi-speaker speech synthesis. Defaults to 0.
-            
+            audio_format (str, optional): format of the chunks, one of `AUDIO_FORMATS`. Defaults to 'base64'.
+
         Returns:
-            wav_base64: The base64 format of the synthesized audio.
+            Generator: chunks of the synthesized audio, base64 pcm16 strings or raw bytes.
         """
-        wav_list = []
+        num_samples = 0
 
         for wav in self.infer(
                 text=sentence,
@@ -460,16 +477,11 @@ class PaddleTTSConnectionHandler:
                 am=self.config.am,
                 spk_id=spk_id, ):
 
-            # wav type: <class 'numpy.ndarray'>  float32, convert to pcm (base64)
-            wav = float2pcm(wav)  # float32 to int16
-            wav_bytes = wav.tobytes()  # to bytes
-            wav_base64 = base64.b64encode(wav_bytes).decode('utf8')  # to base64
-            wav_list.append(wav)
+            num_samples += len(wav)
 
-            yield wav_base64
+            yield encode_audio(wav, audio_format)
 
-        wav_all = np.concatenate(wav_list, axis=0)
-        duration = len(wav_all) / self.tts_engine.sample_rate
+        duration = num_samples / self.tts_engine.sample_rate
         logger.info(f"sentence: {sentence}")
         logger.info(f"The durations of audio is: {duration} s")
         logger.info(f"first response time: {self.first_response_time} s")
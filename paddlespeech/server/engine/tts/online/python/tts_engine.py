@@ -11,7 +11,6 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import base64
 import math
 import os
 import time
@@ -26,7 +25,7 @@ from paddlespeech.cli.log import logger
 from paddlespeech.cli.tts.infer import TTSExecutor
 from paddlespeech.resource import CommonTaskResource
 from paddlespeech.server.engine.base_engine import BaseEngine
-from paddlespeech.server.utils.audio_process import float2pcm
+from paddlespeech.server.utils.audio_process import encode_audio
 from paddlespeech.server.utils.util import denorm
 from paddlespeech.server.utils.util import get_chunks
 from paddlespeech.t2s.frontend.en_frontend import English
@@ -219,9 +218,6 @@ class TTSServerExecutor(TTSExecutor):
 
 class TTSEngine(BaseEngine):
     """TTS server engine
-
-    Args:
-        metaclass: Defaults to Singleton.
     """
 
     def __init__(self, name=None):
@@ -471,21 +467,19 @@ class PaddleTTSConnectionHandler:
 
         self.final_response_time = time.time() - frontend_st
 
-    def run(
-            self,
-            sentence: str,
-            spk_id: int=0, ):
+    def run(self, sentence: str, spk_id: int=0, audio_format: str='base64'):
         """ run include inference and postprocess.
 
         Args:
             sentence (str): text to be synthesized
             spk_id (int, optional): speaker id for multi-speaker speech synthesis. Defaults to 0.
+            audio_format (str, optional): format of the chunks, one of `AUDIO_FORMATS`. Defaults to 'base64'.
 
         Returns:
-            wav_base64: The base64 format of the synthesized audio.
+            Generator: chunks of the synthesized audio, base64 pcm16 strings or raw bytes.
         """
 
-        wav_list = []
+        num_samples = 0
 
         for wav in self.infer(
                 text=sentence,
@@ -493,16 +487,11 @@ class PaddleTTSConnectionHandler:
                 am=self.config.am,
                 spk_id=spk_id, ):
 
-            # wav type: <class 'numpy.ndarray'>  float32, convert to pcm (base64)
-            wav = float2pcm(wav)  # float32 to int16
-            wav_bytes = wav.tobytes()  # to bytes
-            wav_base64 = base64.b64encode(wav_bytes).decode('utf8')  # to base64
-            wav_list.append(wav)
+            num_samples += len(wav)
 
-            yield wav_base64
+            yield encode_audio(wav, audio_format)
 
-        wav_all = np.concatenate(wav_list, axis=0)
-        duration = len(wav_all) / self.tts_engine.sample_rate
+        duration = num_samples / self.tts_engine.sample_rate
 
         logger.info(f"sentence: {sentence}")
         logger.info(f"The durations of audio is: {duration} s")
@@ -30,8 +30,8 @@ from paddlespeech.server.engine.base_engine import BaseEngine
 from paddlespeech.server.utils.audio_process import change_speed
 from paddlespeech.server.utils.errors import ErrorCode
 from paddlespeech.server.utils.exception import ServerBaseException
-from paddlespeech.server.utils.paddle_predictor import init_predictor
 from paddlespeech.server.utils.paddle_predictor import run_model
+from paddlespeech.server.utils.predictor_pool import init_predictor_pool
 from paddlespeech.t2s.frontend.en_frontend import English
 from paddlespeech.t2s.frontend.zh_frontend import Frontend
 
@@ -63,7 +63,8 @@ class TTSServerExecutor(TTSExecutor):
         """
         Init model and other resources from a specific path.
         """
-        if hasattr(self, 'am_predictor') and hasattr(self, 'voc_predictor'):
+        if hasattr(self, 'am_predictor_pool') and hasattr(
+                self, 'voc_predictor_pool'):
             logger.debug('Models had been initialized.')
             return
         # am
@@ -183,18 +184,20 @@ class TTSServerExecutor(TTSExecutor):
 
         # Create am predictor
         self.am_predictor_conf = am_predictor_conf
-        self.am_predictor = init_predictor(
+        self.am_predictor_pool = init_predictor_pool(
             model_file=self.am_model,
             params_file=self.am_params,
-            predictor_conf=self.am_predictor_conf)
+            predictor_conf=self.am_predictor_conf,
+            name="tts_am")
         logger.debug("Create AM predictor successfully.")
 
         # Create voc predictor
         self.voc_predictor_conf = voc_predictor_conf
-        self.voc_predictor = init_predictor(
+        self.voc_predictor_pool = init_predictor_pool(
             model_file=self.voc_model,
             params_file=self.voc_params,
-            predictor_conf=self.voc_predictor_conf)
+            predictor_conf=self.voc_predictor_conf,
+            name="tts_voc")
         logger.debug("Create Vocoder predictor successfully.")
 
     @paddle.no_grad()
@@ -231,7 +234,7 @@ class TTSServerExecutor(TTSExecutor):
 
         self.am_time = 0
         self.voc_time = 0
-        flags = 0
+        wavs = []
         for i in range(len(phone_ids)):
             am_st = time.time()
             part_phone_ids = phone_ids[i]
@@ -239,7 +242,7 @@ class TTSServerExecutor(TTSExecutor):
             if am_name == 'speedyspeech':
                 part_tone_ids = tone_ids[i]
                 am_result = run_model(
-                    self.am_predictor,
+                    self.am_predictor_pool,
                     [part_phone_ids.numpy(), part_tone_ids.numpy()])
                 mel = am_result[0]
 
@@ -248,34 +251,25 @@ class TTSServerExecutor(TTSExecutor):
                 # multi speaker  do not have static model
                 if am_dataset in {"aishell3", "vctk"}:
                     am_result = run_model(
-                        self.am_predictor,
+                        self.am_predictor_pool,
                         [part_phone_ids.numpy(), np.array([spk_id])])
                 else:
-                    am_result = run_model(self.am_predictor,
+                    am_result = run_model(self.am_predictor_pool,
                                           [part_phone_ids.numpy()])
                 mel = am_result[0]
             self.am_time += (time.time() - am_st)
 
             # voc
             voc_st = time.time()
-            voc_result = run_model(self.voc_predictor, [mel])
-            wav = voc_result[0]
-            wav = paddle.to_tensor(wav)
-
-            if flags == 0:
-                wav_all = wav
-                flags = 1
-            else:
-                wav_all = paddle.concat([wav_all, wav])
+            voc_result = run_model(self.voc_predictor_pool, [mel])
+            wavs.append(voc_result[0])
             self.voc_time += (time.time() - voc_st)
-        self._outputs["wav"] = wav_all
+        # one copy into the output instead of growing it sentence by sentence
+        self._outputs["wav"] = paddle.to_tensor(np.concatenate(wavs))
 
 
 class TTSEngine(BaseEngine):
     """TTS server engine
-
-    Args:
-        metaclass: Defaults to Singleton.
     """
 
     def __init__(self):
@@ -349,8 +343,8 @@ class PaddleTTSConnectionHandler(TTSServerExecutor):
         self.executor = self.tts_engine.executor
         self.config = self.tts_engine.config
         self.frontend = self.executor.frontend
-        self.am_predictor = self.executor.am_predictor
-        self.voc_predictor = self.executor.voc_predictor
+        self.am_predictor_pool = self.executor.am_predictor_pool
+        self.voc_predictor_pool = self.executor.voc_predictor_pool
 
     def postprocess(self,
                     wav,
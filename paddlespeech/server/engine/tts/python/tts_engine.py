@@ -39,9 +39,6 @@ class TTSServerExecutor(TTSExecutor):
 
 class TTSEngine(BaseEngine):
     """TTS server engine
-
-    Args:
-        metaclass: Defaults to Singleton.
     """
 
     def __init__(self, name=None):
@@ -228,7 +225,11 @@ class PaddleTTSConnectionHandler(TTSServerExecutor):
         try:
             infer_st = time.time()
             self.infer(
-                text=sentence, lang=lang, am=self.config.am, spk_id=spk_id)
+                text=sentence,
+                lang=lang,
+                am=self.config.am,
+                spk_id=spk_id,
+                batch_size=self.config.get("batch_size", None) or 1)
             infer_et = time.time()
             infer_time = infer_et - infer_st
             duration = len(
@@ -17,15 +17,35 @@ from typing import List
 from fastapi import APIRouter
 
 from paddlespeech.cli.log import logger
+from paddlespeech.server.engine.engine_pool import get_engine_registry
 from paddlespeech.server.restful.acs_api import router as acs_router
 from paddlespeech.server.restful.asr_api import router as asr_router
 from paddlespeech.server.restful.cls_api import router as cls_router
 from paddlespeech.server.restful.text_api import router as text_router
 from paddlespeech.server.restful.tts_api import router as tts_router
 from paddlespeech.server.restful.vector_api import router as vec_router
+from paddlespeech.server.utils.inference_executor import get_inference_executor
+from paddlespeech.server.utils.predictor_pool import get_predictor_pools
 _router = APIRouter()
 
 
+@_router.get('/paddlespeech/stats')
+def stats():
+    """the engines, the utilization of the predictor pools and the inference executor
+
+    Returns:
+        json: the stats of each predictor pool and engine
+    """
+    registry = get_engine_registry()
+    return {
+        "engines": registry.stats() if registry is not None else {},
+        "predictor_pools":
+        {name: pool.stats()
+         for name, pool in get_predictor_pools().items()},
+        "inference_executor": get_inference_executor().stats(),
+    }
+
+
 def setup_router(api_list: List):
     """setup router for fastapi
 
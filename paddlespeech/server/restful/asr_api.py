@@ -19,7 +19,7 @@ from typing import Union
 from fastapi import APIRouter
 
 from paddlespeech.cli.log import logger
-from paddlespeech.server.engine.engine_pool import get_engine_pool
+from paddlespeech.server.engine.engine_pool import get_engine
 from paddlespeech.server.restful.request import ASRRequest
 from paddlespeech.server.restful.response import ASRResponse
 from paddlespeech.server.restful.response import ErrorResponse
@@ -66,9 +66,11 @@ def asr(request_body: ASRRequest):
     try:
         audio_data = base64.b64decode(request_body.audio)
 
-        # get single engine from engine pool
-        engine_pool = get_engine_pool()
-        asr_engine = engine_pool['asr']
+        # get the engine of the requested model, the default one if None
+        asr_engine = get_engine(
+            'asr',
+            model=request_body.model,
+            lang=request_body.lang.split("_")[0])
 
         if asr_engine.engine_type == "python":
             from paddlespeech.server.engine.asr.python.asr_engine import PaddleASRConnectionHandler
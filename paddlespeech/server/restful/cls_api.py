@@ -19,7 +19,7 @@ from typing import Union
 from fastapi import APIRouter
 
 from paddlespeech.cli.log import logger
-from paddlespeech.server.engine.engine_pool import get_engine_pool
+from paddlespeech.server.engine.engine_pool import get_engine
 from paddlespeech.server.restful.request import CLSRequest
 from paddlespeech.server.restful.response import CLSResponse
 from paddlespeech.server.restful.response import ErrorResponse
@@ -66,9 +66,8 @@ def cls(request_body: CLSRequest):
     try:
         audio_data = base64.b64decode(request_body.audio)
 
-        # get single engine from engine pool
-        engine_pool = get_engine_pool()
-        cls_engine = engine_pool['cls']
+        # get the engine of the requested model, the default one if None
+        cls_engine = get_engine('cls', model=request_body.model)
 
         if cls_engine.engine_type == "python":
             from paddlespeech.server.engine.cls.python.cls_engine import PaddleCLSConnectionHandler
@@ -32,7 +32,8 @@ class ASRRequest(BaseModel):
         "audio_format": "wav",
         "sample_rate": 16000,
         "lang": "zh_cn",
-        "punc":false
+        "punc":false,
+        "model": "conformer_wenetspeech"
     }
     """
     audio: str
@@ -40,6 +41,7 @@ class ASRRequest(BaseModel):
     sample_rate: int
     lang: str
     punc: Optional[bool] = None
+    model: Optional[str] = None
 
 
 #****************************************************************************************/
@@ -55,7 +57,9 @@ class TTSRequest(BaseModel):
         "speed": 1.0,
         "volume": 1.0,
         "sample_rate": 0,
-        "tts_audio_path": "./tts.wav"
+        "tts_audio_path": "./tts.wav",
+        "model": "fastspeech2_csmsc",
+        "lang": "zh"
     }
     
     """
@@ -66,6 +70,8 @@ class TTSRequest(BaseModel):
     volume: float = 1.0
     sample_rate: int = 0
     save_path: str = None
+    model: Optional[str] = None
+    lang: Optional[str] = None
 
 
 #****************************************************************************************/
@@ -76,11 +82,13 @@ class CLSRequest(BaseModel):
     request body example
     {
         "audio": "exSI6ICJlbiIsCgkgICAgInBvc2l0aW9uIjogImZhbHNlIgoJf...",
-        "topk": 1
+        "topk": 1,
+        "model": "panns_cnn14"
     }
     """
     audio: str
     topk: int = 1
+    model: Optional[str] = None
 
 
 #****************************************************************************************/
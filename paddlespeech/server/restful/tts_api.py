@@ -17,8 +17,10 @@ from typing import Union
 
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
 from paddlespeech.cli.log import logger
+from paddlespeech.server.engine.engine_pool import get_engine
 from paddlespeech.server.engine.engine_pool import get_engine_pool
 from paddlespeech.server.restful.request import TTSRequest
 from paddlespeech.server.restful.response import ErrorResponse
@@ -95,9 +97,9 @@ def tts(request_body: TTSRequest):
 
     # run
     try:
-        # get single engine from engine pool
-        engine_pool = get_engine_pool()
-        tts_engine = engine_pool['tts']
+        # get the engine of the requested model, the default one if None
+        tts_engine = get_engine(
+            'tts', model=request_body.model, lang=request_body.lang)
         logger.info("Get tts engine successfully.")
 
         if tts_engine.engine_type == "python":
@@ -144,8 +146,9 @@ async def stream_tts(request_body: TTSRequest):
     text = request_body.text
     spk_id = request_body.spk_id
 
-    engine_pool = get_engine_pool()
-    tts_engine = engine_pool['tts']
+    # in a thread, since an engine not loaded yet is loaded on first use
+    tts_engine = await run_in_threadpool(
+        get_engine, 'tts', model=request_body.model, lang=request_body.lang)
     logger.info("Get tts engine successfully.")
 
     if tts_engine.engine_type == "online":
@@ -31,13 +31,20 @@ if __name__ == "__main__":
         "--output", type=str, help="save audio path", default=None)
     parser.add_argument(
         "--play", type=bool, help="whether to play audio", default=False)
+    parser.add_argument(
+        "--audio_format",
+        type=str,
+        help="audio format of the websocket messages",
+        choices=["base64", "pcm16", "float32"],
+        default="pcm16")
     args = parser.parse_args()
 
     print("tts websocket client start")
-    handler = TTSWsHandler(args.server, args.port, args.play)
+    handler = TTSWsHandler(args.server, args.port, args.play,
+                           args.audio_format)
     loop = asyncio.get_event_loop()
     first_response, final_response, duration, save_audio_success, receive_time_list, chunk_duration_list = loop.run_until_complete(
-        handler.run(args.text, args.output))
+        handler.run(args.text, output=args.output))
     delay_time_list = compute_delay(receive_time_list, chunk_duration_list)
 
     print(f"sentence: {args.text}")
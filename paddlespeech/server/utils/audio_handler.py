@@ -23,7 +23,10 @@ import soundfile
 import websockets
 
 from paddlespeech.cli.log import logger
+from paddlespeech.server.utils.audio_process import AUDIO_FORMATS
+from paddlespeech.server.utils.audio_process import float2pcm
 from paddlespeech.server.utils.audio_process import save_audio
+from paddlespeech.server.utils.audio_process import unpack_audio_frame
 from paddlespeech.server.utils.util import wav2base64
 
 
@@ -253,16 +256,24 @@ class ASRHttpHandler:
 
 
 class TTSWsHandler:
-    def __init__(self, server="127.0.0.1", port=8092, play: bool=False):
+    def __init__(self,
+                 server="127.0.0.1",
+                 port=8092,
+                 play: bool=False,
+                 audio_format: str="pcm16"):
         """PaddleSpeech Online TTS Server Client  audio handler
            Online tts server use the websocket protocal
         Args:
             server (str, optional): the server ip. Defaults to "127.0.0.1".
             port (int, optional): the server port. Defaults to 8092.
             play (bool, optional): whether to play audio. Defaults False
+            audio_format (str, optional): format of the audio messages, "base64" for base64 pcm16 in json,
+                "pcm16" or "float32" for raw audio in binary messages. Defaults to "pcm16".
         """
+        assert audio_format in AUDIO_FORMATS, f"audio_format should be one of {AUDIO_FORMATS}"
         self.server = server
         self.port = port
+        self.audio_format = audio_format
         self.url = "ws://" + self.server + ":" + str(
             self.port) + "/paddlespeech/tts/streaming"
         self.play = play
@@ -299,6 +310,25 @@ class TTSWsHandler:
             self.buffer = b''
             self.mutex.release()
 
+    def _parse_message(self, message):
+        """Status and pcm16 audio of a message of the server.
+
+        Binary messages are the raw audio of `pack_audio_frame`, text messages
+        are json, the audio of which is base64 pcm16. The type of the message
+        is checked, so a server without binary messages still works.
+        """
+        if isinstance(message, bytes):
+            _, is_final, audio = unpack_audio_frame(message)
+            if is_final:
+                return 2, b''
+            if self.audio_format == "float32":
+                return 1, float2pcm(np.frombuffer(
+                    audio, dtype=np.float32)).tobytes()
+            return 1, bytes(audio)
+
+        message = json.loads(message)
+        return message["status"], base64.b64decode(message.get("audio", ''))
+
     async def run(self, text: str, spk_id=0, output: str=None):
         """Send a text to online server
 
@@ -314,7 +344,11 @@ class TTSWsHandler:
         # 1. Send websocket handshake request
         async with websockets.connect(self.url) as ws:
             # 2. Server has already received handshake response, send start request
-            start_request = json.dumps({"task": "tts", "signal": "start"})
+            start_request = json.dumps({
+                "task": "tts",
+                "signal": "start",
+                "format": self.audio_format
+            })
             await ws.send(start_request)
             msg = await ws.recv()
             logger.info(f"client receive msg={msg}")
@@ -336,8 +370,7 @@ class TTSWsHandler:
             # 4. Process the received response
             message = await ws.recv()
             first_response = time.time() - st
-            message = json.loads(message)
-            status = message["status"]
+            status, audio = self._parse_message(message)
             while True:
                 # When throw an exception
                 if status == -1:
@@ -373,8 +406,6 @@ class TTSWsHandler:
                 # Return the audio stream normally
                 elif status == 1:
                     receive_time_list.append(time.time())
-                    audio = message["audio"]
-                    audio = base64.b64decode(audio)  # bytes
                     chunk_duration_list.append(
                         len(audio) / 2.0 / self.sample_rate)
                     all_bytes += audio
@@ -387,8 +418,7 @@ class TTSWsHandler:
                             self.start_play = False
 
                     message = await ws.recv()
-                    message = json.loads(message)
-                    status = message["status"]
+                    status, audio = self._parse_message(message)
 
                 else:
                     logger.error("infer error, return status is invalid.")
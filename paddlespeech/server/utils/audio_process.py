@@ -11,13 +11,23 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import base64
 import os
+import struct
 import wave
 
 import numpy as np
 
 from paddlespeech.cli.log import logger
 
+# formats of the audio of the streaming tts websocket: base64 pcm16 in json
+# text messages, or raw pcm16 / float32 in binary messages
+AUDIO_FORMATS = ('base64', 'pcm16', 'float32')
+
+# header of a binary audio message: little-endian uint32 seq, uint8 is_final
+# and 3 bytes of padding, so that a float32 payload stays aligned
+AUDIO_FRAME_HEADER = struct.Struct('<IB3x')
+
 
 def wav2pcm(wavfile, pcmfile, data_type=np.int16):
     """ Save the wav file as a pcm file
@@ -173,3 +183,52 @@ def save_audio(bytes_data, audio_path, sample_rate: int=24000) -> bool:
         return False
 
     return True
+
+
+def encode_audio(wav, audio_format: str='base64'):
+    """Encode a float32 chunk of the synthesized audio.
+
+    Args:
+        wav (numpy.ndarray): float32 audio in the range of -1 to 1.
+        audio_format (str, optional): one of `AUDIO_FORMATS`. Defaults to 'base64'.
+
+    Returns:
+        Union[str, bytes]: base64 string of pcm16 for 'base64', raw bytes otherwise.
+    """
+    if audio_format == 'float32':
+        return np.asarray(wav, dtype=np.float32).tobytes()
+    wav_bytes = float2pcm(wav).tobytes()
+    if audio_format == 'pcm16':
+        return wav_bytes
+    if audio_format == 'base64':
+        return base64.b64encode(wav_bytes).decode('utf8')
+    raise ValueError(
+        f"audio_format should be one of {AUDIO_FORMATS}, but got {audio_format}"
+    )
+
+
+def pack_audio_frame(seq: int, audio: bytes=b'', is_final: bool=False):
+    """Binary websocket message of a chunk of audio, see `AUDIO_FRAME_HEADER`.
+
+    Args:
+        seq (int): index of the chunk in the sentence.
+        audio (bytes, optional): raw pcm16 or float32 audio. Defaults to b''.
+        is_final (bool, optional): whether it is the last message of the sentence. Defaults to False.
+
+    Returns:
+        bytes: the header followed by the audio.
+    """
+    return AUDIO_FRAME_HEADER.pack(seq, int(is_final)) + audio
+
+
+def unpack_audio_frame(frame: bytes):
+    """Split a binary websocket message made by `pack_audio_frame`.
+
+    Args:
+        frame (bytes): the binary message.
+
+    Returns:
+        Tuple[int, bool, memoryview]: seq, is_final and the audio, without copy.
+    """
+    seq, is_final = AUDIO_FRAME_HEADER.unpack_from(frame)
+    return seq, bool(is_final), memoryview(frame)[AUDIO_FRAME_HEADER.size:]
@@ -25,6 +25,7 @@ class ErrorCode(IntEnum):
 
     SERVER_INTERNAL_ERR = 500  # Internal error.
     SERVER_NETWORK_ERR = 502  # Network exception.
+    SERVER_BUSY = 503  # Too many pending requests.
     SERVER_UNKOWN_ERR = 509  # Unknown error occurred.
 
 
@@ -34,6 +35,7 @@ ErrorMsg = {
     ErrorCode.SERVER_TASK_NOT_EXIST: "Task is not exist.",
     ErrorCode.SERVER_INTERNAL_ERR: "Internal error.",
     ErrorCode.SERVER_NETWORK_ERR: "Network exception.",
+    ErrorCode.SERVER_BUSY: "Server is busy.",
     ErrorCode.SERVER_UNKOWN_ERR: "Unknown error occurred."
 }
 
@@ -0,0 +1,190 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import functools
+import os
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+
+from paddlespeech.cli.log import logger
+from paddlespeech.server.utils.errors import ErrorCode
+from paddlespeech.server.utils.exception import ServerBaseException
+
+__all__ = [
+    'InferenceExecutor', 'get_inference_executor', 'init_inference_executor'
+]
+
+# global value
+INFERENCE_EXECUTOR = None
+
+_END_OF_ITERATION = object()
+
+
+class InferenceExecutor:
+    """Run the blocking inference of the engines in a bounded thread pool,
+    so that the websocket handlers await the results instead of blocking the
+    event loop, and one slow request does not stall the other connections.
+
+    Args:
+        max_workers (int): number of threads shared by all the engines.
+        engine_concurrency (Dict[str, int]): max running calls of each engine,
+            e.g. 1 for engines whose predictor is not thread safe.
+        max_pending (int): max running and waiting calls of each engine, a new
+            call is rejected with `SERVER_BUSY` beyond it.
+    """
+
+    def __init__(self,
+                 max_workers: int=None,
+                 engine_concurrency: Dict[str, int]=None,
+                 max_pending: int=64):
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        self.max_workers = max_workers
+        self.engine_concurrency = dict(engine_concurrency or {})
+        self.max_pending = max_pending
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="inference")
+        # created lazily, since they must be created in the running event loop
+        self._semaphores = {}
+        self._pending = defaultdict(int)
+        self._running = defaultdict(int)
+
+    def _get_semaphore(self, engine_name: str) -> asyncio.Semaphore:
+        if engine_name not in self._semaphores:
+            concurrency = self.engine_concurrency.get(engine_name,
+                                                      self.max_workers)
+            self._semaphores[engine_name] = asyncio.Semaphore(concurrency)
+        return self._semaphores[engine_name]
+
+    async def run(self, engine_name: str, func: Callable, *args, **kwargs):
+        """Run `func(*args, **kwargs)` in the thread pool under the concurrency
+        limit of the engine.
+
+        Args:
+            engine_name (str): the engine which the call belongs to, e.g. asr, tts
+            func (Callable): the blocking function
+
+        Raises:
+            ServerBaseException: too many calls are waiting for the engine
+
+        Returns:
+            Any: the return value of func
+        """
+        if self._pending[engine_name] >= self.max_pending:
+            raise ServerBaseException(
+                ErrorCode.SERVER_BUSY,
+                f"too many pending requests of engine {engine_name}")
+
+        self._pending[engine_name] += 1
+        try:
+            async with self._get_semaphore(engine_name):
+                self._running[engine_name] += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(
+                        self._pool, functools.partial(func, *args, **kwargs))
+                finally:
+                    self._running[engine_name] -= 1
+        finally:
+            self._pending[engine_name] -= 1
+
+    async def iterate(self, engine_name: str,
+                      iterator: Iterator) -> AsyncIterator:
+        """Advance a blocking iterator in the thread pool, e.g. the streaming
+        tts wav generator, each step is scheduled as one call of the engine.
+
+        Args:
+            engine_name (str): the engine which the iterator belongs to
+            iterator (Iterator): the blocking iterator
+
+        Yields:
+            Any: the items of the iterator
+        """
+        while True:
+            item = await self.run(engine_name, next, iterator,
+                                  _END_OF_ITERATION)
+            if item is _END_OF_ITERATION:
+                break
+            yield item
+
+    def stats(self) -> Dict[str, dict]:
+        """Running and waiting calls of each engine.
+        """
+        return {
+            engine_name: {
+                "running": self._running[engine_name],
+                "waiting": pending - self._running[engine_name],
+            }
+            for engine_name, pending in self._pending.items()
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """ Get inference executor
+    """
+    global INFERENCE_EXECUTOR
+    if INFERENCE_EXECUTOR is None:
+        INFERENCE_EXECUTOR = InferenceExecutor()
+    return INFERENCE_EXECUTOR
+
+
+def init_inference_executor(config) -> InferenceExecutor:
+    """ Init inference executor from the server config
+
+    Args:
+        config (CfgNode): server config, with optional `inference_executor_conf`
+
+    Returns:
+        InferenceExecutor: the global inference executor
+    """
+    global INFERENCE_EXECUTOR
+
+    executor_conf = config.get("inference_executor_conf", None) or {}
+
+    # paddle inference predictors are not thread safe, so the engines of
+    # these types run as many calls at a time as their predictor pools, for
+    # all the models and replicas of the task
+    engine_concurrency = {}
+    for engine_and_type in config.engine_list:
+        engine, engine_type = engine_and_type.split("_")[:2]
+        if engine_type.endswith("inference"):
+            engine_conf = config.get(engine_and_type, None) or {}
+            pool_sizes = [
+                conf.get("pool_size", None) or 1
+                for key, conf in engine_conf.items()
+                if key.endswith("predictor_conf") and conf
+            ]
+            replicas = engine_conf.get("replicas", None) or 1
+            engine_concurrency[engine] = engine_concurrency.get(
+                engine, 0) + replicas * min(pool_sizes or [1])
+    engine_concurrency.update(executor_conf.get("engine_concurrency", None) or
+                              {})
+
+    INFERENCE_EXECUTOR = InferenceExecutor(
+        max_workers=executor_conf.get("max_workers", None),
+        engine_concurrency=engine_concurrency,
+        max_pending=executor_conf.get("max_pending", 64))
+    logger.info(
+        f"inference executor: max_workers={INFERENCE_EXECUTOR.max_workers}, "
+        f"engine_concurrency={engine_concurrency}, max_pending={INFERENCE_EXECUTOR.max_pending}"
+    )
+    return INFERENCE_EXECUTOR
@@ -37,7 +37,7 @@ def init_predictor(model_dir: Optional[os.PathLike]=None,
     """
     if model_dir is not None:
         assert os.path.isdir(model_dir), 'Please check model dir.'
-        config = Config(args.model_dir)
+        config = Config(model_dir)
     else:
         assert os.path.isfile(model_file) and os.path.isfile(
             params_file), 'Please check model and parameter files.'
@@ -75,12 +75,17 @@ def run_model(predictor, input: List) -> List:
     """ run predictor
 
     Args:
-        predictor: paddle inference predictor
+        predictor: paddle inference predictor, or a PredictorPool which a
+            predictor is checked out from for the run
         input (list): The input of predictor
 
     Returns:
         list: result list
     """
+    if hasattr(predictor, "checkout"):
+        with predictor.checkout() as _predictor:
+            return run_model(_predictor, input)
+
     input_names = predictor.get_input_names()
     for i, name in enumerate(input_names):
         input_handle = predictor.get_input_handle(name)
@@ -0,0 +1,235 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import queue
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from paddlespeech.cli.log import logger
+from paddlespeech.server.utils.errors import ErrorCode
+from paddlespeech.server.utils.exception import ServerBaseException
+from paddlespeech.server.utils.paddle_predictor import init_predictor
+
+__all__ = [
+    'PredictorPool', 'init_predictor_pool', 'get_sess_pool',
+    'get_predictor_pools'
+]
+
+# all the pools of the process, by name, a pool is dropped with its engine
+PREDICTOR_POOLS = weakref.WeakValueDictionary()
+
+
+class PredictorPool:
+    """A fixed set of predictors, each one is used by one caller at a time.
+
+    Paddle inference predictors are not thread safe, the clones of a
+    predictor share its weights and can run concurrently. An onnxruntime
+    session is thread safe, the pool then holds the same session several
+    times to bound the concurrent runs.
+
+    Args:
+        predictors (List[Any]): the predictors or sessions
+        name (str, optional): name of the pool in the metrics. Defaults to "predictor".
+        timeout (float, optional): default timeout of `checkout` in seconds,
+            None to wait forever. Defaults to None.
+    """
+
+    def __init__(self,
+                 predictors: List[Any],
+                 name: str="predictor",
+                 timeout: Optional[float]=None):
+        assert len(predictors) > 0
+        self.name = name
+        self.size = len(predictors)
+        self.timeout = timeout
+
+        self._free = queue.LifoQueue()
+        for predictor in predictors:
+            self._free.put(predictor)
+
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._max_busy = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+        self._busy_time = 0.0
+        self._start_time = time.time()
+        self._busy_since = self._start_time
+
+    def acquire(self, timeout: Optional[float]=-1) -> Any:
+        """Take a predictor out of the pool.
+
+        Args:
+            timeout (Optional[float], optional): max seconds to wait, None to
+                wait forever, -1 for the default timeout of the pool. Defaults to -1.
+
+        Raises:
+            ServerBaseException: no predictor is returned in time
+
+        Returns:
+            Any: the predictor, which must be given back by `release`
+        """
+        if timeout == -1:
+            timeout = self.timeout
+        st = time.time()
+        try:
+            predictor = self._free.get(timeout=timeout)
+        except queue.Empty:
+            with self._lock:
+                self._timeouts += 1
+            raise ServerBaseException(
+                ErrorCode.SERVER_BUSY,
+                f"no free predictor in pool {self.name} after {timeout}s")
+
+        with self._lock:
+            self._update_busy_time()
+            self._busy += 1
+            self._max_busy = max(self._max_busy, self._busy)
+            self._checkouts += 1
+            self._wait_time += time.time() - st
+        return predictor
+
+    def release(self, predictor: Any):
+        """Give back a predictor taken by `acquire`.
+        """
+        with self._lock:
+            self._update_busy_time()
+            self._busy -= 1
+        self._free.put(predictor)
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float]=-1):
+        """Use a predictor in a with statement, see `acquire`.
+
+        Examples:
+            >>> with pool.checkout() as predictor:
+            ...     predictor.run()
+        """
+        predictor = self.acquire(timeout)
+        try:
+            yield predictor
+        finally:
+            self.release(predictor)
+
+    def _update_busy_time(self):
+        # integral of the busy predictors over time
+        now = time.time()
+        self._busy_time += self._busy * (now - self._busy_since)
+        self._busy_since = now
+
+    def stats(self) -> Dict[str, Any]:
+        """Utilization of the pool since it was created.
+        """
+        with self._lock:
+            self._update_busy_time()
+            elapsed = max(time.time() - self._start_time, 1e-6)
+            return {
+                "size": self.size,
+                "busy": self._busy,
+                "max_busy": self._max_busy,
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms":
+                1000 * self._wait_time / max(self._checkouts, 1),
+                "utilization": self._busy_time / (elapsed * self.size),
+            }
+
+
+def _register(pool: PredictorPool) -> PredictorPool:
+    name = pool.name
+    idx = 1
+    while pool.name in PREDICTOR_POOLS:
+        idx += 1
+        pool.name = f"{name}_{idx}"
+    PREDICTOR_POOLS[pool.name] = pool
+    return pool
+
+
+def init_predictor_pool(model_dir: Optional[os.PathLike]=None,
+                        model_file: Optional[os.PathLike]=None,
+                        params_file: Optional[os.PathLike]=None,
+                        predictor_conf: dict=None,
+                        name: str="predictor") -> PredictorPool:
+    """Create a pool of paddle inference predictors, the first one is
+    created by `init_predictor` and the others are its clones.
+
+    The size of the pool is `pool_size` of predictor_conf, 1 by default, and
+    the default checkout timeout is `pool_timeout` in seconds, no timeout by
+    default.
+
+    Args:
+        model_dir (Optional[os.PathLike], optional): The path of the static model saved in the model layer. Defaults to None.
+        model_file (Optional[os.PathLike], optional): *.pdmodel file path. Defaults to None.
+        params_file (Optional[os.PathLike], optional): *.pdiparams file path.. Defaults to None.
+        predictor_conf (dict, optional): The configuration parameters of predictor. Defaults to None.
+        name (str, optional): name of the pool in the metrics. Defaults to "predictor".
+
+    Returns:
+        PredictorPool: the predictor pool
+    """
+    pool_size = predictor_conf.get("pool_size", None) or 1
+    predictor = init_predictor(
+        model_dir=model_dir,
+        model_file=model_file,
+        params_file=params_file,
+        predictor_conf=predictor_conf)
+    predictors = [predictor] + [predictor.clone() for _ in range(pool_size - 1)]
+    logger.info(f"create {pool_size} predictors of pool {name}")
+    return _register(
+        PredictorPool(
+            predictors,
+            name=name,
+            timeout=predictor_conf.get("pool_timeout", None)))
+
+
+def get_sess_pool(model_path: Optional[os.PathLike]=None,
+                  sess_conf: dict=None,
+                  name: str="sess") -> PredictorPool:
+    """Create a pool of an onnxruntime session by `get_sess`.
+
+    The session is shared by `pool_size` callers at most, 1 by default, the
+    default checkout timeout is `pool_timeout` in seconds, no timeout by
+    default. Set `intra_op_num_threads` about cores / pool_size, so that the
+    concurrent runs do not oversubscribe the cores.
+
+    Args:
+        model_path (Optional[os.PathLike], optional): *.onnx file path. Defaults to None.
+        sess_conf (dict, optional): The configuration parameters of session. Defaults to None.
+        name (str, optional): name of the pool in the metrics. Defaults to "sess".
+
+    Returns:
+        PredictorPool: the session pool
+    """
+    from paddlespeech.server.utils.onnx_infer import get_sess
+
+    pool_size = sess_conf.get("pool_size", None) or 1
+    sess = get_sess(model_path=model_path, sess_conf=sess_conf)
+    return _register(
+        PredictorPool(
+            [sess] * pool_size,
+            name=name,
+            timeout=sess_conf.get("pool_timeout", None)))
+
+
+def get_predictor_pools() -> Dict[str, PredictorPool]:
+    """ Get all the predictor pools of the process
+    """
+    return dict(PREDICTOR_POOLS)
@@ -11,7 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import collections
+from typing import List
+from typing import Optional
+from typing import Tuple
 
 import webrtcvad
 
@@ -24,31 +26,102 @@ class VADAudio():
                  sample_width=2,
                  padding_ms=200,
                  padding_ratio=0.9):
-        """Initializes VAD with given aggressivenes and sets up internal queues"""
+        """Initializes VAD with given aggressivenes and sets up internal buffers"""
         self.vad = webrtcvad.Vad(aggressiveness)
         self.rate = rate
         self.sample_width = sample_width
         self.frame_duration_ms = frame_duration_ms
         self._frame_length = int(rate * (frame_duration_ms / 1000.0) *
                                  self.sample_width)
-        self._buffer_queue = collections.deque()
-        self.ring_buffer = collections.deque(maxlen=padding_ms //
-                                             frame_duration_ms)
+        # the audio not framed yet is self._buffer[self._start:self._end],
+        # the buffer grows only if it can not hold the audio
+        self._buffer = bytearray(rate * sample_width)
+        self._start = 0
+        self._end = 0
+        # ring buffer of the latest padding_ms frames and whether they are
+        # speech, the speech frames in it are counted as frames come and go
+        self._ring_size = padding_ms // frame_duration_ms
+        assert self._ring_size > 0, \
+            "padding_ms should be no less than frame_duration_ms"
+        self._ring = bytearray(self._ring_size * self._frame_length)
+        self._ring_speech = [False] * self._ring_size
+        self._ring_head = 0
+        self._ring_count = 0
+        self._num_voiced = 0
         self._ratio = padding_ratio
+        self._num_frames = 0
         self.triggered = False
 
     def add_audio(self, audio):
-        """Adds new audio to internal queue"""
-        for x in audio:
-            self._buffer_queue.append(x)
+        """Adds new audio to internal buffer"""
+        audio = memoryview(audio).cast('B')
+        size = len(audio)
+        if self._end + size > len(self._buffer):
+            # move the audio not framed yet to the front, grow if needed
+            remaining = self._end - self._start
+            if remaining + size > len(self._buffer):
+                buffer = bytearray(
+                    max(2 * len(self._buffer), remaining + size))
+            else:
+                buffer = self._buffer
+            buffer[:remaining] = self._buffer[self._start:self._end]
+            self._buffer = buffer
+            self._start = 0
+            self._end = remaining
+        self._buffer[self._end:self._end + size] = audio
+        self._end += size
 
     def frame_generator(self):
         """Generator that yields audio frames of frame_duration_ms"""
-        while len(self._buffer_queue) > self._frame_length:
-            frame = bytearray()
-            for _ in range(self._frame_length):
-                frame.append(self._buffer_queue.popleft())
-            yield bytes(frame)
+        while self._end - self._start >= self._frame_length:
+            start = self._start
+            self._start += self._frame_length
+            yield bytes(memoryview(self._buffer)[start:self._start])
+
+    def _process_frame(self, frame) -> Optional[bool]:
+        """Adds a frame to the ring buffer, returns True if an utterence starts,
+        False if an utterence ends, otherwise None.
+        """
+        is_speech = self.vad.is_speech(frame, self.rate)
+        if self._ring_count == self._ring_size:
+            # overwrite the oldest frame
+            index = self._ring_head
+            self._ring_head = (self._ring_head + 1) % self._ring_size
+            self._num_voiced -= self._ring_speech[index]
+        else:
+            index = (self._ring_head + self._ring_count) % self._ring_size
+            self._ring_count += 1
+        self._ring_speech[index] = is_speech
+        self._num_voiced += is_speech
+        self._num_frames += 1
+
+        if not self.triggered:
+            # only the frames before an utterence are yielded as its padding
+            offset = index * self._frame_length
+            self._ring[offset:offset + self._frame_length] = frame
+            if self._num_voiced > self._ratio * self._ring_size:
+                self.triggered = True
+                return True
+        else:
+            num_unvoiced = self._ring_count - self._num_voiced
+            if num_unvoiced > self._ratio * self._ring_size:
+                self.triggered = False
+                return False
+        return None
+
+    def _ring_frames(self) -> List[bytes]:
+        ring = memoryview(self._ring)
+        frames = []
+        for i in range(self._ring_count):
+            index = (self._ring_head + i) % self._ring_size
+            offset = index * self._frame_length
+            frames.append(bytes(ring[offset:offset + self._frame_length]))
+        return frames
+
+    def _clear_ring(self):
+        self._ring_head = 0
+        self._ring_count = 0
+        self._num_voiced = 0
 
     def vad_collector(self):
         """Generator that yields series of consecutive audio frames comprising each utterence, separated by yielding a single None.
@@ -57,22 +130,46 @@ class VADAudio():
                       |---utterence---|        |---utterence---|
         """
         for frame in self.frame_generator():
-            is_speech = self.vad.is_speech(frame, self.rate)
-            if not self.triggered:
-                self.ring_buffer.append((frame, is_speech))
-                num_voiced = len(
-                    [f for f, speech in self.ring_buffer if speech])
-                if num_voiced > self._ratio * self.ring_buffer.maxlen:
-                    self.triggered = True
-                    for f, s in self.ring_buffer:
-                        yield f
-                    self.ring_buffer.clear()
-            else:
+            triggered = self.triggered
+            boundary = self._process_frame(frame)
+            if triggered:
                 yield frame
-                self.ring_buffer.append((frame, is_speech))
-                num_unvoiced = len(
-                    [f for f, speech in self.ring_buffer if not speech])
-                if num_unvoiced > self._ratio * self.ring_buffer.maxlen:
-                    self.triggered = False
+                if boundary is False:
                     yield None
-                    self.ring_buffer.clear()
+                    self._clear_ring()
+            elif boundary:
+                frames = self._ring_frames()
+                self._clear_ring()
+                yield from frames
+
+    def process(self, audio) -> List[Tuple[bool, int]]:
+        """Adds new audio and detects the boundaries of the utterences in it,
+            without copying the audio frames.
+            An utterence starts padding_ms before it is triggered, as vad_collector yields, and ends after the frame untriggering it.
+            Example: [(True, 3200), (False, 48000), (True, 64000)]
+                      |----utterence----|   |---utterence in progress...
+
+        Args:
+            audio (bytes): audio of sample_width bytes per sample, of any length
+
+        Returns:
+            List[Tuple[bool, int]]: the boundaries, True for the start and False for the end of an utterence,
+                and the offset of it in samples from the beginning of the stream.
+        """
+        self.add_audio(audio)
+        boundaries = []
+        samples_per_frame = self._frame_length // self.sample_width
+        buffer = memoryview(self._buffer)
+        while self._end - self._start >= self._frame_length:
+            start = self._start
+            self._start += self._frame_length
+            boundary = self._process_frame(buffer[start:self._start])
+            if boundary is None:
+                continue
+            if boundary:
+                num_frames = self._num_frames - self._ring_count
+            else:
+                num_frames = self._num_frames
+            boundaries.append((boundary, num_frames * samples_per_frame))
+            self._clear_ring()
+        return boundaries
@@ -16,10 +16,13 @@ import json
 from fastapi import APIRouter
 from fastapi import WebSocket
 from fastapi import WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
 from starlette.websockets import WebSocketState as WebSocketState
 
 from paddlespeech.cli.log import logger
-from paddlespeech.server.engine.engine_pool import get_engine_pool
+from paddlespeech.server.engine.engine_pool import get_engine
+from paddlespeech.server.utils.exception import ServerBaseException
+from paddlespeech.server.utils.inference_executor import get_inference_executor
 router = APIRouter()
 
 
@@ -35,16 +38,25 @@ async def websocket_endpoint(websocket: WebSocket):
     #   and only we receive the header, it establish the connection with specific thread
     await websocket.accept()
 
-    #2. if we accept the websocket headers, we will get the online asr engine instance
-    engine_pool = get_engine_pool()
-    asr_model = engine_pool['asr']
-
     #3. each websocket connection, we will create an PaddleASRConnectionHanddler to process such audio
     #   and each connection has its own connection instance to process the request
     #   and only if client send the start signal, we create the PaddleASRConnectionHanddler instance
     connection_handler = None
 
+    # the feature extraction and decoding run in the inference executor,
+    # so that they do not block the other connections
+    executor = get_inference_executor()
+
+    async def run(func, *args, **kwargs):
+        return await executor.run('asr', func, *args, **kwargs)
+
     try:
+        #2. if we accept the websocket headers, we will get the online asr engine instance
+        #   of the model in the query string, e.g. ?model=conformer_online_wenetspeech
+        #   in a thread, since an engine not loaded yet is loaded on first use
+        asr_model = await run_in_threadpool(
+            get_engine, 'asr', model=websocket.query_params.get("model"))
+
         #4. we do a loop to process the audio package by package according the protocal
         #   and only if the client send finished signal, we will break the loop
         while True:
@@ -75,8 +87,8 @@ async def websocket_endpoint(websocket: WebSocket):
                 elif message['signal'] == 'end':
                     # reset single  engine for an new connection
                     # and we will destroy the connection
-                    connection_handler.decode(is_finished=True)
-                    connection_handler.rescoring()
+                    await run(connection_handler.decode, is_finished=True)
+                    await run(connection_handler.rescoring)
                     asr_results = connection_handler.get_result()
                     word_time_stamp = connection_handler.get_word_time_stamp()
                     connection_handler.reset()
@@ -99,18 +111,21 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 # we extract the remained audio pcm 
                 # and decode for the result in this package data
-                connection_handler.extract_feat(message)
-                connection_handler.decode(is_finished=False)
+                await run(connection_handler.extract_feat, message)
+                await run(connection_handler.decode, is_finished=False)
 
                 if connection_handler.endpoint_state:
                     logger.info("endpoint: detected and rescoring.")
-                    connection_handler.rescoring()
+                    await run(connection_handler.rescoring)
                     word_time_stamp = connection_handler.get_word_time_stamp()
 
                 asr_results = connection_handler.get_result()
 
                 if connection_handler.endpoint_state:
-                    if connection_handler.continuous_decoding:
+                    # the segment cut by max_retained_frames is committed
+                    # and the decoding goes on in both modes
+                    if (connection_handler.continuous_decoding or
+                            connection_handler.endpoint_forced):
                         logger.info("endpoint: continue decoding")
                         connection_handler.reset_continuous_decoding()
                     else:
@@ -128,7 +143,17 @@ async def websocket_endpoint(websocket: WebSocket):
                 # return the current partial result
                 # if the engine create the vad instance, this connection will have many partial results 
                 resp = {'result': asr_results}
+                if connection_handler.endpoint_state:
+                    # the committed segment in continuous decoding
+                    resp['times'] = word_time_stamp
                 await websocket.send_json(resp)
 
+    except ServerBaseException as e:
+        logger.error(e.msg)
+        resp = {"status": "error", "code": int(e.error_code), "message": e.msg}
+        await websocket.send_json(resp)
     except WebSocketDisconnect as e:
         logger.error(e)
+    finally:
+        if hasattr(connection_handler, "release"):
+            connection_handler.release()
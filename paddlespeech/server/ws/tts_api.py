@@ -16,10 +16,16 @@ import uuid
 
 from fastapi import APIRouter
 from fastapi import WebSocket
+from starlette.concurrency import run_in_threadpool
 from starlette.websockets import WebSocketState as WebSocketState
 
 from paddlespeech.cli.log import logger
+from paddlespeech.server.engine.engine_pool import get_engine
 from paddlespeech.server.engine.engine_pool import get_engine_pool
+from paddlespeech.server.utils.audio_process import AUDIO_FORMATS
+from paddlespeech.server.utils.audio_process import pack_audio_frame
+from paddlespeech.server.utils.exception import ServerBaseException
+from paddlespeech.server.utils.inference_executor import get_inference_executor
 
 router = APIRouter()
 
@@ -37,11 +43,23 @@ async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
 
     #2. if we accept the websocket headers, we will get the online tts engine instance
-    engine_pool = get_engine_pool()
-    tts_engine = engine_pool['tts']
+    #   of the model in the query string, e.g. ?model=fastspeech2_cnndecoder_csmsc
+    #   in a thread, since an engine not loaded yet is loaded on first use
+    try:
+        tts_engine = await run_in_threadpool(
+            get_engine, 'tts', model=websocket.query_params.get("model"))
+    except ServerBaseException as e:
+        logger.error(e.msg)
+        await websocket.send_json({"status": -1, "signal": e.msg})
+        await websocket.close()
+        return
 
     connection_handler = None
 
+    # the synthesis runs in the inference executor chunk by chunk,
+    # so that it does not block the other connections
+    executor = get_inference_executor()
+
     if tts_engine.engine_type == "online":
         from paddlespeech.server.engine.tts.online.python.tts_engine import PaddleTTSConnectionHandler
     elif tts_engine.engine_type == "online-onnx":
@@ -60,12 +78,28 @@ async def websocket_endpoint(websocket: WebSocket):
 
             if 'signal' in message:
                 # start request
+                # the optional "format" negotiates the audio messages:
+                # "base64" (default) sends base64 pcm16 in json messages,
+                # "pcm16" or "float32" sends raw audio in binary messages
+                # with the header of `pack_audio_frame`
                 if message['signal'] == 'start':
+                    audio_format = message.get('format', 'base64')
+                    if audio_format not in AUDIO_FORMATS:
+                        resp = {
+                            "status": -1,
+                            "signal":
+                            f"format should be one of {AUDIO_FORMATS}, but got {audio_format}"
+                        }
+                        await websocket.send_json(resp)
+                        continue
+
                     session = uuid.uuid1().hex
                     resp = {
                         "status": 0,
                         "signal": "server ready",
-                        "session": session
+                        "session": session,
+                        "format": audio_format,
+                        "sample_rate": tts_engine.sample_rate
                     }
 
                     connection_handler = PaddleTTSConnectionHandler(tts_engine)
@@ -92,23 +126,33 @@ async def websocket_endpoint(websocket: WebSocket):
 
                 # run
                 wav_generator = connection_handler.run(
-                    sentence=text, spk_id=spk_id)
-
-                while True:
-                    try:
-                        tts_results = next(wav_generator)
-                        resp = {"status": 1, "audio": tts_results}
-                        await websocket.send_json(resp)
-                    except StopIteration as e:
+                    sentence=text, spk_id=spk_id, audio_format=audio_format)
+
+                try:
+                    if audio_format == 'base64':
+                        async for tts_results in executor.iterate(
+                                'tts', wav_generator):
+                            resp = {"status": 1, "audio": tts_results}
+                            await websocket.send_json(resp)
                         resp = {"status": 2, "audio": ''}
                         await websocket.send_json(resp)
-                        logger.info(
-                            "Complete the synthesis of the audio streams")
-                        break
-                    except Exception as e:
-                        resp = {"status": -1, "audio": ''}
-                        await websocket.send_json(resp)
-                        break
+                    else:
+                        seq = 0
+                        async for tts_results in executor.iterate(
+                                'tts', wav_generator):
+                            await websocket.send_bytes(
+                                pack_audio_frame(seq, tts_results))
+                            seq += 1
+                        await websocket.send_bytes(
+                            pack_audio_frame(seq, is_final=True))
+                    logger.info("Complete the synthesis of the audio streams")
+                except ServerBaseException as e:
+                    logger.error(e.msg)
+                    resp = {"status": -1, "audio": ''}
+                    await websocket.send_json(resp)
+                except Exception as e:
+                    resp = {"status": -1, "audio": ''}
+                    await websocket.send_json(resp)
 
             else:
                 logger.error(
@@ -18,9 +18,10 @@ from typing import Callable
 from typing import Dict
 from typing import List
 
-import numpy as np
 from paddle.io import Dataset
 
+from paddlespeech.t2s.datasets.feature_store import load_feature
+
 
 class DataTable(Dataset):
     """Dataset to load and convert data for general purpose.
@@ -28,7 +29,10 @@ class DataTable(Dataset):
         data (List[Dict[str, Any]]): Metadata, a list of meta datum, each of which is composed of  several fields
         fields (List[str], optional): Fields to use, if not specified, all the fields in the data are used, by default None
         converters (Dict[str, Callable], optional): Converters used to process each field, by default None
-        use_cache (bool, optional): Whether to use cache, by default False
+        use_cache (bool, optional): Whether to use cache, by default False.
+            With `load_feature` as the converter of features packed in a `FeatureStore`
+            (see `utils/pack_features.py`), loading an example costs no copy and the
+            features are shared by the dataloader workers, so the cache is not needed.
 
     Raises:
         ValueError:
@@ -173,10 +177,10 @@ class StarGANv2VCDataTable(DataTable):
         # mel_tensor, label, ref_mel_tensor, ref2_mel_tensor, ref_label
         new_example = {
             'utt_id': data['utt_id'],
-            'mel': np.load(data['speech']),
+            'mel': load_feature(data['speech']),
             'label': int(data['spk_id']),
-            'ref_mel': np.load(ref_data['speech']),
-            'ref_mel_2': np.load(ref_data_2['speech']),
+            'ref_mel': load_feature(ref_data['speech']),
+            'ref_mel_2': load_feature(ref_data_2['speech']),
             'ref_label': int(ref_label)
         }
 
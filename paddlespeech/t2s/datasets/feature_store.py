@@ -0,0 +1,211 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A consolidated store of the features of a dataset.
+
+The features of a field, e.g. `speech`, of all the utterances are packed in
+one file `{field}.bin`, the rows of which are indexed by `{field}_index.npy`
+of (offset, length) in rows. `meta.json` keeps the dtype and the shape of a
+row of each field.
+
+Instead of the path of a `.npy` file, the metadata keeps a reference to the
+feature, `{store_dir}#{field}#{index}`, which `load_feature` loads.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+import numpy as np
+
+__all__ = ["FeatureStoreWriter", "FeatureStore", "load_feature"]
+
+REF_SEP = "#"
+
+
+def make_ref(root: os.PathLike, field: str, index: int) -> str:
+    return f"{root}{REF_SEP}{field}{REF_SEP}{index}"
+
+
+class FeatureStoreWriter:
+    """Append the features of utterances to a feature store.
+
+    Args:
+        root (os.PathLike): directory of the store.
+        mode (str, optional): 'w' to create a new store, 'a' to append to an existing one, by default 'w'
+        dtype (np.dtype, optional): dtype of the features, None to keep the dtype of the first feature of each field, by default np.float32
+    """
+
+    def __init__(self,
+                 root: os.PathLike,
+                 mode: str='w',
+                 dtype: Optional[np.dtype]=np.float32):
+        assert mode in ('w', 'a'), "mode should be 'w' or 'a'"
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.dtype = None if dtype is None else np.dtype(dtype)
+        self.mode = mode
+
+        self.meta = {}
+        self.index = {}
+        self.num_rows = {}
+        self.files = {}
+        if mode == 'a' and (self.root / "meta.json").is_file():
+            with open(self.root / "meta.json", 'rt') as f:
+                self.meta = json.load(f)
+            for field in self.meta:
+                index = np.load(self.root / f"{field}_index.npy")
+                self.index[field] = index.tolist()
+                self.num_rows[field] = int(index[:, 1].sum())
+
+    def _open(self, field: str, feat: np.ndarray):
+        if field not in self.meta:
+            dtype = feat.dtype if self.dtype is None else self.dtype
+            self.meta[field] = {
+                "dtype": dtype.name,
+                "shape": list(feat.shape[1:])
+            }
+            self.index[field] = []
+            self.num_rows[field] = 0
+            mode = 'wb'
+        else:
+            assert list(feat.shape[1:]) == self.meta[field]["shape"], \
+                f"shape of {field} should be (*, {self.meta[field]['shape']}), but got {feat.shape}"
+            # append to the features of the store opened in mode 'a'
+            mode = 'ab'
+        self.files[field] = open(self.root / f"{field}.bin", mode)
+
+    def append(self, feats: Dict[str, np.ndarray]) -> Dict[str, str]:
+        """Append the features of an utterance.
+
+        Args:
+            feats (Dict[str, np.ndarray]): the features of each field, (num_rows, *)
+
+        Returns:
+            Dict[str, str]: the reference to each feature
+        """
+        refs = {}
+        for field, feat in feats.items():
+            feat = np.asarray(feat)
+            if field not in self.files:
+                self._open(field, feat)
+            feat = np.ascontiguousarray(
+                feat, dtype=self.meta[field]["dtype"])
+            self.files[field].write(feat.tobytes())
+            refs[field] = make_ref(self.root, field, len(self.index[field]))
+            self.index[field].append((self.num_rows[field], feat.shape[0]))
+            self.num_rows[field] += feat.shape[0]
+        return refs
+
+    def close(self):
+        for field, f in self.files.items():
+            f.close()
+            np.save(
+                self.root / f"{field}_index.npy",
+                np.array(self.index[field], dtype=np.int64).reshape([-1, 2]),
+                allow_pickle=False)
+        self.files = {}
+        with open(self.root / "meta.json", 'wt') as f:
+            json.dump(self.meta, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class FeatureStore:
+    """Read the features of a feature store, the files are memory mapped.
+
+    The features are views of the mapping, so loading one costs no read or
+    copy, and the pages are shared by the processes of a dataloader through
+    the page cache. The features are read-only, copy one to modify it.
+
+    Args:
+        root (os.PathLike): directory of the store.
+    """
+
+    def __init__(self, root: os.PathLike):
+        self.root = Path(root)
+        with open(self.root / "meta.json", 'rt') as f:
+            self.meta = json.load(f)
+        self.index = {
+            field: np.load(self.root / f"{field}_index.npy")
+            for field in self.meta
+        }
+        self._data = {}
+
+    def _get_data(self, field: str) -> np.ndarray:
+        # mapped on first use
+        if field not in self._data:
+            meta = self.meta[field]
+            row_size = int(np.prod(meta["shape"], dtype=np.int64))
+            num_rows = int(self.index[field][:, 1].sum())
+            if num_rows * row_size == 0:
+                data = np.zeros([0] + meta["shape"], dtype=meta["dtype"])
+            else:
+                data = np.memmap(
+                    self.root / f"{field}.bin",
+                    dtype=meta["dtype"],
+                    mode='r',
+                    shape=tuple([num_rows] + meta["shape"]))
+            self._data[field] = data
+        return self._data[field]
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self.meta.keys())
+
+    def __len__(self) -> int:
+        return max((len(index) for index in self.index.values()), default=0)
+
+    def get(self, field: str, index: int) -> np.ndarray:
+        """Get the feature of an utterance, a read-only view of the store.
+
+        Args:
+            field (str): name of the feature
+            index (int): index of the utterance in the field
+
+        Returns:
+            np.ndarray: the feature, (num_rows, *)
+        """
+        offset, length = self.index[field][index]
+        return self._get_data(field)[offset:offset + length]
+
+
+# the stores opened by load_feature in this process
+_stores = {}
+
+
+def load_feature(ref: Union[str, os.PathLike]) -> np.ndarray:
+    """Load a feature of the metadata, which is either the path of a `.npy`
+    file or a reference to a `FeatureStore`. It replaces `np.load` as the
+    converter of `DataTable`.
+
+    Args:
+        ref (Union[str, os.PathLike]): path or reference of the feature
+
+    Returns:
+        np.ndarray: the feature
+    """
+    ref = str(ref)
+    if ref.endswith(".npy"):
+        return np.load(ref)
+    root, field, index = ref.rsplit(REF_SEP, 2)
+    if root not in _stores:
+        _stores[root] = FeatureStore(root)
+    return _stores[root].get(field, int(index))
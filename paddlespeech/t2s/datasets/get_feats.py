@@ -81,17 +81,32 @@ class LogMelFBank():
         D = self._stft(wav)
         return np.abs(D)**self.power
 
-    def _mel_spectrogram(self, wav: np.ndarray):
-        S = self._spectrogram(wav)
+    def _mel_spectrogram(self, wav: np.ndarray, magnitude: np.ndarray=None):
+        if magnitude is None:
+            S = self._spectrogram(wav)
+        else:
+            S = magnitude**self.power
         mel = np.dot(self.mel_filter, S)
         return mel
 
+    def get_magnitude(self, wav: np.ndarray):
+        """Magnitude of the stft of wav, (n_fft // 2 + 1, num_frames).
+        It can be shared with `Energy` of the same stft params, see `get_log_mel_fbank`.
+        """
+        return np.abs(self._stft(wav))
+
     # We use different definition for log-spec between TTS and ASR
     #   TTS: log_10(abs(stft))
     #   ASR: log_e(power(stft))
 
-    def get_log_mel_fbank(self, wav, base='10'):
-        mel = self._mel_spectrogram(wav)
+    def get_log_mel_fbank(self, wav, base='10', magnitude: np.ndarray=None):
+        """
+        Args:
+            wav (np.ndarray): the audio.
+            base (str, optional): base of the log, '10' or 'e'.
+            magnitude (np.ndarray, optional): the result of `get_magnitude` of wav, computed if None.
+        """
+        mel = self._mel_spectrogram(wav, magnitude)
         mel = np.clip(mel, a_min=1e-10, a_max=float("inf"))
         if base == '10':
             mel = np.log10(mel.T)
@@ -138,7 +153,7 @@ class Pitch():
                       input: np.ndarray,
                       use_continuous_f0: bool=True,
                       use_log_f0: bool=True) -> np.ndarray:
-        input = input.astype(np.float)
+        input = input.astype(np.float64)
         frame_period = 1000 * self.hop_length / self.sr
         f0, timeaxis = pyworld.dio(
             input,
@@ -210,10 +225,13 @@ class Energy():
             pad_mode=self.pad_mode)
         return D
 
-    def _calculate_energy(self, input: np.ndarray):
-        input = input.astype(np.float32)
-        input_stft = self._stft(input)
-        input_power = np.abs(input_stft)**2
+    def _calculate_energy(self,
+                          input: np.ndarray,
+                          magnitude: np.ndarray=None):
+        if magnitude is None:
+            input = input.astype(np.float32)
+            magnitude = np.abs(self._stft(input))
+        input_power = magnitude**2
         energy = np.sqrt(
             np.clip(
                 np.sum(input_power, axis=0), a_min=1.0e-10, a_max=float('inf')))
@@ -234,8 +252,14 @@ class Energy():
     def get_energy(self,
                    wav: np.ndarray,
                    use_token_averaged_energy: bool=True,
-                   duration: np.ndarray=None):
-        energy = self._calculate_energy(wav)
+                   duration: np.ndarray=None,
+                   magnitude: np.ndarray=None):
+        """
+        Args:
+            magnitude (np.ndarray, optional): magnitude of the stft of wav with the same params,
+                e.g. `LogMelFBank.get_magnitude`, computed if None.
+        """
+        energy = self._calculate_energy(wav, magnitude)
         if use_token_averaged_energy and duration is not None:
             energy = self._average_by_duration(energy, duration)
         else:
@@ -23,6 +23,7 @@ from sklearn.preprocessing import StandardScaler
 from tqdm import tqdm
 
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.utils import str2bool
 
 
@@ -78,9 +79,9 @@ def main():
     dataset = DataTable(
         metadata,
         converters={
-            "speech": np.load,
-            "pitch": np.load,
-            "energy": np.load,
+            "speech": load_feature,
+            "pitch": load_feature,
+            "energy": load_feature,
         })
     logging.info(f"The number of files = {len(dataset)}.")
 
@@ -33,6 +33,7 @@ from yacs.config import CfgNode
 from paddlespeech.t2s.datasets.am_batch_fn import diffsinger_multi_spk_batch_fn
 from paddlespeech.t2s.datasets.am_batch_fn import diffsinger_single_spk_batch_fn
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.models.diffsinger import DiffSinger
 from paddlespeech.t2s.models.diffsinger import DiffSingerEvaluator
 from paddlespeech.t2s.models.diffsinger import DiffSingerUpdater
@@ -66,7 +67,11 @@ def train_sp(args, config):
         "text", "text_lengths", "speech", "speech_lengths", "durations",
         "pitch", "energy", "note", "note_dur", "is_slur"
     ]
-    converters = {"speech": np.load, "pitch": np.load, "energy": np.load}
+    converters = {
+        "speech": load_feature,
+        "pitch": load_feature,
+        "energy": load_feature
+    }
     spk_num = None
     if args.speaker_dict is not None:
         print("multiple speaker diffsinger!")
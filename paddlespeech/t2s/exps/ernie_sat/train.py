@@ -18,7 +18,6 @@ import shutil
 from pathlib import Path
 
 import jsonlines
-import numpy as np
 import paddle
 import yaml
 from paddle import DataParallel
@@ -30,6 +29,7 @@ from yacs.config import CfgNode
 
 from paddlespeech.t2s.datasets.am_batch_fn import build_erniesat_collate_fn
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.datasets.sampler import ErnieSATSampler
 from paddlespeech.t2s.models.ernie_sat import ErnieSAT
 from paddlespeech.t2s.models.ernie_sat import ErnieSATEvaluator
@@ -61,7 +61,7 @@ def train_sp(args, config):
         "text", "text_lengths", "speech", "speech_lengths", "align_start",
         "align_end"
     ]
-    converters = {"speech": np.load}
+    converters = {"speech": load_feature}
     # dataloader has been too verbose
     logging.getLogger("DataLoader").disabled = True
 
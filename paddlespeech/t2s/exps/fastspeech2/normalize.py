@@ -23,6 +23,7 @@ from sklearn.preprocessing import StandardScaler
 from tqdm import tqdm
 
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 
 
 def main():
@@ -72,9 +73,9 @@ def main():
     dataset = DataTable(
         metadata,
         converters={
-            "speech": np.load,
-            "pitch": np.load,
-            "energy": np.load,
+            "speech": load_feature,
+            "pitch": load_feature,
+            "energy": load_feature,
         })
     logging.info(f"The number of files = {len(dataset)}.")
 
@@ -13,12 +13,15 @@
 # limitations under the License.
 import argparse
 import os
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
 from operator import itemgetter
 from pathlib import Path
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 import jsonlines
 import librosa
@@ -27,6 +30,7 @@ import tqdm
 import yaml
 from yacs.config import CfgNode
 
+from paddlespeech.t2s.datasets.feature_store import FeatureStoreWriter
 from paddlespeech.t2s.datasets.get_feats import Energy
 from paddlespeech.t2s.datasets.get_feats import LogMelFBank
 from paddlespeech.t2s.datasets.get_feats import Pitch
@@ -38,6 +42,135 @@ from paddlespeech.t2s.datasets.preprocess_utils import merge_silence
 from paddlespeech.t2s.utils import str2bool
 
 
+def _get_utt_id(fp: Path) -> str:
+    utt_id = fp.stem
+    # for vctk
+    if utt_id.endswith("_mic2"):
+        utt_id = utt_id[:-5]
+    return utt_id
+
+
+def _share_stft(mel_extractor, energy_extractor) -> bool:
+    """Whether the energy can reuse the stft magnitude of the mel."""
+    return all(
+        getattr(mel_extractor, name) == getattr(energy_extractor, name)
+        for name in ("n_fft", "hop_length", "win_length", "window", "center",
+                     "pad_mode"))
+
+
+def extract_sentence(config: Dict[str, Any],
+                     fp: Path,
+                     sentences: Dict,
+                     mel_extractor=None,
+                     pitch_extractor=None,
+                     energy_extractor=None,
+                     cut_sil: bool=True,
+                     spk_emb_dir: Path=None
+                     ) -> Optional[Tuple[Dict[str, Any], Dict[str, np.ndarray]]]:
+    """Extract the features of an utterance.
+
+    Returns:
+        Optional[Tuple[Dict[str, Any], Dict[str, np.ndarray]]]:
+            the record of the metadata without the features,
+            and the features of "speech", "pitch" and "energy",
+            None if the utterance is skipped.
+    """
+    utt_id = _get_utt_id(fp)
+    if utt_id not in sentences:
+        return None
+    # reading, resampling may occur
+    wav, _ = librosa.load(
+        str(fp), sr=config.fs,
+        mono=False) if "canton" in str(fp) else librosa.load(
+            str(fp), sr=config.fs)
+    if len(wav.shape) == 2 and "canton" in str(fp):
+        # Remind that Cantonese datasets should be placed in ~/datasets/canton_all. Otherwise, it may cause problem.
+        wav = wav[0]
+        wav = np.ascontiguousarray(wav)
+    elif len(wav.shape) != 1:
+        return None
+    max_value = np.abs(wav).max()
+    if max_value > 1.0:
+        wav = wav / max_value
+    assert len(wav.shape) == 1, f"{utt_id} is not a mono-channel audio."
+    assert np.abs(wav).max(
+    ) <= 1.0, f"{utt_id} is seems to be different that 16 bit PCM."
+    phones = sentences[utt_id][0]
+    durations = sentences[utt_id][1]
+    speaker = sentences[utt_id][2]
+    d_cumsum = np.pad(np.array(durations).cumsum(0), (1, 0), 'constant')
+    # little imprecise than use *.TextGrid directly
+    times = librosa.frames_to_time(
+        d_cumsum, sr=config.fs, hop_length=config.n_shift)
+    if cut_sil:
+        start = 0
+        end = d_cumsum[-1]
+        if phones[0] == "sil" and len(durations) > 1:
+            start = times[1]
+            durations = durations[1:]
+            phones = phones[1:]
+        if phones[-1] == 'sil' and len(durations) > 1:
+            end = times[-2]
+            durations = durations[:-1]
+            phones = phones[:-1]
+        sentences[utt_id][0] = phones
+        sentences[utt_id][1] = durations
+        start, end = librosa.time_to_samples([start, end], sr=config.fs)
+        wav = wav[start:end]
+    # compute the stft once for both mel and energy
+    magnitude = None
+    if wav.dtype == np.float32 and _share_stft(mel_extractor,
+                                               energy_extractor):
+        magnitude = mel_extractor.get_magnitude(wav)
+    # extract mel feats
+    logmel = mel_extractor.get_log_mel_fbank(wav, magnitude=magnitude)
+    # change duration according to mel_length
+    compare_duration_and_mel_length(sentences, utt_id, logmel)
+    # utt_id may be popped in compare_duration_and_mel_length
+    if utt_id not in sentences:
+        return None
+    phones = sentences[utt_id][0]
+    durations = sentences[utt_id][1]
+    num_frames = logmel.shape[0]
+    assert sum(durations) == num_frames
+    # extract pitch and energy
+    f0 = pitch_extractor.get_pitch(wav, duration=np.array(durations))
+    if (f0 == 0).all():
+        return None
+    assert f0.shape[0] == len(durations)
+    energy = energy_extractor.get_energy(
+        wav, duration=np.array(durations), magnitude=magnitude)
+    assert energy.shape[0] == len(durations)
+    record = {
+        "utt_id": utt_id,
+        "phones": phones,
+        "text_lengths": len(phones),
+        "speech_lengths": num_frames,
+        "durations": durations,
+        "speaker": speaker
+    }
+    if spk_emb_dir and (spk_emb_dir / speaker).exists():
+        embed_path = spk_emb_dir / speaker / (utt_id + ".npy")
+        if not embed_path.is_file():
+            return None
+        record["spk_emb"] = str(embed_path)
+    feats = {"speech": logmel, "pitch": f0, "energy": energy}
+    return record, feats
+
+
+def save_feats(output_dir: Path, utt_id: str,
+               feats: Dict[str, np.ndarray]) -> Dict[str, str]:
+    """Save the features of an utterance as .npy files, return their paths."""
+    paths = {}
+    for name, feat in feats.items():
+        feat_dir = output_dir / f"data_{name}"
+        feat_dir.mkdir(parents=True, exist_ok=True)
+        feat_path = feat_dir / f"{utt_id}_{name}.npy"
+        np.save(feat_path, feat)
+        paths[name] = str(feat_path)
+    return paths
+
+
 def process_sentence(config: Dict[str, Any],
                      fp: Path,
                      sentences: Dict,
@@ -47,103 +180,46 @@ def process_sentence(config: Dict[str, Any],
                      energy_extractor=None,
                      cut_sil: bool=True,
                      spk_emb_dir: Path=None):
-    utt_id = fp.stem
-    # for vctk
-    if utt_id.endswith("_mic2"):
-        utt_id = utt_id[:-5]
-    record = None
-    if utt_id in sentences:
-        # reading, resampling may occur
-        wav, _ = librosa.load(
-            str(fp), sr=config.fs,
-            mono=False) if "canton" in str(fp) else librosa.load(
-                str(fp), sr=config.fs)
-        if len(wav.shape) == 2 and "canton" in str(fp):
-            # Remind that Cantonese datasets should be placed in ~/datasets/canton_all. Otherwise, it may cause problem.
-            wav = wav[0]
-            wav = np.ascontiguousarray(wav)
-        elif len(wav.shape) != 1:
-            return record
-        max_value = np.abs(wav).max()
-        if max_value > 1.0:
-            wav = wav / max_value
-        assert len(wav.shape) == 1, f"{utt_id} is not a mono-channel audio."
-        assert np.abs(wav).max(
-        ) <= 1.0, f"{utt_id} is seems to be different that 16 bit PCM."
-        phones = sentences[utt_id][0]
-        durations = sentences[utt_id][1]
-        speaker = sentences[utt_id][2]
-        d_cumsum = np.pad(np.array(durations).cumsum(0), (1, 0), 'constant')
-        # little imprecise than use *.TextGrid directly
-        times = librosa.frames_to_time(
-            d_cumsum, sr=config.fs, hop_length=config.n_shift)
-        if cut_sil:
-            start = 0
-            end = d_cumsum[-1]
-            if phones[0] == "sil" and len(durations) > 1:
-                start = times[1]
-                durations = durations[1:]
-                phones = phones[1:]
-            if phones[-1] == 'sil' and len(durations) > 1:
-                end = times[-2]
-                durations = durations[:-1]
-                phones = phones[:-1]
-            sentences[utt_id][0] = phones
-            sentences[utt_id][1] = durations
-            start, end = librosa.time_to_samples([start, end], sr=config.fs)
-            wav = wav[start:end]
-        # extract mel feats
-        logmel = mel_extractor.get_log_mel_fbank(wav)
-        # change duration according to mel_length
-        compare_duration_and_mel_length(sentences, utt_id, logmel)
-        # utt_id may be popped in compare_duration_and_mel_length
-        if utt_id not in sentences:
-            return None
-        phones = sentences[utt_id][0]
-        durations = sentences[utt_id][1]
-        num_frames = logmel.shape[0]
-        assert sum(durations) == num_frames
-        mel_dir = output_dir / "data_speech"
-        mel_dir.mkdir(parents=True, exist_ok=True)
-        mel_path = mel_dir / (utt_id + "_speech.npy")
-        np.save(mel_path, logmel)
-        # extract pitch and energy
-        f0 = pitch_extractor.get_pitch(wav, duration=np.array(durations))
-        if (f0 == 0).all():
-            return None
-        assert f0.shape[0] == len(durations)
-        f0_dir = output_dir / "data_pitch"
-        f0_dir.mkdir(parents=True, exist_ok=True)
-        f0_path = f0_dir / (utt_id + "_pitch.npy")
-        np.save(f0_path, f0)
-        energy = energy_extractor.get_energy(wav, duration=np.array(durations))
-        assert energy.shape[0] == len(durations)
-        energy_dir = output_dir / "data_energy"
-        energy_dir.mkdir(parents=True, exist_ok=True)
-        energy_path = energy_dir / (utt_id + "_energy.npy")
-        np.save(energy_path, energy)
-        record = {
-            "utt_id": utt_id,
-            "phones": phones,
-            "text_lengths": len(phones),
-            "speech_lengths": num_frames,
-            "durations": durations,
-            "speech": str(mel_path),
-            "pitch": str(f0_path),
-            "energy": str(energy_path),
-            "speaker": speaker
-        }
-        if spk_emb_dir:
-            if speaker in os.listdir(spk_emb_dir):
-                embed_name = utt_id + ".npy"
-                embed_path = spk_emb_dir / speaker / embed_name
-                if embed_path.is_file():
-                    record["spk_emb"] = str(embed_path)
-                else:
-                    return None
+    outputs = extract_sentence(config, fp, sentences, mel_extractor,
+                               pitch_extractor, energy_extractor, cut_sil,
+                               spk_emb_dir)
+    if outputs is None:
+        return None
+    record, feats = outputs
+    record.update(save_feats(output_dir, record["utt_id"], feats))
     return record
 
 
+# the arguments shared by the tasks of a worker process, set once by
+# _init_worker instead of pickled for each task
+_worker_args = None
+
+
+def _init_worker(*args):
+    global _worker_args
+    _worker_args = args
+
+
+def _process_chunk(fps: List[Path],
+                   sentences: Dict,
+                   output_dir: Path,
+                   feats_format: str):
+    config, mel_extractor, pitch_extractor, energy_extractor, cut_sil, spk_emb_dir = _worker_args
+    outputs = []
+    for fp in fps:
+        if feats_format == "npy":
+            output = process_sentence(config, fp, sentences, output_dir,
+                                      mel_extractor, pitch_extractor,
+                                      energy_extractor, cut_sil, spk_emb_dir)
+        else:
+            # the features are sent back to be written to the store
+            output = extract_sentence(config, fp, sentences, mel_extractor,
+                                      pitch_extractor, energy_extractor,
+                                      cut_sil, spk_emb_dir)
+        outputs.append(output)
+    return outputs
+
+
 def process_sentences(config,
                       fps: List[Path],
                       sentences: Dict,
@@ -154,39 +230,87 @@ def process_sentences(config,
                       nprocs: int=1,
                       cut_sil: bool=True,
                       spk_emb_dir: Path=None,
-                      write_metadata_method: str='w'):
+                      write_metadata_method: str='w',
+                      feats_format: str='npy',
+                      chunk_size: int=16):
+    """Extract the features of the utterances and write the metadata.
+
+    Args:
+        nprocs (int, optional): number of the worker processes.
+        feats_format (str, optional): "npy" for a .npy file per feature of an utterance,
+            "store" for a `FeatureStore` in `output_dir / "feats"`.
+        chunk_size (int, optional): number of the utterances of a task of a worker process.
+    """
+    assert feats_format in ("npy", "store")
+    store_writer = None
+    if feats_format == "store":
+        store_writer = FeatureStoreWriter(
+            output_dir / "feats", mode=write_metadata_method)
+
+    results = []
+
+    def collect(outputs):
+        for output in outputs:
+            if not output:
+                continue
+            if store_writer is not None:
+                record, feats = output
+                record.update(store_writer.append(feats))
+            else:
+                record = output
+            results.append(record)
+
     if nprocs == 1:
-        results = []
         for fp in tqdm.tqdm(fps, total=len(fps)):
-            record = process_sentence(
-                config=config,
-                fp=fp,
-                sentences=sentences,
-                output_dir=output_dir,
-                mel_extractor=mel_extractor,
-                pitch_extractor=pitch_extractor,
-                energy_extractor=energy_extractor,
-                cut_sil=cut_sil,
-                spk_emb_dir=spk_emb_dir)
-            if record:
-                results.append(record)
+            if store_writer is not None:
+                output = extract_sentence(
+                    config=config,
+                    fp=fp,
+                    sentences=sentences,
+                    mel_extractor=mel_extractor,
+                    pitch_extractor=pitch_extractor,
+                    energy_extractor=energy_extractor,
+                    cut_sil=cut_sil,
+                    spk_emb_dir=spk_emb_dir)
+            else:
+                output = process_sentence(
+                    config=config,
+                    fp=fp,
+                    sentences=sentences,
+                    output_dir=output_dir,
+                    mel_extractor=mel_extractor,
+                    pitch_extractor=pitch_extractor,
+                    energy_extractor=energy_extractor,
+                    cut_sil=cut_sil,
+                    spk_emb_dir=spk_emb_dir)
+            collect([output])
     else:
-        with ThreadPoolExecutor(nprocs) as pool:
-            futures = []
+        # feature extraction is cpu bound, run it in processes, a chunk of
+        # utterances per task with only their own entries of sentences
+        with ProcessPoolExecutor(
+                nprocs,
+                initializer=_init_worker,
+                initargs=(config, mel_extractor, pitch_extractor,
+                          energy_extractor, cut_sil, spk_emb_dir)) as pool:
+            futures = {}
+            for i in range(0, len(fps), chunk_size):
+                chunk = fps[i:i + chunk_size]
+                chunk_sentences = {}
+                for fp in chunk:
+                    utt_id = _get_utt_id(fp)
+                    if utt_id in sentences:
+                        chunk_sentences[utt_id] = sentences[utt_id]
+                future = pool.submit(_process_chunk, chunk, chunk_sentences,
+                                     output_dir, feats_format)
+                futures[future] = len(chunk)
+
             with tqdm.tqdm(total=len(fps)) as progress:
-                for fp in fps:
-                    future = pool.submit(process_sentence, config, fp,
-                                         sentences, output_dir, mel_extractor,
-                                         pitch_extractor, energy_extractor,
-                                         cut_sil, spk_emb_dir)
-                    future.add_done_callback(lambda p: progress.update())
-                    futures.append(future)
-
-                results = []
-                for ft in futures:
-                    record = ft.result()
-                    if record:
-                        results.append(record)
+                for future in as_completed(futures):
+                    collect(future.result())
+                    progress.update(futures[future])
+
+    if store_writer is not None:
+        store_writer.close()
 
     results.sort(key=itemgetter("utt_id"))
     with jsonlines.open(output_dir / "metadata.jsonl",
@@ -221,7 +345,7 @@ def main():
     parser.add_argument("--config", type=str, help="fastspeech2 config file.")
 
     parser.add_argument(
-        "--num-cpu", type=int, default=1, help="number of process.")
+        "--num-cpu", type=int, default=1, help="number of processes.")
 
     parser.add_argument(
         "--cut-sil",
@@ -241,6 +365,13 @@ def main():
         type=str,
         choices=["w", "a"],
         help="How the metadata.jsonl file is written.")
+    parser.add_argument(
+        "--feats-format",
+        default="store",
+        type=str,
+        choices=["npy", "store"],
+        help="store the features in .npy files of each utterance, or in a consolidated feature store of each split."
+    )
     args = parser.parse_args()
 
     rootdir = Path(args.rootdir).expanduser()
@@ -372,7 +503,8 @@ def main():
             nprocs=args.num_cpu,
             cut_sil=args.cut_sil,
             spk_emb_dir=spk_emb_dir,
-            write_metadata_method=args.write_metadata_method)
+            write_metadata_method=args.write_metadata_method,
+            feats_format=args.feats_format)
     if dev_wav_files:
         process_sentences(
             config=config,
@@ -385,7 +517,8 @@ def main():
             nprocs=args.num_cpu,
             cut_sil=args.cut_sil,
             spk_emb_dir=spk_emb_dir,
-            write_metadata_method=args.write_metadata_method)
+            write_metadata_method=args.write_metadata_method,
+            feats_format=args.feats_format)
     if test_wav_files:
         process_sentences(
             config=config,
@@ -398,7 +531,8 @@ def main():
             nprocs=args.num_cpu,
             cut_sil=args.cut_sil,
             spk_emb_dir=spk_emb_dir,
-            write_metadata_method=args.write_metadata_method)
+            write_metadata_method=args.write_metadata_method,
+            feats_format=args.feats_format)
 
 
 if __name__ == "__main__":
@@ -18,7 +18,6 @@ import shutil
 from pathlib import Path
 
 import jsonlines
-import numpy as np
 import paddle
 import yaml
 from paddle import DataParallel
@@ -30,6 +29,7 @@ from yacs.config import CfgNode
 from paddlespeech.t2s.datasets.am_batch_fn import fastspeech2_multi_spk_batch_fn
 from paddlespeech.t2s.datasets.am_batch_fn import fastspeech2_single_spk_batch_fn
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.models.fastspeech2 import FastSpeech2
 from paddlespeech.t2s.models.fastspeech2 import FastSpeech2Evaluator
 from paddlespeech.t2s.models.fastspeech2 import FastSpeech2Updater
@@ -69,7 +69,11 @@ def train_sp(args, config):
         "text", "text_lengths", "speech", "speech_lengths", "durations",
         "pitch", "energy"
     ]
-    converters = {"speech": np.load, "pitch": np.load, "energy": np.load}
+    converters = {
+        "speech": load_feature,
+        "pitch": load_feature,
+        "energy": load_feature
+    }
     spk_num = None
     if args.speaker_dict is not None:
         print("multiple speaker fastspeech2!")
@@ -82,7 +86,7 @@ def train_sp(args, config):
         print("Training voice cloning!")
         collate_fn = fastspeech2_multi_spk_batch_fn
         fields += ["spk_emb"]
-        converters["spk_emb"] = np.load
+        converters["spk_emb"] = load_feature
     else:
         print("single speaker fastspeech2!")
         collate_fn = fastspeech2_single_spk_batch_fn
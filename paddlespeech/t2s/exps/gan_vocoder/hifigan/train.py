@@ -18,7 +18,6 @@ import shutil
 from pathlib import Path
 
 import jsonlines
-import numpy as np
 import paddle
 import yaml
 from paddle import DataParallel
@@ -31,6 +30,7 @@ from paddle.optimizer.lr import MultiStepDecay
 from yacs.config import CfgNode
 
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.datasets.vocoder_batch_fn import Clip
 from paddlespeech.t2s.models.hifigan import HiFiGANEvaluator
 from paddlespeech.t2s.models.hifigan import HiFiGANGenerator
@@ -74,8 +74,8 @@ def train_sp(args, config):
         data=train_metadata,
         fields=["wave", "feats"],
         converters={
-            "wave": np.load,
-            "feats": np.load,
+            "wave": load_feature,
+            "feats": load_feature,
         }, )
     with jsonlines.open(args.dev_metadata, 'r') as reader:
         dev_metadata = list(reader)
@@ -83,8 +83,8 @@ def train_sp(args, config):
         data=dev_metadata,
         fields=["wave", "feats"],
         converters={
-            "wave": np.load,
-            "feats": np.load,
+            "wave": load_feature,
+            "feats": load_feature,
         }, )
 
     # collate function and dataloader
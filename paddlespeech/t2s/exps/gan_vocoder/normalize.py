@@ -23,6 +23,7 @@ from sklearn.preprocessing import StandardScaler
 from tqdm import tqdm
 
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 
 
 def main():
@@ -64,7 +65,7 @@ def main():
         converters={
             'utt_id': None,
             'wave': None if args.skip_wav_copy else np.load,
-            'feats': np.load,
+            'feats': load_feature,
         })
     logging.info(f"The number of files = {len(dataset)}.")
 
@@ -23,6 +23,7 @@ from sklearn.preprocessing import StandardScaler
 from tqdm import tqdm
 
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 
 
 def main():
@@ -69,9 +70,9 @@ def main():
     dataset = DataTable(
         metadata,
         converters={
-            "feats": np.load,
-            "pitch": np.load,
-            "energy": np.load,
+            "feats": load_feature,
+            "pitch": load_feature,
+            "energy": load_feature,
             "wave": str,
         })
     logging.info(f"The number of files = {len(dataset)}.")
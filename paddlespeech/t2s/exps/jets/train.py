@@ -18,7 +18,6 @@ import shutil
 from pathlib import Path
 
 import jsonlines
-import numpy as np
 import paddle
 import yaml
 from paddle import DataParallel
@@ -30,6 +29,7 @@ from yacs.config import CfgNode
 from paddlespeech.t2s.datasets.am_batch_fn import jets_multi_spk_batch_fn
 from paddlespeech.t2s.datasets.am_batch_fn import jets_single_spk_batch_fn
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.datasets.sampler import ErnieSATSampler
 from paddlespeech.t2s.models.jets import JETS
 from paddlespeech.t2s.models.jets import JETSEvaluator
@@ -75,10 +75,10 @@ def train_sp(args, config):
     ]
 
     converters = {
-        "wave": np.load,
-        "feats": np.load,
-        "pitch": np.load,
-        "energy": np.load,
+        "wave": load_feature,
+        "feats": load_feature,
+        "pitch": load_feature,
+        "energy": load_feature,
     }
     spk_num = None
     if args.speaker_dict is not None:
@@ -92,7 +92,7 @@ def train_sp(args, config):
         print("Training voice cloning!")
         collate_fn = jets_multi_spk_batch_fn
         fields += ["spk_emb"]
-        converters["spk_emb"] = np.load
+        converters["spk_emb"] = load_feature
     else:
         print("single speaker jets!")
         collate_fn = jets_single_spk_batch_fn
@@ -18,7 +18,6 @@ import shutil
 from pathlib import Path
 
 import jsonlines
-import numpy as np
 import paddle
 import yaml
 from paddle import DataParallel
@@ -30,6 +29,7 @@ from yacs.config import CfgNode
 from paddlespeech.t2s.datasets.am_batch_fn import speedyspeech_multi_spk_batch_fn
 from paddlespeech.t2s.datasets.am_batch_fn import speedyspeech_single_spk_batch_fn
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.models.speedyspeech import SpeedySpeech
 from paddlespeech.t2s.models.speedyspeech import SpeedySpeechEvaluator
 from paddlespeech.t2s.models.speedyspeech import SpeedySpeechUpdater
@@ -98,7 +98,7 @@ def train_sp(args, config):
         data=train_metadata,
         fields=fields,
         converters={
-            "feats": np.load,
+            "feats": load_feature,
         }, )
     with jsonlines.open(args.dev_metadata, 'r') as reader:
         dev_metadata = list(reader)
@@ -112,7 +112,7 @@ def train_sp(args, config):
         data=dev_metadata,
         fields=fields,
         converters={
-            "feats": np.load,
+            "feats": load_feature,
         }, )
 
     # collate function and dataloader
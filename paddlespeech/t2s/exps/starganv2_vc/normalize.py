@@ -22,6 +22,7 @@ import numpy as np
 import tqdm
 
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 
 
 def main():
@@ -57,7 +58,7 @@ def main():
         metadata = list(reader)
     dataset = DataTable(
         metadata, converters={
-            "speech": np.load,
+            "speech": load_feature,
         })
     logging.info(f"The number of files = {len(dataset)}.")
 
@@ -18,7 +18,6 @@ import shutil
 from pathlib import Path
 
 import jsonlines
-import numpy as np
 import paddle
 import yaml
 from paddle import DataParallel
@@ -33,6 +32,7 @@ from paddlespeech.cli.utils import download_and_decompress
 from paddlespeech.resource.pretrained_models import StarGANv2VC_source
 from paddlespeech.t2s.datasets.am_batch_fn import build_starganv2_vc_collate_fn
 from paddlespeech.t2s.datasets.data_table import StarGANv2VCDataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.models.starganv2_vc import ASRCNN
 from paddlespeech.t2s.models.starganv2_vc import Discriminator
 from paddlespeech.t2s.models.starganv2_vc import Generator
@@ -67,7 +67,7 @@ def train_sp(args, config):
     )
     # to edit
     fields = ["speech", "speech_lengths"]
-    converters = {"speech": np.load}
+    converters = {"speech": load_feature}
 
     collate_fn = build_starganv2_vc_collate_fn(
         latent_dim=config['mapping_network_params']['latent_dim'],
@@ -14,6 +14,7 @@
 import math
 import os
 import re
+import time
 from pathlib import Path
 from typing import Any
 from typing import Dict
@@ -32,6 +33,7 @@ from yacs.config import CfgNode
 
 from paddlespeech.t2s.datasets.am_batch_fn import *
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.datasets.vocoder_batch_fn import Clip_static
 from paddlespeech.t2s.frontend.canton_frontend import CantonFrontend
 from paddlespeech.t2s.frontend.en_frontend import English
@@ -181,7 +183,7 @@ def get_test_dataset(test_metadata: List[Dict[str, Any]],
             "utt_id", "text", "text_lengths", "speech", "speech_lengths",
             "align_start", "align_end"
         ]
-        converters = {"speech": np.load}
+        converters = {"speech": load_feature}
     else:
         print("wrong am, please input right am!!!")
 
@@ -270,8 +272,8 @@ def get_dev_dataloader(dev_metadata: List[Dict[str, Any]],
             data=dev_metadata,
             fields=["wave", "feats"],
             converters={
-                "wave": np.load,
-                "feats": np.load,
+                "wave": load_feature,
+                "feats": load_feature,
             }, )
 
         dev_dataloader = DataLoader(
@@ -469,6 +471,98 @@ def get_voc_inference(
     return voc_inference
 
 
+def _length_batches(lengths: List[int], batch_size: int) -> List[List[int]]:
+    """Indices of the items in batches of similar lengths, longest first.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: -lengths[i])
+    return [
+        order[i:i + batch_size] for i in range(0, len(order), batch_size)
+    ]
+
+
+@paddle.no_grad()
+def batch_synthesize(am_inference,
+                     voc_inference,
+                     phone_ids: List[paddle.Tensor],
+                     batch_size: int=8,
+                     spk_id: Optional[int]=None):
+    """Synthesize the sentences of a text in batches.
+
+    The sentences are sorted by length and run through the acoustic model in
+    padded batches, then the mels are batched again by their own lengths for
+    the vocoder, so that little compute is spent on padding. The waveforms
+    are written to one buffer in the order of the sentences. A vocoder
+    without `batch_inference` runs sentence by sentence.
+
+    Args:
+        am_inference: acoustic model with `batch_inference`, e.g. FastSpeech2Inference
+        voc_inference: vocoder, e.g. HiFiGANInference
+        phone_ids (List[paddle.Tensor]): phone ids of each sentence, (T, )
+        batch_size (int, optional): max number of sentences in a batch. Defaults to 8.
+        spk_id (Optional[int], optional): speaker id of multi-speaker models. Defaults to None.
+
+    Returns:
+        paddle.Tensor: the waveform of all the sentences (N, 1)
+        float: time of the acoustic model in seconds
+        float: time of the vocoder in seconds
+    """
+    am_time = 0.0
+    mels = [None] * len(phone_ids)
+    lengths = [int(phones.shape[0]) for phones in phone_ids]
+    for batch in _length_batches(lengths, batch_size):
+        am_st = time.time()
+        max_len = lengths[batch[0]]
+        text = np.zeros([len(batch), max_len], dtype=np.int64)
+        for b, idx in enumerate(batch):
+            text[b, :lengths[idx]] = phone_ids[idx].numpy()
+        kwargs = {}
+        if spk_id is not None:
+            kwargs["spk_id"] = paddle.full([len(batch)], spk_id, dtype="int64")
+        mel, mel_lens = am_inference.batch_inference(
+            paddle.to_tensor(text),
+            paddle.to_tensor([lengths[idx] for idx in batch]), **kwargs)
+        mel = mel.numpy()
+        for b, idx in enumerate(batch):
+            mels[idx] = mel[b, :int(mel_lens[b])]
+        am_time += time.time() - am_st
+
+    voc_st = time.time()
+    mel_lengths = [len(mel) for mel in mels]
+    wavs = [None] * len(mels)
+    if hasattr(voc_inference, "batch_inference"):
+        # the empty mels are dropped, they can not be padded with edge
+        nonempty = [idx for idx, length in enumerate(mel_lengths) if length]
+        for batch in _length_batches([mel_lengths[idx] for idx in nonempty],
+                                     batch_size):
+            batch = [nonempty[b] for b in batch]
+            max_len = mel_lengths[batch[0]]
+            # pad by repeating the last frame, so the ends are not distorted
+            mel = np.stack([
+                np.pad(mels[idx], [(0, max_len - mel_lengths[idx]), (0, 0)],
+                       mode="edge") for idx in batch
+            ])
+            wav = voc_inference.batch_inference(paddle.to_tensor(mel)).numpy()
+            hop_length = wav.shape[1] // max_len
+            for b, idx in enumerate(batch):
+                wavs[idx] = wav[b, :mel_lengths[idx] * hop_length]
+    else:
+        for idx, mel in enumerate(mels):
+            if len(mel) > 0:
+                wavs[idx] = voc_inference(paddle.to_tensor(mel)).numpy()
+
+    wavs = [wav for wav in wavs if wav is not None]
+    if not wavs:
+        return paddle.zeros([0, 1]), am_time, time.time() - voc_st
+    wav_all = np.empty(
+        [sum(len(wav) for wav in wavs), wavs[0].shape[-1]], dtype=wavs[0].dtype)
+    offset = 0
+    for wav in wavs:
+        wav_all[offset:offset + len(wav)] = wav
+        offset += len(wav)
+    voc_time = time.time() - voc_st
+    return paddle.to_tensor(wav_all), am_time, voc_time
+
+
 # dygraph to static graph
 def am_to_static(am_inference,
                  am: str='fastspeech2_csmsc',
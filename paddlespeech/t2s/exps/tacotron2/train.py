@@ -18,7 +18,6 @@ import shutil
 from pathlib import Path
 
 import jsonlines
-import numpy as np
 import paddle
 import yaml
 from paddle import DataParallel
@@ -30,6 +29,7 @@ from yacs.config import CfgNode
 from paddlespeech.t2s.datasets.am_batch_fn import tacotron2_multi_spk_batch_fn
 from paddlespeech.t2s.datasets.am_batch_fn import tacotron2_single_spk_batch_fn
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.models.tacotron2 import Tacotron2
 from paddlespeech.t2s.models.tacotron2 import Tacotron2Evaluator
 from paddlespeech.t2s.models.tacotron2 import Tacotron2Updater
@@ -70,13 +70,13 @@ def train_sp(args, config):
     ]
 
     converters = {
-        "speech": np.load,
+        "speech": load_feature,
     }
     if args.voice_cloning:
         print("Training voice cloning!")
         collate_fn = tacotron2_multi_spk_batch_fn
         fields += ["spk_emb"]
-        converters["spk_emb"] = np.load
+        converters["spk_emb"] = load_feature
     else:
         print("single speaker tacotron2!")
         collate_fn = tacotron2_single_spk_batch_fn
@@ -18,7 +18,6 @@ import shutil
 from pathlib import Path
 
 import jsonlines
-import numpy as np
 import paddle
 import yaml
 from paddle import DataParallel
@@ -29,6 +28,7 @@ from yacs.config import CfgNode
 
 from paddlespeech.t2s.datasets.am_batch_fn import transformer_single_spk_batch_fn
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.models.transformer_tts import TransformerTTS
 from paddlespeech.t2s.models.transformer_tts import TransformerTTSEvaluator
 from paddlespeech.t2s.models.transformer_tts import TransformerTTSUpdater
@@ -74,7 +74,7 @@ def train_sp(args, config):
             "speech_lengths",
         ],
         converters={
-            "speech": np.load,
+            "speech": load_feature,
         }, )
     with jsonlines.open(args.dev_metadata, 'r') as reader:
         dev_metadata = list(reader)
@@ -87,7 +87,7 @@ def train_sp(args, config):
             "speech_lengths",
         ],
         converters={
-            "speech": np.load,
+            "speech": load_feature,
         }, )
 
     # collate function and dataloader
@@ -24,6 +24,7 @@ from sklearn.preprocessing import StandardScaler
 from tqdm import tqdm
 
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.utils import str2bool
 
 INITIALS = [
@@ -121,7 +122,7 @@ def main():
     dataset = DataTable(
         metadata,
         converters={
-            "feats": np.load,
+            "feats": load_feature,
             "wave": None if args.skip_wav_copy else np.load,
         })
     logging.info(f"The number of files = {len(dataset)}.")
@@ -16,7 +16,6 @@ import os
 from pathlib import Path
 
 import jsonlines
-import numpy as np
 import paddle
 import soundfile as sf
 import yaml
@@ -25,6 +24,7 @@ from timer import timer
 from yacs.config import CfgNode
 
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.models.wavernn import WaveRNN
 
 
@@ -71,7 +71,7 @@ def main():
         fields=['utt_id', 'feats'],
         converters={
             'utt_id': None,
-            'feats': np.load,
+            'feats': load_feature,
         })
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
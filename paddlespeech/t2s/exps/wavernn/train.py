@@ -17,7 +17,6 @@ import shutil
 from pathlib import Path
 
 import jsonlines
-import numpy as np
 import paddle
 import yaml
 from paddle import DataParallel
@@ -28,6 +27,7 @@ from paddle.optimizer import Adam
 from yacs.config import CfgNode
 
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.datasets.vocoder_batch_fn import WaveRNNClip
 from paddlespeech.t2s.models.wavernn import WaveRNN
 from paddlespeech.t2s.models.wavernn import WaveRNNEvaluator
@@ -64,8 +64,8 @@ def train_sp(args, config):
         data=train_metadata,
         fields=["wave", "feats"],
         converters={
-            "wave": np.load,
-            "feats": np.load,
+            "wave": load_feature,
+            "feats": load_feature,
         }, )
 
     with jsonlines.open(args.dev_metadata, 'r') as reader:
@@ -74,8 +74,8 @@ def train_sp(args, config):
         data=dev_metadata,
         fields=["wave", "feats"],
         converters={
-            "wave": np.load,
-            "feats": np.load,
+            "wave": load_feature,
+            "feats": load_feature,
         }, )
 
     batch_fn = WaveRNNClip(
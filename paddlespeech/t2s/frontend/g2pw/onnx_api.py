@@ -17,6 +17,8 @@ Credits
 """
 import json
 import os
+import threading
+from collections import OrderedDict
 from typing import Any
 from typing import Dict
 from typing import List
@@ -69,7 +71,14 @@ class G2PWOnnxConverter:
                  model_dir: os.PathLike=MODEL_HOME,
                  style: str='bopomofo',
                  model_source: str=None,
-                 enable_non_tradional_chinese: bool=False):
+                 enable_non_tradional_chinese: bool=False,
+                 batch_size: int=64,
+                 cache_size: int=1024):
+        """
+        Args:
+            batch_size (int, optional): max number of polyphonic characters of the sentences in one run of the model.
+            cache_size (int, optional): max number of sentences of the LRU cache of the results, 0 to disable it.
+        """
         uncompress_path = download_and_decompress(
             g2pw_onnx_models['G2PWModel'][model_version], model_dir)
 
@@ -152,6 +161,11 @@ class G2PWOnnxConverter:
         if self.enable_opencc:
             self.cc = OpenCC('s2tw')
 
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
     def _convert_bopomofo_to_pinyin(self, bopomofo: str) -> str:
         tone = bopomofo[-1]
         assert tone in '12345'
@@ -166,6 +180,28 @@ class G2PWOnnxConverter:
         if isinstance(sentences, str):
             sentences = [sentences]
 
+        found = {}
+        with self._cache_lock:
+            for sent in sentences:
+                if sent in self._cache:
+                    self._cache.move_to_end(sent)
+                    found[sent] = self._cache[sent]
+
+        # the sentences not in the cache run in one batch, each only once
+        todo = [sent for sent in dict.fromkeys(sentences) if sent not in found]
+        if todo:
+            found.update(zip(todo, self._predict(todo)))
+            if self.cache_size > 0:
+                with self._cache_lock:
+                    for sent in todo:
+                        self._cache[sent] = found[sent]
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+
+        # copies, the callers may modify the results
+        return [list(found[sent]) for sent in sentences]
+
+    def _predict(self, sentences: List[str]) -> List[List[str]]:
         if self.enable_opencc:
             translated_sentences = []
             for sent in sentences:
@@ -180,20 +216,28 @@ class G2PWOnnxConverter:
             # sentences no polyphonic words
             return partial_results
 
-        onnx_input = prepare_onnx_input(
-            tokenizer=self.tokenizer,
-            labels=self.labels,
-            char2phonemes=self.char2phonemes,
-            chars=self.chars,
-            texts=texts,
-            query_ids=query_ids,
-            use_mask=self.config.use_mask,
-            window_size=None)
-
-        preds, confidences = predict(
-            session=self.session_g2pW,
-            onnx_input=onnx_input,
-            labels=self.labels)
+        # sort the queries by the length of their sentences, so that the
+        # batches are padded little
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        preds = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            onnx_input = prepare_onnx_input(
+                tokenizer=self.tokenizer,
+                labels=self.labels,
+                char2phonemes=self.char2phonemes,
+                chars=self.chars,
+                texts=[texts[i] for i in batch],
+                query_ids=[query_ids[i] for i in batch],
+                use_mask=self.config.use_mask,
+                window_size=None)
+
+            batch_preds, _ = predict(
+                session=self.session_g2pW,
+                onnx_input=onnx_input,
+                labels=self.labels)
+            for i, pred in zip(batch, batch_preds):
+                preds[i] = pred
         if self.config.use_char_phoneme:
             preds = [pred.split(' ')[1] for pred in preds]
 
@@ -241,6 +241,26 @@ class Frontend():
 
         return new_initials, new_finals
 
+    def _g2pw(self, segments: List[str]) -> List[List[str]]:
+        """
+        Pinyins of the segments by g2pW, in one batch.
+        """
+        try:
+            return self.g2pW_model(segments)
+        except Exception:
+            # one segment g2pW can not handle fails the batch, retry one by one
+            pass
+        pinyins_list = []
+        for seg in segments:
+            try:
+                pinyins = self.g2pW_model(seg)[0]
+            except Exception:
+                # g2pW 模型采用繁体输入，如果有cover不了的简体词，采用g2pM预测
+                print("[%s] not in g2pW dict,use g2pM" % seg)
+                pinyins = self.g2pM_model(seg, tone=True, char_split=False)
+            pinyins_list.append(pinyins)
+        return pinyins_list
+
     # if merge_sentences, merge all sentences into one phone sequence
     def _g2p(self,
              sentences: List[str],
@@ -250,11 +270,8 @@ class Frontend():
         Return: list of list phonemes.
             [['w', 'o3', 'm', 'en2', 'sp'], ...]
         """
-        segments = sentences
-        phones_list = []
-
-        # split by punctuation
-        for seg in segments:
+        segments = []
+        for seg in sentences:
             if self.use_rhy:
                 seg = self.rhy_predictor._clean_text(seg)
 
@@ -264,28 +281,34 @@ class Frontend():
             # add prosody mark
             if self.use_rhy:
                 seg = self.rhy_predictor.get_prediction(seg)
+            segments.append(seg)
 
+        # 为了多音词获得更好的效果，这里采用整句预测
+        # g2pW predicts all the sentences in one batch
+        if self.g2p_model == "g2pW":
+            # undo prosody
+            if self.use_rhy:
+                g2pw_segments = [
+                    self.rhy_predictor._clean_text(seg) for seg in segments
+                ]
+            else:
+                g2pw_segments = segments
+            g2pw_pinyins = self._g2pw(g2pw_segments)
+
+        phones_list = []
+        # split by punctuation
+        for seg_id, seg in enumerate(segments):
             # [(word, pos), ...]
             seg_cut = psg.lcut(seg)
             # fix wordseg bad case for sandhi
             seg_cut = self.tone_modifier.pre_merge_for_modify(seg_cut)
 
-            # 为了多音词获得更好的效果，这里采用整句预测
             phones = []
             initials = []
             finals = []
             if self.g2p_model == "g2pW":
-                try:
-                    # undo prosody 
-                    if self.use_rhy:
-                        seg = self.rhy_predictor._clean_text(seg)
-
-                    # g2p
-                    pinyins = self.g2pW_model(seg)[0]
-                except Exception:
-                    # g2pW 模型采用繁体输入，如果有cover不了的简体词，采用g2pM预测
-                    print("[%s] not in g2pW dict,use g2pM" % seg)
-                    pinyins = self.g2pM_model(seg, tone=True, char_split=False)
+                seg = g2pw_segments[seg_id]
+                pinyins = g2pw_pinyins[seg_id]
 
                 # do prosody
                 if self.use_rhy:
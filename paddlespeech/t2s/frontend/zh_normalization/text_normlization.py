@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import re
+from functools import lru_cache
 from typing import List
 
+from .char_convert import t2s_dict
 from .char_convert import tranditional_to_simplified
 from .chronology import RE_DATE
 from .chronology import RE_DATE2
@@ -50,9 +52,123 @@ from .quantifier import replace_measure
 from .quantifier import replace_temperature
 
 
+def _convert_char(char: str) -> str:
+    """The basic character conversions of a character."""
+    return tranditional_to_simplified(char).translate(
+        F2H_ASCII_LETTERS).translate(F2H_DIGITS).translate(F2H_SPACE)
+
+
+# traditional to simplified and full width to half width conversions in one
+# str.translate, built from the conversions of each character they change
+CHAR_CONVERT_TABLE = {
+    ord(char): _convert_char(char)
+    for char in set(t2s_dict) | {
+        chr(code)
+        for code in list(F2H_ASCII_LETTERS) + list(F2H_DIGITS)
+    } if _convert_char(char) != char
+}
+
+# all the NSW rules need a digit, and none of the replacements gives one
+RE_DIGIT = re.compile(r'\d')
+
+# NSW rules before and after replace_measure in the order they apply, with
+# the strings one of which a match contains, the rule is skipped if none of
+# them is in the sentence, None for rules that only need a digit
+NSW_RULES_BEFORE_MEASURE = [
+    (RE_DATE, replace_date, ('年', )),
+    (RE_DATE2, replace_date2, ('-', ' ', '/', '.')),
+    # range first
+    (RE_TIME_RANGE, replace_time, (':', )),
+    (RE_TIME, replace_time, (':', )),
+    (RE_TEMPERATURE, replace_temperature, ('°C', '℃', '度')),
+]
+NSW_RULES_AFTER_MEASURE = [
+    (RE_FRAC, replace_frac, ('/', )),
+    (RE_PERCENTAGE, replace_percentage, ('%', )),
+    (RE_MOBILE_PHONE, replace_mobile, None),
+    (RE_TELEPHONE, replace_phone, None),
+    (RE_NATIONAL_UNIFORM_NUMBER, replace_phone, ('400', )),
+    (RE_RANGE, replace_range, ('-', '~')),
+    (RE_INTEGER, replace_negative_num, ('-', )),
+    (RE_DECIMAL_NUM, replace_number, ('.', )),
+    (RE_POSITIVE_QUANTIFIERS, replace_positive_quantifier, None),
+    (RE_DEFAULT_NUM, replace_default_num, None),
+    (RE_NUMBER, replace_number, None),
+]
+
+# the replacements of _post_replace, all of one character
+POST_REPLACE_DICT = {
+    '/': '每',
+    '~': '至',
+    '～': '至',
+    '①': '一',
+    '②': '二',
+    '③': '三',
+    '④': '四',
+    '⑤': '五',
+    '⑥': '六',
+    '⑦': '七',
+    '⑧': '八',
+    '⑨': '九',
+    '⑩': '十',
+    'α': '阿尔法',
+    'β': '贝塔',
+    'γ': '伽玛',
+    'Γ': '伽玛',
+    'δ': '德尔塔',
+    'Δ': '德尔塔',
+    'ε': '艾普西龙',
+    'ζ': '捷塔',
+    'η': '依塔',
+    'θ': '西塔',
+    'Θ': '西塔',
+    'ι': '艾欧塔',
+    'κ': '喀帕',
+    'λ': '拉姆达',
+    'Λ': '拉姆达',
+    'μ': '缪',
+    'ν': '拗',
+    'ξ': '克西',
+    'Ξ': '克西',
+    'ο': '欧米克伦',
+    'π': '派',
+    'Π': '派',
+    'ρ': '肉',
+    'ς': '西格玛',
+    'Σ': '西格玛',
+    'σ': '西格玛',
+    'τ': '套',
+    'υ': '宇普西龙',
+    'φ': '服艾',
+    'Φ': '服艾',
+    'χ': '器',
+    'ψ': '普赛',
+    'Ψ': '普赛',
+    'ω': '欧米伽',
+    'Ω': '欧米伽',
+}
+# special characters filtered after the replacements, have one more
+# character "-" than _split
+POST_FILTER_CHARS = '-—《》【】<=>{}()（）#&@“”^_|…\\'
+# none of the replaced characters is in the replacements or filtered, so they
+# are done in one str.translate
+POST_REPLACE_TABLE = str.maketrans(POST_REPLACE_DICT)
+POST_REPLACE_TABLE.update({ord(char): None for char in POST_FILTER_CHARS})
+
+
 class TextNormalizer():
-    def __init__(self):
+    """Normalize Chinese text to be read, e.g. verbalize numbers.
+
+    Args:
+        cache_size (int, optional): number of the normalized sentences to cache, 0 to disable the cache, by default 1024
+    """
+
+    def __init__(self, cache_size: int=1024):
         self.SENTENCE_SPLITOR = re.compile(r'([：、，；。？！,;?!][”’]?)')
+        # sentences repeat, e.g. of the same prompt
+        if cache_size > 0:
+            self._normalize_sentence = lru_cache(maxsize=cache_size)(
+                self._normalize_sentence)
 
     def _split(self, text: str, lang="zh") -> List[str]:
         """Split long text into sentences with sentence-splitting punctuations.
@@ -72,82 +188,32 @@ class TextNormalizer():
         return sentences
 
     def _post_replace(self, sentence: str) -> str:
-        sentence = sentence.replace('/', '每')
-        sentence = sentence.replace('~', '至')
-        sentence = sentence.replace('～', '至')
-        sentence = sentence.replace('①', '一')
-        sentence = sentence.replace('②', '二')
-        sentence = sentence.replace('③', '三')
-        sentence = sentence.replace('④', '四')
-        sentence = sentence.replace('⑤', '五')
-        sentence = sentence.replace('⑥', '六')
-        sentence = sentence.replace('⑦', '七')
-        sentence = sentence.replace('⑧', '八')
-        sentence = sentence.replace('⑨', '九')
-        sentence = sentence.replace('⑩', '十')
-        sentence = sentence.replace('α', '阿尔法')
-        sentence = sentence.replace('β', '贝塔')
-        sentence = sentence.replace('γ', '伽玛').replace('Γ', '伽玛')
-        sentence = sentence.replace('δ', '德尔塔').replace('Δ', '德尔塔')
-        sentence = sentence.replace('ε', '艾普西龙')
-        sentence = sentence.replace('ζ', '捷塔')
-        sentence = sentence.replace('η', '依塔')
-        sentence = sentence.replace('θ', '西塔').replace('Θ', '西塔')
-        sentence = sentence.replace('ι', '艾欧塔')
-        sentence = sentence.replace('κ', '喀帕')
-        sentence = sentence.replace('λ', '拉姆达').replace('Λ', '拉姆达')
-        sentence = sentence.replace('μ', '缪')
-        sentence = sentence.replace('ν', '拗')
-        sentence = sentence.replace('ξ', '克西').replace('Ξ', '克西')
-        sentence = sentence.replace('ο', '欧米克伦')
-        sentence = sentence.replace('π', '派').replace('Π', '派')
-        sentence = sentence.replace('ρ', '肉')
-        sentence = sentence.replace('ς', '西格玛').replace('Σ', '西格玛').replace(
-            'σ', '西格玛')
-        sentence = sentence.replace('τ', '套')
-        sentence = sentence.replace('υ', '宇普西龙')
-        sentence = sentence.replace('φ', '服艾').replace('Φ', '服艾')
-        sentence = sentence.replace('χ', '器')
-        sentence = sentence.replace('ψ', '普赛').replace('Ψ', '普赛')
-        sentence = sentence.replace('ω', '欧米伽').replace('Ω', '欧米伽')
-        # re filter special characters, have one more character "-" than line 68
-        sentence = re.sub(r'[-——《》【】<=>{}()（）#&@“”^_|…\\]', '', sentence)
+        return sentence.translate(POST_REPLACE_TABLE)
+
+    def _apply_rules(self, rules, sentence: str) -> str:
+        for regex, repl, required in rules:
+            if required is None or any(string in sentence
+                                       for string in required):
+                sentence = regex.sub(repl, sentence)
         return sentence
 
-    def normalize_sentence(self, sentence: str) -> str:
+    def _normalize_sentence(self, sentence: str) -> str:
         # basic character conversions
-        sentence = tranditional_to_simplified(sentence)
-        sentence = sentence.translate(F2H_ASCII_LETTERS).translate(
-            F2H_DIGITS).translate(F2H_SPACE)
+        sentence = sentence.translate(CHAR_CONVERT_TABLE)
 
         # number related NSW verbalization
-        sentence = RE_DATE.sub(replace_date, sentence)
-        sentence = RE_DATE2.sub(replace_date2, sentence)
-
-        # range first
-        sentence = RE_TIME_RANGE.sub(replace_time, sentence)
-        sentence = RE_TIME.sub(replace_time, sentence)
-
-        sentence = RE_TEMPERATURE.sub(replace_temperature, sentence)
+        if RE_DIGIT.search(sentence):
+            sentence = self._apply_rules(NSW_RULES_BEFORE_MEASURE, sentence)
         sentence = replace_measure(sentence)
-        sentence = RE_FRAC.sub(replace_frac, sentence)
-        sentence = RE_PERCENTAGE.sub(replace_percentage, sentence)
-        sentence = RE_MOBILE_PHONE.sub(replace_mobile, sentence)
-
-        sentence = RE_TELEPHONE.sub(replace_phone, sentence)
-        sentence = RE_NATIONAL_UNIFORM_NUMBER.sub(replace_phone, sentence)
-
-        sentence = RE_RANGE.sub(replace_range, sentence)
-        sentence = RE_INTEGER.sub(replace_negative_num, sentence)
-        sentence = RE_DECIMAL_NUM.sub(replace_number, sentence)
-        sentence = RE_POSITIVE_QUANTIFIERS.sub(replace_positive_quantifier,
-                                               sentence)
-        sentence = RE_DEFAULT_NUM.sub(replace_default_num, sentence)
-        sentence = RE_NUMBER.sub(replace_number, sentence)
+        if RE_DIGIT.search(sentence):
+            sentence = self._apply_rules(NSW_RULES_AFTER_MEASURE, sentence)
         sentence = self._post_replace(sentence)
 
         return sentence
 
+    def normalize_sentence(self, sentence: str) -> str:
+        return self._normalize_sentence(sentence)
+
     def normalize(self, text: str) -> List[str]:
         sentences = self._split(text)
         sentences = [self.normalize_sentence(sent) for sent in sentences]
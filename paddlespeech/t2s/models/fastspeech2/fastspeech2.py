@@ -601,11 +601,15 @@ class FastSpeech2(nn.Layer):
                  alpha: float=1.0,
                  spk_emb=None,
                  spk_id=None,
-                 tone_id=None) -> Sequence[paddle.Tensor]:
+                 tone_id=None,
+                 mask_outputs: bool=False) -> Sequence[paddle.Tensor]:
         # forward encoder
         x_masks = self._source_mask(ilens)
         # (B, Tmax, adim)
         hs, _ = self.encoder(xs, x_masks)
+        if mask_outputs:
+            # keep the padded tokens out of the convolutions of the predictors
+            hs = hs * x_masks.transpose([0, 2, 1]).cast(hs.dtype)
 
         if self.spk_num and self.enable_speaker_classifier and not is_inference:
             hs_for_spk_cls = self.grad_reverse(hs)
@@ -682,6 +686,9 @@ class FastSpeech2(nn.Layer):
                 olens_in = olens
             # (B, 1, T)
             h_masks = self._source_mask(olens_in)
+        elif mask_outputs:
+            # padded batch in inference, mask the frames of the padded tokens
+            h_masks = self._source_mask(self._output_lengths(d_outs, alpha))
         else:
             h_masks = None
         if return_after_enc:
@@ -698,12 +705,22 @@ class FastSpeech2(nn.Layer):
             before_outs = self.feat_out(zs).reshape(
                 (paddle.shape(zs)[0], -1, self.odim))
 
+        if mask_outputs:
+            # (B, 1, Lmax//r * r), keep the padded frames out of the postnet
+            postnet_masks = make_non_pad_mask(
+                self._output_lengths(d_outs, alpha) *
+                self.reduction_factor).unsqueeze(1).cast(before_outs.dtype)
+            before_outs = before_outs * postnet_masks.transpose((0, 2, 1))
+        else:
+            postnet_masks = None
+
         # postnet -> (B, Lmax//r * r, odim)
         if self.postnet is None:
             after_outs = before_outs
         else:
             after_outs = before_outs + self.postnet(
-                before_outs.transpose((0, 2, 1))).transpose((0, 2, 1))
+                before_outs.transpose((0, 2, 1)),
+                postnet_masks).transpose((0, 2, 1))
 
         return before_outs, after_outs, d_outs, p_outs, e_outs, spk_logits
 
@@ -823,6 +840,71 @@ class FastSpeech2(nn.Layer):
 
         return outs[0], d_outs[0], p_outs[0], e_outs[0]
 
+    def batch_inference(
+            self,
+            text: paddle.Tensor,
+            text_lengths: paddle.Tensor,
+            alpha: float=1.0,
+            spk_emb=None,
+            spk_id=None,
+            tone_id=None,
+    ) -> Tuple[paddle.Tensor, paddle.Tensor]:
+        """Generate the features of a batch of padded sequences of characters.
+
+        Args:
+            text(Tensor(int64)): 
+                Batch of padded sequences of characters (B, Tmax).
+            text_lengths(Tensor(int64)): 
+                Batch of lengths of each input (B,).
+            alpha(float, optional): 
+                Alpha to control the speed.
+            spk_emb(Tensor, optional, optional): 
+                Batch of speaker embedding vectors (B, spk_embed_dim). (Default value = None)
+            spk_id(Tensor, optional(int64), optional): 
+                Batch of spk ids (B,). (Default value = None)
+            tone_id(Tensor, optional(int64), optional): 
+                Batch of padded tone ids (B, Tmax). (Default value = None)
+
+        Returns:
+            Tensor: 
+                Batch of padded output features (B, Lmax, odim).
+            Tensor: 
+                Batch of lengths of each output (B,).
+        """
+        # input of embedding must be int64
+        xs = paddle.cast(text, 'int64')
+        ilens = paddle.cast(text_lengths, 'int64')
+        # (B, Lmax, odim)
+        _, outs, d_outs, *_ = self._forward(
+            xs,
+            ilens,
+            is_inference=True,
+            alpha=alpha,
+            spk_emb=spk_emb,
+            spk_id=spk_id,
+            tone_id=tone_id,
+            mask_outputs=True)
+        olens = self._output_lengths(d_outs, alpha) * self.reduction_factor
+        return outs, olens
+
+    def _output_lengths(self, d_outs: paddle.Tensor,
+                        alpha: float=1.0) -> paddle.Tensor:
+        """Number of frames of the length regulator output, see LengthRegulator.
+
+        Args:
+            d_outs(Tensor): 
+                Batch of durations of each token (B, Tmax).
+            alpha(float, optional): 
+                Alpha to control the speed.
+
+        Returns:
+            Tensor: 
+                Batch of lengths (B,).
+        """
+        if alpha != 1.0:
+            d_outs = paddle.round(d_outs.cast(dtype=paddle.float32) * alpha)
+        return paddle.sum(d_outs.cast(dtype=paddle.int64), axis=-1)
+
     def _integrate_with_spk_embed(self, hs, spk_emb):
         """Integrate speaker embedding with hidden states.
 
@@ -927,6 +1009,23 @@ class FastSpeech2Inference(nn.Layer):
         logmel = self.normalizer.inverse(normalized_mel)
         return logmel
 
+    def batch_inference(self,
+                        text,
+                        text_lengths,
+                        spk_id=None,
+                        spk_emb=None,
+                        alpha: float=1.0):
+        """Batch version of forward, see FastSpeech2.batch_inference.
+
+        Returns:
+            Tensor: padded logmel (B, Lmax, odim)
+            Tensor: lengths of each logmel (B,)
+        """
+        normalized_mel, mel_lengths = self.acoustic_model.batch_inference(
+            text, text_lengths, alpha=alpha, spk_id=spk_id, spk_emb=spk_emb)
+        logmel = self.normalizer.inverse(normalized_mel)
+        return logmel, mel_lengths
+
 
 class StyleFastSpeech2Inference(FastSpeech2Inference):
     def __init__(self,
@@ -284,6 +284,20 @@ class HiFiGANGenerator(nn.Layer):
         c = self.forward(c.transpose([1, 0]).unsqueeze(0), g=g)
         return c.squeeze(0).transpose([1, 0])
 
+    def batch_inference(self, c, g: Optional[paddle.Tensor]=None):
+        """Perform inference on a batch.
+        Args:
+            c (Tensor): 
+                Input tensor (B, T, in_channels).
+            g (Optional[Tensor]): 
+                Global conditioning tensor (B, global_channels, 1).
+        Returns:
+            Tensor:
+                Output tensor (B, T ** prod(upsample_scales), out_channels).
+        """
+        c = self.forward(c.transpose([0, 2, 1]), g=g)
+        return c.transpose([0, 2, 1])
+
 
 class HiFiGANPeriodDiscriminator(nn.Layer):
     """HiFiGAN period discriminator module."""
@@ -834,3 +848,9 @@ class HiFiGANInference(nn.Layer):
         normalized_mel = self.normalizer(logmel)
         wav = self.hifigan_generator.inference(normalized_mel)
         return wav
+
+    def batch_inference(self, logmel):
+        """logmel (B, T, C) -> wav (B, T ** prod(upsample_scales), 1)"""
+        normalized_mel = self.normalizer(logmel)
+        wav = self.hifigan_generator.batch_inference(normalized_mel)
+        return wav
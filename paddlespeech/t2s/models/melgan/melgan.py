@@ -274,6 +274,22 @@ class MelGANGenerator(nn.Layer):
         out = out.squeeze(0).transpose([1, 0])
         return out
 
+    def batch_inference(self, c):
+        """Perform inference on a batch.
+
+        Args:
+            c (Tensor): 
+                Input tensor (B, T, in_channels).
+        Returns:
+            Tensor: Output tensor (B, out_channels*T ** prod(upsample_scales), 1).
+        """
+        # (B, out_channels, T ** prod(upsample_scales)
+        out = self.melgan(c.transpose([0, 2, 1]))
+        if self.pqmf is not None:
+            # (B, 1, out_channels * T ** prod(upsample_scales)
+            out = self.pqmf(out)
+        return out.transpose([0, 2, 1])
+
 
 class MelGANDiscriminator(nn.Layer):
     """MelGAN discriminator module."""
@@ -569,3 +585,9 @@ class MelGANInference(nn.Layer):
         normalized_mel = self.normalizer(logmel)
         wav = self.melgan_generator.inference(normalized_mel)
         return wav
+
+    def batch_inference(self, logmel):
+        """logmel (B, T, C) -> wav (B, T ** prod(upsample_scales), 1)"""
+        normalized_mel = self.normalizer(logmel)
+        wav = self.melgan_generator.batch_inference(normalized_mel)
+        return wav
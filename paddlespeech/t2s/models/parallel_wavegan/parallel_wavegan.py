@@ -229,6 +229,25 @@ class PWGGenerator(nn.Layer):
         out = self(x, c).squeeze(0).transpose([1, 0])
         return out
 
+    def batch_inference(self, c):
+        """Waveform generation of a batch.
+
+        Args:
+            c(Tensor): 
+                Shape (B, T', C_aux), the auxiliary input
+
+        Returns:
+            Tensor: Shape (B, T, C_out), the generated waveform
+        """
+        x = paddle.randn([
+            paddle.shape(c)[0], self.in_channels,
+            paddle.shape(c)[1] * self.upsample_factor
+        ])
+        c = paddle.transpose(c, [0, 2, 1])
+        c = nn.Pad1D(self.aux_context_window, mode='replicate')(c)
+        out = self(x, c).transpose([0, 2, 1])
+        return out
+
 
 class PWGDiscriminator(nn.Layer):
     """A convolutional discriminator for audio.
@@ -489,3 +508,9 @@ class PWGInference(nn.Layer):
         normalized_mel = self.normalizer(logmel)
         wav = self.pwg_generator.inference(normalized_mel)
         return wav
+
+    def batch_inference(self, logmel):
+        """logmel (B, T, C) -> wav (B, T * upsample_factor, 1)"""
+        normalized_mel = self.normalizer(logmel)
+        wav = self.pwg_generator.batch_inference(normalized_mel)
+        return wav
@@ -57,12 +57,15 @@ class ConvolutionModule(nn.Layer):
             bias_attr=bias, )
         self.activation = activation
 
-    def forward(self, x):
+    def forward(self, x, masks=None):
         """Compute convolution module.
 
         Args:
             x (Tensor): 
                 Input tensor (#batch, time, channels).
+            masks (Tensor, optional): 
+                Mask tensor (#batch, time, 1), the padded frames are zeroed
+                before the depthwise conv if given.
         Returns:
             Tensor: Output tensor (#batch, time, channels).
         """
@@ -74,6 +77,8 @@ class ConvolutionModule(nn.Layer):
         x = self.pointwise_conv1(x)
         # (batch, channel, time)
         x = nn.functional.glu(x, axis=1)
+        if masks is not None:
+            x = x * masks.transpose([0, 2, 1])
 
         # 1D Depthwise Conv
         x = self.depthwise_conv(x)
@@ -120,6 +120,12 @@ class EncoderLayer(nn.Layer):
         if self.training and self.stochastic_depth_rate > 0:
             skip_layer = paddle.rand(1).item() < self.stochastic_depth_rate
             stoch_layer_coeff = 1.0 / (1 - self.stochastic_depth_rate)
+        # zero the padded frames before the convolutions of a padded batch in
+        # inference, so that they do not change the valid frames
+        pad_mask = None
+        if (cache is None and not self.training and mask is not None and
+                mask.shape[1] == 1):
+            pad_mask = mask.transpose([0, 2, 1]).cast(x.dtype)
         if skip_layer:
             if cache is not None:
                 x = paddle.concat([cache, x], axis=1)
@@ -132,7 +138,7 @@ class EncoderLayer(nn.Layer):
             if self.normalize_before:
                 x = self.norm_ff_macaron(x)
             x = residual + stoch_layer_coeff * self.ff_scale * self.dropout(
-                self.feed_forward_macaron(x))
+                self.feed_forward_macaron(x, pad_mask))
             if not self.normalize_before:
                 x = self.norm_ff_macaron(x)
         # multi-headed self-attention module
@@ -166,7 +172,8 @@ class EncoderLayer(nn.Layer):
             residual = x
             if self.normalize_before:
                 x = self.norm_conv(x)
-            x = residual + stoch_layer_coeff * self.dropout(self.conv_module(x))
+            x = residual + stoch_layer_coeff * self.dropout(
+                self.conv_module(x, pad_mask))
             if not self.normalize_before:
                 x = self.norm_conv(x)
 
@@ -175,7 +182,7 @@ class EncoderLayer(nn.Layer):
         if self.normalize_before:
             x = self.norm_ff(x)
         x = residual + stoch_layer_coeff * self.ff_scale * self.dropout(
-            self.feed_forward(x))
+            self.feed_forward(x, pad_mask))
         if not self.normalize_before:
             x = self.norm_ff(x)
 
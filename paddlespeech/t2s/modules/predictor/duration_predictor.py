@@ -85,9 +85,17 @@ class DurationPredictor(nn.Layer):
     def _forward(self, xs, x_masks=None, is_inference=False):
         # (B, idim, Tmax)
         xs = xs.transpose([0, 2, 1])
+        if is_inference and x_masks is not None:
+            # (B, 1, Tmax), keep the padded frames out of the next layer
+            conv_masks = paddle.logical_not(x_masks).unsqueeze(1).cast(
+                xs.dtype)
+        else:
+            conv_masks = None
         # (B, C, Tmax)
         for f in self.conv:
             xs = f(xs)
+            if conv_masks is not None:
+                xs = xs * conv_masks
 
         # NOTE: calculate in log domain
         # (B, Tmax)
@@ -32,16 +32,58 @@ class LengthRegulator(nn.Layer):
 
     """
 
-    def __init__(self, pad_value=0.0):
+    def __init__(self, pad_value=0.0, use_gather: bool=True):
         """Initilize length regulator module.
 
         Args:
             pad_value (float, optional): 
                 Value used for padding.
+            use_gather (bool, optional): 
+                Expand by gathering the encodings of each frame, otherwise by
+                the alignment matrix as before.
 
         """
         super().__init__()
         self.pad_value = pad_value
+        self.use_gather = use_gather
+
+    def expand_gather(self, encodings: paddle.Tensor,
+                      durations: paddle.Tensor) -> paddle.Tensor:
+        """Expand by the index of the token of each frame, which costs
+        O(T_dec * C) rather than O(T_dec * T_enc * C) of the alignment matrix.
+
+        encodings: (B, T, C)
+        durations: (B, T)
+        """
+        batch_size = paddle.shape(encodings)[0]
+        t_enc = paddle.shape(encodings)[1]
+        channels = paddle.shape(encodings)[2]
+        # (B, T), the end frame of each token, exclusive
+        ends = paddle.cumsum(durations, axis=-1)
+        # (B, )
+        slens = ends[:, -1]
+        t_dec = paddle.max(slens)
+        # (B, T_dec)
+        frames = paddle.expand(
+            paddle.arange(t_dec, dtype=ends.dtype).unsqueeze(0),
+            [batch_size, t_dec])
+        # the token of a frame is the first one ending after it
+        index = paddle.searchsorted(ends, frames, right=True)
+        # index of the rows of the flattened batch, and the padded frames
+        # point to an extra row of the pad value
+        index = index + paddle.arange(
+            batch_size, dtype=index.dtype).unsqueeze(-1) * t_enc
+        index = paddle.where(frames < slens.unsqueeze(-1), index,
+                             paddle.full_like(index, batch_size * t_enc))
+        rows = paddle.concat(
+            [
+                encodings.reshape([-1, channels]), paddle.full(
+                    [1, channels], self.pad_value, dtype=encodings.dtype)
+            ],
+            axis=0)
+        # (B, T_dec, C)
+        return paddle.gather(rows, index.reshape([-1])).reshape(
+            [batch_size, t_dec, channels])
 
     # expand_numpy is faster than expand
     def expand_numpy(self, encodings: paddle.Tensor,
@@ -77,17 +119,20 @@ class LengthRegulator(nn.Layer):
         slens = paddle.sum(durations, -1)
         t_dec = paddle.max(slens)
         t_dec_1 = t_dec + 1
-        flatten_duration = paddle.cumsum(
-            paddle.reshape(durations, [batch_size * t_enc])) + 1
-        init = paddle.zeros(t_dec_1)
+        # the end frame of each token, counted in its own utterance
+        flatten_duration = paddle.reshape(
+            paddle.cumsum(durations, axis=-1), [batch_size * t_enc]) + 1
         m_batch = batch_size * t_enc
         M = paddle.zeros([t_dec_1, m_batch])
-        for i in range(m_batch):
-            d = flatten_duration[i]
-            m = paddle.concat(
-                [paddle.ones(d), paddle.zeros(t_dec_1 - d)], axis=0)
-            M[:, i] = m - init
-            init = m
+        for b in range(batch_size):
+            init = paddle.zeros(t_dec_1)
+            for j in range(t_enc):
+                i = b * t_enc + j
+                d = flatten_duration[i]
+                m = paddle.concat(
+                    [paddle.ones(d), paddle.zeros(t_dec_1 - d)], axis=0)
+                M[:, i] = m - init
+                init = m
         M = paddle.reshape(M, shape=[t_dec_1, batch_size, t_enc])
         M = M[1:t_dec_1, :, :]
         M = paddle.transpose(M, (1, 0, 2))
@@ -123,7 +168,9 @@ class LengthRegulator(nn.Layer):
             repeat = [paddle.repeat_interleave(x, d, axis=0) for x, d in zip(xs, ds)]
             return pad_list(repeat, self.pad_value)
         '''
-        if is_inference:
+        if self.use_gather:
+            return self.expand_gather(xs, ds)
+        elif is_inference:
             return self.expand(xs, ds)
         else:
             return self.expand_numpy(xs, ds)
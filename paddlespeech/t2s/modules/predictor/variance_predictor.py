@@ -90,10 +90,18 @@ class VariancePredictor(nn.Layer):
         """
         # (B, idim, Tmax)
         xs = xs.transpose([0, 2, 1])
+        if not self.training and x_masks is not None:
+            # (B, 1, Tmax), keep the padded frames out of the next layer
+            conv_masks = paddle.logical_not(x_masks).transpose(
+                [0, 2, 1]).cast(xs.dtype)
+        else:
+            conv_masks = None
         # (B, C, Tmax)
         for f in self.conv:
             # (B, C, Tmax)
             xs = f(xs)
+            if conv_masks is not None:
+                xs = xs * conv_masks
         # (B, Tmax, 1)
         xs = self.linear(xs.transpose([0, 2, 1]))
     
@@ -169,16 +169,20 @@ class Postnet(nn.Layer):
                         bias_attr=False, ),
                     nn.Dropout(dropout_rate), ))
 
-    def forward(self, xs):
+    def forward(self, xs, masks=None):
         """Calculate forward propagation.
 
         Args:
             xs (Tensor): Batch of the sequences of padded input tensors (B, idim, Tmax).
+            masks (Tensor, optional): Mask tensor (B, 1, Tmax), the padded frames
+                are zeroed after each layer if given.
         Returns:
             Tensor: Batch of padded output tensor. (B, odim, Tmax).
         """
         for i in range(len(self.postnet)):
             xs = self.postnet[i](xs)
+            if masks is not None:
+                xs = xs * masks
         return xs
 
 
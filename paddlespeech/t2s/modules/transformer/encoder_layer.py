@@ -78,6 +78,13 @@ class EncoderLayer(nn.Layer):
             Tensor: 
                 Mask tensor (#batch, time).
         """
+        # zero the padded frames before the convolutions of a padded batch in
+        # inference, so that they do not change the valid frames
+        pad_mask = None
+        if (cache is None and not self.training and mask is not None and
+                mask.shape[1] == 1):
+            pad_mask = mask.transpose([0, 2, 1]).cast(x.dtype)
+
         residual = x
         if self.normalize_before:
             x = self.norm1(x)
@@ -103,7 +110,7 @@ class EncoderLayer(nn.Layer):
         residual = x
         if self.normalize_before:
             x = self.norm2(x)
-        x = residual + self.dropout(self.feed_forward(x))
+        x = residual + self.dropout(self.feed_forward(x, pad_mask))
         if not self.normalize_before:
             x = self.norm2(x)
 
@@ -58,17 +58,24 @@ class MultiLayeredConv1d(nn.Layer):
         self.dropout = nn.Dropout(dropout_rate)
         self.relu = nn.ReLU()
 
-    def forward(self, x):
+    def forward(self, x, masks=None):
         """Calculate forward propagation.
 
         Args:
             x (Tensor): 
                 Batch of input tensors (B, T, in_chans).
+            masks (Tensor, optional): 
+                Batch of masks (B, T, 1), the padded frames are zeroed
+                before each conv if given.
 
         Returns: 
             Tensor: Batch of output tensors (B, T, in_chans).
         """
+        if masks is not None:
+            x = x * masks
         x = self.relu(self.w_1(x.transpose([0, 2, 1]))).transpose([0, 2, 1])
+        if masks is not None:
+            x = x * masks
         out = self.w_2(self.dropout(x).transpose([0, 2, 1])).transpose([0, 2, 1])
         return out
 
@@ -104,17 +111,22 @@ class Conv1dLinear(nn.Layer):
         self.dropout = nn.Dropout(dropout_rate)
         self.relu = nn.ReLU()
 
-    def forward(self, x):
+    def forward(self, x, masks=None):
         """Calculate forward propagation.
 
         Args:
             x (Tensor): 
                 Batch of input tensors (B, T, in_chans).
+            masks (Tensor, optional): 
+                Batch of masks (B, T, 1), the padded frames are zeroed
+                before the conv if given.
 
         Returns:
             Tensor: Batch of output tensors (B, T, in_chans).
 
         """
+        if masks is not None:
+            x = x * masks
         x = self.relu(self.w_1(x.transpose([0, 2, 1]))).transpose([0, 2, 1])
 
         return self.w_2(self.dropout(x))
@@ -41,6 +41,7 @@ class PositionwiseFeedForward(nn.Layer):
         self.dropout = paddle.nn.Dropout(dropout_rate)
         self.activation = activation
 
-    def forward(self, x):
-        """Forward funciton."""
+    def forward(self, x, masks=None):
+        """Forward funciton, `masks` is unused since every frame is
+        computed on its own."""
         return self.w_2(self.dropout(self.activation(self.w_1(x))))
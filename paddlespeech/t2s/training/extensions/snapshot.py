@@ -25,6 +25,8 @@ import jsonlines
 from paddlespeech.t2s.training import extension
 from paddlespeech.t2s.training.trainer import Trainer
 from paddlespeech.t2s.utils.mp_tools import rank_zero_only
+from paddlespeech.utils.checkpoint_writer import CheckpointWriter
+from paddlespeech.utils.checkpoint_writer import to_host
 
 
 def load_records(records_fp):
@@ -43,20 +45,30 @@ class Snapshot(extension.Extension):
     parameters and optimizer states. If the updater inside the trainer
     subclasses StandardUpdater, everything is good to go.
 
+    The state_dict is copied to host memory on the training thread, and
+    written to disk in a background thread, after which the earliest
+    snapshot is removed and the record file is updated.
+
     Arsg:
-        checkpoint_dir (Union[str, Path]): The directory to save checkpoints into.
+        max_size (int): The number of snapshots to keep, -1 to keep all.
+        snapshot_on_error (bool): Whether to make a snapshot on error.
+        async_save (bool): Whether to write the snapshot in a background thread.
     """
 
     trigger = (1, 'epoch')
     priority = -100
     default_name = "snapshot"
 
-    def __init__(self, max_size: int=5, snapshot_on_error: bool=False):
+    def __init__(self,
+                 max_size: int=5,
+                 snapshot_on_error: bool=False,
+                 async_save: bool=True):
         self.records: List[Dict[str, Any]] = []
         self.max_size = max_size
         self._snapshot_on_error = snapshot_on_error
         self._save_all = (max_size == -1)
         self.checkpoint_dir = None
+        self.writer = CheckpointWriter(asynchronous=async_save)
 
     def initialize(self, trainer: Trainer):
         """Setting up this extention."""
@@ -76,6 +88,10 @@ class Snapshot(extension.Extension):
     def __call__(self, trainer: Trainer):
         self.save_checkpoint_and_update(trainer)
 
+    def finalize(self, trainer: Trainer):
+        """Wait for the pending snapshot."""
+        self.writer.wait()
+
     def full(self):
         """Whether the number of snapshots it keeps track of is greater
         than the max_size."""
@@ -87,13 +103,19 @@ class Snapshot(extension.Extension):
         iteration = trainer.updater.state.iteration
         path = self.checkpoint_dir / f"snapshot_iter_{iteration}.pdz"
 
-        # add the new one
-        trainer.updater.save(path)
+        # copy the state to host memory, and write it in the background
+        state_dict = to_host(trainer.updater.state_dict())
         record = {
             "time": str(datetime.now()),
             'path': str(path.resolve()),  # use absolute path
             'iteration': iteration
         }
+        self.writer.submit({path: state_dict},
+                           callback=lambda: self._update_records(record))
+
+    def _update_records(self, record: Dict[str, Any]):
+        """Add the record of a snapshot written to disk, and remove the
+        earliest snapshot if needed."""
         self.records.append(record)
 
         # remove the earist
@@ -104,7 +126,9 @@ class Snapshot(extension.Extension):
 
         # update the record file
         record_path = self.checkpoint_dir / "records.jsonl"
-        with jsonlines.open(record_path, 'w') as writer:
+        tmp_path = record_path.with_suffix(".jsonl.tmp")
+        with jsonlines.open(tmp_path, 'w') as writer:
             for record in self.records:
                 # jsonlines.open may return a Writer or a Reader
                 writer.write(record)  # pylint: disable=no-member
+        os.replace(tmp_path, record_path)
@@ -0,0 +1,155 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Write checkpoints in a background thread.
+
+The training thread only copies the state dicts to host memory, which is
+fast, then a background thread serializes them, fsyncs and atomically renames
+the files, so the step loop is not blocked by the disk. A checkpoint file is
+either complete or absent, even if the process dies during the write.
+"""
+import logging
+import os
+import threading
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+import numpy as np
+import paddle
+
+__all__ = ["to_host", "atomic_save", "CheckpointWriter"]
+
+logger = logging.getLogger(__name__)
+
+
+def to_host(obj: Any) -> Any:
+    """Copy the tensors of a (nested) state dict to host memory.
+
+    The tensors are copied to numpy arrays, which `paddle.save` saves like
+    tensors and `paddle.load` loads as tensors, so the checkpoint is the same
+    as that of the state dict, while the training goes on updating the
+    parameters.
+
+    Args:
+        obj (Any): a state dict, or a tensor, list, tuple or dict of them.
+
+    Returns:
+        Any: the same structure with the tensors replaced by numpy arrays.
+    """
+    if isinstance(obj, paddle.Tensor):
+        return obj.numpy()
+    if isinstance(obj, np.ndarray):
+        return obj.copy()
+    if isinstance(obj, dict):
+        return type(obj)((key, to_host(value)) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(to_host(value) for value in obj)
+    return obj
+
+
+def _fsync(path: os.PathLike):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_save(obj: Any, path: os.PathLike):
+    """Save an object with `paddle.save` to a temporary file, fsync it and
+    rename it to `path`, so `path` is never a partially written checkpoint.
+
+    Args:
+        obj (Any): the object to save, e.g. a state dict.
+        path (os.PathLike): path of the checkpoint.
+    """
+    path = os.fspath(path)
+    tmp_path = path + ".tmp"
+    try:
+        paddle.save(obj, tmp_path)
+        _fsync(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # do not leave a partially written file behind
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    # make the rename durable
+    _fsync(os.path.dirname(os.path.abspath(path)))
+
+
+class CheckpointWriter:
+    """Save checkpoints in a background thread, at most one in flight.
+
+    `submit` waits for the previous checkpoint to be done, so the checkpoints
+    are written in order and at most one copy of the state is kept in host
+    memory. The callback of a checkpoint, e.g. removing the old checkpoints
+    and updating the records, runs after its files are written. The thread is
+    not a daemon, the interpreter waits for the pending checkpoint on exit.
+
+    Args:
+        asynchronous (bool, optional): write in a background thread, or on the calling thread, by default True
+    """
+
+    def __init__(self, asynchronous: bool=True):
+        self.asynchronous = asynchronous
+        self._thread = None
+        self._error = None
+
+    def _write(self,
+               objs: Dict[str, Any],
+               callback: Optional[Callable[[], None]]=None):
+        for path, obj in objs.items():
+            atomic_save(obj, path)
+            logger.info(f"Saved checkpoint to {path}")
+        if callback is not None:
+            callback()
+
+    def _run(self, objs, callback):
+        try:
+            self._write(objs, callback)
+        except BaseException as e:
+            logger.exception("Failed to save checkpoint")
+            self._error = e
+
+    def submit(self,
+               objs: Dict[str, Any],
+               callback: Optional[Callable[[], None]]=None):
+        """Save objects after the pending checkpoint is done.
+
+        Args:
+            objs (Dict[str, Any]): the objects to save by path, which should be in host memory, see `to_host`.
+            callback (Callable[[], None], optional): called after the objects are saved.
+        """
+        self.wait()
+        if not self.asynchronous:
+            self._write(objs, callback)
+            return
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(objs, callback),
+            name="CheckpointWriter",
+            daemon=False)
+        self._thread.start()
+
+    def wait(self):
+        """Wait for the pending checkpoint, and raise the error of it if any.
+        """
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Failed to save checkpoint") from error
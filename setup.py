@@ -75,7 +75,7 @@ base = [
     "zhon",
 ]
 
-server = ["pattern_singleton", "websockets"]
+server = ["websockets"]
 
 requirements = {
     "install":
@@ -0,0 +1,82 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Per frame cost of the ctc prefix beam search of the online asr engine."""
+import argparse
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import paddle
+from yacs.config import CfgNode
+
+from paddlespeech.cli.log import logger
+from paddlespeech.server.engine.asr.online.ctc_search import CTCPrefixBeamSearch
+
+# the pure python reference lives next to its unit test
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../unit/asr'))
+from naive_ctc_search import NaiveCTCPrefixBeamSearch  # noqa: E402
+
+
+def fake_ctc_probs(num_frames: int, vocab_size: int, seed: int=0):
+    """Peaky ctc log probs, mostly blank as the outputs of a trained model."""
+    rng = np.random.RandomState(seed)
+    logits = rng.randn(num_frames, vocab_size) * 2
+    logits[:, 0] += 6
+    for t in range(0, num_frames, 4):
+        logits[t, rng.randint(1, vocab_size)] += 10
+    return paddle.nn.functional.log_softmax(
+        paddle.to_tensor(logits, dtype='float32'), axis=-1)
+
+
+def benchmark(searcher_cls, ctc_probs, beam_size: int, chunk_size: int):
+    searcher = searcher_cls(CfgNode(dict(beam_size=beam_size)))
+    start = time.perf_counter()
+    for t in range(0, ctc_probs.shape[0], chunk_size):
+        hyps = searcher.search(ctc_probs[t:t + chunk_size], None)
+    elapsed = time.perf_counter() - start
+    return elapsed / ctc_probs.shape[0] * 1000, hyps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--beam_sizes", type=int, nargs='+', default=[1, 5, 10, 20])
+    parser.add_argument("--vocab_size", type=int, default=5537)
+    parser.add_argument("--num_frames", type=int, default=400)
+    parser.add_argument(
+        "--chunk_size", type=int, default=16, help="decoding frames per chunk")
+    args = parser.parse_args()
+
+    logger.logger.setLevel(logging.WARNING)
+    paddle.set_device('cpu')
+    ctc_probs = fake_ctc_probs(args.num_frames, args.vocab_size)
+
+    print("| beam size | naive (ms/frame) | vectorized (ms/frame) | speedup |")
+    print("| --- | --- | --- | --- |")
+    for beam_size in args.beam_sizes:
+        naive_ms, naive_hyps = benchmark(NaiveCTCPrefixBeamSearch, ctc_probs,
+                                         beam_size, args.chunk_size)
+        ms, hyps = benchmark(CTCPrefixBeamSearch, ctc_probs, beam_size,
+                             args.chunk_size)
+        assert [hyp[0] for hyp in hyps] == [hyp[0] for hyp in naive_hyps]
+        print(
+            f"| {beam_size} | {naive_ms:.3f} | {ms:.3f} | {naive_ms / ms:.1f}x |"
+        )
+
+
+if __name__ == '__main__':
+    main()
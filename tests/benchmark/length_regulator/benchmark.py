@@ -0,0 +1,93 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Cost of the expansions of the length regulator of fastspeech2."""
+import argparse
+import time
+
+import numpy as np
+import paddle
+
+from paddlespeech.t2s.modules.predictor.length_regulator import LengthRegulator
+
+
+def fake_inputs(batch_size: int,
+                num_tokens: int,
+                channels: int,
+                max_duration: int,
+                seed: int=0):
+    """Encodings and durations of about the statistics of phones."""
+    rng = np.random.RandomState(seed)
+    encodings = paddle.to_tensor(
+        rng.randn(batch_size, num_tokens, channels).astype('float32'))
+    durations = paddle.to_tensor(
+        rng.randint(0, max_duration + 1, [batch_size, num_tokens]),
+        dtype='int64')
+    return encodings, durations
+
+
+def benchmark(expand, encodings, durations, repeat: int):
+    # warm up
+    out = expand(encodings, durations)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = expand(encodings, durations)
+    if paddle.is_compiled_with_cuda():
+        paddle.device.cuda.synchronize()
+    return (time.perf_counter() - start) / repeat * 1000, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--num_tokens", type=int, nargs='+', default=[32, 128, 512])
+    parser.add_argument("--batch_size", type=int, default=8)
+    parser.add_argument("--channels", type=int, default=384)
+    parser.add_argument("--max_duration", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--max_loop_tokens",
+        type=int,
+        default=128,
+        help="skip the python loop of `expand` above this number of tokens")
+    parser.add_argument("--device", type=str, default='cpu')
+    args = parser.parse_args()
+
+    paddle.set_device(args.device)
+    length_regulator = LengthRegulator()
+
+    print(
+        "| tokens | frames | matmul numpy (ms) | matmul loop (ms) | gather (ms) | speedup |"
+    )
+    print("| --- | --- | --- | --- | --- | --- |")
+    for num_tokens in args.num_tokens:
+        encodings, durations = fake_inputs(args.batch_size, num_tokens,
+                                           args.channels, args.max_duration)
+        numpy_ms, ref = benchmark(length_regulator.expand_numpy, encodings,
+                                  durations, args.repeat)
+        if num_tokens <= args.max_loop_tokens:
+            loop_ms, _ = benchmark(length_regulator.expand, encodings,
+                                   durations, 1)
+            loop_ms = f"{loop_ms:.2f}"
+        else:
+            loop_ms = "-"
+        gather_ms, out = benchmark(length_regulator.expand_gather, encodings,
+                                   durations, args.repeat)
+        np.testing.assert_allclose(out.numpy(), ref.numpy(), atol=1e-6)
+        print(
+            f"| {num_tokens} | {out.shape[1]} | {numpy_ms:.2f} | {loop_ms} | {gather_ms:.2f} | {numpy_ms / gather_ms:.1f}x |"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Throughput of the feature stages of the streamdata ASR pipeline, per
+sample and per batch."""
+import argparse
+import time
+
+import numpy as np
+import paddle
+
+from paddlespeech.audio.streamdata import filters
+
+
+def make_samples(num_samples: int, min_seconds: float, max_seconds: float):
+    rng = np.random.RandomState(0)
+    samples = []
+    for i in range(num_samples):
+        num = int(rng.uniform(min_seconds, max_seconds) * 16000)
+        samples.append(
+            dict(
+                fname=str(i),
+                label=rng.randint(1, 100, size=20).tolist(),
+                sample_rate=16000,
+                wav=paddle.to_tensor(
+                    (rng.randn(1, num) * 0.1).astype(np.float32))))
+    return samples
+
+
+def per_sample(samples, batch_size, cmvn, augment_conf):
+    return filters.pipeline(
+        iter(samples),
+        filters._audio_compute_fbank,
+        lambda source: filters._audio_spec_aug(source, **augment_conf),
+        filters._sort,
+        lambda source: filters._batched(source, batch_size),
+        filters._audio_padding,
+        lambda source: filters._audio_cmvn(source, cmvn))
+
+
+def per_batch(samples, batch_size, cmvn, augment_conf):
+    return filters.pipeline(
+        iter(samples),
+        filters._sort,
+        lambda source: filters._batched(source, batch_size),
+        filters._audio_padding,
+        filters._audio_batch_compute_fbank,
+        lambda source: filters._audio_batch_spec_aug(source, **augment_conf),
+        lambda source: filters._audio_cmvn(source, cmvn))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num_samples", type=int, default=256)
+    parser.add_argument("--batch_size", type=int, default=32)
+    parser.add_argument("--min_seconds", type=float, default=2.0)
+    parser.add_argument("--max_seconds", type=float, default=8.0)
+    args = parser.parse_args()
+    paddle.set_device("cpu")
+
+    cmvn = {
+        "mean_stat": [0.0] * 80,
+        "var_stat": [1.0] * 80,
+        "frame_num": 1,
+    }
+    augment_conf = dict(max_w=5, max_f=30, num_f_mask=2, max_t=40, num_t_mask=2)
+    print("| stages | samples/s |")
+    print("| --- | --- |")
+    for name, stages in (("per sample", per_sample), ("per batch", per_batch)):
+        # the samples are not modified by the stages, except spec_aug inplace
+        samples = make_samples(args.num_samples, args.min_seconds,
+                               args.max_seconds)
+        start = time.perf_counter()
+        for _ in stages(samples, args.batch_size, cmvn, augment_conf):
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"| {name} | {args.num_samples / elapsed:.1f} |")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Throughput of the Chinese text normalizer of the tts frontend."""
+import argparse
+import time
+from pathlib import Path
+
+from paddlespeech.t2s.frontend.zh_normalization.text_normlization import TextNormalizer
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def load_sentences(paths):
+    sentences = []
+    for path in paths:
+        with open(path, 'rt') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if '|' in line:
+                    # textnorm_test_cases.txt: raw|normalized
+                    line = line.split('|')[0]
+                elif line.split(' ', 1)[0].isdigit():
+                    # csmsc_test.txt: utt_id sentence
+                    line = line.split(' ', 1)[-1]
+                sentences.append(line)
+    return sentences
+
+
+def benchmark(text_normalizer, sentences, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for sentence in sentences:
+            text_normalizer.normalize_sentence(sentence)
+    elapsed = time.perf_counter() - start
+    num_chars = sum(len(sentence) for sentence in sentences) * repeat
+    return len(sentences) * repeat / elapsed, num_chars / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--text",
+        type=str,
+        nargs='+',
+        default=[
+            REPO_ROOT / "paddlespeech/t2s/assets/csmsc_test.txt",
+            REPO_ROOT / "examples/other/tn/data/textnorm_test_cases.txt"
+        ],
+        help="text files of one sentence per line.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sentences = load_sentences(args.text)
+    print(f"{len(sentences)} sentences, "
+          f"{sum(len(sentence) for sentence in sentences)} characters")
+    print("| normalizer | sentences/s | characters/s |")
+    print("| --- | --- | --- |")
+    for name, cache_size in (("no cache", 0), ("cache", 1024)):
+        sentences_per_s, chars_per_s = benchmark(
+            TextNormalizer(cache_size=cache_size), sentences, args.repeat)
+        print(f"| {name} | {sentences_per_s:.0f} | {chars_per_s:.0f} |")
+
+
+if __name__ == '__main__':
+    main()
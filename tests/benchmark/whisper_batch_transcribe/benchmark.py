@@ -0,0 +1,89 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Real time factor of the long-form Whisper transcription, decoding the
+30-second windows one by one and in batch."""
+import argparse
+import time
+
+import paddle
+
+from paddlespeech.s2t.models.whisper import ModelDimensions
+from paddlespeech.s2t.models.whisper import Whisper
+from paddlespeech.s2t.models.whisper.tokenizer import get_tokenizer
+from paddlespeech.s2t.models.whisper.whipser import HOP_LENGTH
+from paddlespeech.s2t.models.whisper.whipser import SAMPLE_RATE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--resource_path",
+        type=str,
+        required=True,
+        help="resource of whisper, with the tokenizer assets")
+    parser.add_argument("--minutes", type=float, default=5.0)
+    parser.add_argument("--batch_sizes", type=int, nargs="+", default=[1, 4, 8])
+    # the dims of whisper tiny
+    parser.add_argument("--n_state", type=int, default=384)
+    parser.add_argument("--n_head", type=int, default=6)
+    parser.add_argument("--n_layer", type=int, default=4)
+    parser.add_argument("--n_text_ctx", type=int, default=448)
+    args = parser.parse_args()
+    paddle.set_device("cpu")
+    paddle.seed(0)
+
+    tokenizer = get_tokenizer(False, resource_path=args.resource_path)
+    dims = ModelDimensions(
+        n_mels=80,
+        n_audio_ctx=1500,
+        n_audio_state=args.n_state,
+        n_audio_head=args.n_head,
+        n_audio_layer=args.n_layer,
+        n_vocab=tokenizer.timestamp_begin + 1501,
+        n_text_ctx=args.n_text_ctx,
+        n_text_state=args.n_state,
+        n_text_head=args.n_head,
+        n_text_layer=args.n_layer)
+    # random weights, every window decodes up to n_text_ctx // 2 tokens
+    model = Whisper(dims)
+    model.eval()
+    num_frames = int(args.minutes * 60 * SAMPLE_RATE / HOP_LENGTH)
+    mel = paddle.uniform([80, num_frames], min=-1.0, max=1.0)
+    seconds = num_frames * HOP_LENGTH / SAMPLE_RATE
+
+    print("| mode | batch size | RTF |")
+    print("| --- | --- | --- |")
+    start = time.perf_counter()
+    model.transcribe(
+        mel,
+        args.resource_path,
+        temperature=0.0,
+        condition_on_previous_text=False,
+        language="en")
+    elapsed = time.perf_counter() - start
+    print(f"| transcribe | 1 | {elapsed / seconds:.4f} |")
+    for batch_size in args.batch_sizes:
+        start = time.perf_counter()
+        model.batch_transcribe(
+            mel,
+            args.resource_path,
+            batch_size=batch_size,
+            temperature=0.0,
+            language="en")
+        elapsed = time.perf_counter() - start
+        print(f"| batch_transcribe | {batch_size} | {elapsed / seconds:.4f} |")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+import numpy as np
+import paddle
+from naive_ctc_search import NaiveCTCPrefixBeamSearch
+from yacs.config import CfgNode
+
+from paddlespeech.server.engine.asr.online.ctc_search import CTCPrefixBeamSearch
+
+
+class TestCTCPrefixBeamSearch(unittest.TestCase):
+    def setUp(self):
+        paddle.set_device('cpu')
+        self.rng = np.random.RandomState(0)
+
+    def _test_search(self, vocab_size, beam_size, scale):
+        config = CfgNode(dict(beam_size=beam_size))
+        searcher = CTCPrefixBeamSearch(config)
+        expected_searcher = NaiveCTCPrefixBeamSearch(config)
+        # search chunk by chunk
+        for num_frames in (7, 1, 12):
+            logits = self.rng.randn(num_frames, vocab_size) * scale
+            logits[:, 0] += scale
+            ctc_probs = paddle.nn.functional.log_softmax(
+                paddle.to_tensor(logits, dtype='float32'), axis=-1)
+            hyps = searcher.search(ctc_probs, None)
+            expected = expected_searcher.search(ctc_probs, None)
+
+            self.assertEqual(len(hyps), len(expected))
+            for hyp, expected_hyp in zip(hyps, expected):
+                # prefix and time stamps
+                self.assertEqual(hyp[0], expected_hyp[0])
+                self.assertEqual(hyp[5], expected_hyp[5])
+                self.assertEqual(hyp[6], expected_hyp[6])
+                # scores
+                np.testing.assert_allclose(hyp[1:5], expected_hyp[1:5])
+            self.assertEqual(searcher.get_one_best_hyps(),
+                             expected_searcher.get_one_best_hyps())
+            self.assertIs(searcher.get_hyps(), hyps)
+
+    def test_small_vocab(self):
+        self._test_search(vocab_size=6, beam_size=4, scale=2.0)
+
+    def test_peaky(self):
+        self._test_search(vocab_size=30, beam_size=10, scale=8.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
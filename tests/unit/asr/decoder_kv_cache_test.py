@@ -0,0 +1,102 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+import numpy as np
+import paddle
+
+from paddlespeech.s2t.modules.decoder import TransformerDecoder
+from paddlespeech.s2t.modules.mask import make_non_pad_mask
+from paddlespeech.s2t.modules.mask import subsequent_mask
+
+
+class TestDecoderKVCache(unittest.TestCase):
+    def setUp(self):
+        paddle.set_device('cpu')
+        paddle.seed(0)
+        self.vocab_size = 10
+        self.batch_size = 3
+        self.memory = paddle.randn([self.batch_size, 20, 64])
+        self.memory_mask = make_non_pad_mask(
+            paddle.to_tensor([20, 13, 17])).unsqueeze(1)
+        self.tokens = paddle.randint(0, self.vocab_size,
+                                     [self.batch_size, 6])
+
+    def _build(self, **kwargs):
+        decoder = TransformerDecoder(
+            self.vocab_size,
+            64,
+            attention_heads=4,
+            linear_units=128,
+            num_blocks=2,
+            **kwargs)
+        decoder.eval()
+        return decoder
+
+    def _test_steps(self, decoder):
+        # reorder the hyps at every step, like a beam search
+        perm = paddle.to_tensor([2, 0, 1])
+        tokens = self.tokens
+        memory_kv = decoder.init_kv_cache(self.memory)
+        cache = None
+        for i in range(1, tokens.shape[1] + 1):
+            expected, _ = decoder.forward_one_step(
+                self.memory, self.memory_mask, tokens[:, :i],
+                subsequent_mask(i).unsqueeze(0))
+            logp, cache = decoder.forward_one_step_kv(
+                memory_kv, self.memory_mask, tokens[:, :i], cache)
+            np.testing.assert_allclose(
+                logp.numpy(), expected.numpy(), rtol=1e-5, atol=1e-5)
+            self.assertEqual(cache.shape[4], i)
+
+            tokens = paddle.index_select(tokens, perm, axis=0)
+            cache = paddle.index_select(cache, perm, axis=2)
+            self.memory = paddle.index_select(self.memory, perm, axis=0)
+            self.memory_mask = paddle.index_select(
+                self.memory_mask.astype('int32'), perm,
+                axis=0).astype('bool')
+            memory_kv = paddle.index_select(memory_kv, perm, axis=2)
+
+    def test_normalize_before(self):
+        self._test_steps(self._build())
+
+    def test_concat_after(self):
+        self._test_steps(
+            self._build(normalize_before=False, concat_after=True))
+
+    def test_batch_score(self):
+        decoder = self._build()
+        x = self.memory[0]
+        state = decoder.init_state(x)
+        ys = self.tokens[0]
+        # two hyps share the prefix, then split
+        _, states = decoder.batch_score(ys[:1].unsqueeze(0), [state], x[None])
+        _, states = decoder.batch_score(
+            paddle.stack([ys[:2], ys[:2]]), [states[0], states[0]],
+            x.expand([2] + x.shape))
+        logp, _ = decoder.batch_score(
+            paddle.stack([ys[:3], ys[:3]]), states[::-1],
+            x.expand([2] + x.shape))
+
+        score_state = state
+        for i in range(1, 4):
+            expected, score_state = decoder.score(ys[:i], score_state, x)
+        np.testing.assert_allclose(
+            logp[0].numpy(), expected.numpy(), rtol=1e-5, atol=1e-5)
+        np.testing.assert_allclose(
+            logp[1].numpy(), expected.numpy(), rtol=1e-5, atol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
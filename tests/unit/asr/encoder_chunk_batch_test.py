@@ -0,0 +1,130 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+import numpy as np
+import paddle
+
+from paddlespeech.s2t.modules.encoder import ConformerEncoder
+
+
+class TestEncoderChunkBatch(unittest.TestCase):
+    def setUp(self):
+        paddle.set_device('cpu')
+        paddle.seed(0)
+        self.feat_dim = 80
+        self.encoder = ConformerEncoder(
+            self.feat_dim,
+            output_size=64,
+            attention_heads=4,
+            linear_units=128,
+            num_blocks=2,
+            pos_enc_layer_type='rel_pos',
+            selfattention_layer_type='rel_selfattn',
+            use_cnn_module=True,
+            cnn_module_kernel=15,
+            causal=True,
+            use_dynamic_chunk=True)
+        self.encoder.eval()
+
+        subsampling = self.encoder.embed.subsampling_rate
+        context = self.encoder.embed.right_context + 1
+        self.decoding_window = (4 - 1) * subsampling + context
+
+    def _forward_stream(self, chunks, required_cache_size):
+        att_cache = paddle.zeros([0, 0, 0, 0])
+        cnn_cache = paddle.zeros([0, 0, 0, 0])
+        offset = 0
+        outputs = []
+        for chunk in chunks:
+            y, att_cache, cnn_cache = self.encoder.forward_chunk(
+                chunk, offset, required_cache_size, att_cache, cnn_cache)
+            offset += y.shape[1]
+            outputs.append(y)
+        return outputs
+
+    def _test_chunk_batch(self, required_cache_size):
+        # two streams, the second one starts two chunks later
+        chunks = [[
+            paddle.randn([1, self.decoding_window, self.feat_dim])
+            for _ in range(num_chunks)
+        ] for num_chunks in (5, 3)]
+        expected = [
+            self._forward_stream(stream, required_cache_size)
+            for stream in chunks
+        ]
+
+        # first two chunks of stream 0 alone
+        states = [[paddle.zeros([0, 0, 0, 0]), paddle.zeros([0, 0, 0, 0]), 0]
+                  for _ in chunks]
+        for i in range(2):
+            y, states[0][0], states[0][1] = self.encoder.forward_chunk(
+                chunks[0][i], states[0][2], required_cache_size, states[0][0],
+                states[0][1])
+            states[0][2] += y.shape[1]
+
+        # then both streams in one batch, with left padded attention cache
+        for i in range(3):
+            att_cache_lens = [state[0].shape[2] for state in states]
+            max_len = max(att_cache_lens)
+            att_cache = paddle.stack(
+                [
+                    paddle.concat(
+                        [
+                            paddle.zeros(
+                                [2, 4, max_len - state[0].shape[2], 32]),
+                            state[0]
+                        ],
+                        axis=2) if state[0].shape[2] > 0 else paddle.zeros(
+                            [2, 4, max_len, 32]) for state in states
+                ],
+                axis=1)
+            cnn_cache = paddle.concat(
+                [
+                    state[1] if state[1].shape[-1] > 0 else
+                    paddle.zeros_like(states[0][1]) for state in states
+                ],
+                axis=1)
+            xs = paddle.concat([chunks[0][i + 2], chunks[1][i]], axis=0)
+            offsets = paddle.to_tensor(
+                [state[2] for state in states], dtype='int64')
+            ys, r_att_cache, r_cnn_cache = self.encoder.forward_chunk_batch(
+                xs,
+                offsets,
+                paddle.to_tensor(att_cache_lens, dtype='int64'),
+                att_cache=att_cache,
+                cnn_cache=cnn_cache)
+
+            np.testing.assert_allclose(
+                ys[0:1].numpy(), expected[0][i + 2].numpy(), atol=1e-5)
+            np.testing.assert_allclose(
+                ys[1:2].numpy(), expected[1][i].numpy(), atol=1e-5)
+
+            for b, state in enumerate(states):
+                valid_len = att_cache_lens[b] + ys.shape[1]
+                keep = valid_len if required_cache_size < 0 else min(
+                    valid_len, required_cache_size)
+                state[0] = r_att_cache[:, b, :, r_att_cache.shape[3] - keep:]
+                state[1] = r_cnn_cache[:, b:b + 1]
+                state[2] += ys.shape[1]
+
+    def test_full_history(self):
+        self._test_chunk_batch(-1)
+
+    def test_limited_history(self):
+        self._test_chunk_batch(8)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import unittest
+
+import kaldiio
+import numpy as np
+import soundfile
+
+from paddlespeech.audio.transform.pitch import compute_kaldi_pitch
+from paddlespeech.audio.transform.pitch import LogMelSpectrogramKaldiPitch
+
+# the features of test.wav computed by the kaldi binaries
+TESTDATA = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "../../../audio/tests/features/testdata")
+
+
+class TestKaldiPitch(unittest.TestCase):
+    def test_same_as_kaldi(self):
+        wav, _ = soundfile.read(
+            os.path.join(TESTDATA, "test.wav"), dtype="int16")
+        # compute-kaldi-pitch-feats --sample-frequency=16000
+        _, expected = next(
+            kaldiio.load_ark(os.path.join(TESTDATA, "pitch_feat.ark")))
+        pitch = compute_kaldi_pitch([wav.astype(np.float32)])[0]
+        self.assertEqual(pitch.shape, expected.shape)
+        np.testing.assert_allclose(pitch[:, 0], expected[:, 0], atol=1e-5)
+        np.testing.assert_allclose(pitch[:, 1], expected[:, 1], rtol=1e-5)
+
+    def test_batch(self):
+        rng = np.random.RandomState(0)
+        t = np.arange(16000) / 16000
+        wavs = [(np.sin(2 * np.pi * 150 * t[:n]) * 8000 + rng.randn(n) * 300
+                 ).astype(np.float32) for n in (16000, 4000, 9999)]
+        extractor = LogMelSpectrogramKaldiPitch(n_mels=80)
+        feats = extractor.batch(wavs)
+        for wav, feat in zip(wavs, feats):
+            self.assertEqual(feat.shape[1], 83)
+            np.testing.assert_allclose(
+                feat, extractor(wav), rtol=1e-5, atol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
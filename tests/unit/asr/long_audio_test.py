@@ -0,0 +1,114 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import itertools
+import unittest
+
+import numpy as np
+
+from paddlespeech.audio.utils.vad import EnergyVAD
+from paddlespeech.cli.asr.infer import ASRExecutor
+from paddlespeech.s2t.utils.ctc_utils import ctc_token_frames
+
+
+class TestEnergyVAD(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.sample_rate = 16000
+
+    def _speech(self, seconds):
+        return (np.random.randn(int(seconds * self.sample_rate)) *
+                3000).astype(np.int16)
+
+    def _silence(self, seconds):
+        return np.zeros(int(seconds * self.sample_rate), dtype=np.int16)
+
+    def _segment(self, audio, block_size):
+        vad = EnergyVAD(
+            sample_rate=self.sample_rate, min_segment_s=2.0, max_segment_s=6.0)
+        segments = []
+        for start in range(0, len(audio), block_size):
+            segments.extend(vad.push(audio[start:start + block_size]))
+        segments.extend(vad.flush())
+        return segments
+
+    def test_split(self):
+        audio = np.concatenate([
+            self._speech(3), self._silence(1), self._speech(1),
+            self._silence(0.5), self._speech(10), self._silence(2)
+        ])
+        for block_size in (160, 3333, len(audio)):
+            segments = self._segment(audio, block_size)
+            for start, segment in segments:
+                np.testing.assert_array_equal(
+                    segment, audio[start:start + len(segment)])
+                self.assertLessEqual(len(segment), 6 * self.sample_rate)
+
+            starts = [start for start, _ in segments]
+            # cut in the first silence
+            self.assertGreater(starts[1], 3 * self.sample_rate)
+            self.assertLess(starts[1], 4 * self.sample_rate)
+            # no segment of the trailing silence
+            end = starts[-1] + len(segments[-1][1])
+            self.assertLess(end, len(audio))
+            self.assertEqual(starts, sorted(starts))
+
+    def test_silence(self):
+        self.assertEqual(self._segment(self._silence(8), 1000), [])
+
+
+class TestCTCTokenFrames(unittest.TestCase):
+    def _brute_force(self, ctc_probs, y, blank_id):
+        T, V = ctc_probs.shape
+        best, best_frames = -np.inf, None
+        for path in itertools.product(range(V), repeat=T):
+            # collapse the path
+            tokens, frames, prev = [], [], None
+            for t, token in enumerate(path):
+                if token != blank_id and token != prev:
+                    tokens.append(token)
+                    frames.append(t)
+                prev = token
+            if tokens != list(y):
+                continue
+            score = sum(ctc_probs[t, token] for t, token in enumerate(path))
+            if score > best:
+                best, best_frames = score, frames
+        return best_frames
+
+    def test_best_path(self):
+        np.random.seed(0)
+        for _ in range(20):
+            T, V = 6, 3
+            logits = np.random.randn(T, V)
+            ctc_probs = logits - np.log(np.exp(logits).sum(-1, keepdims=True))
+            y = list(np.random.randint(1, V, size=np.random.randint(1, 4)))
+            self.assertEqual(
+                ctc_token_frames(ctc_probs, y, blank_id=0),
+                self._brute_force(ctc_probs, y, 0))
+
+
+class TestDownmix(unittest.TestCase):
+    def test_no_overflow(self):
+        audio = np.array(
+            [[20000, 20000], [-32768, -32768], [32767, 32766], [3, -6],
+             [100, 201]],
+            dtype=np.int16)
+        downmixed = ASRExecutor._downmix(audio)
+        self.assertEqual(downmixed.dtype, np.int16)
+        np.testing.assert_array_equal(downmixed,
+                                      [20000, -32768, 32766, -2, 150])
+
+
+if __name__ == '__main__':
+    unittest.main()
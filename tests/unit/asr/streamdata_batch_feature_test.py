@@ -0,0 +1,123 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import random
+import unittest
+from unittest import mock
+
+import numpy as np
+import paddle
+
+from paddlespeech.audio.streamdata import filters
+from paddlespeech.audio.transform.cmvn import GlobalCMVN
+from paddlespeech.audio.transform.spec_augment import time_warp
+
+
+class TestBatchFeature(unittest.TestCase):
+    def setUp(self):
+        paddle.set_device('cpu')
+        rng = np.random.RandomState(0)
+        self.samples = [
+            dict(
+                fname=str(i),
+                label=[1, 2, 3],
+                sample_rate=16000,
+                wav=paddle.to_tensor(
+                    (rng.randn(1, n) * 0.1).astype(np.float32)))
+            for i, n in enumerate([16000, 12345, 400, 399, 8000])
+        ]
+        self.cmvn = {
+            "mean_stat": rng.randn(80).tolist(),
+            "var_stat": (rng.rand(80) * 10 + 10).tolist(),
+            "frame_num": 10,
+        }
+
+    def batch_feats(self):
+        return next(
+            filters.pipeline(
+                iter([self.samples]), filters._audio_padding,
+                filters._audio_batch_compute_fbank))
+
+    def test_fbank(self):
+        keys, feats, feats_lengths, labels, label_lengths = self.batch_feats()
+        self.assertEqual(feats.shape[0], len(self.samples))
+        expected = {
+            sample['fname']: sample['feat']
+            for sample in filters._audio_compute_fbank(
+                iter([s for s in self.samples if s['wav'].shape[1] >= 400]))
+        }
+        for key, feat, length in zip(keys, feats.numpy(),
+                                     feats_lengths.numpy()):
+            if key not in expected:
+                self.assertEqual(length, 0)
+                continue
+            ref = expected[key].numpy().reshape([-1, 80])
+            self.assertEqual(length, len(ref))
+            np.testing.assert_allclose(feat[:length], ref, atol=1e-3)
+            np.testing.assert_array_equal(feat[length:], 0)
+
+    def test_spec_aug(self):
+        keys, feats, feats_lengths, labels, label_lengths = self.batch_feats()
+        augmented = next(
+            filters._audio_batch_spec_aug(
+                iter([(keys, feats, feats_lengths, labels, label_lengths)]),
+                max_w=5,
+                f_replace_with_zero=True,
+                t_replace_with_zero=True))[1].numpy()
+        self.assertEqual(list(augmented.shape), feats.shape)
+        for feat, length in zip(augmented, feats_lengths.numpy()):
+            np.testing.assert_array_equal(feat[length:], 0)
+
+    def test_time_warp_linear(self):
+        rng = np.random.RandomState(0)
+        window = 5
+        lengths = np.array([40, 23, 11, 10, 0])
+        x = rng.randn(len(lengths), 40, 8).astype(np.float32)
+        x[np.arange(40)[None, :] >= lengths[:, None]] = 0
+
+        np.random.seed(1)
+        warped = filters._batch_time_warp(x, lengths, window)
+        # the same draws as the batch, by randrange of each row
+        np.random.seed(1)
+        draws = np.random.rand(2, len(lengths))
+        centers = window + np.floor(
+            draws[0] * np.maximum(lengths - 2 * window, 1))
+        shifts = np.floor(draws[1] * 2 * window)
+        for i, (row, length) in enumerate(zip(x, lengths)):
+            ranges = [int(centers[i]), int(centers[i] - window + shifts[i])]
+            with mock.patch.object(
+                    random, "randrange", side_effect=ranges) as randrange:
+                expected = time_warp(
+                    row[:length].copy(), max_time_warp=window, mode="linear")
+            if length - window > window:
+                self.assertEqual(randrange.call_count, 2)
+            else:
+                np.testing.assert_array_equal(expected, row[:length])
+            np.testing.assert_allclose(
+                warped[i, :length], expected, rtol=1e-5, atol=1e-6)
+
+    def test_spec_aug_mode(self):
+        batch = self.batch_feats()
+        with self.assertRaises(NotImplementedError):
+            next(filters._audio_batch_spec_aug(iter([batch]), w_mode="PIL"))
+
+    def test_cmvn(self):
+        batch = self.batch_feats()
+        normalized = next(filters._audio_cmvn(iter([batch]), self.cmvn))[1]
+        expected = GlobalCMVN(self.cmvn)(batch[1].numpy())
+        np.testing.assert_allclose(
+            normalized.numpy(), expected, rtol=1e-5, atol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+import numpy as np
+
+from paddlespeech.audio.transform.spectrogram import LogMelSpectrogramKaldi
+from paddlespeech.audio.transform.spectrogram import StreamingLogMelSpectrogramKaldi
+from paddlespeech.audio.utils import RingBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+    def test_push_pop(self):
+        buffer = RingBuffer(4, shape=(2, ))
+        expected = np.zeros([0, 2], dtype='float32')
+        rng = np.random.RandomState(0)
+        for _ in range(50):
+            x = rng.randn(rng.randint(0, 7), 2).astype('float32')
+            buffer.push(x)
+            expected = np.concatenate([expected, x])
+            num = rng.randint(0, len(buffer) + 1)
+            buffer.pop(num)
+            expected = expected[num:]
+            self.assertEqual(len(buffer), len(expected))
+            np.testing.assert_array_equal(buffer.view(), expected)
+
+
+class TestStreamingLogMelSpectrogramKaldi(unittest.TestCase):
+    def test_same_as_offline(self):
+        rng = np.random.RandomState(0)
+        wav = (rng.randn(16000 * 2) * 3000).astype(np.int16)
+        expected = LogMelSpectrogramKaldi(n_mels=80)(wav, train=False)
+
+        extractor = StreamingLogMelSpectrogramKaldi(n_mels=80, buffer_size=1000)
+        feats = []
+        start = 0
+        while start < len(wav):
+            end = start + rng.randint(1, 600)
+            feats.append(extractor.accept_waveform(wav[start:end], train=False))
+            start = end
+        np.testing.assert_array_equal(np.concatenate(feats), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
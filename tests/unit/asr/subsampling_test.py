@@ -0,0 +1,89 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+import numpy as np
+import paddle
+
+from paddlespeech.s2t.modules.embedding import PositionalEncoding
+from paddlespeech.s2t.modules.mask import make_non_pad_mask
+from paddlespeech.s2t.modules.subsampling import Conv2dSubsampling4
+from paddlespeech.s2t.modules.subsampling import Conv2dSubsampling6
+from paddlespeech.s2t.modules.subsampling import Conv2dSubsampling8
+from paddlespeech.s2t.modules.subsampling import DepthwiseConv2DSubsampling4
+
+
+def conv_length(length, stages):
+    """The output length of the convs without padding, stage by stage."""
+    for kernel_size, stride in stages:
+        length = (length - kernel_size) // stride + 1
+    return length
+
+
+class TestSubsamplingMask(unittest.TestCase):
+    def setUp(self):
+        paddle.set_device('cpu')
+        paddle.seed(0)
+        self.idim = 20
+        self.odim = 8
+        self.lengths = [64, 57, 30, 17, 16, 15]
+
+    def _test_mask(self, subsampling, stages):
+        subsampling.eval()
+        max_len = max(self.lengths)
+        xs = paddle.randn([len(self.lengths), max_len, self.idim])
+        masks = make_non_pad_mask(paddle.to_tensor(
+            self.lengths)).unsqueeze(1)
+        ys, _, ys_masks = subsampling(xs, masks)
+        self.assertEqual(ys_masks.shape[-1], ys.shape[1])
+        self.assertEqual(ys.shape[1], conv_length(max_len, stages))
+
+        ys_lens = ys_masks.squeeze(1).astype('int64').sum(-1).numpy()
+        expected = [conv_length(length, stages) for length in self.lengths]
+        np.testing.assert_array_equal(ys_lens, expected)
+        for i, length in enumerate(self.lengths):
+            # the mask covers the frames of the utterance without padding
+            y, _, _ = subsampling(xs[i:i + 1, :length], masks[i:i + 1, :, :
+                                                                  length])
+            self.assertEqual(y.shape[1], expected[i])
+
+    def test_conv2d_subsampling4(self):
+        subsampling = Conv2dSubsampling4(
+            self.idim, self.odim, 0.0, PositionalEncoding(self.odim, 0.0))
+        self._test_mask(subsampling, [(3, 2), (3, 2)])
+
+    def test_conv2d_subsampling6(self):
+        subsampling = Conv2dSubsampling6(
+            self.idim, self.odim, 0.0, PositionalEncoding(self.odim, 0.0))
+        self._test_mask(subsampling, [(3, 2), (5, 3)])
+
+    def test_conv2d_subsampling8(self):
+        subsampling = Conv2dSubsampling8(
+            self.idim, self.odim, 0.0, PositionalEncoding(self.odim, 0.0))
+        self._test_mask(subsampling, [(3, 2), (3, 2), (3, 2)])
+
+    def test_depthwise_conv2d_subsampling4(self):
+        # the position encoding is added before the projection
+        pos_dim = self.odim * (((self.idim - 1) // 2 - 1) // 2)
+        subsampling = DepthwiseConv2DSubsampling4(
+            1,
+            self.odim,
+            PositionalEncoding(pos_dim, 0.0),
+            input_size=self.idim,
+            input_dropout_rate=0.0)
+        self._test_mask(subsampling, [(3, 2), (3, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
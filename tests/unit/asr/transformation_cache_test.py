@@ -0,0 +1,81 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import yaml
+
+from paddlespeech.audio.transform.transformation import get_transformation
+
+
+class TestTransformationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _conf(self, window=2):
+        return {
+            "mode": "sequential",
+            "process": [{
+                "type": "delta",
+                "window": window,
+                "order": 1
+            }, {
+                "type": "utterance_cmvn",
+                "norm_means": True,
+                "norm_vars": False
+            }]
+        }
+
+    def test_same_config(self):
+        transformation = get_transformation(self._conf())
+        # an equal config, but not the same object
+        self.assertIs(get_transformation(self._conf()), transformation)
+        self.assertIs(get_transformation(None), get_transformation(None))
+
+        x = np.random.RandomState(0).randn(20, 4).astype(np.float32)
+        self.assertEqual(transformation(x).shape, (20, 8))
+
+    def test_changed_args(self):
+        transformation = get_transformation(self._conf(window=2))
+        changed = get_transformation(self._conf(window=3))
+        self.assertIsNot(changed, transformation)
+        self.assertEqual(transformation.functions[0].window, 2)
+        self.assertEqual(changed.functions[0].window, 3)
+        self.assertIs(get_transformation(self._conf(window=2)), transformation)
+
+    def test_config_file(self):
+        path = os.path.join(self.tmpdir, "preprocess.yaml")
+        with open(path, "w") as f:
+            yaml.safe_dump(self._conf(window=2), f)
+        transformation = get_transformation(path)
+        self.assertIs(get_transformation(path), transformation)
+
+        # the file is read again when it is modified
+        with open(path, "w") as f:
+            yaml.safe_dump(self._conf(window=3), f)
+        mtime = os.path.getmtime(path) + 10
+        os.utime(path, (mtime, mtime))
+        changed = get_transformation(path)
+        self.assertIsNot(changed, transformation)
+        self.assertEqual(changed.functions[0].window, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
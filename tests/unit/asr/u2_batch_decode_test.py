@@ -0,0 +1,155 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import unittest
+
+import numpy as np
+import paddle
+from yacs.config import CfgNode as CN
+
+from paddlespeech.s2t.decoders.beam_search import BatchBeamSearch
+from paddlespeech.s2t.decoders.beam_search import BeamSearch
+from paddlespeech.s2t.models.u2 import U2Model
+
+
+class FakeTextFeaturizer():
+    def defeaturize(self, idxs):
+        return " ".join(str(idx) for idx in idxs)
+
+
+class TestU2BatchDecode(unittest.TestCase):
+    def setUp(self):
+        paddle.set_device('cpu')
+        paddle.seed(0)
+        np.random.seed(0)
+
+        self.feat_dim = 20
+        self.vocab_size = 12
+        conf_str = """
+            encoder: conformer
+            encoder_conf:
+                output_size: 64
+                attention_heads: 4
+                linear_units: 128
+                num_blocks: 2
+                input_layer: conv2d
+                normalize_before: true
+                cnn_module_kernel: 7
+                use_cnn_module: True
+                activation_type: 'swish'
+                pos_enc_layer_type: 'rel_pos'
+                selfattention_layer_type: 'rel_selfattn'
+                causal: True
+                use_dynamic_chunk: True
+            decoder: bitransformer
+            decoder_conf:
+                attention_heads: 4
+                linear_units: 128
+                num_blocks: 2
+                r_num_blocks: 1
+            model_conf:
+                ctc_weight: 0.3
+                reverse_weight: 0.3
+        """
+        cfg = CN().load_cfg(conf_str)
+        cfg.input_dim = self.feat_dim
+        cfg.output_dim = self.vocab_size
+        cfg.cmvn_file = None
+        cfg.cmvn_file_type = 'npz'
+        self.model = U2Model(cfg)
+        self.model.eval()
+
+        # (B, T, D), padded
+        self.feats_lengths = [64, 37, 50]
+        feats = np.zeros(
+            [len(self.feats_lengths), max(self.feats_lengths), self.feat_dim],
+            dtype='float32')
+        for i, length in enumerate(self.feats_lengths):
+            feats[i, :length] = np.random.randn(length, self.feat_dim)
+        self.feats = paddle.to_tensor(feats)
+
+    def _test_decode(self, decoding_method, utt_ids=None, **kwargs):
+        kwargs = dict(
+            text_feature=FakeTextFeaturizer(),
+            decoding_method=decoding_method,
+            beam_size=4,
+            ctc_weight=0.3,
+            reverse_weight=0.3,
+            **kwargs)
+        _, batch_hyps = self.model.decode(
+            self.feats,
+            paddle.to_tensor(self.feats_lengths, dtype='int64'), **kwargs)
+        for i, length in enumerate(self.feats_lengths):
+            if utt_ids is not None and i not in utt_ids:
+                continue
+            _, hyps = self.model.decode(self.feats[i:i + 1, :length],
+                                        paddle.to_tensor([length]), **kwargs)
+            self.assertEqual(list(batch_hyps[i]), list(hyps[0]))
+
+    def test_attention(self):
+        # the max length of the hyps is the length of the longest encoder
+        # output in the batch, the untrained model never ends the other ones
+        self._test_decode('attention', utt_ids=[0])
+
+    def test_ctc_prefix_beam_search(self):
+        self._test_decode('ctc_prefix_beam_search')
+
+    def test_attention_rescoring(self):
+        self._test_decode('attention_rescoring')
+
+    def test_attention_rescoring_streaming(self):
+        self._test_decode(
+            'attention_rescoring',
+            decoding_chunk_size=4,
+            num_decoding_left_chunks=-1,
+            simulate_streaming=True)
+
+    def test_decode_with_time_stamps(self):
+        kwargs = dict(
+            text_feature=FakeTextFeaturizer(),
+            decoding_method='ctc_prefix_beam_search',
+            beam_size=4)
+        feats_lengths = paddle.to_tensor(self.feats_lengths, dtype='int64')
+        res, hyps = self.model.decode(self.feats, feats_lengths, **kwargs)
+        ts_res, ts_hyps, frames = self.model.decode_with_time_stamps(
+            self.feats, feats_lengths, **kwargs)
+        self.assertEqual(res, ts_res)
+        self.assertEqual([list(hyp) for hyp in hyps], ts_hyps)
+        for hyp, hyp_frames in zip(ts_hyps, frames):
+            self.assertEqual(len(hyp), len(hyp_frames))
+            self.assertEqual(hyp_frames, sorted(set(hyp_frames)))
+
+    def test_batch_beam_search(self):
+        scorers = self.model.scorers()
+        weights = dict(decoder=0.7, ctc=0.3)
+        encoder_out, _ = self.model._forward_encoder(
+            self.feats[:1], paddle.to_tensor(self.feats_lengths[:1]))
+        x = encoder_out[0]
+        kwargs = dict(
+            scorers=scorers,
+            weights=weights,
+            beam_size=3,
+            vocab_size=self.vocab_size,
+            sos=self.model.sos,
+            eos=self.model.eos,
+            pre_beam_score_key='full')
+        with paddle.no_grad():
+            nbest = BeamSearch(**kwargs)(x, maxlenratio=-4)
+            batch_nbest = BatchBeamSearch(**kwargs)(x, maxlenratio=-4)
+        self.assertEqual(nbest[0].yseq.tolist(), batch_nbest[0].yseq.tolist())
+        np.testing.assert_allclose(
+            float(nbest[0].score), float(batch_nbest[0].score), rtol=1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import paddle
+from paddlenlp.transformers.gpt.tokenizer import bytes_to_unicode
+
+from paddlespeech.s2t.models.whisper import ModelDimensions
+from paddlespeech.s2t.models.whisper import split_windows
+from paddlespeech.s2t.models.whisper import Whisper
+from paddlespeech.s2t.models.whisper.tokenizer import get_tokenizer
+from paddlespeech.s2t.models.whisper.whipser import _window_segments
+from paddlespeech.s2t.models.whisper.whipser import N_FRAMES
+
+
+class TestWhisperBatchTranscribe(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # a byte level tokenizer, without merges
+        cls.resource_path = tempfile.mkdtemp()
+        path = os.path.join(cls.resource_path, "assets", "gpt2")
+        os.makedirs(path)
+        vocab = {c: i for i, c in enumerate(bytes_to_unicode().values())}
+        vocab["<|endoftext|>"] = len(vocab)
+        with open(os.path.join(path, "vocab.json"), "w") as f:
+            json.dump(vocab, f)
+        with open(os.path.join(path, "merges.txt"), "w") as f:
+            f.write("#version: 0.2\n")
+        with open(os.path.join(path, "tokenizer_config.json"), "w") as f:
+            json.dump({"pad_token": None}, f)
+        cls.tokenizer = get_tokenizer(False, resource_path=cls.resource_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.resource_path)
+
+    def setUp(self):
+        paddle.set_device('cpu')
+        paddle.seed(0)
+
+    def test_split_windows(self):
+        mel = np.ones([80, 2 * N_FRAMES + 100], dtype=np.float32)
+        mel[:, 2800:2820] = -1.0
+        mel = paddle.to_tensor(mel)
+        self.assertEqual(
+            split_windows(mel), [(0, 3000), (3000, 6000), (6000, 6100)])
+        windows = split_windows(mel, 500)
+        # cut at the quiet frames
+        self.assertTrue(2800 <= windows[0][1] < 2820)
+        self.assertEqual(windows[0][0], 0)
+        self.assertEqual(windows[-1][1], mel.shape[-1])
+        for (_, end), (begin, _) in zip(windows[:-1], windows[1:]):
+            self.assertEqual(end, begin)
+        self.assertTrue(all(end - begin <= N_FRAMES for begin, end in windows))
+
+    def test_window_segments(self):
+        ts = self.tokenizer.timestamp_begin
+        text = self.tokenizer.encode(" hi").input_ids
+        # <|0.00|> hi <|1.00|><|1.00|> hi <|2.00|><|2.00|> hi
+        tokens = [ts] + text + [ts + 50, ts + 50] + text + [ts + 100, ts + 100
+                                                          ] + text
+        segments = _window_segments(tokens, self.tokenizer, 10.0, 15.0, 0.02)
+        self.assertEqual(
+            [(start, end) for start, end, _ in segments],
+            [(10.0, 11.0), (11.0, 12.0), (12.0, 15.0)])
+        self.assertTrue(all(tokens == text for _, _, tokens in segments))
+
+    def test_batch_transcribe(self):
+        n_vocab = self.tokenizer.timestamp_begin + 1501
+        dims = ModelDimensions(
+            n_mels=80,
+            n_audio_ctx=1500,
+            n_audio_state=64,
+            n_audio_head=2,
+            n_audio_layer=1,
+            n_vocab=n_vocab,
+            n_text_ctx=64,
+            n_text_state=64,
+            n_text_head=2,
+            n_text_layer=1)
+        model = Whisper(dims)
+        model.eval()
+        mel = paddle.uniform([80, 2 * N_FRAMES + 500], min=-1.0, max=1.0)
+
+        options = dict(temperature=(0.0, ), language="en")
+        expected = model.batch_transcribe(
+            mel, self.resource_path, batch_size=1, **options)
+        result = model.batch_transcribe(
+            mel, self.resource_path, batch_size=2, **options)
+        self.assertEqual(result["text"], expected["text"])
+        self.assertEqual(len(result["segments"]), len(expected["segments"]))
+        for segment, expected_segment in zip(result["segments"],
+                                             expected["segments"]):
+            for key in ("seek", "start", "end", "text", "tokens"):
+                self.assertEqual(segment[key], expected_segment[key])
+            for key in ("avg_logprob", "no_speech_prob"):
+                np.testing.assert_allclose(
+                    segment[key], expected_segment[key], rtol=1e-4)
+            self.assertTrue(segment["end"] <= mel.shape[-1] / 100)
+
+        # all the windows fail at t=0 and are decoded again at t=0.5
+        result = model.batch_transcribe(
+            mel,
+            self.resource_path,
+            batch_size=2,
+            temperature=(0.0, 0.5),
+            logprob_threshold=1.0,
+            no_speech_threshold=None,
+            language="en")
+        self.assertTrue(result["segments"])
+        self.assertTrue(
+            all(segment["temperature"] == 0.5
+                for segment in result["segments"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -32,6 +32,11 @@ paddlespeech asr --model conformer_talcs --lang zh_en --codeswitch True --input
 # Support editing num_decoding_left_chunks
 paddlespeech asr --model conformer_online_wenetspeech --num_decoding_left_chunks 3 --input ./zh.wav
 
+# Batch job
+echo -e "demo1 zh.wav \n demo2 zh.wav \n demo3 zh.wav" > asr.job
+paddlespeech asr --input asr.job --batch_size 2 --num_workers 2 -v
+rm asr.job
+
 # long audio restriction
 {
 wget -c https://paddlespeech.bj.bcebos.com/datasets/single_wav/zh/test_long_audio_01.wav
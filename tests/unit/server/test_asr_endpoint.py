@@ -0,0 +1,186 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from types import SimpleNamespace
+
+import numpy as np
+import paddle
+import pytest
+from yacs.config import CfgNode
+
+from paddlespeech.audio.transform.spectrogram import LogMelSpectrogramKaldi
+from paddlespeech.server.engine.asr.online.ctc_endpoint import OnlineCTCEndpoingOpt
+from paddlespeech.server.engine.asr.online.ctc_endpoint import OnlineCTCEndpoint
+from paddlespeech.server.engine.asr.online.python.asr_engine import PaddleASRConnectionHanddler
+
+VOCAB_SIZE = 8
+MAX_RETAINED_FRAMES = 12
+# decoding frames are 4 audio frames of 10ms
+DECODING_FRAME_SHIFT = 0.04
+
+
+class StubEncoder:
+    """Emits one non blank token for each decoding frame, and records the
+    chunks of audio frames it is fed."""
+
+    def __init__(self):
+        self.embed = SimpleNamespace(subsampling_rate=4, right_context=6)
+        self.chunks = []
+        self.num_outputs = 0
+
+    def forward_chunk(self, xs, offset, required_cache_size, att_cache,
+                      cnn_cache):
+        self.chunks.append(xs[0].numpy())
+        num_outputs = (xs.shape[1] - 7) // 4 + 1
+        tokens = (np.arange(self.num_outputs, self.num_outputs + num_outputs)
+                  % (VOCAB_SIZE - 1)) + 1
+        self.num_outputs += num_outputs
+        logits = np.full([1, num_outputs, VOCAB_SIZE], -10.0, dtype='float32')
+        logits[0, np.arange(num_outputs), tokens] = 10.0
+        return paddle.to_tensor(logits), att_cache, cnn_cache
+
+
+class StubModel:
+    sos = eos = VOCAB_SIZE - 1
+    ignore_id = -1
+
+    def __init__(self):
+        self.encoder = StubEncoder()
+        self.ctc = SimpleNamespace(
+            blank_id=0,
+            log_softmax=lambda ys: paddle.nn.functional.log_softmax(ys, -1))
+        # the frames of the encoder outputs rescored at each endpoint
+        self.rescored_frames = []
+
+    def forward_attention_decoder(self, hyps, hyps_lens, encoder_out,
+                                  reverse_weight):
+        self.rescored_frames.append(encoder_out.shape[1])
+        out = paddle.zeros([hyps.shape[0], hyps.shape[1], VOCAB_SIZE])
+        return out, out
+
+
+def make_handler(continuous_decoding):
+    fbank = dict(
+        type='fbank_kaldi',
+        fs=16000,
+        n_mels=10,
+        n_shift=160,
+        win_length=400,
+        dither=0.0)
+    model_config = CfgNode(
+        dict(
+            preprocess_config=CfgNode(dict(process=[fbank])),
+            decode=CfgNode(
+                dict(
+                    decoding_method='attention_rescoring',
+                    decoding_chunk_size=4,
+                    num_decoding_left_chunks=-1,
+                    beam_size=2,
+                    ctc_weight=0.5,
+                    reverse_weight=0.0))))
+    executor = SimpleNamespace(
+        config=model_config,
+        model_type='conformer_online_stub',
+        sample_rate=16000,
+        text_feature=SimpleNamespace(
+            defeaturize=lambda hyp: ''.join(chr(ord('a') + t) for t in hyp)),
+        model=StubModel())
+    engine = SimpleNamespace(
+        config=CfgNode(
+            dict(
+                continuous_decoding=continuous_decoding,
+                max_retained_frames=MAX_RETAINED_FRAMES)),
+        executor=executor,
+        scheduler=None)
+    return PaddleASRConnectionHanddler(engine)
+
+
+def test_endpoint_max_num_frames():
+    endpointer = OnlineCTCEndpoint(
+        OnlineCTCEndpoingOpt(max_num_frames=MAX_RETAINED_FRAMES))
+    # speech without silence, no silence rule is activated
+    log_probs = np.log(np.full([5, VOCAB_SIZE], 1.0 / VOCAB_SIZE))
+    assert not endpointer.endpoint_detected(log_probs[:4], True)
+    assert not endpointer.endpoint_detected(log_probs, True)
+    assert not endpointer.max_num_frames_reached
+    assert endpointer.endpoint_detected(log_probs, True)
+    assert endpointer.max_num_frames_reached
+    endpointer.reset()
+    assert endpointer.num_frames_decoded == 0
+    assert not endpointer.max_num_frames_reached
+
+
+@pytest.mark.parametrize("continuous_decoding", [False, True])
+def test_segments_past_max_retained_frames(continuous_decoding):
+    paddle.set_device('cpu')
+    handler = make_handler(continuous_decoding)
+    model = handler.model
+    rng = np.random.RandomState(0)
+    wav = (rng.randn(16000 * 2 + 123) * 3000).astype(np.int16)
+
+    segments = []
+    for start in range(0, len(wav), 1000):
+        handler.extract_feat(wav[start:start + 1000].tobytes())
+        handler.decode(is_finished=False)
+        if handler.endpoint_state:
+            assert handler.endpoint_forced
+            handler.rescoring()
+            segments.append(
+                (handler.get_result(), handler.get_word_time_stamp()))
+            handler.reset_continuous_decoding()
+            # the encoder outputs of the segment are released
+            assert handler.encoder_out is None
+            assert handler.offset == 0
+    handler.decode(is_finished=True)
+    handler.rescoring()
+    segments.append((handler.get_result(), handler.get_word_time_stamp()))
+
+    # the encoder outputs are bounded by max_retained_frames and a package
+    assert len(segments) > 2
+    assert max(model.rescored_frames) < 2 * MAX_RETAINED_FRAMES
+
+    # no frame is dropped: the chunks of all the segments are the decoding
+    # windows of the whole audio, with a stride of 4 frames
+    feats = LogMelSpectrogramKaldi(
+        n_mels=10, dither=0.0)(wav, train=False).astype('float32')
+    windows = [w for chunk in model.encoder.chunks
+               for w in range(0, chunk.shape[0] - 6, 4)]
+    num_outputs = model.encoder.num_outputs
+    assert num_outputs == (len(feats) - 7) // 4 + 1
+    assert len(windows) == num_outputs
+    np.testing.assert_allclose(
+        np.concatenate([chunk[:(chunk.shape[0] - 7) // 4 * 4 + 4]
+                        for chunk in model.encoder.chunks])[::4],
+        feats[:num_outputs * 4:4],
+        rtol=1e-5,
+        atol=1e-5)
+
+    # one token of each decoding frame
+    expected = ''.join(
+        chr(ord('a') + t % (VOCAB_SIZE - 1) + 1) for t in range(num_outputs))
+    if continuous_decoding:
+        # the result of each segment is sent at its endpoint
+        text = ''.join(result for result, _ in segments)
+        times = [t for _, stamps in segments for t in stamps]
+    else:
+        # the transcripts and time stamps of the segments are kept
+        text, times = segments[-1]
+        for (result, stamps), (next_result, next_stamps) in zip(
+                segments[:-1], segments[1:]):
+            assert next_result.startswith(result)
+            assert next_stamps[:len(stamps)] == stamps
+    assert text == expected
+    assert [t['w'] for t in times] == list(expected)
+    for k, t in enumerate(times):
+        assert abs(t['bg'] - k * DECODING_FRAME_SHIFT) <= 0.021
+        assert t['bg'] < t['ed']
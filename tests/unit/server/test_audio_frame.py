@@ -0,0 +1,89 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+
+import numpy as np
+import pytest
+
+from paddlespeech.server.utils import audio_handler
+from paddlespeech.server.utils.audio_handler import TTSWsHandler
+from paddlespeech.server.utils.audio_process import AUDIO_FRAME_HEADER
+from paddlespeech.server.utils.audio_process import encode_audio
+from paddlespeech.server.utils.audio_process import float2pcm
+from paddlespeech.server.utils.audio_process import pack_audio_frame
+from paddlespeech.server.utils.audio_process import unpack_audio_frame
+
+
+@pytest.fixture
+def wav():
+    return np.sin(np.linspace(0, 100, 480)).astype(np.float32) * 0.5
+
+
+def make_handler(monkeypatch, audio_format):
+    class Response:
+        def json(self):
+            return {"sample_rate": 24000}
+
+    monkeypatch.setattr(audio_handler.requests, "get",
+                        lambda url: Response())
+    return TTSWsHandler(audio_format=audio_format)
+
+
+def test_pcm16_round_trip(wav):
+    frame = pack_audio_frame(3, encode_audio(wav, 'pcm16'))
+    assert AUDIO_FRAME_HEADER.size == 8
+    assert len(frame) == AUDIO_FRAME_HEADER.size + 2 * len(wav)
+
+    seq, is_final, audio = unpack_audio_frame(frame)
+    assert seq == 3
+    assert not is_final
+    np.testing.assert_array_equal(
+        np.frombuffer(audio, dtype=np.int16), float2pcm(wav))
+
+    seq, is_final, audio = unpack_audio_frame(
+        pack_audio_frame(4, is_final=True))
+    assert (seq, is_final, len(audio)) == (4, True, 0)
+
+
+def test_float32_round_trip(wav):
+    _, _, audio = unpack_audio_frame(
+        pack_audio_frame(0, encode_audio(wav, 'float32')))
+    np.testing.assert_array_equal(np.frombuffer(audio, dtype=np.float32), wav)
+
+
+def test_client_parses_binary_and_json(monkeypatch, wav):
+    expected = float2pcm(wav).tobytes()
+    for audio_format in ('pcm16', 'float32'):
+        handler = make_handler(monkeypatch, audio_format)
+        frame = pack_audio_frame(0, encode_audio(wav, audio_format))
+        status, audio = handler._parse_message(frame)
+        assert status == 1
+        if audio_format == 'pcm16':
+            assert audio == expected
+        else:
+            np.testing.assert_allclose(
+                np.frombuffer(audio, dtype=np.int16),
+                np.frombuffer(expected, dtype=np.int16),
+                atol=1)
+        assert handler._parse_message(pack_audio_frame(
+            1, is_final=True)) == (2, b'')
+
+        # a server without binary messages sends base64 pcm16 in json
+        message = json.dumps({
+            "status": 1,
+            "audio": encode_audio(wav, 'base64')
+        })
+        assert handler._parse_message(message) == (1, expected)
+        message = json.dumps({"status": 2, "signal": "tts finished"})
+        assert handler._parse_message(message) == (2, b'')
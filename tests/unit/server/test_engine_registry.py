@@ -0,0 +1,170 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+from yacs.config import CfgNode
+
+from paddlespeech.server.engine import engine_pool
+from paddlespeech.server.engine.base_engine import BaseEngine
+from paddlespeech.server.engine.engine_factory import EngineFactory
+from paddlespeech.server.engine.engine_pool import EngineKey
+from paddlespeech.server.engine.engine_pool import EngineRegistry
+from paddlespeech.server.utils.exception import ServerBaseException
+
+
+class StubEngine(BaseEngine):
+    def __init__(self, task, engine_type):
+        super().__init__()
+        self.task = task
+        self.engine_type = engine_type
+        self.config = None
+
+    def init(self, config):
+        self.config = config
+        return True
+
+
+@pytest.fixture
+def created(monkeypatch):
+    engines = []
+
+    def get_engine(engine_name, engine_type):
+        engines.append(StubEngine(engine_name, engine_type))
+        return engines[-1]
+
+    monkeypatch.setattr(EngineFactory, "get_engine", staticmethod(get_engine))
+    monkeypatch.setattr(engine_pool, "ENGINE_POOL", {})
+    monkeypatch.setattr(engine_pool, "ENGINE_REGISTRY", None)
+    return engines
+
+
+def make_config():
+    return CfgNode({
+        "engine_list": ["asr_python", "asr_python_en", "tts_python"],
+        "asr_python": {
+            "model": "conformer_wenetspeech",
+            "lang": "zh",
+            "memory_mb": 100
+        },
+        "asr_python_en": {
+            "model": "conformer_librispeech",
+            "lang": "en",
+            "replicas": 2,
+            "memory_mb": 100
+        },
+        "tts_python": {
+            "am": "fastspeech2_csmsc",
+            "memory_mb": 100
+        },
+    })
+
+
+def test_default_engines_pinned_and_lazy_load(created):
+    assert engine_pool.init_engine_pool(make_config())
+    registry = engine_pool.get_engine_registry()
+
+    # the first engine of each task is loaded, the others on first use
+    assert [(e.task, e.config.get("model")) for e in created] == [
+        ("asr", "conformer_wenetspeech"), ("tts", None)
+    ]
+    stats = registry.stats()
+    assert stats["asr_python"]["loaded"] and stats["asr_python"]["pinned"]
+    assert stats["tts_python"]["loaded"] and stats["tts_python"]["pinned"]
+    assert not stats["asr_python_en"]["loaded"]
+    assert not stats["asr_python_en"]["pinned"]
+    assert engine_pool.get_engine_pool()["asr"] is created[0]
+
+    engine = engine_pool.get_engine("asr", model="conformer_librispeech")
+    assert engine.config.model == "conformer_librispeech"
+    assert registry.stats()["asr_python_en"]["loaded"]
+    # the replicas are loaded together
+    assert len(created) == 4
+    # the default engine is still the first one
+    assert engine_pool.get_engine("asr") is created[0]
+
+
+def test_replicas_round_robin(created):
+    registry = EngineRegistry()
+    key = registry.register("asr_python", CfgNode({"replicas": 3}))
+    engines = [registry.get("asr") for _ in range(6)]
+    assert len(created) == 3
+    assert engines == created + created
+    assert registry.load(key) == created
+
+
+def test_resolve_engine(created):
+    registry = EngineRegistry()
+    zh = registry.register(
+        "asr_python", CfgNode({"model": "conformer_wenetspeech",
+                               "lang": "zh"}))
+    en = registry.register(
+        "asr_python_en",
+        CfgNode({"model": "conformer_librispeech",
+                 "lang": "en"}))
+    inference = registry.register(
+        "asr_inference", CfgNode({"model_type": "deepspeech2_aishell"}))
+    assert zh == EngineKey("asr", "conformer_wenetspeech", "zh", "python")
+    assert inference == EngineKey("asr", "deepspeech2_aishell", None,
+                                  "inference")
+
+    assert registry.find("asr") == zh
+    # by the model name or the section name
+    assert registry.find("asr", model="conformer_librispeech") == en
+    assert registry.find("asr", model="asr_python_en") == en
+    # the language is a hint
+    assert registry.find("asr", lang="en") == en
+    assert registry.find("asr", lang="fr") == zh
+    assert registry.find("asr", engine_type="inference") == inference
+    assert registry.find(
+        "asr", lang="en", engine_type="inference") == inference
+
+    engine = registry.get("asr", lang="en", engine_type="python")
+    assert engine.engine_type == "python"
+    assert engine.config.model == "conformer_librispeech"
+
+    with pytest.raises(ServerBaseException):
+        registry.find("tts")
+    with pytest.raises(ServerBaseException):
+        registry.find("asr", model="unknown")
+
+
+def test_lru_unload(created):
+    registry = EngineRegistry(max_memory_mb=250)
+    default = registry.register(
+        "asr_python", CfgNode({"model": "a",
+                               "memory_mb": 100}), pinned=True)
+    b = registry.register("asr_python_b",
+                          CfgNode({"model": "b",
+                                   "memory_mb": 100}))
+    c = registry.register("asr_python_c",
+                          CfgNode({"model": "c",
+                                   "memory_mb": 100}))
+    registry.load(default)
+    registry.load(b)
+
+    def loaded():
+        return {
+            name
+            for name, stats in registry.stats().items() if stats["loaded"]
+        }
+
+    assert loaded() == {"asr_python", "asr_python_b"}
+    # b is the least recently used one, the default engine is pinned
+    registry.get("asr")
+    registry.get("asr", model="c")
+    assert loaded() == {"asr_python", "asr_python_c"}
+    registry.get("asr", model="b")
+    assert loaded() == {"asr_python", "asr_python_b"}
+    # a new replica is created when it is loaded again
+    assert registry.load(c)[0] is not created[2]
+    assert len(created) == 5
@@ -0,0 +1,136 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import threading
+import time
+
+import pytest
+
+from paddlespeech.server.utils.errors import ErrorCode
+from paddlespeech.server.utils.exception import ServerBaseException
+from paddlespeech.server.utils.inference_executor import InferenceExecutor
+
+
+async def wait_for_stats(executor, engine_name, running, waiting):
+    for _ in range(500):
+        stats = executor.stats().get(engine_name, {})
+        if stats == {"running": running, "waiting": waiting}:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"stats of {engine_name}: {executor.stats()}")
+
+
+def test_max_pending_and_stats():
+    executor = InferenceExecutor(
+        max_workers=4, engine_concurrency={"asr": 1}, max_pending=2)
+    release = threading.Event()
+
+    def blocking_call(value):
+        release.wait(5)
+        return value
+
+    async def main():
+        tasks = [
+            asyncio.create_task(executor.run("asr", blocking_call, i))
+            for i in range(2)
+        ]
+        # one call runs, the other one waits for the engine
+        await wait_for_stats(executor, "asr", running=1, waiting=1)
+
+        with pytest.raises(ServerBaseException) as e:
+            await executor.run("asr", blocking_call, 2)
+        assert e.value.error_code == ErrorCode.SERVER_BUSY
+        # the pending calls of the other engines are counted apart
+        assert await executor.run("tts", lambda: "tts") == "tts"
+
+        release.set()
+        assert await asyncio.gather(*tasks) == [0, 1]
+        assert executor.stats()["asr"] == {"running": 0, "waiting": 0}
+        # a call is accepted again
+        assert await executor.run("asr", blocking_call, 3) == 3
+
+    try:
+        asyncio.run(main())
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_engine_concurrency():
+    executor = InferenceExecutor(
+        max_workers=8, engine_concurrency={"asr": 2}, max_pending=64)
+    lock = threading.Lock()
+    running = {"asr": 0, "tts": 0}
+    max_running = {"asr": 0, "tts": 0}
+
+    def blocking_call(engine_name, value):
+        with lock:
+            running[engine_name] += 1
+            max_running[engine_name] = max(max_running[engine_name],
+                                           running[engine_name])
+        time.sleep(0.05)
+        with lock:
+            running[engine_name] -= 1
+        return value
+
+    async def main():
+        return await asyncio.gather(
+            *[executor.run("asr", blocking_call, "asr", i) for i in range(6)],
+            *[executor.run("tts", blocking_call, "tts", i) for i in range(4)])
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        executor.shutdown()
+    assert results == list(range(6)) + list(range(4))
+    assert max_running["asr"] == 2
+    # the engines without a limit share all the workers
+    assert max_running["tts"] == 4
+
+
+def test_iterate():
+    executor = InferenceExecutor(max_workers=2)
+    threads = []
+
+    def generator(num_items, error=None):
+        for i in range(num_items):
+            threads.append(threading.current_thread())
+            yield i
+        if error is not None:
+            raise error
+
+    async def collect(iterator):
+        items = []
+        async for item in executor.iterate("tts", iterator):
+            items.append(item)
+        return items
+
+    async def main():
+        assert await collect(generator(5)) == list(range(5))
+        assert await collect(generator(0)) == []
+
+        items = []
+        with pytest.raises(ValueError, match="vocoder failed"):
+            async for item in executor.iterate(
+                    "tts", generator(3, ValueError("vocoder failed"))):
+                items.append(item)
+        assert items == [0, 1, 2]
+        assert executor.stats()["tts"] == {"running": 0, "waiting": 0}
+
+    try:
+        asyncio.run(main())
+    finally:
+        executor.shutdown()
+    # the steps of the generator run in the thread pool
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,114 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import time
+
+import pytest
+
+from paddlespeech.server.utils import onnx_infer
+from paddlespeech.server.utils.errors import ErrorCode
+from paddlespeech.server.utils.exception import ServerBaseException
+from paddlespeech.server.utils.predictor_pool import get_predictor_pools
+from paddlespeech.server.utils.predictor_pool import get_sess_pool
+from paddlespeech.server.utils.predictor_pool import PredictorPool
+
+
+def test_acquire_release():
+    pool = PredictorPool(["a", "b"], name="test_acquire")
+    first = pool.acquire()
+    second = pool.acquire()
+    assert {first, second} == {"a", "b"}
+    assert pool.stats()["busy"] == 2
+
+    pool.release(first)
+    # the released predictor is taken again
+    assert pool.acquire() == first
+    pool.release(first)
+    pool.release(second)
+
+    with pool.checkout() as predictor:
+        assert predictor in ("a", "b")
+        assert pool.stats()["busy"] == 1
+    stats = pool.stats()
+    assert stats["busy"] == 0
+    assert stats["max_busy"] == 2
+    assert stats["checkouts"] == 4
+    assert stats["timeouts"] == 0
+
+
+def test_checkout_timeout():
+    pool = PredictorPool(["a"], name="test_timeout", timeout=0.05)
+    with pool.checkout():
+        st = time.time()
+        with pytest.raises(ServerBaseException) as e:
+            with pool.checkout():
+                pass
+        assert e.value.error_code == ErrorCode.SERVER_BUSY
+        assert time.time() - st >= 0.05
+        # a timeout given to the checkout overrides that of the pool
+        with pytest.raises(ServerBaseException):
+            pool.acquire(timeout=0)
+
+    stats = pool.stats()
+    assert stats["timeouts"] == 2
+    assert stats["checkouts"] == 1
+    assert stats["busy"] == 0
+    # the predictor is given back, the pool is usable again
+    with pool.checkout(timeout=0) as predictor:
+        assert predictor == "a"
+
+
+def test_checkout_waits_for_release():
+    pool = PredictorPool(["a"], name="test_wait")
+    predictor = pool.acquire()
+    timer = threading.Timer(0.05, pool.release, args=(predictor, ))
+    timer.start()
+    with pool.checkout(timeout=5) as predictor:
+        assert predictor == "a"
+    timer.join()
+    assert pool.stats()["avg_wait_ms"] >= 20
+
+
+def test_stats_utilization():
+    pool = PredictorPool(["a", "b"], name="test_utilization")
+    with pool.checkout():
+        time.sleep(0.2)
+    # one of the two predictors is busy most of the time
+    utilization = pool.stats()["utilization"]
+    assert 0.3 < utilization <= 0.5
+
+    with pool.checkout(), pool.checkout():
+        time.sleep(0.4)
+    utilization = pool.stats()["utilization"]
+    assert 0.5 < utilization <= 1.0
+
+
+def test_get_sess_pool(monkeypatch):
+    sess = object()
+    monkeypatch.setattr(onnx_infer, "get_sess",
+                        lambda model_path, sess_conf: sess)
+    pool = get_sess_pool(
+        "model.onnx", {"pool_size": 3,
+                       "pool_timeout": 0.5}, name="test_sess")
+    assert pool.size == 3
+    assert pool.timeout == 0.5
+    # the session is shared by the callers
+    predictors = [pool.acquire() for _ in range(3)]
+    assert all(predictor is sess for predictor in predictors)
+    assert get_predictor_pools()[pool.name] is pool
+
+    # the names of the pools in the metrics are unique
+    other = get_sess_pool("model.onnx", {"pool_size": None}, name="test_sess")
+    assert other.size == 1
+    assert other.name != pool.name
@@ -0,0 +1,85 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+pytest.importorskip("webrtcvad")
+
+from paddlespeech.server.utils.vad import VADAudio  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_audio(pattern):
+    """pcm16 of 1s silence or 1s modulated tone for each item of pattern."""
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    tone = 0.5 * np.sin(2 * np.pi * 440 * t) * (
+        1 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    silence = np.zeros(SAMPLE_RATE)
+    wav = np.concatenate([tone if voiced else silence for voiced in pattern])
+    return (wav * 16000).astype(np.int16).tobytes()
+
+
+def spans(boundaries, num_samples):
+    """Voiced and unvoiced spans of the stream, from the boundaries."""
+    result = []
+    begin, voiced = 0, False
+    for start, offset in boundaries:
+        assert start != voiced
+        result.append((voiced, begin, offset))
+        begin, voiced = offset, start
+    result.append((voiced, begin, num_samples))
+    return result
+
+
+def test_process_spans():
+    audio = synthetic_audio([False, True, False, True, False])
+    num_samples = len(audio) // 2
+    vad = VADAudio(padding_ms=200)
+    result = spans(vad.process(audio), num_samples)
+
+    assert [voiced for voiced, _, _ in result] == [
+        False, True, False, True, False
+    ]
+    # padding_ms before being triggered, the utterence starts at the tone
+    for (voiced, begin, end), tone_begin in zip(result[1::2], (16000, 48000)):
+        assert voiced
+        assert begin == tone_begin
+        # it ends at most padding_ms and the hangover of webrtcvad later
+        tone_end = tone_begin + SAMPLE_RATE
+        assert tone_end <= end <= tone_end + 8000
+    for voiced, begin, end in result[::2]:
+        assert not voiced
+        assert end - begin >= 8000
+
+
+def test_process_chunks():
+    audio = synthetic_audio([False, True, False])
+    expected = VADAudio().process(audio)
+    assert len(expected) == 2
+
+    # the same boundaries whatever the chunks are
+    vad = VADAudio()
+    boundaries = []
+    for i in range(0, len(audio), 1234):
+        boundaries += vad.process(audio[i:i + 1234])
+    assert boundaries == expected
+
+    # and the same utterence as vad_collector yields
+    vad = VADAudio()
+    vad.add_audio(audio)
+    frames = list(vad.vad_collector())
+    (_, start), (_, end) = expected
+    assert frames[-1] is None
+    assert b"".join(frames[:-1]) == audio[2 * start:2 * end]
@@ -0,0 +1,176 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import paddle
+import pytest
+
+from paddlespeech.t2s.exps.syn_utils import batch_synthesize
+from paddlespeech.t2s.models.hifigan import HiFiGANGenerator
+from paddlespeech.t2s.models.hifigan import HiFiGANInference
+from paddlespeech.t2s.models.melgan import MelGANGenerator
+from paddlespeech.t2s.models.melgan import MelGANInference
+from paddlespeech.t2s.modules.normalizer import ZScore
+
+N_MELS = 8
+HOP_LENGTH = 4
+# the frames at the end of a sentence whose samples see the padding
+TAIL_FRAMES = 12
+
+
+class FakeAM:
+    """Expands each phone to `3 * (phone % 4)` frames, so the mels are not
+    sorted like the phones, and fills the padding of the batch with garbage. A
+    sentence of phones 4 and 8 has an empty mel."""
+
+    def __init__(self):
+        self.batches = []
+
+    def mel(self, phones):
+        frames = np.repeat(phones, 3 * (phones % 4)).astype(np.float32)
+        t = np.arange(len(frames), dtype=np.float32)[:, None]
+        c = np.arange(N_MELS, dtype=np.float32)[None, :]
+        return np.sin(0.7 * frames[:, None] + 0.2 * t + 0.5 * c)
+
+    def batch_inference(self, text, lengths):
+        text, lengths = text.numpy(), lengths.numpy()
+        self.batches.append(lengths.tolist())
+        mels = [self.mel(text[b, :n]) for b, n in enumerate(lengths)]
+        max_len = max(len(mel) for mel in mels)
+        out = np.full([len(mels), max_len, N_MELS], 100.0, dtype=np.float32)
+        for b, mel in enumerate(mels):
+            out[b, :len(mel)] = mel
+        return paddle.to_tensor(out), paddle.to_tensor(
+            [len(mel) for mel in mels])
+
+
+class RecordingVocoder:
+    """Records the mel batches of a vocoder."""
+
+    def __init__(self, voc_inference):
+        self.voc_inference = voc_inference
+        self.batches = []
+
+    def __call__(self, logmel):
+        return self.voc_inference(logmel)
+
+    def batch_inference(self, logmel):
+        self.batches.append(logmel.numpy())
+        return self.voc_inference.batch_inference(logmel)
+
+
+def make_vocoder(name):
+    paddle.seed(0)
+    if name == "hifigan":
+        generator = HiFiGANGenerator(
+            in_channels=N_MELS,
+            channels=16,
+            upsample_scales=(2, 2),
+            upsample_kernel_sizes=(4, 4),
+            resblock_kernel_sizes=(3, ),
+            resblock_dilations=[(1, 3)])
+        inference_class = HiFiGANInference
+    else:
+        generator = MelGANGenerator(
+            in_channels=N_MELS,
+            channels=16,
+            upsample_scales=[2, 2],
+            stacks=2)
+        inference_class = MelGANInference
+    generator.remove_weight_norm()
+    generator.eval()
+    normalizer = ZScore(paddle.zeros([N_MELS]), paddle.ones([N_MELS]))
+    voc_inference = inference_class(normalizer, generator)
+    voc_inference.eval()
+    return voc_inference
+
+
+PHONES = [
+    [1, 2, 3, 5, 6, 7, 9],
+    [3, 3, 3],
+    [4, 8],
+    [1, 5, 9, 13, 1, 5],
+    [2, 7, 11, 2],
+    [7, 5, 7],
+]
+
+
+@pytest.mark.parametrize("voc", ["hifigan", "melgan"])
+@pytest.mark.parametrize("batch_size", [1, 2, 4])
+def test_batch_synthesize(voc, batch_size):
+    am = FakeAM()
+    voc_inference = RecordingVocoder(make_vocoder(voc))
+    phone_ids = [paddle.to_tensor(p, dtype="int64") for p in PHONES]
+    mels = [am.mel(np.array(p)) for p in PHONES]
+    assert len(mels[2]) == 0
+
+    wav, am_time, voc_time = batch_synthesize(
+        am, voc_inference, phone_ids, batch_size=batch_size)
+    wav = wav.numpy()
+    assert am_time >= 0 and voc_time >= 0
+
+    # the acoustic model runs on batches sorted by the phone lengths
+    phone_lengths = [len(p) for p in PHONES]
+    assert [n for batch in am.batches for n in batch] == sorted(
+        phone_lengths, reverse=True)
+    assert all(len(batch) <= batch_size for batch in am.batches)
+
+    # the vocoder runs on batches re-sorted by the mel lengths, without
+    # the empty mel
+    mel_lengths = sorted([len(mel) for mel in mels if len(mel)], reverse=True)
+    assert [len(batch) for batch in voc_inference.batches] == [
+        len(mel_lengths[i:i + batch_size])
+        for i in range(0, len(mel_lengths), batch_size)
+    ]
+    rows = [row for batch in voc_inference.batches for row in batch]
+    for row, mel_length in zip(rows, mel_lengths):
+        mel = next(mel for mel in mels if len(mel) == mel_length)
+        np.testing.assert_allclose(row[:mel_length], mel)
+        # the padding repeats the last frame
+        np.testing.assert_allclose(row[mel_length:],
+                                   np.broadcast_to(mel[-1], row[
+                                       mel_length:].shape))
+
+    # the waveforms are in the order of the sentences, a hop per frame
+    assert wav.shape == (sum(len(mel) for mel in mels) * HOP_LENGTH, 1)
+    offset = 0
+    for mel in mels:
+        if len(mel) == 0:
+            continue
+        expected = voc_inference(paddle.to_tensor(mel)).numpy()
+        assert expected.shape == (len(mel) * HOP_LENGTH, 1)
+        num_samples = len(expected)
+        interior = max(len(mel) - TAIL_FRAMES, 0) * HOP_LENGTH
+        np.testing.assert_allclose(
+            wav[offset:offset + interior], expected[:interior], atol=1e-5)
+        np.testing.assert_allclose(
+            wav[offset:offset + num_samples], expected, atol=0.5)
+        offset += num_samples
+
+
+def test_batch_synthesize_without_batch_vocoder():
+    am = FakeAM()
+    voc_inference = make_vocoder("hifigan")
+    phone_ids = [paddle.to_tensor(p, dtype="int64") for p in PHONES]
+    wav, _, _ = batch_synthesize(
+        am, voc_inference.forward, phone_ids, batch_size=4)
+    expected = np.concatenate([
+        voc_inference(paddle.to_tensor(am.mel(np.array(p)))).numpy()
+        for p in PHONES if len(am.mel(np.array(p)))
+    ])
+    np.testing.assert_allclose(wav.numpy(), expected, atol=1e-5)
+
+    # only empty mels
+    wav, _, _ = batch_synthesize(
+        am, voc_inference, [paddle.to_tensor([4, 8])], batch_size=4)
+    assert wav.shape == [0, 1]
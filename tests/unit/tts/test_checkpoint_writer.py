@@ -0,0 +1,98 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from itertools import count
+from types import SimpleNamespace
+
+import numpy as np
+import paddle
+import pytest
+from paddle import nn
+from paddle.optimizer import Adam
+
+from paddlespeech.t2s.training.extensions.snapshot import Snapshot
+from paddlespeech.t2s.training.updaters.standard_updater import StandardUpdater
+from paddlespeech.utils import checkpoint_writer
+from paddlespeech.utils.checkpoint_writer import atomic_save
+from paddlespeech.utils.checkpoint_writer import CheckpointWriter
+from paddlespeech.utils.checkpoint_writer import to_host
+
+
+def make_updater():
+    model = nn.Linear(3, 4)
+    optimizer = Adam(parameters=model.parameters())
+    # train a step, so that the optimizer has states
+    loss = model(paddle.randn([2, 3])).mean()
+    loss.backward()
+    optimizer.step()
+    optimizer.clear_grad()
+    return StandardUpdater(model, optimizer, dataloader=count())
+
+
+def test_async_snapshot_and_restore(tmp_path):
+    updater = make_updater()
+    trainer = SimpleNamespace(updater=updater)
+    snap = Snapshot(max_size=5, async_save=True)
+    snap.checkpoint_dir = tmp_path
+    expected = to_host(updater.state_dict())
+
+    snap(trainer)
+    # the training goes on while the snapshot is written
+    for param in updater.model.parameters():
+        param.set_value(paddle.zeros_like(param))
+    snap.finalize(trainer)
+
+    path = tmp_path / "snapshot_iter_0.pdz"
+    assert [record["path"] for record in snap.records] == [str(path)]
+    assert not list(tmp_path.glob("*.tmp"))
+
+    # the parameter names of the optimizer states are those of this model
+    updater.set_state_dict(paddle.load(str(path)))
+    restored = updater.state_dict()
+    for name in ("main_params", "main_optimizer"):
+        for key, value in expected[name].items():
+            if isinstance(value, np.ndarray):
+                np.testing.assert_array_equal(restored[name][key].numpy(),
+                                              value)
+
+
+def test_failed_write_leaves_no_file(tmp_path, monkeypatch):
+    def broken_save(obj, path):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+        raise OSError("No space left on device")
+
+    path = str(tmp_path / "model.pdparams")
+    state_dict = to_host(nn.Linear(3, 4).state_dict())
+    atomic_save(state_dict, path)
+    saved = paddle.load(path)
+
+    monkeypatch.setattr(checkpoint_writer.paddle, "save", broken_save)
+    with pytest.raises(OSError):
+        atomic_save(state_dict, path)
+    # the previous checkpoint is kept
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["model.pdparams"]
+    for key, value in paddle.load(path).items():
+        np.testing.assert_array_equal(value.numpy(), saved[key].numpy())
+
+    writer = CheckpointWriter(asynchronous=True)
+    callback_calls = []
+    new_path = str(tmp_path / "new.pdparams")
+    writer.submit({new_path: state_dict},
+                  callback=lambda: callback_calls.append(new_path))
+    with pytest.raises(RuntimeError):
+        writer.wait()
+    assert not callback_calls
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["model.pdparams"]
+    # the error is raised once
+    writer.wait()
@@ -0,0 +1,75 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import paddle
+
+from paddlespeech.t2s.models.fastspeech2 import FastSpeech2
+
+
+def _check_batch_inference(**kwargs):
+    paddle.seed(0)
+    np.random.seed(0)
+    model = FastSpeech2(
+        idim=20,
+        odim=8,
+        adim=16,
+        aheads=2,
+        elayers=2,
+        eunits=32,
+        dlayers=2,
+        dunits=32,
+        positionwise_conv_kernel_size=3,
+        postnet_layers=2,
+        postnet_chans=8,
+        duration_predictor_layers=2,
+        duration_predictor_chans=8,
+        pitch_predictor_layers=2,
+        pitch_predictor_chans=8,
+        energy_predictor_layers=2,
+        energy_predictor_chans=8,
+        **kwargs)
+    # about 4 frames per token
+    model.duration_predictor.linear.bias.set_value(paddle.full([1], 1.5))
+    model.eval()
+
+    lengths = [12, 5, 8]
+    phones = [np.random.randint(1, 20, n) for n in lengths]
+    text = np.zeros([len(lengths), max(lengths)], dtype=np.int64)
+    for i, p in enumerate(phones):
+        text[i, :len(p)] = p
+
+    with paddle.no_grad():
+        outs, olens = model.batch_inference(
+            paddle.to_tensor(text), paddle.to_tensor(lengths))
+        for i, p in enumerate(phones):
+            out = model.inference(paddle.to_tensor(p))[0].numpy()
+            assert int(olens[i]) == out.shape[0]
+            np.testing.assert_allclose(
+                outs[i, :int(olens[i])].numpy(), out, atol=1e-5)
+
+
+def test_batch_inference_transformer():
+    _check_batch_inference()
+
+
+def test_batch_inference_conformer():
+    _check_batch_inference(
+        encoder_type="conformer",
+        decoder_type="conformer",
+        use_macaron_style_in_conformer=True,
+        use_cnn_in_conformer=True)
+
+
+def test_batch_inference_cnndecoder():
+    _check_batch_inference(decoder_type="cnndecoder")
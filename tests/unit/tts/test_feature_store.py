@@ -0,0 +1,53 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+
+from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import FeatureStoreWriter
+from paddlespeech.t2s.datasets.feature_store import load_feature
+
+
+def test_feature_store(tmp_path):
+    rng = np.random.RandomState(0)
+    feats = [{
+        "speech": rng.randn(n, 4).astype(np.float32),
+        "pitch": rng.randn(n // 2, 1)
+    } for n in (5, 0, 9)]
+
+    metadata = []
+    with FeatureStoreWriter(tmp_path / "feats", dtype=None) as writer:
+        for i, feat in enumerate(feats[:2]):
+            metadata.append({"utt_id": str(i), **writer.append(feat)})
+    # append to the existing store
+    with FeatureStoreWriter(tmp_path / "feats", mode='a', dtype=None) as writer:
+        metadata.append({"utt_id": "2", **writer.append(feats[2])})
+    np.save(tmp_path / "3.npy", feats[0]["speech"])
+    metadata.append({
+        "utt_id": "3",
+        "speech": str(tmp_path / "3.npy"),
+        "pitch": str(tmp_path / "3.npy")
+    })
+    feats.append({"speech": feats[0]["speech"], "pitch": feats[0]["speech"]})
+
+    dataset = DataTable(
+        metadata,
+        converters={"speech": load_feature,
+                    "pitch": load_feature})
+    for example, feat in zip(dataset, feats):
+        for field in ("speech", "pitch"):
+            assert example[field].dtype == feat[field].dtype
+            np.testing.assert_array_equal(example[field], feat[field])
+
+    # views of the store, not writable
+    assert not dataset[0]["speech"].flags.writeable
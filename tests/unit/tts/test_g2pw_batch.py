@@ -0,0 +1,182 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from paddlespeech.t2s.frontend.g2pw.dataset import get_phoneme_labels
+from paddlespeech.t2s.frontend.g2pw.dataset import prepare_onnx_input
+from paddlespeech.t2s.frontend.g2pw.onnx_api import G2PWOnnxConverter
+from paddlespeech.t2s.frontend.zh_frontend import Frontend
+
+POLYPHONIC_CHARS = [
+    ['行', 'xing2'],
+    ['行', 'hang2'],
+    ['长', 'chang2'],
+    ['长', 'zhang3'],
+    ['重', 'zhong4'],
+    ['重', 'chong2'],
+]
+# the fake tokenizer fails on it, as g2pW on the words out of its vocab
+INVALID_CHAR = '鬱'
+
+
+class FakeTokenizer:
+    pad_token_id = 0
+
+    def tokenize(self, word):
+        if INVALID_CHAR in word:
+            raise ValueError(f"invalid word {word}")
+        return list(word)
+
+    def convert_tokens_to_ids(self, tokens):
+        return [ord(token[0]) % 1000 + 1 for token in tokens]
+
+
+class FakeSession:
+    """Predicts a phoneme of the query from its own unpadded tokens only,
+    and counts the queries it runs."""
+
+    def __init__(self):
+        self.num_runs = 0
+        self.num_queries = 0
+
+    def run(self, output_names, feeds):
+        self.num_runs += 1
+        input_ids = feeds["input_ids"]
+        self.num_queries += len(input_ids)
+        probs = np.zeros(feeds["phoneme_mask"].shape, dtype=np.float32)
+        for i, input_id in enumerate(input_ids):
+            tokens = input_id[feeds["attention_mask"][i] == 1]
+            assert (input_id[feeds["attention_mask"][i] == 0] == 0).all()
+            allowed = np.nonzero(feeds["phoneme_mask"][i])[0]
+            score = int(tokens.sum()) * 31 + int(feeds["position_ids"][
+                i]) * 7 + int(feeds["char_ids"][i])
+            probs[i, allowed[score % len(allowed)]] = 0.9
+        return [probs]
+
+
+def make_converter(batch_size=64, cache_size=1024):
+    converter = G2PWOnnxConverter.__new__(G2PWOnnxConverter)
+    converter.session_g2pW = FakeSession()
+    converter.tokenizer = FakeTokenizer()
+    converter.config = SimpleNamespace(use_mask=True, use_char_phoneme=False)
+    converter.enable_opencc = False
+    converter.labels, converter.char2phonemes = get_phoneme_labels(
+        POLYPHONIC_CHARS)
+    converter.chars = sorted(converter.char2phonemes)
+    converter.polyphonic_chars_new = set(converter.chars)
+    converter.monophonic_chars_dict = {}
+    converter.char_bopomofo_dict = {}
+    converter.style_convert_func = lambda x: x
+    converter.batch_size = batch_size
+    converter.cache_size = cache_size
+    converter._cache = OrderedDict()
+    converter._cache_lock = threading.Lock()
+    return converter
+
+
+SENTENCES = ['银行行长很重视', '长', '重新出发', '行长说银行的业务很重要', '你好']
+
+
+def test_prepare_onnx_input_padding():
+    converter = make_converter()
+    texts = ['行长', '银行行长很重视', '银行行长很重视']
+    query_ids = [0, 2, 5]
+    kwargs = dict(
+        tokenizer=converter.tokenizer,
+        labels=converter.labels,
+        char2phonemes=converter.char2phonemes,
+        chars=converter.chars,
+        use_mask=True)
+    batch = prepare_onnx_input(texts=texts, query_ids=query_ids, **kwargs)
+    assert batch['input_ids'].shape == (3, len(texts[1]) + 2)
+    for i, (text, query_id) in enumerate(zip(texts, query_ids)):
+        single = prepare_onnx_input(
+            texts=[text], query_ids=[query_id], **kwargs)
+        length = single['input_ids'].shape[1]
+        np.testing.assert_array_equal(batch['input_ids'][i, :length],
+                                      single['input_ids'][0])
+        assert (batch['input_ids'][i, length:] == 0).all()
+        assert batch['attention_masks'][i].tolist() == [1] * length + [0] * (
+            batch['input_ids'].shape[1] - length)
+        for key in ('phoneme_masks', 'char_ids', 'position_ids'):
+            np.testing.assert_array_equal(batch[key][i], single[key][0])
+
+
+@pytest.mark.parametrize("batch_size", [1, 2, 64])
+def test_batched_equals_per_sentence(batch_size):
+    expected = [
+        make_converter(cache_size=0)(sent)[0] for sent in SENTENCES
+    ]
+    converter = make_converter(batch_size=batch_size, cache_size=0)
+    assert converter(SENTENCES) == expected
+    num_queries = sum(
+        char in converter.polyphonic_chars_new for sent in SENTENCES
+        for char in sent)
+    assert converter.session_g2pW.num_queries == num_queries
+    assert converter.session_g2pW.num_runs == -(-num_queries // batch_size)
+    assert expected[-1] == ['ni3', 'hao3']
+
+
+def test_cache():
+    converter = make_converter(cache_size=2)
+    session = converter.session_g2pW
+    first = converter(['银行行长很重视', '长', '银行行长很重视'])
+    # the same sentences of a request run once
+    assert session.num_queries == 5
+    assert first[0] == first[2] and first[0] is not first[2]
+
+    # cache hits skip the session
+    result = converter(['长', '银行行长很重视'])
+    assert result == [first[1], first[0]]
+    assert session.num_runs == 1
+
+    # copies are returned, the cached results are not modified
+    result[1][0] = 'modified'
+    assert converter('银行行长很重视')[0] == first[0]
+    assert session.num_runs == 1
+
+    # the least recently used sentence is evicted
+    converter('重新出发')
+    assert list(converter._cache) == ['银行行长很重视', '重新出发']
+    converter('长')
+    assert session.num_runs == 3
+    converter('重新出发')
+    assert session.num_runs == 3
+
+
+def test_g2pm_fallback_for_the_failing_segment():
+    calls = []
+
+    def g2pM_model(seg, tone=True, char_split=False):
+        calls.append(seg)
+        return ['g2pm'] * len(seg)
+
+    frontend = Frontend.__new__(Frontend)
+    frontend.g2pW_model = make_converter()
+    frontend.g2pM_model = g2pM_model
+    segments = ['银行行长', INVALID_CHAR + '重', '长']
+
+    with pytest.raises(Exception):
+        frontend.g2pW_model(segments)
+    pinyins = frontend._g2pw(segments)
+
+    assert calls == [segments[1]]
+    assert pinyins[1] == ['g2pm', 'g2pm']
+    assert pinyins[0] == make_converter()(segments[0])[0]
+    assert pinyins[2] == make_converter()(segments[2])[0]
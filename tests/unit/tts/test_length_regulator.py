@@ -0,0 +1,43 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import paddle
+
+from paddlespeech.t2s.modules.predictor.length_regulator import LengthRegulator
+
+
+def test_expand_gather():
+    length_regulator = LengthRegulator()
+    x = paddle.randn([2, 5, 3])
+    durations = paddle.to_tensor(
+        [[1, 0, 3, 2, 0], [2, 2, 0, 1, 0]], dtype='int64')
+
+    y = length_regulator.expand_gather(x, durations)
+    assert y.shape == [2, 6, 3]
+    np.testing.assert_allclose(
+        y.numpy(), length_regulator.expand_numpy(x, durations).numpy())
+    # the padded frames
+    np.testing.assert_allclose(y[1, 5:].numpy(), 0.0)
+
+
+def test_expand_gather_grad():
+    x = paddle.randn([2, 5, 3])
+    x.stop_gradient = False
+    durations = paddle.to_tensor(
+        [[1, 0, 3, 2, 0], [2, 2, 0, 1, 0]], dtype='int64')
+
+    LengthRegulator()(x, durations).sum().backward()
+    # each token gets the gradient of its frames
+    np.testing.assert_allclose(x.grad[:, :, 0].numpy(),
+                               durations.numpy().astype('float32'))
@@ -0,0 +1,162 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import copy
+
+import jsonlines
+import numpy as np
+import pytest
+import soundfile as sf
+from yacs.config import CfgNode
+
+from paddlespeech.t2s.datasets.feature_store import load_feature
+from paddlespeech.t2s.datasets.get_feats import Energy
+from paddlespeech.t2s.datasets.get_feats import LogMelFBank
+from paddlespeech.t2s.datasets.get_feats import Pitch
+from paddlespeech.t2s.exps.fastspeech2.preprocess import _share_stft
+from paddlespeech.t2s.exps.fastspeech2.preprocess import extract_sentence
+from paddlespeech.t2s.exps.fastspeech2.preprocess import process_sentences
+
+FS = 16000
+N_FFT = 512
+N_SHIFT = 128
+FEATS = ("speech", "pitch", "energy")
+
+
+def make_extractors(win_length=None):
+    mel_extractor = LogMelFBank(
+        sr=FS,
+        n_fft=N_FFT,
+        hop_length=N_SHIFT,
+        win_length=win_length,
+        n_mels=20,
+        fmin=80,
+        fmax=7600)
+    pitch_extractor = Pitch(sr=FS, hop_length=N_SHIFT, f0min=80, f0max=400)
+    energy_extractor = Energy(
+        n_fft=N_FFT, hop_length=N_SHIFT, win_length=win_length)
+    return mel_extractor, pitch_extractor, energy_extractor
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """A few synthetic wavs of a gliding tone, with silence at both ends,
+    and their sentences of phones and durations."""
+    rng = np.random.RandomState(0)
+    fps = []
+    sentences = {}
+    for i, seconds in enumerate((0.6, 0.9, 0.5, 1.2, 0.7)):
+        n = int(FS * seconds)
+        t = np.arange(n) / FS
+        f0 = 120 + 60 * i + 40 * t
+        tone = 0.5 * np.sin(2 * np.pi * np.cumsum(f0) / FS)
+        tone *= np.hanning(n)
+        wav = np.concatenate([np.zeros(FS // 10), tone, np.zeros(FS // 10)])
+        wav += 0.001 * rng.randn(len(wav))
+        fp = tmp_path / "wavs" / f"utt{i}.wav"
+        fp.parent.mkdir(exist_ok=True)
+        sf.write(fp, wav.astype(np.float32), FS)
+        fps.append(fp)
+
+        num_frames = len(wav) // N_SHIFT + 1
+        sil = FS // 10 // N_SHIFT
+        durations = [sil, (num_frames - 2 * sil) // 2]
+        durations += [num_frames - 2 * sil - durations[1], sil]
+        sentences[fp.stem] = [["sil", "a", "b", "sil"], durations, "spk0"]
+    # an utterance without a sentence is skipped
+    fp = tmp_path / "wavs" / "unknown.wav"
+    sf.write(fp, np.zeros(FS, dtype=np.float32), FS)
+    fps.append(fp)
+    return fps, sentences
+
+
+def test_share_stft(corpus):
+    fps, sentences = corpus
+    config = CfgNode(dict(fs=FS, n_shift=N_SHIFT))
+    mel_extractor, pitch_extractor, energy_extractor = make_extractors()
+    assert _share_stft(mel_extractor, energy_extractor)
+    # the same stft, but with different params, is computed twice
+    separate = make_extractors(win_length=N_FFT)
+    assert not _share_stft(mel_extractor, separate[2])
+    assert not _share_stft(mel_extractor, Energy(n_fft=N_FFT, hop_length=64))
+
+    wav = sf.read(fps[0], dtype="float32")[0]
+    magnitude = mel_extractor.get_magnitude(wav)
+    np.testing.assert_allclose(
+        mel_extractor.get_log_mel_fbank(wav, magnitude=magnitude),
+        mel_extractor.get_log_mel_fbank(wav),
+        rtol=1e-6)
+    duration = np.array(sentences[fps[0].stem][1])
+    duration[-1] += magnitude.shape[1] - duration.sum()
+    np.testing.assert_allclose(
+        energy_extractor.get_energy(
+            wav, duration=duration, magnitude=magnitude),
+        energy_extractor.get_energy(wav, duration=duration),
+        rtol=1e-6)
+
+    # the features of extract_sentence with the shared magnitude are the
+    # same as with separate stfts
+    for fp in fps[:-1]:
+        shared = extract_sentence(config, fp,
+                                  copy.deepcopy(sentences), *make_extractors())
+        unshared = extract_sentence(config, fp,
+                                    copy.deepcopy(sentences), *separate)
+        assert shared[0] == unshared[0]
+        for name in FEATS:
+            np.testing.assert_allclose(
+                shared[1][name], unshared[1][name], rtol=1e-5, atol=1e-6)
+    assert extract_sentence(config, fps[-1],
+                            copy.deepcopy(sentences), *separate) is None
+
+
+def run_process_sentences(corpus, output_dir, nprocs, feats_format):
+    fps, sentences = corpus
+    output_dir.mkdir()
+    process_sentences(
+        CfgNode(dict(fs=FS, n_shift=N_SHIFT)),
+        fps,
+        copy.deepcopy(sentences),
+        output_dir,
+        *make_extractors(),
+        nprocs=nprocs,
+        cut_sil=True,
+        feats_format=feats_format,
+        chunk_size=2)
+    with jsonlines.open(output_dir / "metadata.jsonl") as reader:
+        return list(reader)
+
+
+@pytest.mark.parametrize("nprocs", [1, 2])
+def test_process_sentences_store(corpus, tmp_path, nprocs):
+    expected = run_process_sentences(corpus, tmp_path / "npy", 1, "npy")
+    metadata = run_process_sentences(corpus, tmp_path / "store", nprocs,
+                                     "store")
+
+    assert [item["utt_id"] for item in expected] == [
+        f"utt{i}" for i in range(5)
+    ]
+    assert len(metadata) == len(expected)
+    for item, expected_item in zip(metadata, expected):
+        assert item.keys() == expected_item.keys()
+        for key, value in expected_item.items():
+            if key in FEATS:
+                assert value.endswith(".npy")
+                assert not item[key].endswith(".npy")
+                np.testing.assert_allclose(
+                    load_feature(item[key]),
+                    np.load(value).astype(np.float32),
+                    rtol=1e-6)
+            else:
+                assert item[key] == value
+        assert load_feature(item["speech"]).shape == (item["speech_lengths"],
+                                                      20)
@@ -0,0 +1,83 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from pathlib import Path
+
+import pytest
+
+from paddlespeech.t2s.frontend.zh_normalization.text_normlization import TextNormalizer
+
+TEST_CASES = Path(__file__).parents[3] / "examples/other/tn/data/textnorm_test_cases.txt"
+
+# the line numbers of the test cases which the normalizer does not pass
+DIGITS_AS_YAO = "digit strings with 1 are read with 幺"
+KNOWN_DIFFERENCES = {
+    11: "the 's' of english words is read as a unit",
+    18: DIGITS_AS_YAO,
+    19: DIGITS_AS_YAO,
+    20: "the quotes are removed and " + DIGITS_AS_YAO,
+    24: "the hyphen of a word is removed",
+    29: DIGITS_AS_YAO,
+    33: "the separators of phone numbers are read as a pause",
+    34: "the separators of phone numbers are read as a pause",
+    39: DIGITS_AS_YAO,
+    41: "scores are read as times",
+    42: "scores are read as times",
+    50: DIGITS_AS_YAO,
+    51: "numbers of an addition are read as digit strings",
+    53: DIGITS_AS_YAO,
+    54: DIGITS_AS_YAO,
+    56: DIGITS_AS_YAO,
+    57: DIGITS_AS_YAO,
+    58: DIGITS_AS_YAO,
+    59: DIGITS_AS_YAO,
+    86: DIGITS_AS_YAO,
+    127: "the expected output drops the number",
+}
+
+NORMALIZERS = {
+    "cached": TextNormalizer(),
+    "uncached": TextNormalizer(cache_size=0),
+}
+
+
+def load_test_cases():
+    with open(TEST_CASES, "rt", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    cases = []
+    for lineno, line in enumerate(lines, start=1):
+        raw, expected = line.split("|")
+        marks = []
+        if lineno in KNOWN_DIFFERENCES:
+            marks.append(
+                pytest.mark.xfail(
+                    reason=KNOWN_DIFFERENCES[lineno], strict=True))
+        cases.append(
+            pytest.param(raw, expected, marks=marks, id=f"line{lineno}"))
+    return cases
+
+
+@pytest.mark.parametrize("normalizer", list(NORMALIZERS))
+@pytest.mark.parametrize("raw,expected", load_test_cases())
+def test_normalize_sentence(normalizer, raw, expected):
+    text_normalizer = NORMALIZERS[normalizer]
+    assert text_normalizer.normalize_sentence(raw) == expected
+    # the cached result is the same
+    assert text_normalizer.normalize_sentence(raw) == expected
+
+
+def test_cached_equals_uncached():
+    for case in load_test_cases():
+        raw = case.values[0]
+        assert NORMALIZERS["cached"].normalize_sentence(
+            raw) == NORMALIZERS["uncached"].normalize_sentence(raw)
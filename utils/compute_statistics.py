@@ -22,6 +22,7 @@ from sklearn.preprocessing import StandardScaler
 from tqdm import tqdm
 
 from paddlespeech.t2s.datasets.data_table import DataTable
+from paddlespeech.t2s.datasets.feature_store import load_feature
 from paddlespeech.t2s.utils import str2bool
 
 
@@ -92,7 +93,7 @@ def main():
     dataset = DataTable(
         metadata,
         fields=[args.field_name],
-        converters={args.field_name: np.load}, )
+        converters={args.field_name: load_feature}, )
     logging.info(f"The number of files = {len(dataset)}.")
 
     # calculate statistics
@@ -0,0 +1,80 @@
+# Copyright (c) 2022 PaddlePaddle Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Pack the .npy feature files of a dump directory into a feature store."""
+import argparse
+from pathlib import Path
+
+import jsonlines
+import numpy as np
+from tqdm import tqdm
+
+from paddlespeech.t2s.datasets.feature_store import FeatureStoreWriter
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pack the .npy feature files of a metadata.jsonl into one memory mapped file per feature, "
+        "and write a metadata.jsonl that refers to them, which the training scripts read without change."
+    )
+    parser.add_argument(
+        "--metadata",
+        type=str,
+        required=True,
+        help="metadata.jsonl of the dump directory, e.g. dump/train/norm/metadata.jsonl."
+    )
+    parser.add_argument(
+        "--fields",
+        type=str,
+        nargs='+',
+        default=None,
+        help="fields to pack, all the fields of .npy files if not provided.")
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=None,
+        help="directory of the feature store and the new metadata.jsonl, "
+        "`packed` next to the metadata if not provided.")
+    args = parser.parse_args()
+
+    metadata_path = Path(args.metadata).expanduser().resolve()
+    if args.output_dir is None:
+        output_dir = metadata_path.parent / "packed"
+    else:
+        output_dir = Path(args.output_dir).expanduser().resolve()
+
+    with jsonlines.open(metadata_path, 'r') as reader:
+        metadata = list(reader)
+
+    fields = args.fields
+    if fields is None:
+        fields = [
+            field for field, value in metadata[0].items()
+            if isinstance(value, str) and value.endswith(".npy")
+        ]
+    print(f"pack {fields} of {len(metadata)} utterances to {output_dir}")
+
+    # keep the dtype of the features, e.g. float32 of normalized ones
+    with FeatureStoreWriter(output_dir / "feats", dtype=None) as writer:
+        for item in tqdm(metadata):
+            feats = {field: np.load(item[field]) for field in fields}
+            item.update(writer.append(feats))
+
+    with jsonlines.open(output_dir / "metadata.jsonl", 'w') as writer:
+        for item in metadata:
+            writer.write(item)
+    print(f"metadata saved to {output_dir / 'metadata.jsonl'}")
+
+
+if __name__ == "__main__":
+    main()